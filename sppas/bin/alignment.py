@@ -94,7 +94,7 @@ parser.add_argument("-a",
                     required=False,
                     choices=aligners.aligner_names(),
                     default="julius",
-                    help='Speech automatic aligner system: julius, hvite, basic (default: julius)')
+                    help='Speech automatic aligner system: julius, hvite, viterbi, basic (default: julius)')
 
 parser.add_argument("--basic",
                     action='store_true',
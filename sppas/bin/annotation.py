@@ -100,6 +100,29 @@ parser.add_argument("--nomerge",
                     action='store_true',
                     help="Do not create a merged TextGrid file.")
 
+parser.add_argument("--workers",
+                    type=int,
+                    default=1,
+                    metavar="N",
+                    help="Number of processes annotating files at the same time, 0=number of CPUs (default: 1)")
+
+parser.add_argument("--resume",
+                    action='store_true',
+                    help="Do not annotate again the files with an up-to-date annotation.")
+
+parser.add_argument("--pipeline",
+                    action='store_true',
+                    help="Perform all the annotations on a file before the next file.")
+
+parser.add_argument("--cache",
+                    action='store_true',
+                    help="Do not annotate again the files with a valid output in the cache "
+                         "(the cache is saved in the directories of the outputs).")
+
+parser.add_argument("--invalidate",
+                    action='store_true',
+                    help="Clear the cache of the annotations before annotating.")
+
 if len(sys.argv) <= 1:
     sys.argv.append('-h')
 
@@ -124,6 +147,7 @@ if not ext.lower() in extensions:
     print("\n")
     ext = DEFAULT_OUTPUT_EXTENSION
 parameters.set_output_format(ext)
+parameters.set_nb_workers(args.workers)
 
 if args.momel:
     parameters.activate_annotation("momel")
@@ -174,6 +198,14 @@ if args.nomerge:
     process.set_do_merge(False)
 if args.merge:
     process.set_do_merge(True)
+if args.resume:
+    process.set_resume(True)
+if args.pipeline:
+    process.set_pipeline(True)
+if args.cache:
+    process.set_cache(True)
+if args.invalidate:
+    process.set_invalidate(True)
 process.run_annotations(p)
 
 try:
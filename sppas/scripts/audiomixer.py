@@ -80,9 +80,7 @@ for inputFile in args.w:
         audio.rewind()
         mixer.append_channel(audio.get_channel(idx))
 
-new_channel = mixer.mix()
-
-# Save the converted channel
+# Mix and save the channels, block by block
 audio_out = sppasAudioPCM()
-audio_out.append_channel(new_channel)
-sppas.src.audiodata.aio.save(args.o, audio_out)
+audio_out.append_channel(mixer.get_channel(0))
+sppas.src.audiodata.aio.save_blocks(args.o, audio_out, mixer.mix_blocks())
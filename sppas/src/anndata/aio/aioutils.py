@@ -58,6 +58,7 @@ from ..annlabel.tag import sppasTag
 from ..anndataexc import AnnDataTypeError
 from ..anndataexc import AioError
 from ..anndataexc import AioEncodingError
+from ..anndataexc import AioLineFormatError
 
 # ---------------------------------------------------------------------------
 
@@ -91,6 +92,96 @@ def load(filename, file_encoding=sppas.encoding):
 # ---------------------------------------------------------------------------
 
 
+class sppasLineReader(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Read the lines of a file on demand.
+
+    The lines are read only when they are requested, so that a file can be
+    parsed without loading its whole content. The reader counts the lines
+    it returned and it can look ahead for the next ones.
+
+    >>> with codecs.open(filename, 'r', sppas.encoding) as fp:
+    >>>     reader = sppasLineReader(fp)
+    >>>     while reader.has_lines():
+    >>>         line = reader.next_line()
+
+    """
+    def __init__(self, lines, number=0, start=0):
+        """ Create a new sppasLineReader instance.
+
+        :param lines: (iterable) A file object or a list of lines
+        :param number: (int) Number of lines before the given ones
+        :param start: (int) Index of the first line to read in a list of
+        lines: the list is not copied.
+
+        """
+        if start > 0:
+            self.__lines = sppasLineReader.__iter_list(lines, start)
+        else:
+            self.__lines = iter(lines)
+        self.__next = list()
+        self.__number = number
+        self.__last = ""
+
+    # -----------------------------------------------------------------------
+
+    def get_number(self):
+        """ Return the number of the last returned line. """
+
+        return self.__number
+
+    # -----------------------------------------------------------------------
+
+    def has_lines(self, n=1):
+        """ Return True if there are at least n lines to be read.
+
+        :param n: (int) Number of lines
+        :returns: (bool)
+
+        """
+        while len(self.__next) < n:
+            try:
+                self.__next.append(next(self.__lines))
+            except StopIteration:
+                return False
+
+        return True
+
+    # -----------------------------------------------------------------------
+
+    def next_line(self):
+        """ Return the next line.
+
+        :raises: AioLineFormatError if there are no more lines
+        :returns: (str)
+
+        """
+        if self.has_lines() is False:
+            raise AioLineFormatError(self.__number, self.__last)
+
+        self.__last = self.__next.pop(0)
+        self.__number += 1
+        return self.__last
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __iter_list(lines, start):
+        """ Iterate over the lines of a list from the given index. """
+
+        i = start
+        while i < len(lines):
+            yield lines[i]
+            i += 1
+
+# ---------------------------------------------------------------------------
+
+
 def format_labels(text, separator="\n", empty=""):
     """ Create a set of labels from a text.
 
@@ -44,11 +44,13 @@
 
 """
 import codecs
+import io
 import re
 
 import sppas
 from sppas.src.utils.makeunicode import u
 
+from ..anndataexc import AioError
 from ..anndataexc import AioEncodingError
 from ..anndataexc import AioEmptyTierError
 from ..anndataexc import AioMultiTiersError
@@ -58,6 +60,7 @@ from ..anndataexc import AioLineFormatError
 from ..anndataexc import AioNoTiersError
 from ..anndataexc import AioFormatError
 from ..anndataexc import TagValueError
+from ..anndataexc import TierAppendError
 from ..annlocation.location import sppasLocation
 from ..annlocation.point import sppasPoint
 from ..annlocation.interval import sppasInterval
@@ -68,6 +71,7 @@ from ..annotation import sppasAnnotation
 from .aioutils import fill_gaps
 from .aioutils import merge_overlapping_annotations
 from .aioutils import load
+from .aioutils import sppasLineReader
 from .aioutils import format_labels
 from .basetrs import sppasBaseIO
 
@@ -341,38 +345,93 @@ class sppasTextGrid(sppasBasePraat):
     def read(self, filename):
         """ Read a TextGrid file.
 
+        The file is parsed while it is read, with the encoding given by its
+        BOM or the default one.
+
         :param filename: is the input file name, ending by ".TextGrid"
 
         """
-        # get the content of the file
-
+        encoding = sppasTextGrid._detect_encoding(filename)
+        nb_tiers = len(self)
         try:
-            lines = load(filename, sppas.encoding)
+            self._read_lines(filename, encoding)
         except AioEncodingError:
+            if encoding == "UTF-16":
+                raise
+            # the file has no BOM and it's not in the default encoding
+            while len(self) > nb_tiers:
+                self.pop()
             try:
-                lines = load(filename, "UTF-16")
+                self._read_lines(filename, "UTF-16")
             except AioEncodingError:
                 raise AioEncodingError(filename, "", sppas.encoding+"/UTF-16")
 
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _detect_encoding(filename):
+        """ Return the encoding of a file from its BOM.
+
+        :param filename: (str)
+        :returns: (str) UTF-16 or the default sppas encoding
+
+        """
+        try:
+            with open(filename, 'rb') as fp:
+                bom = fp.read(2)
+        except IOError:
+            raise AioError(filename)
+
+        if bom in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            return "UTF-16"
+        return sppas.encoding
+
+    # -----------------------------------------------------------------------
+
+    def _read_lines(self, filename, encoding):
+        """ Parse the lines of a TextGrid file while reading them.
+
+        :param filename: (str)
+        :param encoding: (str)
+
+        """
+        try:
+            fp = io.open(filename, 'r', encoding=encoding)
+        except IOError:
+            raise AioError(filename)
+
+        try:
+            with fp:
+                self._parse_lines(sppasLineReader(fp))
+        except UnicodeDecodeError:
+            raise AioEncodingError(filename, "", encoding)
+
+    # -----------------------------------------------------------------------
+
+    def _parse_lines(self, reader):
+        """ Parse the content of a TextGrid file.
+
+        :param reader: (sppasLineReader) the lines of the file.
+
+        """
         # parse the header of the file
+        for i in range(6):
+            reader.next_line()
 
         # if the size isn't named, it is a short TextGrid file
-        is_long = not lines[6].strip().isdigit()
-
-        last_line = len(lines) - 1
-        cur_line = 7
-        if is_long is True:
+        is_long = not reader.next_line().strip().isdigit()
+        if is_long is True and reader.has_lines():
             # Ignore the line 'item []:'
-            cur_line += 1
+            reader.next_line()
 
         # parse all lines of the file
 
-        while cur_line < last_line:
+        while reader.has_lines(2):
             # Ignore the line: 'item [1]:'
             # with the tier number between the brackets
             if is_long is True:
-                cur_line += 1
-            cur_line = self._parse_tier(lines, cur_line, is_long)
+                reader.next_line()
+            self._parse_tier_lines(reader, is_long)
 
     # -----------------------------------------------------------------------
 
@@ -384,12 +443,33 @@ class sppasTextGrid(sppasBasePraat):
         :param is_long: A boolean which is false if the TextGrid is in short form.
         :returns: (int) Number of lines of this tier
 
+        """
+        reader = sppasLineReader(lines, start_line, start=start_line)
+        self._parse_tier_lines(reader, is_long)
+
+        return reader.get_number()
+
+    # -----------------------------------------------------------------------
+
+    def _parse_tier_lines(self, reader, is_long):
+        """ Parse a tier from the lines of a TextGrid file.
+
+        The annotations are appended to the tier: they are added in sorted
+        order only if they are not in the right order in the file.
+
+        :param reader: (sppasLineReader) the lines of the file.
+        :param is_long: A boolean which is false if the TextGrid is in short form.
+
         """
         # Parse the header of the tier
 
-        tier_type = sppasBasePraat._parse_string(lines[start_line])
-        tier_name = sppasBasePraat._parse_string(lines[start_line+1])
-        tier_size = sppasBasePraat._parse_int(lines[start_line+4])
+        line = reader.next_line()
+        number = reader.get_number()
+        tier_type = sppasBasePraat._parse_string(line)
+        tier_name = sppasBasePraat._parse_string(reader.next_line())
+        reader.next_line()
+        reader.next_line()
+        tier_size = sppasBasePraat._parse_int(reader.next_line())
         tier = self.create_tier(tier_name)
 
         if tier_type == "IntervalTier":
@@ -397,21 +477,20 @@ class sppasTextGrid(sppasBasePraat):
         elif tier_type == "TextTier":
             is_interval = False
         else:
-            raise AioLineFormatError(start_line+1, lines[start_line])
+            raise AioLineFormatError(number, line)
 
         # Parse the content of the tier
-        start_line += 5
-        end = len(lines) - 1
 
-        while start_line < end and len(tier) < tier_size:
+        while reader.has_lines(2) and len(tier) < tier_size:
             # Ignore the line: 'intervals [1]:'
             # with the interval number between the brackets
             if is_long is True:
-                start_line += 1
-            ann, start_line = self._parse_annotation(lines, start_line, is_interval)
-            tier.add(ann)
-
-        return start_line
+                reader.next_line()
+            ann = sppasTextGrid._parse_annotation_lines(reader, is_interval)
+            try:
+                tier.append(ann)
+            except TierAppendError:
+                tier.add(ann)
 
     # -----------------------------------------------------------------------
 
@@ -425,20 +504,35 @@ class sppasTextGrid(sppasBasePraat):
         :returns: number of lines for this annotation in the file
 
         """
-        # Parse the localization
-        localization, start_line = \
-            sppasTextGrid._parse_localization(lines, start_line, is_interval)
-        if start_line >= len(lines):
-            raise AioLineFormatError(start_line - 1, lines[-1])
+        reader = sppasLineReader(lines, start_line, start=start_line)
+        ann = sppasTextGrid._parse_annotation_lines(reader, is_interval)
+
+        return ann, reader.get_number()
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_annotation_lines(reader, is_interval):
+        """ Read an annotation from the lines of a TextGrid file.
+
+        :param reader: (sppasLineReader) the lines of the file.
+        :param is_interval: (bool)
+        :returns: (sppasAnnotation)
 
-        # Parse the tag
-        labels, start_line = \
-            sppasTextGrid._parse_text(lines, start_line)
+        """
+        # Parse the localization
+        localization = \
+            sppasTextGrid._parse_localization_lines(reader, is_interval)
 
-        ann = sppasAnnotation(sppasLocation(localization),
-                              labels)
+        # Parse the tag: the text can be on several lines
+        line = reader.next_line()
+        text_lines = [line]
+        while line.strip().endswith('"') is False:
+            line = reader.next_line()
+            text_lines.append(line)
+        labels, nb = sppasTextGrid._parse_text(text_lines, 0)
 
-        return ann, start_line
+        return sppasAnnotation(sppasLocation(localization), labels)
 
     # -----------------------------------------------------------------------
 
@@ -446,19 +540,27 @@ class sppasTextGrid(sppasBasePraat):
     def _parse_localization(lines, start_line, is_interval):
         """ Parse the localization (point or interval).  """
 
-        midpoint = sppasBasePraat._parse_float(lines[start_line], start_line+1)
-        start_line += 1
+        reader = sppasLineReader(lines, start_line, start=start_line)
+        localization = \
+            sppasTextGrid._parse_localization_lines(reader, is_interval)
+
+        return localization, reader.get_number()
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_localization_lines(reader, is_interval):
+        """ Parse the localization (point or interval) from the lines.  """
+
+        midpoint = sppasBasePraat._parse_float(reader.next_line(),
+                                               reader.get_number())
         if is_interval is True:
-            if start_line >= len(lines):
-                raise AioLineFormatError(start_line-1, lines[-1])
-            end = sppasBasePraat._parse_float(lines[start_line], start_line+1)
-            start_line += 1
-            localization = sppasInterval(sppasBasePraat.make_point(midpoint),
-                                         sppasBasePraat.make_point(end))
-        else:
-            localization = sppasBasePraat.make_point(midpoint)
+            end = sppasBasePraat._parse_float(reader.next_line(),
+                                              reader.get_number())
+            return sppasInterval(sppasBasePraat.make_point(midpoint),
+                                 sppasBasePraat.make_point(end))
 
-        return localization, start_line
+        return sppasBasePraat.make_point(midpoint)
 
     # -----------------------------------------------------------------------
 
@@ -36,6 +36,8 @@
 
 """
 import os.path
+import codecs
+import importlib
 from datetime import datetime
 from collections import OrderedDict
 
@@ -45,29 +47,6 @@ from sppas.src.utils.datatype import sppasTime
 from ..anndataexc import AioEncodingError
 from ..anndataexc import AioFileExtensionError
 
-from .text import sppasRawText
-from .text import sppasCSV
-from .sclite import sppasCTM
-from .sclite import sppasSTM
-from .xtrans import sppasTDF
-from .praat import sppasTextGrid
-from .praat import sppasPitchTier
-from .praat import sppasIntensityTier
-from .phonedit import sppasMRK
-from .phonedit import sppasSignaix
-from .htk import sppasLab
-from .subtitle import sppasSubRip
-from .subtitle import sppasSubViewer
-from .weka import sppasARFF
-from .weka import sppasXRFF
-from .transcriber import sppasTRS
-from .audacity import sppasAudacity
-from .anvil import sppasAnvil
-from .elan import sppasEAF
-from .annotationpro import sppasANT
-from .annotationpro import sppasANTX
-from .xra import sppasXRA
-
 # ---------------------------------------------------------------------------
 
 
@@ -80,30 +59,40 @@ class sppasRW(object):
     :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
     :summary:      Main parser of annotated data.
 
+    The reader-writer of each file extension is given by the name of its
+    module and of its class. A module is imported only the first time one
+    of its reader-writers is needed.
+
     """
     TRANSCRIPTION_TYPES = OrderedDict()
-    TRANSCRIPTION_TYPES[sppasXRA().default_extension.lower()] = sppasXRA
-    TRANSCRIPTION_TYPES[sppasTextGrid().default_extension.lower()] = sppasTextGrid
-    TRANSCRIPTION_TYPES[sppasARFF().default_extension.lower()] = sppasARFF
-    TRANSCRIPTION_TYPES[sppasXRFF().default_extension.lower()] = sppasXRFF
-    TRANSCRIPTION_TYPES[sppasAnvil().default_extension.lower()] = sppasAnvil
-    TRANSCRIPTION_TYPES[sppasEAF().default_extension.lower()] = sppasEAF
-    TRANSCRIPTION_TYPES[sppasANT().default_extension.lower()] = sppasANT
-    TRANSCRIPTION_TYPES[sppasANTX().default_extension.lower()] = sppasANTX
-    TRANSCRIPTION_TYPES[sppasTRS().default_extension.lower()] = sppasTRS
-    TRANSCRIPTION_TYPES[sppasMRK().default_extension.lower()] = sppasMRK
-    TRANSCRIPTION_TYPES[sppasSignaix().default_extension.lower()] = sppasSignaix
-    TRANSCRIPTION_TYPES[sppasLab().default_extension.lower()] = sppasLab
-    TRANSCRIPTION_TYPES[sppasSubRip().default_extension.lower()] = sppasSubRip
-    TRANSCRIPTION_TYPES[sppasSubViewer().default_extension.lower()] = sppasSubViewer
-    TRANSCRIPTION_TYPES[sppasCTM().default_extension.lower()] = sppasCTM
-    TRANSCRIPTION_TYPES[sppasSTM().default_extension.lower()] = sppasSTM
-    TRANSCRIPTION_TYPES[sppasIntensityTier().default_extension.lower()] = sppasIntensityTier
-    TRANSCRIPTION_TYPES[sppasPitchTier().default_extension.lower()] = sppasPitchTier
-    TRANSCRIPTION_TYPES[sppasAudacity().default_extension.lower()] = sppasAudacity
-    TRANSCRIPTION_TYPES[sppasTDF().default_extension.lower()] = sppasTDF
-    TRANSCRIPTION_TYPES[sppasCSV().default_extension.lower()] = sppasCSV
-    TRANSCRIPTION_TYPES[sppasRawText().default_extension.lower()] = sppasRawText
+    TRANSCRIPTION_TYPES["xra"] = ("xra", "sppasXRA")
+    TRANSCRIPTION_TYPES["textgrid"] = ("praat", "sppasTextGrid")
+    TRANSCRIPTION_TYPES["arff"] = ("weka", "sppasARFF")
+    TRANSCRIPTION_TYPES["xrff"] = ("weka", "sppasXRFF")
+    TRANSCRIPTION_TYPES["anvil"] = ("anvil", "sppasAnvil")
+    TRANSCRIPTION_TYPES["eaf"] = ("elan", "sppasEAF")
+    TRANSCRIPTION_TYPES["ant"] = ("annotationpro", "sppasANT")
+    TRANSCRIPTION_TYPES["antx"] = ("annotationpro", "sppasANTX")
+    TRANSCRIPTION_TYPES["trs"] = ("transcriber", "sppasTRS")
+    TRANSCRIPTION_TYPES["mrk"] = ("phonedit", "sppasMRK")
+    TRANSCRIPTION_TYPES["hz"] = ("phonedit", "sppasSignaix")
+    TRANSCRIPTION_TYPES["lab"] = ("htk", "sppasLab")
+    TRANSCRIPTION_TYPES["srt"] = ("subtitle", "sppasSubRip")
+    TRANSCRIPTION_TYPES["sub"] = ("subtitle", "sppasSubViewer")
+    TRANSCRIPTION_TYPES["ctm"] = ("sclite", "sppasCTM")
+    TRANSCRIPTION_TYPES["stm"] = ("sclite", "sppasSTM")
+    TRANSCRIPTION_TYPES["intensitytier"] = ("praat", "sppasIntensityTier")
+    TRANSCRIPTION_TYPES["pitchtier"] = ("praat", "sppasPitchTier")
+    TRANSCRIPTION_TYPES["aup"] = ("audacity", "sppasAudacity")
+    TRANSCRIPTION_TYPES["tdf"] = ("xtrans", "sppasTDF")
+    TRANSCRIPTION_TYPES["csv"] = ("text", "sppasCSV")
+    TRANSCRIPTION_TYPES["txt"] = ("text", "sppasRawText")
+
+    # Extensions of the formats to be checked first, given the first bytes
+    # of a file.
+    XML_TYPES = ("xra", "xrff", "anvil", "eaf", "antx", "trs", "aup")
+    PRAAT_TYPES = ("textgrid", "intensitytier", "pitchtier")
+    ZIP_TYPES = ("ant", )
 
     # -----------------------------------------------------------------------
 
@@ -115,6 +104,24 @@ class sppasRW(object):
 
     # -----------------------------------------------------------------------
 
+    @staticmethod
+    def get_trs_class(extension):
+        """ Return the reader-writer class of an extension.
+
+        Its module is imported the first time it is requested.
+
+        :param extension: (str) An extension in lower case, without the dot
+        :returns: a sppasBaseIO class
+
+        """
+        module_name, class_name = sppasRW.TRANSCRIPTION_TYPES[extension]
+        package = __name__[:__name__.rfind('.')]
+        module = importlib.import_module(package + "." + module_name)
+
+        return getattr(module, class_name)
+
+    # -----------------------------------------------------------------------
+
     def __init__(self, filename):
         """ Create a Transcription reader-writer.
 
@@ -190,7 +197,7 @@ class sppasRW(object):
         extension = os.path.splitext(filename)[1][1:]
         extension = extension.lower()
         if extension in sppasRW.extensions():
-            return sppasRW.TRANSCRIPTION_TYPES[extension]()
+            return sppasRW.get_trs_class(extension)()
 
         raise AioFileExtensionError(filename)
 
@@ -201,17 +208,21 @@ class sppasRW(object):
         """ Return a transcription according to a given filename.
         The given file is opened and an heuristic allows to fix the format.
 
+        The formats which can match the first bytes of the file are checked
+        first, then all the other ones.
+
         :param filename: (str)
         :returns: Transcription()
 
         """
-        for file_reader in sppasRW.TRANSCRIPTION_TYPES.values():
+        for extension in sppasRW.__heuristic_order(filename):
             try:
+                file_reader = sppasRW.get_trs_class(extension)
                 if file_reader.detect(filename) is True:
                     return file_reader()
             except:
                 continue
-        return sppasRawText()
+        return sppasRW.get_trs_class("txt")()
 
     # -----------------------------------------------------------------------
 
@@ -242,3 +253,38 @@ class sppasRW(object):
             raise AioEncodingError(self.__filename, str(e))
         except Exception:
             raise
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __heuristic_order(filename):
+        """ Return the extensions in the order to check a file format.
+
+        :param filename: (str)
+        :returns: (list) extensions in lower case
+
+        """
+        try:
+            with open(filename, 'rb') as fp:
+                head = fp.read(1024)
+        except IOError:
+            head = b""
+
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            head = head.decode("UTF-16", "ignore").encode("UTF-8")
+        head = head.lstrip(codecs.BOM_UTF8).lstrip()
+
+        if head.startswith(b"PK"):
+            first = sppasRW.ZIP_TYPES
+        elif b"ooTextFile" in head:
+            first = sppasRW.PRAAT_TYPES
+        elif head.startswith(b"<"):
+            first = sppasRW.XML_TYPES
+        else:
+            first = ()
+
+        return list(first) + \
+            [e for e in sppasRW.extensions() if e not in first]
+
@@ -85,6 +85,8 @@ from .annlabel.tagcompare import sppasTagCompare
 from .annlocation.durationcompare import sppasDurationCompare
 from .annlocation.localizationcompare import sppasLocalizationCompare
 from .annlocation.intervalcompare import sppasIntervalCompare
+from .annlocation.duration import sppasDuration
+from .intervalindex import sppasIntervalIndex
 from .tier import sppasTier
 from .annlabel.label import sppasLabel
 from .annlabel.tag import sppasTag
@@ -404,6 +406,9 @@ class sppasFilters(object):
         Examples:
             >>> f.rel(other_tier, "equals", "overlaps", "overlappedby", min_overlap=0.04)
 
+        The annotations of the other tier are indexed by time, so that each
+        relation is only tested with the annotations of its time window.
+
         """
         comparator = sppasIntervalCompare()
 
@@ -412,12 +417,18 @@ class sppasFilters(object):
 
         data = sppasAnnSet()
 
+        # index the annotations of the other tier by time
+        other_anns = [ann for ann in other_tier]
+        index = sppasIntervalIndex(
+            [sppasFilters.__bounds(ann.get_location()) for ann in other_anns])
+
         # search the annotations to be returned:
         for annotation in self.tier:
 
             location = annotation.get_location()
             match_values = sppasFilters.__connect(location,
-                                                  other_tier,
+                                                  other_anns,
+                                                  index,
                                                   rel_functions,
                                                   **kwargs)
             if len(match_values) > 0:
@@ -513,16 +524,108 @@ class sppasFilters(object):
     # -----------------------------------------------------------------------
 
     @staticmethod
-    def __connect(location, other_tier, rel_functions, **kwargs):
-        """ Find connections between location and the other tier. """
-
-        values = list()
-        for other_ann in other_tier:
-            for localization, score in location:
-                for other_loc, other_score in other_ann.get_location():
-                    for func_name, complement in rel_functions:
-                        is_connected = func_name(localization, other_loc, **kwargs)
-                        if is_connected:
-                            values.append(func_name.__name__)
-
-        return values
+    def __connect(location, other_anns, index, rel_functions, **kwargs):
+        """ Find connections between location and the other annotations.
+
+        Each relation is tested with the annotations of its time window
+        only, until the first connected one. The names of the connected
+        functions are returned in the order they would be found by testing
+        all the annotations.
+
+        :param location: (sppasLocation)
+        :param other_anns: (list) Annotations of the other tier
+        :param index: (sppasIntervalIndex) Index of other_anns
+        :param rel_functions: (list) Functions and their complement
+        :returns: (list) Names of the connected functions
+
+        """
+        begin, end = sppasFilters.__bounds(location)
+        first = dict()
+        for f, (func, complement) in enumerate(rel_functions):
+            name = func.__name__
+            lo, hi = sppasFilters.__window(name, begin, end, **kwargs)
+            for i in index.iter_find(lo, hi):
+                if name in first and first[name][0] <= i:
+                    break
+                p = sppasFilters.__first_pair(location, other_anns[i],
+                                              func, **kwargs)
+                if p is not None:
+                    if name not in first or (i, p, f) < first[name]:
+                        first[name] = (i, p, f)
+                    break
+
+        return [name for name, key in sorted(first.items(),
+                                             key=lambda item: item[1])]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __first_pair(location, other_ann, func, **kwargs):
+        """ Return the rank of the first pair of localizations connected. """
+
+        p = 0
+        for localization, score in location:
+            for other_loc, other_score in other_ann.get_location():
+                if func(localization, other_loc, **kwargs):
+                    return p
+                p += 1
+
+        return None
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __bounds(location):
+        """ Return the lowest and highest values of a location.
+
+        The radius of the points is included.
+
+        """
+        begin = float("inf")
+        end = float("-inf")
+        for localization, score in location:
+            b, e = sppasIntervalCompare._unpack(localization)
+            begin = min(begin, b.get_midpoint() - (b.get_radius() or 0))
+            end = max(end, e.get_midpoint() + (e.get_radius() or 0))
+
+        return begin, end
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __window(func_name, begin, end, max_delay=None, **kwargs):
+        """ Return the range the annotations must overlap to be connected.
+
+        :param func_name: (str) Name of a sppasIntervalCompare() method
+        :param begin: (float) Lowest value of the location
+        :param end: (float) Highest value of the location
+        :param max_delay: Option of the "before" and "after" relations
+        :returns: (tuple) begin and end values of the range
+
+        """
+        for suffix in ("_equal", "_greater", "_lower"):
+            if func_name.endswith(suffix):
+                func_name = func_name[:-len(suffix)]
+
+        delay = None
+        if isinstance(max_delay, sppasDuration):
+            delay = max_delay.get_value()
+        elif isinstance(max_delay, (int, float)):
+            delay = max_delay
+
+        if func_name == "before":
+            if delay is None:
+                return begin, float("inf")
+            return begin, end + delay
+
+        if func_name == "after":
+            if delay is None:
+                return float("-inf"), end
+            return begin - delay, end
+
+        if func_name in ("meets", "metby", "overlaps", "overlappedby",
+                         "starts", "startedby", "finishes", "finishedby",
+                         "during", "contains", "equals"):
+            return begin, end
+
+        return float("-inf"), float("inf")
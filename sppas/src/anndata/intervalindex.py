@@ -0,0 +1,285 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+
+    src.anndata.intervalindex.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import random
+
+# ---------------------------------------------------------------------------
+
+
+class sppasIntervalNode(object):
+    """ A node of the index: an interval and the summary of its sub-tree. """
+
+    __slots__ = ("begin", "end", "lowest", "highest", "size",
+                 "priority", "left", "right")
+
+    def __init__(self, begin, end, priority):
+        self.begin = float(begin)
+        self.end = float(end)
+        self.lowest = self.begin
+        self.highest = self.end
+        self.size = 1
+        self.priority = priority
+        self.left = None
+        self.right = None
+
+    # -----------------------------------------------------------------------
+
+    def update(self):
+        """ Update the summary of the sub-tree from the children. """
+
+        self.lowest = self.begin
+        self.highest = self.end
+        self.size = 1
+        for child in (self.left, self.right):
+            if child is not None:
+                self.lowest = min(self.lowest, child.lowest)
+                self.highest = max(self.highest, child.highest)
+                self.size += child.size
+
+# ---------------------------------------------------------------------------
+
+
+class sppasIntervalIndex(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Augmented tree of intervals, to search for overlaps.
+
+    The intervals are stored in a randomized balanced binary tree (a treap),
+    in the order they are given. Each node stores the lowest begin and the
+    highest end of its sub-tree, so that the search for the intervals which
+    overlap a range only explores the relevant branches: when intervals
+    are sorted by their begin, it takes O(log n + k) time for k results.
+    An interval is inserted or removed at any position in O(log n) time.
+
+    >>> index = sppasIntervalIndex([(0., 1.), (1., 2.5), (2.5, 3.)])
+    >>> index.find(1.2, 2.)
+    >>> [1]
+    >>> index.append(3., 4.)
+    >>> index.find(2., 3.5)
+    >>> [1, 2, 3]
+    >>> index.pop(0)
+    >>> index.find(2., 3.5)
+    >>> [0, 1, 2]
+
+    """
+    # Priorities of the nodes, without changing the state of the random module
+    _random = random.Random()
+
+    def __init__(self, intervals=()):
+        """ Create a new sppasIntervalIndex instance.
+
+        :param intervals: (list of tuples) Begin and end values
+
+        """
+        self.__root = None
+        self.build(intervals)
+
+    # -----------------------------------------------------------------------
+
+    def build(self, intervals):
+        """ Index the given intervals, in place of the existing ones.
+
+        :param intervals: (list of tuples) Begin and end values
+
+        """
+        # The tree is built in linear time: each node is the right child of
+        # the last node with a higher priority.
+        stack = list()
+        for b, e in intervals:
+            node = sppasIntervalNode(b, e, sppasIntervalIndex._random.random())
+            last = None
+            while len(stack) > 0 and stack[-1].priority < node.priority:
+                last = stack.pop()
+                last.update()
+            node.left = last
+            if len(stack) > 0:
+                stack[-1].right = node
+            stack.append(node)
+
+        while len(stack) > 1:
+            stack.pop().update()
+        if len(stack) > 0:
+            stack[0].update()
+            self.__root = stack[0]
+        else:
+            self.__root = None
+
+    # -----------------------------------------------------------------------
+
+    def append(self, begin, end):
+        """ Index an interval after the existing ones.
+
+        :param begin: (float) Begin value of the interval
+        :param end: (float) End value of the interval
+
+        """
+        self.insert(len(self), begin, end)
+
+    # -----------------------------------------------------------------------
+
+    def insert(self, index, begin, end):
+        """ Index an interval at the given position.
+
+        The indexes of the next intervals are shifted by one.
+
+        :param index: (int) Position of the interval
+        :param begin: (float) Begin value of the interval
+        :param end: (float) End value of the interval
+
+        """
+        node = sppasIntervalNode(begin, end, sppasIntervalIndex._random.random())
+        left, right = sppasIntervalIndex.__split(self.__root, index)
+        self.__root = sppasIntervalIndex.__merge(
+            sppasIntervalIndex.__merge(left, node), right)
+
+    # -----------------------------------------------------------------------
+
+    def pop(self, index):
+        """ Remove the interval at the given position.
+
+        The indexes of the next intervals are shifted by one.
+
+        :param index: (int) Position of the interval
+        :raises: IndexError
+
+        """
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+
+        left, right = sppasIntervalIndex.__split(self.__root, index)
+        node, right = sppasIntervalIndex.__split(right, 1)
+        self.__root = sppasIntervalIndex.__merge(left, right)
+
+    # -----------------------------------------------------------------------
+
+    def find(self, begin, end):
+        """ Return the indexes of the intervals overlapping a range.
+
+        An interval overlaps the range if its begin is lower or equal to
+        the end of the range and its end is greater or equal to the begin
+        of the range.
+
+        :param begin: (float) Begin value of the range
+        :param end: (float) End value of the range
+        :returns: (list) sorted indexes of the intervals
+
+        """
+        return list(self.iter_find(begin, end))
+
+    # -----------------------------------------------------------------------
+
+    def iter_find(self, begin, end):
+        """ Iterate over the indexes of the intervals overlapping a range.
+
+        The indexes are generated in increasing order and the tree is
+        explored only as far as the caller consumes them.
+
+        :param begin: (float) Begin value of the range
+        :param end: (float) End value of the range
+        :returns: (generator) sorted indexes of the intervals
+
+        """
+        # the stack contains the sub-trees to explore with the index of
+        # their first interval, and the nodes to be yielded
+        nodes = [(self.__root, 0, False)]
+        while len(nodes) > 0:
+            node, offset, visited = nodes.pop()
+            if visited is True:
+                yield offset
+                continue
+            if node is None or node.lowest > end or node.highest < begin:
+                continue
+
+            # the right sub-tree is explored after the node and the left one
+            size = 0 if node.left is None else node.left.size
+            nodes.append((node.right, offset + size + 1, False))
+            if node.begin <= end and node.end >= begin:
+                nodes.append((node, offset + size, True))
+            nodes.append((node.left, offset, False))
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __split(node, index):
+        """ Split a tree into the first index intervals and the other ones. """
+
+        if node is None:
+            return None, None
+
+        size = 0 if node.left is None else node.left.size
+        if index <= size:
+            left, node.left = sppasIntervalIndex.__split(node.left, index)
+            node.update()
+            return left, node
+
+        node.right, right = sppasIntervalIndex.__split(node.right, index - size - 1)
+        node.update()
+        return node, right
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __merge(left, right):
+        """ Merge two trees: the intervals of right follow the ones of left. """
+
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        if left.priority > right.priority:
+            left.right = sppasIntervalIndex.__merge(left.right, right)
+            left.update()
+            return left
+
+        right.left = sppasIntervalIndex.__merge(left, right.left)
+        right.update()
+        return right
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        if self.__root is None:
+            return 0
+        return self.__root.size
@@ -164,6 +164,30 @@ class TestAIO(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_create_trs(self):
+        """ Create a reader-writer from an extension or from the content. """
+
+        for extension in sppasRW.extensions():
+            trs_class = sppasRW.get_trs_class(extension)
+            self.assertEqual(extension, trs_class().default_extension.lower())
+
+        trs = sppasRW.create_trs_from_extension("file.TextGrid")
+        self.assertEqual("sppasTextGrid", trs.__class__.__name__)
+        trs = sppasRW.create_trs_from_heuristic(
+            os.path.join(DATA, "sample.TextGrid"))
+        self.assertEqual("sppasTextGrid", trs.__class__.__name__)
+        trs = sppasRW.create_trs_from_heuristic(
+            os.path.join(DATA, "sample-utf16.TextGrid"))
+        self.assertEqual("sppasTextGrid", trs.__class__.__name__)
+        trs = sppasRW.create_trs_from_heuristic(
+            os.path.join(DATA, "sample-1.2.xra"))
+        self.assertEqual("sppasXRA", trs.__class__.__name__)
+        trs = sppasRW.create_trs_from_heuristic(
+            os.path.join(DATA, "not-exists"))
+        self.assertEqual("sppasRawText", trs.__class__.__name__)
+
+    # -----------------------------------------------------------------------
+
     def test_IO_XRA(self):
         """ Read/Write/Read then compare XRA files. """
 
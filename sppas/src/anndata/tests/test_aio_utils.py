@@ -43,6 +43,7 @@
 import os.path
 import unittest
 
+from ..anndataexc import AioLineFormatError
 from ..tier import sppasTier
 from ..annotation import sppasAnnotation
 from ..annlocation.location import sppasLocation
@@ -54,6 +55,7 @@ from ..annlabel.tag import sppasTag
 from ..aio.aioutils import fill_gaps, check_gaps, unfill_gaps
 from ..aio.aioutils import merge_overlapping_annotations
 from ..aio.aioutils import load
+from ..aio.aioutils import sppasLineReader
 from ..aio.aioutils import format_labels
 
 # ---------------------------------------------------------------------------
@@ -79,6 +81,39 @@ class TestUtils(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_line_reader(self):
+        """ Read lines on demand. """
+
+        reader = sppasLineReader(["a\n", "b\n", "c\n"], 10)
+        self.assertEqual(10, reader.get_number())
+        self.assertTrue(reader.has_lines(3))
+        self.assertFalse(reader.has_lines(4))
+        self.assertEqual("a\n", reader.next_line())
+        self.assertEqual(11, reader.get_number())
+        self.assertTrue(reader.has_lines(2))
+        self.assertFalse(reader.has_lines(3))
+        self.assertEqual("b\n", reader.next_line())
+        self.assertEqual("c\n", reader.next_line())
+        self.assertEqual(13, reader.get_number())
+        self.assertFalse(reader.has_lines())
+        with self.assertRaises(AioLineFormatError):
+            reader.next_line()
+
+        # the lines of a list are read from an index
+        reader = sppasLineReader(["a\n", "b\n", "c\n"], 2, start=2)
+        self.assertTrue(reader.has_lines())
+        self.assertFalse(reader.has_lines(2))
+        self.assertEqual("c\n", reader.next_line())
+        self.assertEqual(3, reader.get_number())
+
+        with open(os.path.join(DATA, "sample.ctm")) as fp:
+            reader = sppasLineReader(fp)
+            while reader.has_lines():
+                reader.next_line()
+        self.assertEqual(45, reader.get_number())
+
+    # -----------------------------------------------------------------------
+
     def test_format_labels(self):
         """ Convert a string into a list of labels. """
 
@@ -566,3 +566,29 @@ class TestFilterRelationTier(unittest.TestCase):
         res2 = f.rel(self.rtier, "overlaps") | f.rel(self.rtier, "overlappedby")
         self.assertEqual(res1, res2)
 
+    # -----------------------------------------------------------------------
+
+    def test_delay_relations(self):
+        f = sppasFilters(self.tier)
+
+        # [0,3] before [5,8] and [5,7] before [8,11] with a delay < 3
+        res = f.rel(self.rtier, "before", max_delay=3)
+        self.assertEqual(2, len(res))
+        self.assertTrue(self.tier[0] in res)
+        self.assertTrue(self.tier[2] in res)
+
+        # [3,5] after [1,2] and [9,10] after [5,8] with a delay < 1.5
+        res = f.rel(self.rtier, "after", max_delay=1.5)
+        self.assertEqual(2, len(res))
+        self.assertTrue(self.tier[1] in res)
+        self.assertTrue(self.tier[4] in res)
+        self.assertEqual(["after"], res.get_value(self.tier[4]))
+
+        # without delay, all the annotations are before/after another one
+        res = f.rel(self.rtier, "before", "after")
+        self.assertEqual(6, len(res))
+        self.assertEqual(["before"], res.get_value(self.tier[0]))
+        self.assertEqual(sorted(["before", "after"]),
+                         sorted(res.get_value(self.tier[1])))
+        self.assertEqual(["after"], res.get_value(self.tier[5]))
+
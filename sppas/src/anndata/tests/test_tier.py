@@ -493,6 +493,101 @@ class TestTier(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_find_indexed_intervals(self):
+        tier = sppasTier("IntervalsTier")
+        tier.enable_index()
+        self.assertTrue(tier.is_indexed())
+        localizations = [sppasInterval(sppasPoint(0.), sppasPoint(10.)),   # 0
+                         sppasInterval(sppasPoint(1.), sppasPoint(2.)),    # 1
+                         sppasInterval(sppasPoint(1.5), sppasPoint(8.)),   # 2
+                         sppasInterval(sppasPoint(3.), sppasPoint(4.)),    # 3
+                         sppasInterval(sppasPoint(5.), sppasPoint(6.))     # 4
+                         ]
+        for i in (0, 1, 3, 4, 2):
+            tier.add(sppasAnnotation(sppasLocation(localizations[i]),
+                                     sppasLabel(sppasTag(i, "int"))))
+
+        def labels(anns):
+            return [a.get_best_tag().get_typed_content() for a in anns]
+
+        # nested intervals are all found, in the order of the tier
+        self.assertEqual([0, 1, 2], labels(tier.find(sppasPoint(1.6), sppasPoint(1.8))))
+        self.assertEqual([0, 2, 3, 4], labels(tier.find(sppasPoint(3.5), sppasPoint(5.5))))
+        self.assertEqual([3], labels(tier.find(sppasPoint(2.5), sppasPoint(5.5), overlaps=False)))
+        self.assertEqual([], labels(tier.find(sppasPoint(10.), sppasPoint(11.))))
+        self.assertEqual(0, tier.mindex(sppasPoint(7.), bound=0))
+        self.assertEqual(-1, tier.mindex(sppasPoint(10.), bound=0))
+
+        # the index is updated
+        tier.append(sppasAnnotation(sppasLocation(sppasInterval(sppasPoint(10.), sppasPoint(12.))),
+                                    sppasLabel(sppasTag(5, "int"))))
+        self.assertEqual([5], labels(tier.find(sppasPoint(10.), sppasPoint(11.))))
+        tier.pop(0)
+        self.assertEqual([2, 3, 4], labels(tier.find(sppasPoint(3.5), sppasPoint(5.5))))
+        self.assertEqual(1, tier.mindex(sppasPoint(7.), bound=0))
+        tier.remove(sppasPoint(4.5), sppasPoint(6.5))
+        self.assertEqual([2, 3], labels(tier.find(sppasPoint(3.5), sppasPoint(5.5))))
+
+        # same results with or without the index on a sequence of intervals
+        indexed = sppasTier()
+        indexed.enable_index()
+        not_indexed = sppasTier()
+        for i in range(20):
+            for t in (indexed, not_indexed):
+                t.create_annotation(sppasLocation(sppasInterval(sppasPoint(i), sppasPoint(i+1))))
+        for i in range(20):
+            for j in range(i, 22):
+                for overlaps in (True, False):
+                    self.assertEqual(not_indexed.find(sppasPoint(i), sppasPoint(j), overlaps),
+                                     indexed.find(sppasPoint(i), sppasPoint(j), overlaps))
+
+    # -----------------------------------------------------------------------
+
+    def test_find_random_indexed_intervals(self):
+        """ Same results with or without the index on random intervals. """
+
+        rand = random.Random(1234)
+        indexed = sppasTier()
+        indexed.enable_index()
+        not_indexed = sppasTier()
+
+        def compare():
+            self.assertEqual(len(not_indexed), len(indexed))
+            for k in range(20):
+                b = rand.randint(0, 100)
+                e = b + rand.randint(0, 30)
+                for overlaps in (True, False):
+                    self.assertEqual(not_indexed.find(sppasPoint(b), sppasPoint(e), overlaps),
+                                     indexed.find(sppasPoint(b), sppasPoint(e), overlaps))
+                self.assertEqual(not_indexed.mindex(sppasPoint(b), bound=-1),
+                                 indexed.mindex(sppasPoint(b), bound=-1))
+
+        # nested and overlapping intervals, added in a random order,
+        # some of them are removed
+        for i in range(300):
+            b = rand.randint(0, 100)
+            e = b + rand.choice((1, 2, 5, 20, 60))
+            location = sppasLocation(sppasInterval(sppasPoint(b), sppasPoint(e)))
+            try:
+                not_indexed.add(sppasAnnotation(location))
+            except TierAddError:
+                continue
+            indexed.add(sppasAnnotation(location.copy()))
+            if i % 10 == 0:
+                compare()
+            if i % 7 == 0:
+                idx = rand.randint(0, len(indexed) - 1)
+                not_indexed.pop(idx)
+                indexed.pop(idx)
+            if i % 50 == 0:
+                b = rand.randint(0, 100)
+                e = b + rand.randint(1, 5)
+                self.assertEqual(not_indexed.remove(sppasPoint(b), sppasPoint(e)),
+                                 indexed.remove(sppasPoint(b), sppasPoint(e)))
+        compare()
+
+    # -----------------------------------------------------------------------
+
     def test_find_point(self):
         tier = sppasTier("PointsTier")
         for i in range(5):
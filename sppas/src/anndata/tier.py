@@ -55,6 +55,7 @@ from .annlocation import sppasLocation
 from .metadata import sppasMetaData
 from .ctrlvocab import sppasCtrlVocab
 from .media import sppasMedia
+from .intervalindex import sppasIntervalIndex
 
 # ----------------------------------------------------------------------------
 
@@ -95,6 +96,12 @@ class sppasTier(sppasMetaData):
         self.__media = None
         self.__parent = None
 
+        # Optional index of the intervals, and whether it's enabled.
+        # It's re-built only when needed after an annotation was inserted
+        # or removed.
+        self.__indexed = False
+        self.__index = None
+
         self.set_name(name)
         self.set_ctrl_vocab(ctrl_vocab)
         self.set_media(media)
@@ -242,6 +249,7 @@ class sppasTier(sppasMetaData):
         new_tier = sppasTier(self.__name)
         new_tier.set_ctrl_vocab(self.__ctrl_vocab)
         new_tier.set_media(self.__media)
+        new_tier.enable_index(self.__indexed)
         for a in self.__ann:
             new_tier.add(a.copy())
 
@@ -291,6 +299,8 @@ class sppasTier(sppasMetaData):
                 raise TierAppendError(end, new)
 
         self.__ann.append(annotation)
+        if self.__index is not None:
+            self.__index.append(*sppasTier.__bounds(annotation))
 
     # -----------------------------------------------------------------------
 
@@ -315,6 +325,8 @@ class sppasTier(sppasMetaData):
                 else:
                     index = self.near(annotation.get_lowest_localization(), direction=-1)
                 self.__ann.insert(index + 1, annotation)
+                if self.__index is not None:
+                    self.__index.insert(index + 1, *sppasTier.__bounds(annotation))
                 return index + 1
 
             else:
@@ -338,6 +350,8 @@ class sppasTier(sppasMetaData):
                         raise TierAddError(index+1)
 
                 self.__ann.insert(index + 1, annotation)
+                if self.__index is not None:
+                    self.__index.insert(index + 1, *sppasTier.__bounds(annotation))
                 return index + 1
 
         return len(self.__ann) - 1
@@ -358,7 +372,10 @@ class sppasTier(sppasMetaData):
 
         annotations = self.find(begin, end, overlaps)
         for a in annotations:
-            self.__ann.remove(a)
+            index = self.__ann.index(a)
+            self.__ann.pop(index)
+            if self.__index is not None:
+                self.__index.pop(index)
 
         return len(annotations)
 
@@ -376,6 +393,8 @@ class sppasTier(sppasMetaData):
             self.__ann.pop(index)
         except IndexError:
             raise AnnDataIndexError(index)
+        if self.__index is not None:
+            self.__index.pop(index)
 
     # -----------------------------------------------------------------------
     # Localizations
@@ -459,6 +478,30 @@ class sppasTier(sppasMetaData):
 
     # -----------------------------------------------------------------------
 
+    def enable_index(self, value=True):
+        """ Enable or disable the index of the intervals of the tier.
+
+        The index speeds up find() and mindex() on tiers with intervals:
+        they take O(log n + k) time, even with long or nested intervals.
+        It is kept up to date by append(), add(), pop(), remove() and
+        set_radius(), but it must be enabled again if the localizations of the annotations
+        are modified directly.
+
+        :param value: (bool) Enable or disable the index
+
+        """
+        self.__indexed = bool(value)
+        self.__index = None
+
+    # -----------------------------------------------------------------------
+
+    def is_indexed(self):
+        """ Return True if the index of the intervals is enabled. """
+
+        return self.__indexed
+
+    # -----------------------------------------------------------------------
+
     def find(self, begin, end, overlaps=True):
         """ Return a list of annotations between begin and end.
 
@@ -488,7 +531,8 @@ class sppasTier(sppasMetaData):
             lo = self.index(begin)
             if lo == -1:
                 lo = self.near(begin, direction=1)
-            for ann in self.__ann[lo:]:
+            for i in range(lo, len(self.__ann)):
+                ann = self.__ann[i]
                 lowest = ann.get_lowest_localization()
                 highest = ann.get_highest_localization()
                 if lowest > end and highest > end:
@@ -496,40 +540,31 @@ class sppasTier(sppasMetaData):
                 if lowest >= begin and highest <= end:
                     annotations.append(ann)
 
+        elif self.__indexed is True:
+            for i in self.__find_candidates(begin, end):
+                ann = self.__ann[i]
+                if sppasTier.__is_found(ann, begin, end, overlaps) is True:
+                    annotations.append(ann)
+
         else:
             lo = self.__find(begin)
+            # We go back to the first annotation starting after begin.
+            while lo > 0 and self.__ann[lo - 1].get_lowest_localization() >= begin:
+                lo -= 1
 
             if overlaps is True:
-
-                if lo > 0:
-                    tmp_annotations = list()
-                    for ann in reversed(self.__ann[:lo]):
-                        b = ann.get_lowest_localization()
-                        e = ann.get_highest_localization()
-                        if b < begin < e:
-                            tmp_annotations.append(ann)
-                        if b > begin:
-                            break
-                    for ann in reversed(tmp_annotations):
-                        annotations.append(ann)
-                else:
-                    annotations = list()
-                for ann in self.__ann[lo:]:
-                    b = ann.get_lowest_localization()
-                    e = ann.get_highest_localization()
-                    if b >= end:
-                        break
-                    if end > b and begin < e:
-                        annotations.append(ann)
-            else:
-                annotations = list()
-                for ann in self.__ann[lo:]:
-                    b = ann.get_lowest_localization()
-                    e = ann.get_highest_localization()
-                    if b >= begin and e <= end:
+                # The annotations starting before begin can overlap it.
+                for i in range(lo):
+                    ann = self.__ann[i]
+                    if sppasTier.__is_found(ann, begin, end, overlaps) is True:
                         annotations.append(ann)
-                    if b >= end:
-                        break
+
+            for i in range(lo, len(self.__ann)):
+                ann = self.__ann[i]
+                if sppasTier.__is_found(ann, begin, end, overlaps) is True:
+                    annotations.append(ann)
+                if ann.get_lowest_localization() >= end:
+                    break
 
         return annotations
 
@@ -624,7 +659,12 @@ class sppasTier(sppasMetaData):
         if self.is_point() is True:
             return -1
 
-        for i, a in enumerate(self.__ann):
+        indexes = range(len(self.__ann))
+        if self.__indexed is True:
+            indexes = self.__find_candidates(moment, moment)
+
+        for i in indexes:
+            a = self.__ann[i]
             b = a.get_lowest_localization()
             e = a.get_highest_localization()
             if bound == -1:
@@ -991,6 +1031,8 @@ class sppasTier(sppasMetaData):
         """
         for ann in self.__ann:
             ann.get_location().set_radius(radius)
+        if self.__index is not None:
+            self.__index.build([sppasTier.__bounds(a) for a in self.__ann])
 
     # -----------------------------------------------------------------------
 
@@ -1045,6 +1087,60 @@ class sppasTier(sppasMetaData):
     # Private
     # -----------------------------------------------------------------------
 
+    @staticmethod
+    def __bounds(annotation):
+        """ Return the indexed begin and end values of an annotation.
+
+        Points with a radius are equal to the values of their range: the
+        range is included.
+
+        """
+        b = annotation.get_lowest_localization()
+        e = annotation.get_highest_localization()
+        return (b.get_midpoint() - (b.get_radius() or 0),
+                e.get_midpoint() + (e.get_radius() or 0))
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __is_found(annotation, begin, end, overlaps):
+        """ Return True if an annotation of intervals is found by find().
+
+        :param annotation: (sppasAnnotation)
+        :param begin: (sppasPoint)
+        :param end: (sppasPoint)
+        :param overlaps: (bool) Accept the overlapping annotations.
+
+        """
+        b = annotation.get_lowest_localization()
+        e = annotation.get_highest_localization()
+        if overlaps is True:
+            return end > b and begin < e
+        return b >= begin and e <= end
+
+    # -----------------------------------------------------------------------
+
+    def __find_candidates(self, begin, end):
+        """ Return the sorted indexes of the annotations which may overlap.
+
+        :param begin: (sppasPoint)
+        :param end: (sppasPoint)
+        :returns: list of indexes, a superset of the overlapping annotations
+
+        """
+        if self.__index is None:
+            self.__index = sppasIntervalIndex(
+                [sppasTier.__bounds(a) for a in self.__ann])
+
+        lo = min(begin.get_midpoint() - (begin.get_radius() or 0),
+                 end.get_midpoint() - (end.get_radius() or 0))
+        hi = max(begin.get_midpoint() + (begin.get_radius() or 0),
+                 end.get_midpoint() + (end.get_radius() or 0))
+
+        return self.__index.find(lo, hi)
+
+    # -----------------------------------------------------------------------
+
     def __find(self, x, direction=1):
         """ Return the index of the annotation whose moment value contains x.
 
@@ -35,16 +35,19 @@
 from .basicalign import BasicAligner
 from .juliusalign import JuliusAligner
 from .hvitealign import HviteAligner
+from .viterbialign import ViterbiAligner
 
 from .basicalign import BASIC_EXT_OUT
 from .juliusalign import JULIUS_EXT_OUT
 from .hvitealign import HVITE_EXT_OUT
+from .viterbialign import VITERBI_EXT_OUT
 
 # ---------------------------------------------------------------------------
 
 __all__ = [
 'JuliusAligner',
 'HviteAligner',
+'ViterbiAligner',
 'BasicAligner'
 ]
 
@@ -54,7 +57,8 @@ __all__ = [
 ALIGNERS_TYPES = {
     "basic": BasicAligner,
     "julius": JuliusAligner,
-    "hvite": HviteAligner
+    "hvite": HviteAligner,
+    "viterbi": ViterbiAligner
 }
 
 # List of supported aligner and related class name
@@ -72,7 +76,8 @@ DEFAULT_TRACK_ALIGNER = "julius"
 ALIGNERS_EXT_OUT = {
     "basic": BASIC_EXT_OUT,
     "julius": JULIUS_EXT_OUT,
-    "hvite": HVITE_EXT_OUT
+    "hvite": HVITE_EXT_OUT,
+    "viterbi": VITERBI_EXT_OUT
 }
 
 # ---------------------------------------------------------------------------
@@ -98,6 +98,22 @@ class AlignerIO(object):
             - (start-time end-time phoneme score)
             - (start-time end-time word score)
 
+        """
+        with codecs.open(filename, 'r', encoding) as fp:
+            lines = fp.readlines()
+
+        return self.parse_palign(lines)
+
+    # ------------------------------------------------------------------
+
+    def parse_palign(self, lines):
+        """ Parse the lines of an alignment in the standard format of Julius CSR engine.
+
+        :param lines: (list of str) The content of a file.
+        :returns: Two lists of tuples:
+            - (start-time end-time phoneme score)
+            - (start-time end-time word score)
+
         """
         _phonalign = []
         _wordalign = []
@@ -111,9 +127,6 @@ class AlignerIO(object):
         tokens = [""]
         wordlist = []
 
-        with codecs.open(filename, 'r', encoding) as fp:
-            lines = fp.readlines()
-
         for line in lines:
             # Each line is either a new annotation or nothing interesting!
             line = sppasUnicode(line).to_strip()
@@ -369,49 +382,49 @@ class AlignerIO(object):
         :param outputfilename: (str) The output file name (a Julius-like output).
 
         """
+        lines = self.format_palign(phoneslist, tokenslist, alignments)
         with codecs.open(outputfilename, 'w', encoding) as fp:
+            fp.writelines(lines)
 
-            fp.write("----------------------- System Information begin ---------------------\n")
-            fp.write("\n")
-            fp.write("                        Basic Alignment\n")
-            fp.write("\n")
-            fp.write("----------------------- System Information end -----------------------\n")
-
-            fp.write("\n### Recognition: 1st pass\n")
-
-            fp.write("pass1_best: ")
-            fp.write("%s\n" % " ".join(tokenslist))
-
-            fp.write("pass1_best_wordseq: ")
-            fp.write("%s\n" % " ".join(tokenslist))
-
-            fp.write("pass1_best_phonemeseq: ")
-            fp.write("%s\n" % " | ".join(phoneslist))
-
-            fp.write("\n### Recognition: 2nd pass\n")
-
-            fp.write("ALIGN: === phoneme alignment begin ===\n")
-
-            fp.write("sentence1: ")
-            fp.write("%s\n" % " ".join(tokenslist))
-
-            fp.write("wseq1: ")
-            fp.write("%s\n" % " ".join(tokenslist))
-
-            fp.write("phseq1: ")
-            fp.write("%s\n" % " | ".join(phoneslist))
+    # ------------------------------------------------------------------
 
-            fp.write("cmscore1: ")
-            fp.write("%s\n" % ("0.000 "*len(phoneslist)))
+    @staticmethod
+    def format_palign(phoneslist, tokenslist, alignments):
+        """ Return the lines of an alignment output file.
 
-            fp.write("=== begin forced alignment ===\n")
-            fp.write("-- phoneme alignment --\n")
-            fp.write(" id: from  to    n_score    unit\n")
-            fp.write(" ----------------------------------------\n")
-            for tv1, tv2, phon in alignments:
-                fp.write("[ %d " % tv1)
-                fp.write(" %d]" % tv2)
-                fp.write(" -30.000000 " + str(phon) + "\n")
-            fp.write("=== end forced alignment ===\n")
+        :param phoneslist: (list) List with the phonetization of each token
+        :param tokenslist: (list) List with each token
+        :param alignments: (list) List of tuples: (start-time end-time phoneme)
+        :returns: (list of str) Lines of a Julius-like output.
 
-            fp.close()
+        """
+        lines = list()
+        lines.append("----------------------- System Information begin ---------------------\n")
+        lines.append("\n")
+        lines.append("                        Basic Alignment\n")
+        lines.append("\n")
+        lines.append("----------------------- System Information end -----------------------\n")
+
+        lines.append("\n")
+        lines.append("### Recognition: 1st pass\n")
+        lines.append("pass1_best: %s\n" % " ".join(tokenslist))
+        lines.append("pass1_best_wordseq: %s\n" % " ".join(tokenslist))
+        lines.append("pass1_best_phonemeseq: %s\n" % " | ".join(phoneslist))
+
+        lines.append("\n")
+        lines.append("### Recognition: 2nd pass\n")
+        lines.append("ALIGN: === phoneme alignment begin ===\n")
+        lines.append("sentence1: %s\n" % " ".join(tokenslist))
+        lines.append("wseq1: %s\n" % " ".join(tokenslist))
+        lines.append("phseq1: %s\n" % " | ".join(phoneslist))
+        lines.append("cmscore1: %s\n" % ("0.000 "*len(phoneslist)))
+
+        lines.append("=== begin forced alignment ===\n")
+        lines.append("-- phoneme alignment --\n")
+        lines.append(" id: from  to    n_score    unit\n")
+        lines.append(" ----------------------------------------\n")
+        for tv1, tv2, phon in alignments:
+            lines.append("[ %d " % tv1 + " %d]" % tv2 + " -30.000000 " + str(phon) + "\n")
+        lines.append("=== end forced alignment ===\n")
+
+        return lines
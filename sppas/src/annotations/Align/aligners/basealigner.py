@@ -33,8 +33,11 @@
 
 """
 import os
+import time
+import errno
 import shutil
 import random
+import threading
 from datetime import date
 
 from sppas.src.models.acm.tiedlist import sppasTiedList
@@ -55,6 +58,12 @@ class BaseAligner(object):
     A base class for a system to perform phonetic speech segmentation.
 
     """
+    # Aligners of several threads can modify the tiedlist of a model
+    _tiedlist_lock = threading.Lock()
+    # ... and aligners of several processes: they wait for a lock file (in seconds)
+    LOCK_DELAY = 0.05
+    LOCK_TIMEOUT = 60.
+
     def __init__(self, modeldir):
         """ Creates a BaseAligner instance.
 
@@ -122,9 +131,26 @@ class BaseAligner(object):
     def add_tiedlist(self, entries):
         """ Add missing triphones/biphones in the tiedlist of the model.
 
+        The tiedlist is locked for the other threads and processes while
+        it is updated.
+
         :param entries: (list) List of missing entries into the tiedlist.
 
         """
+        if os.path.exists(os.path.join(self._model, "tiedlist")) is False:
+            return []
+
+        lock_file = os.path.join(self._model, "tiedlist.lock")
+        with BaseAligner._tiedlist_lock:
+            BaseAligner.__acquire_lock_file(lock_file)
+            try:
+                return self.__add_tiedlist(entries)
+            finally:
+                os.remove(lock_file)
+
+    # ------------------------------------------------------------------------
+
+    def __add_tiedlist(self, entries):
         tied_file = os.path.join(self._model, "tiedlist")
         if os.path.exists(tied_file) is False:
             return []
@@ -143,12 +169,48 @@ class BaseAligner(object):
             rand_val = str(int(random.random()*10000))
             backup_tied_file = os.path.join(self._model, "tiedlist." + today + "." + rand_val)
             shutil.copy(tied_file, backup_tied_file)
-            tie.save(tied_file)
+
+            # the aligners of other processes can read it meanwhile
+            tmp_tied_file = tied_file + "." + str(os.getpid())
+            tie.save(tmp_tied_file)
+            try:
+                os.rename(tmp_tied_file, tied_file)
+            except OSError:
+                os.remove(tied_file)
+                os.rename(tmp_tied_file, tied_file)
 
         return add_entries
 
     # ------------------------------------------------------------------------
 
+    @staticmethod
+    def __acquire_lock_file(lock_file):
+        """ Wait until the lock file can be created by this process.
+
+        A lock file older than LOCK_TIMEOUT seconds is the one of a process
+        which was killed: it is removed.
+
+        """
+        while True:
+            try:
+                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+            try:
+                if time.time() - os.path.getmtime(lock_file) > BaseAligner.LOCK_TIMEOUT:
+                    os.remove(lock_file)
+                    continue
+            except OSError:
+                # the lock was just released
+                continue
+            time.sleep(BaseAligner.LOCK_DELAY)
+
+    # ------------------------------------------------------------------------
+
     def set_phones(self, phones):
         """ Fix the pronunciations of each token.
 
@@ -206,3 +268,32 @@ class BaseAligner(object):
 
         """
         raise NotImplementedError
+
+    # -----------------------------------------------------------------------
+
+    def run_alignments(self, tracks):
+        """ Perform the forced-alignment of several tracks.
+
+        By default, each track is aligned by run_alignment(); an aligner
+        able to align several files with only one call of its external
+        program should overload this method.
+
+        :param tracks: (list) List of tuples with the audio input file name,
+        the phonetization, the tokenization and the output file name.
+
+        :returns: (list) A message of the aligner or the exception which
+        occurred for each track.
+
+        """
+        results = list()
+        for inputwav, phones, tokens, outputalign in tracks:
+            try:
+                self.set_phones(phones)
+                self.set_tokens(tokens)
+                message = self.check_data()
+                message += self.run_alignment(inputwav, outputalign)
+                results.append(message)
+            except Exception as e:
+                results.append(e)
+
+        return results
@@ -122,26 +122,28 @@ class BasicAligner(BaseAligner):
         :returns: the List of tuples (begin, end, phone)
 
         """
-        # Remove variants: Select the first-shorter pronunciation of each token
-        phoneslist = []
-        phonetization = self._phones.strip().split()
-        tokenization  = self._tokens.strip().split()
-        selectphonetization = []
-        delta = 0.
-        for pron in phonetization:
-            token = BasicAligner.select_shortest(pron)
-            phoneslist.extend(token.split("-"))
-            selectphonetization.append(token.replace("-", " "))
+        phonetization, tokenization, phoneslist, phonesdur = self.__fix_durations(duration)
+        return self.gen_alignment(phonetization, tokenization, phoneslist, phonesdur, outputalign)
 
-        # Estimate the duration of a phone (in centi-seconds)
-        if len(phoneslist) > 0:
-            delta = (duration / float(len(phoneslist))) * 100.
+    # ------------------------------------------------------------------------
 
-        # Generate the result
-        if delta < 1. or len(selectphonetization) == 0:
-            return self.gen_alignment([], [], [], int(duration*100.), outputalign)
+    def run_aligned(self, duration):
+        """ Perform the speech segmentation without writing any file.
+        Assign the same duration to each phoneme.
 
-        return self.gen_alignment(selectphonetization, tokenization, phoneslist, int(delta), outputalign)
+        :param duration: (float) the duration of the audio input
+        :returns: Two lists of tuples with phones and words, like
+        AlignerIO.read_aligned() returns from the output file of run_basic().
+            - (start-time end-time phoneme score)
+            - (start-time end-time word score)
+
+        """
+        phonetization, tokenization, phoneslist, phonesdur = self.__fix_durations(duration)
+        alignments = self.gen_alignment(phonetization, tokenization, phoneslist, phonesdur)
+
+        alignerio = AlignerIO()
+        lines = alignerio.format_palign(phonetization, tokenization, alignments)
+        return alignerio.parse_palign(lines)
 
     # ------------------------------------------------------------------------
 
@@ -178,6 +180,32 @@ class BasicAligner(BaseAligner):
     # Private
     # ------------------------------------------------------------------------
 
+    def __fix_durations(self, duration):
+        """ Return the phonetization, tokenization, phones and their duration. """
+
+        # Remove variants: Select the first-shorter pronunciation of each token
+        phoneslist = []
+        phonetization = self._phones.strip().split()
+        tokenization  = self._tokens.strip().split()
+        selectphonetization = []
+        delta = 0.
+        for pron in phonetization:
+            token = BasicAligner.select_shortest(pron)
+            phoneslist.extend(token.split("-"))
+            selectphonetization.append(token.replace("-", " "))
+
+        # Estimate the duration of a phone (in centi-seconds)
+        if len(phoneslist) > 0:
+            delta = (duration / float(len(phoneslist))) * 100.
+
+        # Generate the result
+        if delta < 1. or len(selectphonetization) == 0:
+            return [], [], [], int(duration*100.)
+
+        return selectphonetization, tokenization, phoneslist, int(delta)
+
+    # ------------------------------------------------------------------------
+
     @staticmethod
     def select_shortest(pron):
         """ Return the first of the shortest pronunciations of an entry.
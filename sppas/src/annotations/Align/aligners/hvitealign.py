@@ -102,10 +102,24 @@ class HviteAligner(BaseAligner):
 
         """
         dictpron = sppasDictPron()
+        self.add_dependencies(grammarname, dictpron)
+        dictpron.save_as_ascii(dictname)
+
+    # -----------------------------------------------------------------------
+
+    def add_dependencies(self, grammarname, dictpron, prefix=""):
+        """ Write the grammar of HVite and add the tokens into a dictionary.
+
+        :param grammarname: (str) the file name of the tokens
+        :param dictpron: (sppasDictPron) the dictionary
+        :param prefix: (str) a string to add to each token, in order to not
+        share pronunciations with the tokens of the other tracks.
 
+        """
         with codecs.open(grammarname, 'w', encoding) as flab:
 
             for token, pron in zip(self._tokens.split(), self._phones.split()):
+                token = prefix + token
 
                 # dictionary:
                 for variant in pron.split("|"):
@@ -117,23 +131,15 @@ class HviteAligner(BaseAligner):
                 # lab file (one token per line)
                 flab.write(token+"\n")
 
-        dictpron.save_as_ascii(dictname)
-
     # -----------------------------------------------------------------------
 
-    def run_hvite(self, inputwav, outputalign):
-        """ Perform the speech segmentation.
-        Call the system command `HVite`.
+    def get_command(self, dictname, outputalign):
+        """ Return the command `HVite` without the input files.
 
-        :param inputwav: (str) the audio input file name, of type PCM-WAV 16000 Hz, 16 bits
+        :param dictname: (str) the dictionary file name
         :param outputalign: (str) the output file name
 
         """
-        basename = os.path.splitext(inputwav)[0]
-        dictname = basename + ".dict"
-        grammarname = basename + ".lab"
-        self.gen_dependencies(grammarname, dictname)
-
         # Example of use with triphones:
         #
         # HVite
@@ -178,9 +184,20 @@ class HviteAligner(BaseAligner):
         command += ' -y lab'
         command += ' "' + dictname.replace('"', '\\"') + '" '
         command += ' "' + graph.replace('"', '\\"') + '" '
-        command += inputwav
 
-        # Execute command
+        return command
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def execute(command, outputalign):
+        """ Execute a command `HVite` and check its result.
+
+        :param command: (str) the command
+        :param outputalign: (str) the output file name
+        :returns: (str) the output of the command
+
+        """
         p = Popen(command, shell=True, stdout=PIPE, stderr=STDOUT)
         p.wait()
         line = p.communicate()
@@ -199,6 +216,26 @@ class HviteAligner(BaseAligner):
 
     # -----------------------------------------------------------------------
 
+    def run_hvite(self, inputwav, outputalign):
+        """ Perform the speech segmentation.
+        Call the system command `HVite`.
+
+        :param inputwav: (str) the audio input file name, of type PCM-WAV 16000 Hz, 16 bits
+        :param outputalign: (str) the output file name
+
+        """
+        basename = os.path.splitext(inputwav)[0]
+        dictname = basename + ".dict"
+        grammarname = basename + ".lab"
+        self.gen_dependencies(grammarname, dictname)
+
+        command = self.get_command(dictname, outputalign)
+        command += inputwav
+
+        return HviteAligner.execute(command, outputalign)
+
+    # -----------------------------------------------------------------------
+
     def run_alignment(self, inputwav, outputalign):
         """ Execute the external program `HVite` to align.
 
@@ -211,11 +248,139 @@ class HviteAligner(BaseAligner):
         outputalign = outputalign + "." + self._outext
 
         message = self.run_hvite(inputwav, outputalign)
+        HviteAligner.check_output(outputalign, message)
+
+        return ""
+
+    # -----------------------------------------------------------------------
+
+    def run_alignments(self, tracks):
+        """ Execute the external program `HVite` to align several tracks.
+
+        HVite is executed only once: the acoustic model is loaded only once
+        for all the tracks, which are given in a script file. The tokens of
+        each track are prefixed by its index in a common dictionary, then
+        the resulting MLF file is split into one file for each track.
+
+        :param tracks: (list) List of tuples with the audio input file name,
+        the phonetization, the tokenization and the output file name.
+
+        :returns: (list) An empty string or the exception which occurred
+        for each track.
+
+        """
+        if len(tracks) == 0:
+            return []
+
+        results = [""] * len(tracks)
+        dictpron = sppasDictPron()
+        inputs = dict()
+        for i, (inputwav, phones, tokens, outputalign) in enumerate(tracks):
+            try:
+                self.set_phones(phones)
+                self.set_tokens(tokens)
+                self.check_data()
+                basename = os.path.splitext(inputwav)[0]
+                self.add_dependencies(basename + ".lab", dictpron, HviteAligner.get_prefix(i))
+                inputs[os.path.basename(basename)] = i
+            except Exception as e:
+                results[i] = e
+
+        if len(inputs) == 0:
+            return results
+
+        # Fix the file names of the batch from the first track
+        basename = os.path.splitext(tracks[0][3])[0] + "-batch"
+        dictname = basename + ".dict"
+        scriptname = basename + ".scp"
+        mlfname = basename + "." + self._outext
+        dictpron.save_as_ascii(dictname)
+        with codecs.open(scriptname, 'w', encoding) as fp:
+            for inputwav, phones, tokens, outputalign in tracks:
+                if os.path.basename(os.path.splitext(inputwav)[0]) in inputs:
+                    fp.write(inputwav + "\n")
+
+        command = self.get_command(dictname, mlfname)
+        command += ' -S "' + scriptname.replace('"', '\\"') + '" '
+        try:
+            message = HviteAligner.execute(command, mlfname)
+            outputs = self.split_mlf(mlfname, tracks, inputs)
+        except Exception as e:
+            for i in inputs.values():
+                results[i] = e
+            return results
+
+        for i in inputs.values():
+            outputalign = tracks[i][3] + "." + self._outext
+            try:
+                if i not in outputs:
+                    raise Exception('HVite did not created an alignment file.')
+                HviteAligner.check_output(outputalign, message)
+            except Exception as e:
+                results[i] = e
+
+        return results
+
+    # -----------------------------------------------------------------------
+
+    def split_mlf(self, mlfname, tracks, inputs):
+        """ Split a MLF file into one MLF file for each track.
+
+        :param mlfname: (str) the MLF file name, output of HVite
+        :param tracks: (list) the aligned tracks
+        :param inputs: (dict) index of each track from its base name
+        :returns: (set) index of the tracks with an output file
+
+        """
+        outputs = set()
+        with codecs.open(mlfname, 'r', encoding) as fp:
+            lines = fp.readlines()
+
+        i = None
+        entry = list()
+        for line in lines[1:]:
+            if i is None:
+                # the name of an entry, like "*/track_000001.rec"
+                name = line.strip().strip('"')
+                name = os.path.splitext(name.replace("\\", "/").split("/")[-1])[0]
+                i = inputs.get(name, -1)
+                entry = [line]
+                continue
+
+            columns = line.split()
+            prefix = HviteAligner.get_prefix(i)
+            if len(columns) == 5 and columns[4].startswith(prefix):
+                columns[4] = columns[4][len(prefix):]
+                line = " ".join(columns) + "\n"
+            entry.append(line)
+
+            if line.strip() == ".":
+                if i >= 0:
+                    outputalign = tracks[i][3] + "." + self._outext
+                    with codecs.open(outputalign, 'w', encoding) as fp:
+                        fp.write(lines[0])
+                        fp.writelines(entry)
+                    outputs.add(i)
+                i = None
+
+        return outputs
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def get_prefix(index):
+        """ Return the prefix of the tokens of the index-th track. """
+
+        return "t%d_" % index
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def check_output(outputalign, message):
+        """ Raise an exception if the output file contains only an error. """
 
         if os.path.isfile(outputalign):
             with codecs.open(outputalign, 'r', encoding) as f:
                 lines = f.readlines()
                 if len(lines) == 1:
                     raise Exception(message+"\n"+lines[0])
-
-        return ""
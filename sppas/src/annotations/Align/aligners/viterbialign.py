@@ -0,0 +1,532 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.annotations.Align.aligners.viterbialign.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import os
+import copy
+import math
+import operator
+import threading
+
+import sppas.src.audiodata.aio
+from sppas.src.audiodata.channelmfcc import sppasChannelMFCC
+from sppas.src.models.acm.readwrite import sppasACMRW
+
+from .basealigner import BaseAligner
+from .alignerio import AlignerIO
+
+# ----------------------------------------------------------------------------
+
+VITERBI_EXT_OUT = ["palign"]
+DEFAULT_EXT_OUT = VITERBI_EXT_OUT[0]
+LOG_ZERO = float("-inf")
+
+# ----------------------------------------------------------------------------
+
+
+class ViterbiAligner(BaseAligner):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Viterbi automatic alignment system.
+
+    The speech segmentation is performed without any external program:
+        - the acoustic model is loaded with sppasACMRW;
+        - the MFCC are evaluated by sppasChannelMFCC, from the "config" file
+          of the acoustic model;
+        - the HMMs of the phonetization, with all its variants, are connected
+          into a network, and the best path of the MFCC frames in this
+          network is searched in the log domain.
+
+    Phones are modelled by the monophones of the acoustic model, or by the
+    word-internal triphones or biphones of a triphone model (tiedlist).
+    Only diagonal covariance matrices of one stream are supported.
+
+    """
+    # The beam of the search. If the alignment fails, the search is
+    # performed again without beam.
+    BEAM = 250.
+
+    # Acoustic models loaded by the aligners of all threads
+    _models = dict()
+    _models_lock = threading.Lock()
+
+    def __init__(self, modeldir):
+        """ Create a ViterbiAligner instance.
+
+        ViterbiAligner is able to align one audio segment that can be:
+            - an inter-pausal unit,
+            - an utterance,
+            - a sentence...
+        no longer than a few seconds.
+
+        The acoustic model is loaded the first time it is needed, and
+        shared with the other aligners of the same model.
+
+        :param modeldir: (str) Name of the directory of the acoustic model
+
+        """
+        BaseAligner.__init__(self, modeldir)
+        self._outext = DEFAULT_EXT_OUT
+        self._acmodel = None
+
+    # -----------------------------------------------------------------------
+
+    def set_outext(self, ext):
+        """ Set the extension for output files.
+
+        :param ext: (str)
+
+        """
+        ext = ext.lower()
+        if ext not in VITERBI_EXT_OUT:
+            raise ValueError("%s is not a valid file extension for ViterbiAligner" % ext)
+
+        self._outext = ext
+
+    # -----------------------------------------------------------------------
+
+    def set_acmodel(self, acmodel, config=None):
+        """ Fix the acoustic model instead of loading the one of the directory.
+
+        :param acmodel: (sppasAcModel) the acoustic model
+        :param config: (dict or str) HTK configuration of the MFCC
+
+        """
+        self._acmodel = ViterbiAligner.compile_model(copy.deepcopy(acmodel), config)
+
+    # -----------------------------------------------------------------------
+
+    def get_acmodel(self):
+        """ Return the acoustic model, loaded from the directory if needed.
+
+        :returns: (dict) the model, as returned by compile_model()
+
+        """
+        if self._acmodel is None:
+            if self._model is None:
+                raise IOError("No acoustic model to time-align.")
+            with ViterbiAligner._models_lock:
+                hmmdefs = os.path.join(self._model, "hmmdefs")
+                mtime = os.path.getmtime(hmmdefs) if os.path.exists(hmmdefs) else None
+                loaded = ViterbiAligner._models.get(self._model, None)
+                if loaded is None or loaded[0] != mtime:
+                    loaded = (mtime, ViterbiAligner.load_model(self._model))
+                    ViterbiAligner._models[self._model] = loaded
+                self._acmodel = loaded[1]
+
+        return self._acmodel
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def load_model(modeldir):
+        """ Load the acoustic model of a directory.
+
+        :param modeldir: (str) Name of the directory of the acoustic model
+        :returns: (dict) the model, as returned by compile_model()
+
+        """
+        acmodel = sppasACMRW(modeldir, nodump=False).read()
+        config = os.path.join(modeldir, "config")
+        if os.path.isfile(config) is False:
+            config = None
+
+        return ViterbiAligner.compile_model(acmodel, config)
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def compile_model(acmodel, config=None):
+        """ Return the HMMs of an acoustic model in a form suitable to align.
+
+        States and transitions of the given model are filled.
+
+        :param acmodel: (sppasAcModel) the acoustic model
+        :param config: (dict or str) HTK configuration of the MFCC. By
+        default, the one of the parameter kind of the model.
+        :returns: (dict) with keys:
+            - 'hmms': for each HMM name, the indexes of the pdfs of its
+            states and the log-probabilities of its transitions,
+            - 'pdfs': the Gaussian mixtures of all the states,
+            - 'tiedlist': the tiedlist of the model,
+            - 'config': the configuration of the MFCC.
+
+        """
+        acmodel.fill_hmms()
+        if config is None:
+            config = {"TARGETKIND": acmodel.get_mfcc_parameter_kind() or "MFCC"}
+
+        pdfs = list()
+        hmms = dict()
+        for hmm in acmodel.get_hmms():
+            states = sorted(hmm.definition['states'], key=lambda s: int(s['index']))
+            indexes = list()
+            for state in states:
+                indexes.append(len(pdfs))
+                pdfs.append(ViterbiAligner.__compile_state(state['state']))
+
+            matrix = hmm.definition['transition']['matrix']
+            if len(matrix) != len(states) + 2:
+                raise ValueError("Invalid transition matrix of the HMM %s" % hmm.get_name())
+            transition = [[math.log(p) if p > 0. else LOG_ZERO for p in row]
+                          for row in matrix]
+            hmms[hmm.get_name()] = (indexes, transition)
+
+        return {'hmms': hmms,
+                'pdfs': pdfs,
+                'tiedlist': acmodel.get_tiedlist(),
+                'config': config}
+
+    # -----------------------------------------------------------------------
+
+    def run_alignment(self, inputwav, outputalign):
+        """ Perform the speech segmentation.
+
+        :param inputwav: (str) the audio input file name, of type PCM-WAV 16000 Hz, 16 bits
+        :param outputalign: (str) the output file name
+
+        :returns: (str) An empty string.
+
+        """
+        acmodel = self.get_acmodel()
+        audio = sppas.src.audiodata.aio.open(inputwav)
+        try:
+            idx = audio.extract_channel(0)
+            channel = audio.get_channel(idx)
+        finally:
+            audio.close()
+        features = sppasChannelMFCC(channel).evaluate(acmodel['config'])
+
+        phonetization, tokenization, alignments = self.run_viterbi(features)
+
+        outputalign = outputalign + "." + self._outext
+        alignio = AlignerIO()
+        alignio.write_palign(phonetization, tokenization, alignments, outputalign)
+
+        return ""
+
+    # -----------------------------------------------------------------------
+
+    def run_viterbi(self, features):
+        """ Perform the speech segmentation of MFCC frames.
+
+        :param features: (list) the MFCC vector of each frame
+        :returns: the phonetization of each token, each token, and the list
+        of tuples (first frame, last frame, phone)
+
+        """
+        acmodel = self.get_acmodel()
+        phones = self._phones.split()
+        tokens = self._tokens.split()
+        network = self.__network(acmodel)
+
+        path = ViterbiAligner.__search(network, acmodel['pdfs'], features, ViterbiAligner.BEAM)
+        if path is None:
+            path = ViterbiAligner.__search(network, acmodel['pdfs'], features, None)
+        if path is None:
+            raise Exception("No alignment found: not enough frames.")
+
+        # Frames of each phone of the path
+        alignments = list()
+        phonetization = [list() for p in phones]
+        units = network['units']
+        for frame, node in enumerate(path):
+            unit = network['unit'][node]
+            if len(alignments) > 0 and alignments[-1][3] == unit:
+                alignments[-1][1] = frame
+            else:
+                alignments.append([frame, frame, units[unit][1], unit])
+                phonetization[units[unit][0]].append(units[unit][1])
+
+        return ([" ".join(p) for p in phonetization],
+                tokens,
+                [(tv1, tv2, phone) for tv1, tv2, phone, unit in alignments])
+
+    # ------------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------------
+
+    def __network(self, acmodel):
+        """ Return the network of the HMMs of the phonetization.
+
+        The network is made of emitting nodes, the states of the HMMs, and
+        of non-emitting nodes: the entry and the exit of each HMM, the end
+        of each token. Nodes are sorted so that any non-emitting node is
+        after the nodes it comes from.
+
+        :returns: (dict) with keys:
+            - 'pdf': index of the pdf of each node, or None if non-emitting,
+            - 'preds': list of (node, log-probability) of each node,
+            - 'unit': index of the unit of each emitting node,
+            - 'units': list of (token index, phone) of each HMM.
+
+        """
+        hmms = acmodel['hmms']
+        network = {'pdf': [None], 'preds': [[]], 'unit': [None], 'units': []}
+
+        phones = self._phones.split()
+        if len(phones) == 0:
+            raise IOError("No data to time-align.")
+
+        entry = 0
+        for t, pron in enumerate(phones):
+            variants = [v for v in pron.split("|") if len(v.strip("-")) > 0]
+            if len(variants) == 0:
+                raise ValueError("No pronunciation for the token %d." % (t+1))
+            if self._infersp is True and "sp" in hmms:
+                variants.extend([v + "-sp" for v in variants])
+
+            exits = list()
+            for variant in variants:
+                variant = [p for p in variant.split("-") if len(p) > 0]
+                node = entry
+                for i, phone in enumerate(variant):
+                    left = variant[i-1] if i > 0 else None
+                    right = variant[i+1] if i+1 < len(variant) else None
+                    name = ViterbiAligner.__hmm_name(acmodel, left, phone, right)
+                    network['units'].append((t, phone))
+                    node = ViterbiAligner.__append_hmm(network, hmms[name], node)
+                exits.append(node)
+
+            # the end of the token
+            network['pdf'].append(None)
+            network['preds'].append([(e, 0.) for e in exits])
+            network['unit'].append(None)
+            entry = len(network['pdf']) - 1
+
+        return network
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def __hmm_name(acmodel, left, phone, right):
+        """ Return the name of the HMM of a phone in its context. """
+
+        names = list()
+        if left is not None and right is not None:
+            names.append(left + "-" + phone + "+" + right)
+        if left is not None:
+            names.append(left + "-" + phone)
+        if right is not None:
+            names.append(phone + "+" + right)
+        names.append(phone)
+
+        hmms = acmodel['hmms']
+        tied = acmodel['tiedlist'].tied
+        for name in names:
+            name = tied.get(name, name)
+            if name in hmms:
+                return name
+
+        raise ValueError("%s not in the model" % phone)
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def __append_hmm(network, hmm, entry):
+        """ Append the nodes of an HMM to the network.
+
+        :param network: (dict) the network
+        :param hmm: (tuple) indexes of the pdfs and log-transitions of the HMM
+        :param entry: (int) index of the node to enter the HMM
+        :returns: (int) the index of the node to exit the HMM
+
+        """
+        pdfs, transition = hmm
+        unit = len(network['units']) - 1
+        first = len(network['pdf'])
+        n = len(pdfs)
+
+        # Emitting nodes: the model can't be skipped.
+        for j in range(n):
+            preds = list()
+            if transition[0][j+1] > LOG_ZERO:
+                preds.append((entry, transition[0][j+1]))
+            for i in range(n):
+                if transition[i+1][j+1] > LOG_ZERO:
+                    preds.append((first + i, transition[i+1][j+1]))
+            network['pdf'].append(pdfs[j])
+            network['preds'].append(preds)
+            network['unit'].append(unit)
+
+        # Exit node
+        network['pdf'].append(None)
+        network['preds'].append([(first + i, transition[i+1][n+1])
+                                 for i in range(n) if transition[i+1][n+1] > LOG_ZERO])
+        network['unit'].append(None)
+
+        return len(network['pdf']) - 1
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def __search(network, pdfs, features, beam):
+        """ Return the best path of the frames in the network.
+
+        :param network: (dict) the network
+        :param pdfs: (list) the Gaussian mixtures of the states
+        :param features: (list) the MFCC vector of each frame
+        :param beam: (float) the nodes with a score lower than the best one
+        minus the beam are pruned, or None
+        :returns: (list) the emitting node of each frame, or None if there
+        is no path
+
+        """
+        nodes = network['pdf']
+        preds = network['preds']
+        emitting = [j for j, pdf in enumerate(nodes) if pdf is not None]
+        non_emitting = [j for j, pdf in enumerate(nodes) if pdf is None and j > 0]
+
+        scores = [LOG_ZERO] * len(nodes)
+        scores[0] = 0.
+        ViterbiAligner.__propagate(scores, [None] * len(nodes), preds, non_emitting)
+
+        backs = list()
+        for x in features:
+            x2 = [v * v for v in x]
+            loglik = dict()
+            new = [LOG_ZERO] * len(nodes)
+            back = [None] * len(nodes)
+            best_score = LOG_ZERO
+            for j in emitting:
+                best = LOG_ZERO
+                for p, logp in preds[j]:
+                    s = scores[p] + logp
+                    if s > best:
+                        best = s
+                        back[j] = p
+                if best == LOG_ZERO:
+                    continue
+                pdf = nodes[j]
+                if pdf not in loglik:
+                    loglik[pdf] = ViterbiAligner.__loglik(pdfs[pdf], x, x2)
+                new[j] = best + loglik[pdf]
+                if new[j] > best_score:
+                    best_score = new[j]
+
+            if beam is not None:
+                threshold = best_score - beam
+                for j in emitting:
+                    if new[j] < threshold:
+                        new[j] = LOG_ZERO
+
+            ViterbiAligner.__propagate(new, back, preds, non_emitting)
+            backs.append(back)
+            scores = new
+
+        # Back-trace from the end of the last token
+        node = len(nodes) - 1
+        if len(features) == 0 or scores[node] == LOG_ZERO:
+            return None
+        path = [None] * len(features)
+        frame = len(features) - 1
+        while frame >= 0:
+            back = backs[frame]
+            if nodes[node] is None:
+                node = back[node]
+            else:
+                path[frame] = node
+                node = back[node]
+                frame -= 1
+
+        return path
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def __propagate(scores, back, preds, non_emitting):
+        """ Propagate the scores of a frame to the non-emitting nodes. """
+
+        for j in non_emitting:
+            best = LOG_ZERO
+            for p, logp in preds[j]:
+                s = scores[p] + logp
+                if s > best:
+                    best = s
+                    back[j] = p
+            scores[j] = best
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def __compile_state(state):
+        """ Return the mixtures of a state.
+
+        Each mixture is a tuple (c, a, b) so that its log-likelihood is:
+        c + sum(a*x^2) + sum(b*x).
+
+        """
+        streams = state['streams']
+        if len(streams) != 1:
+            raise NotImplementedError("Only one stream is supported.")
+
+        mixtures = streams[0]['mixtures']
+        result = list()
+        for mixture in mixtures:
+            weight = mixture.get('weight', None)
+            if weight is None:
+                weight = 1. / len(mixtures)
+            if weight <= 0.:
+                continue
+            pdf = mixture['pdf']
+            variance = pdf['covariance'].get('variance', None)
+            if variance is None:
+                raise NotImplementedError("Only diagonal covariance matrices are supported.")
+            variance = variance['vector']
+            mean = pdf['mean']['vector']
+            gconst = pdf.get('gconst', None)
+            if gconst is None:
+                gconst = sum(math.log(2. * math.pi * v) for v in variance)
+            c = math.log(weight) - 0.5 * (gconst + sum(m * m / v for m, v in zip(mean, variance)))
+            result.append((c,
+                           [-0.5 / v for v in variance],
+                           [m / v for m, v in zip(mean, variance)]))
+
+        return result
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def __loglik(mixtures, x, x2):
+        """ Return the log-likelihood of a vector for a state. """
+
+        values = [c + sum(map(operator.mul, a, x2)) + sum(map(operator.mul, b, x))
+                  for c, a, b in mixtures]
+        if len(values) == 1:
+            return values[0]
+        best = max(values)
+        return best + math.log(sum(math.exp(v - best) for v in values))
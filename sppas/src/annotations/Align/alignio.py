@@ -169,6 +169,16 @@ class AlignIO(object):
         """
         self.aligntrack.set_infersp(infersp)
 
+    # ----------------------------------------------------------------------
+
+    def set_nb_workers(self, nb_workers):
+        """ Fix the number of tracks aligned at the same time.
+
+        :param nb_workers: (int) 0 means the number of CPUs.
+
+        """
+        self.aligntrack.set_nb_workers(nb_workers)
+
     # ------------------------------------------------------------------------
 
     def segment_track(self, track, diralign, segment=True):
@@ -197,6 +207,24 @@ class AlignIO(object):
 
     # ------------------------------------------------------------------------
 
+    def segment_store(self, store, tracks, diralign, segment=True):
+        """ Perform the speech segmentation of several tracks of a store.
+
+        :param store: (TracksStore) The tracks, with their alignment
+        :param tracks: (list of int) The tracks to segment
+        :param diralign: (str) The directory to write the files required
+        by the aligner.
+        :param segment: (bool) If True, call an aligner to segment speech,
+        else set an empty alignment.
+
+        :returns: (list) A message of the aligner or the exception which
+        occurred for each track.
+
+        """
+        return self.aligntrack.segment_store(store, tracks, diralign, segment)
+
+    # ------------------------------------------------------------------------
+
     def read(self, dirname):
         """ Read time-aligned tracks in a directory and return a Transcription.
 
@@ -209,16 +237,23 @@ class AlignIO(object):
         trsin = TracksReader()
         trsin.set_tracksnames(self._tracknames)
         trsin.read(dirname, units)
+        self._map_back(trsin)
 
-        # map-back phonemes
-        self._mapping.set_keep_miss(True)
-        self._mapping.set_reverse(False)
+        return trsin
 
-        # Map time-aligned phonemes (even the alternatives)
-        tier = trsin.Find("PhonAlign")
-        for ann in tier:
-            for text in ann.GetLabel().GetLabels():
-                text.SetValue(self._mapping.map_entry(text.GetValue()))
+    # ------------------------------------------------------------------------
+
+    def read_store(self, store):
+        """ Return a Transcription with the time-aligned tracks of a store.
+
+        :param store: (TracksStore) The tracks, with their alignment
+        :returns: Transcription
+
+        """
+        trsin = TracksReader()
+        trsin.set_tracksnames(self._tracknames)
+        trsin.read_store(store)
+        self._map_back(trsin)
 
         return trsin
 
@@ -239,7 +274,63 @@ class AlignIO(object):
         :returns: Transcription
 
         """
-        # Map phonemes from SAMPA to the expected ones.
+        self._map(phontier)
+
+        sgmt = TrackSplitter()
+        sgmt.set_tracksnames(self._tracknames)
+        sgmt.set_trackalign(self.aligntrack)
+        units = sgmt.split(inputaudio, phontier, toktier, diralign)
+        ListIO().write(diralign, units)
+
+        return sgmt
+
+    # ------------------------------------------------------------------------
+
+    def split_store(self, inputaudio, phontier, toktier):
+        """ Store the tracks of a Transcription in memory.
+
+        Nothing is written: the files an aligner requires are written
+        when the tracks are segmented.
+
+        :param inputaudio: (str) Audio file name.
+        :param phontier: (Tier) The phonetization tier.
+        :param toktier: (Tier) The tokenization tier, or None.
+
+        :returns: tuple (TrackSplitter, TracksStore)
+
+        """
+        self._map(phontier)
+
+        sgmt = TrackSplitter()
+        sgmt.set_tracksnames(self._tracknames)
+        sgmt.set_trackalign(self.aligntrack)
+        store = sgmt.split_store(inputaudio, phontier, toktier)
+
+        return sgmt, store
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def write_store(store, diralign):
+        """ Write the tracks of a store, and the list of tracks.
+
+        :param store: (TracksStore) The tracks to write
+        :param diralign: (str) Output directory to store files.
+
+        """
+        store.write(diralign)
+        ListIO().write(diralign, store.get_units())
+
+    # ------------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------------
+
+    def _map(self, phontier):
+        """ Map phonemes of a phonetization tier from SAMPA to the expected ones.
+
+        :param phontier: (Tier) The phonetization tier, modified.
+
+        """
         self._mapping.set_keep_miss(True)
         self._mapping.set_reverse(True)
 
@@ -255,10 +346,19 @@ class AlignIO(object):
                 text.SetValue(self._mapping.map(content,
                                                 AlignIO.DELIMITERS))
 
-        sgmt = TrackSplitter()
-        sgmt.set_tracksnames(self._tracknames)
-        sgmt.set_trackalign(self.aligntrack)
-        units = sgmt.split(inputaudio, phontier, toktier, diralign)
-        ListIO().write(diralign, units)
+    # ------------------------------------------------------------------------
 
-        return sgmt
+    def _map_back(self, trs):
+        """ Map-back the time-aligned phonemes of a Transcription.
+
+        :param trs: (Transcription) with a PhonAlign tier, modified.
+
+        """
+        self._mapping.set_keep_miss(True)
+        self._mapping.set_reverse(False)
+
+        # Map time-aligned phonemes (even the alternatives)
+        tier = trs.Find("PhonAlign")
+        for ann in tier:
+            for text in ann.GetLabel().GetLabels():
+                text.SetValue(self._mapping.map_entry(text.GetValue()))
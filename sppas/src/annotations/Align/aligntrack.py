@@ -33,6 +33,8 @@
 
 """
 import codecs
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 
 from sppas import encoding
 from sppas.src.utils.makeunicode import sppasUnicode
@@ -41,6 +43,7 @@ from .. import t
 from .aligners import DEFAULT_ALIGNER
 from .aligners import instantiate as aligners_instantiate
 from .aligners import check as aligners_check
+from .aligners.alignerio import AlignerIO
 
 # ----------------------------------------------------------------------------
 
@@ -89,6 +92,9 @@ class AlignTrack(object):
         # Options, must be fixed before to instantiate the aligner
         self._infersp = False
 
+        # Number of tracks aligned at the same time
+        self._nb_workers = 1
+
         # The acoustic model directory
         self._modeldir = model
 
@@ -140,6 +146,29 @@ class AlignTrack(object):
 
     # ----------------------------------------------------------------------
 
+    def set_nb_workers(self, nb_workers):
+        """ Fix the number of tracks aligned at the same time.
+
+        :param nb_workers: (int) Number of external aligners running in
+        parallel. 0 means the number of CPUs.
+
+        """
+        nb_workers = int(nb_workers)
+        if nb_workers < 0:
+            raise ValueError("Invalid number of workers: %d" % nb_workers)
+        if nb_workers == 0:
+            nb_workers = cpu_count()
+        self._nb_workers = nb_workers
+
+    # ----------------------------------------------------------------------
+
+    def get_nb_workers(self):
+        """ Return the number of tracks aligned at the same time. """
+
+        return self._nb_workers
+
+    # ----------------------------------------------------------------------
+
     def get_aligner(self):
         """ Return the aligner name identifier. """
 
@@ -210,10 +239,122 @@ class AlignTrack(object):
 
         return ret
 
+    # ------------------------------------------------------------------------
+
+    def segment_store(self, store, tracks, diralign, segment=True):
+        """ Call the aligner to perform speech segmentation of tracks of a store.
+
+        Tracks with nothing to align, or only one phoneme, are aligned in
+        memory by the basic aligner, like all the tracks if the aligner is
+        the basic one. The other tracks are given all at once to the aligner,
+        so that it can load its acoustic model only once: only their audio
+        files are written into the directory. They are shared out between
+        several aligners running in parallel threads if the number of
+        workers is greater than 1.
+
+        The result of the alignment of each track is set to the store.
+
+        :param store: (TracksStore) The tracks to be aligned
+        :param tracks: (list of int) The tracks to segment
+        :param diralign: (str) The directory to write the files
+        :param segment: (bool) If True, call an aligner to segment speech,
+        else set an empty alignment.
+
+        :returns: (list) A message of the aligner or the exception which
+        occurred for each track.
+
+        """
+        results = [""] * len(tracks)
+        to_align = list()
+        for i, track in enumerate(tracks):
+            phones = ""
+            tokens = ""
+            if segment is True:
+                phones = sppasUnicode(store.get_phones(track)).to_strip()
+                tokens = sppasUnicode(store.get_tokens(track)).to_strip()
+
+            try:
+                # Do not align nothing, do not align only one phoneme!
+                if len(phones) == 0 or (len(phones.split()) <= 1 and "-" not in phones):
+                    self._basicaligner.set_phones(phones)
+                    self._basicaligner.set_tokens(tokens)
+                    store.set_aligned(track, *self._basicaligner.run_aligned(store.get_duration(track)))
+                    if len(phones) == 0:
+                        results[i] = MSG_EMPTY_INTERVAL
+
+                elif self._alignerid == "basic":
+                    self._aligner.set_phones(phones)
+                    self._aligner.set_tokens(tokens)
+                    results[i] = self._aligner.check_data()
+                    store.set_aligned(track, *self._aligner.run_aligned(store.get_duration(track)))
+
+                else:
+                    audio_filename = store.write_audio(track, diralign)
+                    alignname = store.align_filename(track, diralign)
+                    to_align.append((i, (audio_filename, phones, tokens, alignname)))
+
+            except Exception as e:
+                results[i] = e
+
+        alignerio = AlignerIO()
+        for (i, track), result in zip(to_align, self.__run_alignments(to_align)):
+            results[i] = result
+            if isinstance(result, Exception) is False:
+                try:
+                    store.set_aligned(tracks[i], *alignerio.read_aligned(track[3]))
+                except Exception as e:
+                    results[i] = e
+
+        return results
+
     # ------------------------------------------------------------------------
     # Private
     # ------------------------------------------------------------------------
 
+    def __run_alignments(self, to_align):
+        """ Align the tracks with the aligner, eventually in parallel threads.
+
+        :param to_align: (list) List of tuples with an index and a track,
+        i.e. a tuple with the audio input file name, the phonetization, the
+        tokenization and the output file name.
+        :returns: (list) A message or an exception for each track.
+
+        """
+        nb_workers = min(self._nb_workers, len(to_align))
+        if nb_workers <= 1:
+            return self._aligner.run_alignments([track for i, track in to_align])
+
+        chunks = [to_align[w::nb_workers] for w in range(nb_workers)]
+        aligners = [self._aligner] + [self._new_aligner() for w in range(nb_workers-1)]
+
+        def align_chunk(args):
+            aligner, chunk = args
+            return aligner.run_alignments([track for i, track in chunk])
+
+        pool = ThreadPool(nb_workers)
+        try:
+            chunk_results = pool.map(align_chunk, zip(aligners, chunks))
+        finally:
+            pool.close()
+            pool.join()
+
+        results = [""] * len(to_align)
+        for w, chunk_result in enumerate(chunk_results):
+            for j, result in enumerate(chunk_result):
+                results[w + j*nb_workers] = result
+
+        return results
+
+    # ------------------------------------------------------------------------
+
+    def _new_aligner(self):
+        """ Return a new instance of the aligner, with the same options. """
+
+        aligner = aligners_instantiate(self._modeldir, self._alignerid)
+        aligner.set_infersp(self._infersp)
+        aligner.set_outext(self._aligner.get_outext())
+        return aligner
+
     def _instantiate_aligner(self):
         """ Instantiate self._aligner to the appropriate Aligner system. """
 
@@ -35,7 +35,6 @@
 """
 import shutil
 import os.path
-import glob
 import logging
 
 from sppas import RESOURCES_PATH
@@ -129,6 +128,8 @@ class sppasAlign(sppasBaseAnnotation):
         self._options['activity'] = True  # Add the Activity tier
         self._options['activityduration'] = False
         self._options['phntok'] = False   # Add the PhnTokAlign tier
+        self._options['workers'] = 1      # Number of tracks aligned at the same time
+        self.alignio.set_nb_workers(1)
 
     # -----------------------------------------------------------------------
 
@@ -176,6 +177,7 @@ class sppasAlign(sppasBaseAnnotation):
             - activity
             - activityduration
             - phntok
+            - workers
 
         :param options: (sppasOption)
 
@@ -205,6 +207,9 @@ class sppasAlign(sppasBaseAnnotation):
             elif "phntok" == key:
                 self.set_phntokalign_tier(opt.get_value())
 
+            elif "workers" == key:
+                self.set_nb_workers(opt.get_value())
+
             else:
                 raise AnnotationOptionError(key)
 
@@ -283,38 +288,54 @@ class sppasAlign(sppasBaseAnnotation):
         """
         self._options['phntok'] = bool(value)
 
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value):
+        """ Fix the workers option.
+
+        :param value: (int) Number of tracks aligned at the same time by
+        aligners running in parallel. 0 means the number of CPUs. It should
+        be 1 if the files are annotated by a pool of processes.
+
+        """
+        self.alignio.set_nb_workers(value)
+        self._options['workers'] = int(value)
+
     # -----------------------------------------------------------------------
     # Methods to time-align series of data
     # -----------------------------------------------------------------------
 
-    def convert_tracks(self, diralign):
-        """ Call the Aligner to align each unit of a directory.
+    def convert_tracks(self, store, diralign):
+        """ Call the Aligner to align each track of a store.
 
-        :param diralign: the directory to get units and put alignments.
+        :param store: (TracksStore) the tracks, to set their alignment.
+        :param diralign: the directory to put the files the aligner requires.
 
         """
         # Verify if the directory exists
         if os.path.exists(diralign) is False:
             raise NoDirectoryError(diralign)
 
-        # Get all audio tracks
-        dirlist = glob.glob(os.path.join(diralign, "track_*.wav"))
-        ntracks = len(dirlist)
+        ntracks = len(store)
         if ntracks == 0:
             raise EmptyDirectoryError(diralign)
 
+        # Align all tracks at once: the aligner can then share the
+        # loading of the acoustic model and use several CPUs.
+        results = self.alignio.segment_store(store, range(1, ntracks+1), diralign)
+
         track = 1
         while track <= ntracks:
             self.print_message(MSG_ALIGN_TRACK.format(number=track), indent=2)
 
-            try:
-                msg = self.alignio.segment_track(track, diralign)
+            msg = results[track-1]
+            if isinstance(msg, Exception) is False:
                 if len(msg) > 0:
                     self.print_message(msg, indent=3, status=INFO_ID)
 
-            except Exception as e:
+            else:
                 self.print_message(MSG_ALIGN_FAILED.format(name=self.alignio.get_aligner()), indent=3, status=ERROR_ID)
-                self.print_message(str(e), indent=4, status=INFO_ID)
+                self.print_message(str(msg), indent=4, status=INFO_ID)
 
                 # Execute BasicAlign
                 if self._options['basic'] is True:
@@ -322,12 +343,16 @@ class sppasAlign(sppasBaseAnnotation):
                         self.logfile.print_message(MSG_BASIC, indent=3)
                     aligner_id = self.alignio.get_aligner()
                     self.alignio.set_aligner('basic')
-                    self.alignio.segment_track(track, diralign)
+                    result = self.alignio.segment_store(store, [track], diralign)[0]
                     self.alignio.set_aligner(aligner_id)
+                    if isinstance(result, Exception):
+                        raise result
 
                 # or Create an empty alignment, to get an empty interval in the final tier
                 else:
-                    self.alignio.segment_track(track, diralign, segment=False)
+                    result = self.alignio.segment_store(store, [track], diralign, segment=False)[0]
+                    if isinstance(result, Exception):
+                        raise result
 
             track += 1
 
@@ -351,12 +376,14 @@ class sppasAlign(sppasBaseAnnotation):
         # --------------------------------------------------------------
 
         self.print_message(MSG_ACTION_SPLIT_INTERVALS, indent=2)
-        sgmt = self.alignio.split(inputaudio, phontier, toktier, workdir)
+        sgmt, store = self.alignio.split_store(inputaudio, phontier, toktier)
 
         # Align each track
         # --------------------------------------------------------------
 
-        self.convert_tracks(workdir)
+        self.convert_tracks(store, workdir)
+        if self._options['clean'] is False:
+            self.alignio.write_store(store, workdir)
 
         # Merge track alignment results
         # --------------------------------------------------------------
@@ -368,7 +395,7 @@ class sppasAlign(sppasBaseAnnotation):
             trs_output.Append(tier)
 
         # Create a Transcription() object with alignments
-        trs = self.alignio.read(workdir)
+        trs = self.alignio.read_store(store)
         if self.alignio.get_aligner() != 'basic':
             trs = self.rustine_liaisons(trs)
             trs = self.rustine_others(trs)
@@ -83,6 +83,186 @@ class TrackNamesGenerator(object):
 # ----------------------------------------------------------------------------
 
 
+class TracksStore(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Keep the tracks of an audio file in memory.
+
+    The tracks are the units to be time-aligned: their time values, their
+    phonetization and tokenization, the audio channel they are extracted
+    from (re-sampled to 16000 Hz, 16 bits) and the result of their
+    alignment. Tracks are numbered from 1.
+
+    Files are written only on demand, i.e. when an external aligner
+    needs them.
+
+    """
+    def __init__(self):
+        """ Creates a new TracksStore instance. """
+
+        self._channel = None
+        self._units = list()
+        self._phones = list()
+        self._tokens = list()
+        self._aligned = dict()
+        self._tracknames = TrackNamesGenerator()
+
+    # ------------------------------------------------------------------------
+
+    def set_tracksnames(self, track_names):
+        """ Set the TrackNamesGenerator(), used to write files. """
+
+        self._tracknames = track_names
+
+    # ------------------------------------------------------------------------
+
+    def set_channel(self, channel):
+        """ Set the audio channel the tracks are extracted from.
+
+        :param channel: (sppasChannel) A channel with 16000 Hz, 16 bits.
+
+        """
+        self._channel = channel
+
+    # ------------------------------------------------------------------------
+
+    def append(self, start, end, phones, tokens):
+        """ Append a track.
+
+        :param start: (float) Start time value in seconds
+        :param end: (float) End time value in seconds
+        :param phones: (str) Phonetization of the track
+        :param tokens: (str) Tokenization of the track
+        :returns: (int) Number of the track
+
+        """
+        self._units.append((start, end))
+        self._phones.append(phones)
+        self._tokens.append(tokens)
+        return len(self._units)
+
+    # ------------------------------------------------------------------------
+
+    def get_units(self):
+        """ Return the list of tracks with (start-time end-time).
+
+        Time values are rounded to the microsecond, like in the list of
+        tracks written by the split.
+
+        """
+        return [(round(s, 6), round(e, 6)) for s, e in self._units]
+
+    # ------------------------------------------------------------------------
+
+    def get_phones(self, track):
+        """ Return the phonetization of a track (str). """
+
+        return self._phones[track-1]
+
+    # ------------------------------------------------------------------------
+
+    def get_tokens(self, track):
+        """ Return the tokenization of a track (str). """
+
+        return self._tokens[track-1]
+
+    # ------------------------------------------------------------------------
+
+    def get_channel(self, track):
+        """ Return the audio channel of a track (sppasChannel). """
+
+        s, e = self._units[track-1]
+        return autils.extract_channel_fragment(self._channel, s, e)
+
+    # ------------------------------------------------------------------------
+
+    def get_duration(self, track):
+        """ Return the duration of the audio channel of a track (float). """
+
+        if self._channel is None:
+            return 0.
+        return self.get_channel(track).get_duration()
+
+    # ------------------------------------------------------------------------
+
+    def set_aligned(self, track, phonannots, wordannots):
+        """ Set the result of the alignment of a track.
+
+        :param track: (int) Number of the track
+        :param phonannots: (list) tuples (start-time end-time phoneme score)
+        :param wordannots: (list) tuples (start-time end-time word score)
+
+        """
+        self._aligned[track] = (phonannots, wordannots)
+
+    # ------------------------------------------------------------------------
+
+    def get_aligned(self, track):
+        """ Return the result of the alignment of a track.
+
+        :returns: Two lists of tuples with phones and words, like
+        AlignerIO.read_aligned().
+
+        """
+        if track not in self._aligned:
+            raise IOError('No time-aligned data for track %d' % track)
+        return self._aligned[track]
+
+    # ------------------------------------------------------------------------
+
+    def write_audio(self, track, diralign):
+        """ Write the audio file of a track.
+
+        :param track: (int) Number of the track
+        :param diralign: (str) Directory to write the file.
+        :returns: (str) The file name
+
+        """
+        trackname = self._tracknames.audio_filename(diralign, track)
+        autils.write_channel(trackname, self.get_channel(track))
+        return trackname
+
+    # ------------------------------------------------------------------------
+
+    def align_filename(self, track, diralign):
+        """ Return the name of the alignment file of a track, without extension.
+
+        :param track: (int) Number of the track
+        :param diralign: (str) Directory of the file.
+
+        """
+        return self._tracknames.align_filename(diralign, track)
+
+    # ------------------------------------------------------------------------
+
+    def write(self, diralign):
+        """ Write the audio and text files of all the tracks.
+
+        :param diralign: (str) Directory to write the files.
+
+        """
+        for track in range(1, len(self._units)+1):
+            fnp = self._tracknames.phones_filename(diralign, track)
+            with codecs.open(fnp, "w", encoding) as fp:
+                fp.write(self.get_phones(track))
+            fnt = self._tracknames.tokens_filename(diralign, track)
+            with codecs.open(fnt, "w", encoding) as fp:
+                fp.write(self.get_tokens(track))
+            if self._channel is not None:
+                self.write_audio(track, diralign)
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._units)
+
+# ----------------------------------------------------------------------------
+
+
 class TrackSplitter(Transcription):
     """
     :author:       Brigitte Bigi
@@ -152,6 +332,34 @@ class TrackSplitter(Transcription):
 
     # ------------------------------------------------------------------------
 
+    def split_store(self, inputaudio, phontier, toktier):
+        """ Store the tracks of the given data in memory.
+
+        :param inputaudio: (src) File name of the audio file.
+        :param phontier: (Tier) Tier with phonetization to split.
+        :param toktier: (Tier) Tier with tokenization to split.
+
+        :returns: TracksStore
+
+        """
+        if phontier.IsTimeInterval() is False:
+            raise BadInputError
+        if toktier is not None:
+            if toktier.IsTimeInterval() is False:
+                toktier = None
+
+        store = TracksStore()
+        store.set_tracksnames(self._tracknames)
+        for b, e, textp, textt in self._text_tracks(phontier, toktier):
+            store.append(b, e, textp, textt)
+
+        channel = autils.extract_audio_channel(inputaudio, 0)
+        store.set_channel(autils.format_channel(channel, 16000, 2))
+
+        return store
+
+    # ------------------------------------------------------------------------
+
     def write_text_tracks(self, phontier, toktier, diralign):
         """ Write tokenization and phonetization of tiers into separated track files.
 
@@ -160,35 +368,14 @@ class TrackSplitter(Transcription):
         :param diralign: (str) the directory to write tracks.
 
         """
-        tokens = True
-        if toktier is None:
-            toktier = phontier.Copy()
-            tokens = False
-        if phontier.GetSize() != toktier.GetSize():
-            raise SizeInputsError(phontier.GetSize(), toktier.GetSize())
-
         units = []
-        for annp, annt in zip(phontier, toktier):
-
-            b = annp.GetLocation().GetBegin().GetMidpoint()
-            e = annp.GetLocation().GetEnd().GetMidpoint()
+        for b, e, textp, textt in self._text_tracks(phontier, toktier):
             units.append((b, e))
 
-            # Here we write only the text-label with the best score,
-            # we don't care about alternative text-labels
             fnp = self._tracknames.phones_filename(diralign, len(units))
-            textp = annp.GetLabel().GetValue()
-            textp = textp.replace('\n', ' ')
             self._write_text_track(fnp, textp)
 
             fnt = self._tracknames.tokens_filename(diralign, len(units))
-            label = annt.GetLabel()
-            if tokens is False and label.IsSpeech() is True:
-                textt = " ".join(["w_"+str(i+1) for i in range(len(textp.split()))])
-            else:
-                textt = label.GetValue()
-                textt = textt.replace('\n', ' ')
-
             self._write_text_track(fnt, textt)
 
         return units
@@ -216,6 +403,41 @@ class TrackSplitter(Transcription):
 
     # ------------------------------------------------------------------------
 
+    def _text_tracks(self, phontier, toktier):
+        """ Return the list of (start-time end-time phonetization tokenization).
+
+        """
+        tokens = True
+        if toktier is None:
+            toktier = phontier.Copy()
+            tokens = False
+        if phontier.GetSize() != toktier.GetSize():
+            raise SizeInputsError(phontier.GetSize(), toktier.GetSize())
+
+        tracks = []
+        for annp, annt in zip(phontier, toktier):
+
+            b = annp.GetLocation().GetBegin().GetMidpoint()
+            e = annp.GetLocation().GetEnd().GetMidpoint()
+
+            # Here we keep only the text-label with the best score,
+            # we don't care about alternative text-labels
+            textp = annp.GetLabel().GetValue()
+            textp = textp.replace('\n', ' ')
+
+            label = annt.GetLabel()
+            if tokens is False and label.IsSpeech() is True:
+                textt = " ".join(["w_"+str(i+1) for i in range(len(textp.split()))])
+            else:
+                textt = label.GetValue()
+                textt = textt.replace('\n', ' ')
+
+            tracks.append((b, e, textp, textt))
+
+        return tracks
+
+    # ------------------------------------------------------------------------
+
     def _write_text_track(self, trackname, trackcontent):
         """ Write a raw text in a file.
 
@@ -264,6 +486,33 @@ class TracksReader(Transcription):
         if os.path.exists(dirname) is False:
             raise NoDirectoryError(dirname=dirname)
 
+        aligned = list()
+        for track in range(len(units)):
+            basename = self._tracknames.align_filename(dirname, track+1)
+            aligned.append(self.alignerio.read_aligned(basename))
+
+        self._append_tracks(units, aligned)
+
+    # ------------------------------------------------------------------------
+
+    def read_store(self, store):
+        """ Set the alignments of the tracks of a store as tiers.
+
+        :param store: (TracksStore) The tracks and their alignment
+
+        """
+        aligned = [store.get_aligned(track+1) for track in range(len(store))]
+        self._append_tracks(store.get_units(), aligned)
+
+    # ------------------------------------------------------------------------
+
+    def _append_tracks(self, units, aligned):
+        """ Append the alignments of the tracks into new tiers.
+
+        :param units: (list) List of units with start/end times
+        :param aligned: (list) Alignments of phones and words of each unit
+
+        """
         # Create new tiers
         itemp = self.NewTier("PhonAlign")
         itemw = self.NewTier("TokensAlign")
@@ -273,9 +522,7 @@ class TracksReader(Transcription):
 
             # Get real start and end time values of this unit.
             unitstart, unitend = units[track]
-
-            basename = self._tracknames.align_filename(dirname, track+1)
-            _phonannots,_wordannots = self.alignerio.read_aligned(basename)
+            _phonannots, _wordannots = aligned[track]
 
             # Append alignments in tiers
             self._append_tuples(itemp, _phonannots, unitstart, unitend)
@@ -36,6 +36,7 @@
 
 """
 from sppas.src.audiodata.channelsilence import sppasChannelSilence
+from sppas.src.audiodata.streamsilence import sppasStreamSilence
 
 # ---------------------------------------------------------------------------
 
@@ -79,6 +80,7 @@ class IPUsAudio(object):
         self._sil_at_end = False
 
         self._channel_sil = None
+        self._stream_sil = None
         self.set_channel(channel)
 
     # ------------------------------------------------------------------
@@ -116,6 +118,60 @@ class IPUsAudio(object):
 
     # ------------------------------------------------------------------
 
+    def get_stream(self):
+        """ Return the sppasStreamSilence, or None. """
+
+        return self._stream_sil
+
+    # ------------------------------------------------------------------
+
+    def set_stream(self, audio, channel_idx=0):
+        """ Set an audio file to be segmented without loading its channel.
+
+        :param audio: (sppasAudioPCM) An opened audio file, or None
+        :param channel_idx: (int) Index of the channel to work on
+
+        """
+        if audio is not None:
+            self._stream_sil = sppasStreamSilence(audio, channel_idx, self._win_length)
+        else:
+            self._stream_sil = None
+
+    # ------------------------------------------------------------------
+
+    def get_stream_data(self, track):
+        """ Return the audio data of a track, block by block.
+
+        :param track: A track is a tuple (start, end).
+        :returns: a generator of frames
+
+        """
+        return self._stream_sil.read_blocks(track[0], track[1])
+
+    # ------------------------------------------------------------------
+
+    def get_framerate(self):
+        """ Return the frame rate of the channel or of the stream. """
+
+        if self._channel_sil is not None:
+            return self._channel_sil.get_channel().get_framerate()
+        if self._stream_sil is not None:
+            return self._stream_sil.get_framerate()
+        return 0
+
+    # ------------------------------------------------------------------
+
+    def get_duration(self):
+        """ Return the duration of the channel or of the stream. """
+
+        if self._channel_sil is not None:
+            return self._channel_sil.get_channel().get_duration()
+        if self._stream_sil is not None:
+            return self._stream_sil.get_duration()
+        return 0.
+
+    # ------------------------------------------------------------------
+
     def reset_silences(self):
         """ Reset the list of silences. """
         
@@ -314,6 +370,36 @@ class IPUsAudio(object):
 
     # ------------------------------------------------------------------
 
+    def stream_tracks(self, shift_start=None, shift_end=None):
+        """ Search the tracks of the stream and return them when found.
+
+        The volume threshold is estimated first if it is automatic.
+
+        :param shift_start: (float) The time to remove to the start boundary (in seconds)
+        :param shift_end: (float) The time to add to the end boundary (in seconds)
+        :returns: a generator of tuples (from_pos,to_pos)
+
+        """
+        if self._stream_sil is None:
+            return
+
+        if shift_start is None:
+            shift_start = self._shift_start
+        if shift_end is None:
+            shift_end = self._shift_end
+        if self._auto_vol is True:
+            self._vol_threshold = self._stream_sil.search_threshold_vol()
+
+        for track in self._stream_sil.search_tracks(self._vol_threshold,
+                                                    self._min_sil_dur,
+                                                    self._min_ipu_dur,
+                                                    shift_start,
+                                                    shift_end,
+                                                    IPUsAudio.MIN_IPU_DUR):
+            yield track
+
+    # ------------------------------------------------------------------
+
     def check_boundaries(self, tracks):
         """ Check if silences at start and end are as expected.
 
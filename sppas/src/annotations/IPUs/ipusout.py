@@ -41,6 +41,7 @@ from sppas.src.audiodata.autils import frames2times
 import sppas.src.audiodata.aio
 import sppas.src.annotationdata.aio
 from sppas.src.audiodata.audio import sppasAudioPCM
+from sppas.src.audiodata.channel import sppasChannel
 from sppas.src.annotationdata.transcription import Transcription
 from sppas.src.annotationdata.ptime.point import TimePoint
 from sppas.src.annotationdata.ptime.interval import TimeInterval
@@ -114,8 +115,8 @@ class IPUsOut(object):
             raise IOError('No IPUs to write.\n')
 
         # Extract the info we need from IPUsAudio
-        framerate = ipusaudio.get_channel().get_framerate()
-        end_time = ipusaudio.get_channel().get_duration()
+        framerate = ipusaudio.get_framerate()
+        end_time = ipusaudio.get_duration()
 
         # Extract the info we need from ipustrs
         try:
@@ -213,7 +214,7 @@ class IPUsOut(object):
 
         """
         # Convert the tracks: from frames to times
-        tracks_times = frames2times(self.tracks, ipusaudio.get_channel().get_framerate())
+        tracks_times = frames2times(self.tracks, ipusaudio.get_framerate())
 
         with codecs.open(filename, 'w', encoding) as fp:
             idx = 0
@@ -232,7 +233,7 @@ class IPUsOut(object):
                 idx += 1
 
             # Finally, print audio duration
-            fp.write("%.4f\n" % ipusaudio.get_channel().get_duration())
+            fp.write("%.4f\n" % ipusaudio.get_duration())
 
     # ------------------------------------------------------------------
 
@@ -278,7 +279,7 @@ class IPUsOut(object):
         names = ipustrs.get_names()
 
         # Convert the tracks: from frames to times
-        tracks_times = frames2times(self.tracks, ipusaudio.get_channel().get_framerate())
+        tracks_times = frames2times(self.tracks, ipusaudio.get_framerate())
 
         # Write text tracks
         for i, track in enumerate(tracks_times):
@@ -340,6 +341,50 @@ class IPUsOut(object):
             except Exception as e:
                 raise Exception("Can't write track: %s. Error is %s" % (track_wavname, e))
 
+    # ------------------------------------------------------------------
+
+    def write_stream_track(self, ipusaudio, output, idx, track, unit,
+                           extension_trs, extension_audio):
+        """ Write a track of the stream of an IPUsAudio in an output directory.
+
+        The audio frames are copied block by block from the audio file,
+        so that a track can be written as soon as it is found.
+
+        :param ipusaudio: (IPUsAudio)
+        :param output: (str) Directory name
+        :param idx: (int) Index of the track
+        :param track: (tuple) from_pos, to_pos
+        :param unit: (str) Content of the track
+        :param extension_trs: (str) Extension of the file name for track units (or None)
+        :param extension_audio: (str) Extension of the file name for audio tracks (or None)
+
+        """
+        if not os.path.exists(output):
+            os.mkdir(output)
+
+        stream = ipusaudio.get_stream()
+        if stream is None:
+            return
+        track_basename = os.path.join(output, "track_%.06d" % (idx+1))
+
+        if extension_trs is not None:
+            track_txtname = track_basename+"."+extension_trs
+            if extension_trs.lower() == "txt":
+                IPUsOut.__write_txt_track(track_txtname, unit)
+            else:
+                d = float(track[1] - track[0]) / float(stream.get_framerate())
+                IPUsOut.__write_trs_track(track_txtname, unit, d)
+
+        if extension_audio is not None:
+            track_wavname = track_basename+"."+extension_audio
+            audio_out = sppasAudioPCM()
+            audio_out.append_channel(sppasChannel(stream.get_framerate(), stream.get_sampwidth()))
+            try:
+                sppas.src.audiodata.aio.save_blocks(track_wavname, audio_out,
+                                                    ipusaudio.get_stream_data(track))
+            except Exception as e:
+                raise Exception("Can't write track: %s. Error is %s" % (track_wavname, e))
+
     # ------------------------------------------------------------------
     # Private
     # ------------------------------------------------------------------
@@ -81,6 +81,7 @@ class sppasIPUseg(sppasBaseAnnotation):
         self._options['dirtracks'] = False
         self._options['save_as_trs'] = False
         self._options['addipuidx'] = False
+        self._options['stream'] = False
 
     # ------------------------------------------------------------------
 
@@ -88,6 +89,7 @@ class sppasIPUseg(sppasBaseAnnotation):
         """ Set default values. """
 
         self.ipusaudio.set_channel(None)
+        self.ipusaudio.set_stream(None)
         self.ipustrs.set_transcription(None)
 
     # ------------------------------------------------------------------------
@@ -105,6 +107,7 @@ class sppasIPUseg(sppasBaseAnnotation):
             - tracks
             - save_as_trs
             - add_ipu_idx
+            - stream
 
         :param options: (sppasOption)
 
@@ -140,6 +143,9 @@ class sppasIPUseg(sppasBaseAnnotation):
             elif "add_ipu_idx" == key:
                 self.set_addipuidx(opt.get_value())
 
+            elif "stream" == key:
+                self.set_stream(opt.get_value())
+
             else:
                 raise AnnotationOptionError(key)
 
@@ -173,6 +179,22 @@ class sppasIPUseg(sppasBaseAnnotation):
         """
         self._options['addipuidx'] = bool(value)
 
+    # ------------------------------------------------------------------------
+
+    def set_stream(self, value):
+        """ Fix the "stream" option.
+
+        If True, the audio file is not loaded in memory: the IPUs are
+        searched while reading the audio file, and each track is written
+        as soon as it is found. It is used only if the IPUs are found
+        automatically, i.e. without transcription nor expected number
+        of IPUs.
+
+        :param value: (bool)
+
+        """
+        self._options['stream'] = bool(value)
+
     # -----------------------------------------------------------------------
     # -----------------------------------------------------------------------
 
@@ -277,6 +299,9 @@ class sppasIPUseg(sppasBaseAnnotation):
         self.print_options()
         self.print_diagnosis(audiofile)
 
+        if self._options['stream'] is True and trsinputfile is None and not ntracks:
+            return self.run_stream(audiofile, diroutput, tracksext, trsoutput)
+
         # Get the inputs.
         # ---------------
 
@@ -375,3 +400,83 @@ class sppasIPUseg(sppasBaseAnnotation):
             if self._options['save_as_trs'] is True and tracksext is None:
                 tracksext = "TextGrid"
             ipusout.write_tracks(self.ipustrs, self.ipusaudio, diroutput, tracksext, "wav")
+
+    # ------------------------------------------------------------------
+
+    def run_stream(self, audiofile, diroutput=None, tracksext=None, trsoutput=None):
+        """ Perform an IPU segmentation from an audio file, in streaming mode.
+
+        The audio file is read by blocks and the tracks are written as soon
+        as they are found, so that the memory does not depend on the
+        duration of the audio file.
+
+        :param audiofile: (str) the speech audio input file name
+        :param diroutput: (str) a directory name to save output IPUs (one per unit)
+        :param tracksext: (str) the file extension for IPUs (used with the diroutput option)
+        :param trsoutput: (str) a file name to save the IPUs segmentation result.
+
+        """
+        audiospeech = sppas.src.audiodata.aio.open(audiofile)
+        try:
+            self.ipusaudio.set_channel(None)
+            self.ipusaudio.set_stream(audiospeech)
+            if self.ipusaudio.get_duration() <= self.ipusaudio.min_channel_duration():
+                raise Exception("Audio file is too short.\n")
+
+            # Transcription with the audio file as Media
+            trs = Transcription()
+            extm = os.path.splitext(audiofile)[1].lower()[1:]
+            media = Media(gen_id(), os.path.abspath(audiofile), "audio/"+extm)
+            trs.AddMedia(media)
+            self.ipustrs.set_transcription(trs)
+
+            # Where to write the tracks
+            if diroutput is None and self._options['dirtracks'] is True:
+                diroutput = os.path.splitext(audiofile)[0] + "-ipus"
+            if diroutput is not None and os.path.exists(diroutput) is False:
+                os.mkdir(diroutput)
+            if self._options['save_as_trs'] is True and tracksext is None:
+                tracksext = "TextGrid"
+
+            # Find the tracks and write them as soon as they are found
+            ipusout = IPUsOut(None)
+            trackslist = list()
+            for track in self.ipusaudio.stream_tracks():
+                if diroutput is not None:
+                    ipusout.write_stream_track(self.ipusaudio, diroutput, len(trackslist), track,
+                                               "ipu_%d" % (len(trackslist)+1), tracksext, "wav")
+                trackslist.append(track)
+
+            # No tracks? Find them without shifting boundaries.
+            if len(trackslist) == 0:
+                for track in self.ipusaudio.stream_tracks(shift_start=0., shift_end=0.):
+                    if diroutput is not None:
+                        ipusout.write_stream_track(self.ipusaudio, diroutput, len(trackslist), track,
+                                                   "ipu_%d" % (len(trackslist)+1), tracksext, "wav")
+                    trackslist.append(track)
+
+            self.print_message("Information: ", indent=2)
+            m1 = "Threshold volume value:     {:d}".format(self.ipusaudio.get_vol_threshold())
+            m2 = "Threshold silence duration: {:.3f}".format(self.ipusaudio.get_min_sil_dur())
+            m3 = "Threshold speech duration:  {:.3f}".format(self.ipusaudio.get_min_ipu_dur())
+            m4 = "Number of IPUs:             {:d}".format(len(trackslist))
+            for m in [m1, m2, m3, m4]:
+                self.print_message(m, indent=3)
+
+            # Save output(s).
+            ipusout.set_tracks(trackslist)
+            trs = ipusout.tracks2transcription(self.ipustrs, self.ipusaudio, self._options['addipuidx'])
+            self.ipustrs.set_transcription(trs)
+            self.ipustrs.extract_units()
+            if trsoutput is not None:
+                try:
+                    sppas.src.annotationdata.aio.write(trsoutput, trs)
+                except Exception as e:
+                    raise Exception('Error while saving the transcription output.\n'+str(e)+'\n')
+
+            if diroutput is not None:
+                ipusout.write_list(os.path.join(diroutput, "index.txt"), self.ipustrs, self.ipusaudio)
+
+        finally:
+            self.ipusaudio.set_stream(None)
+            audiospeech.close()
@@ -55,9 +55,9 @@
 
 """
 import math
+from operator import truediv
 
 from .st_cib import Targets
-from .momelutil import quicksortcib
 
 # ----------------------------------------------------------------------------
 
@@ -72,6 +72,10 @@ class Momel(object):
     :summary:      Implements Momel.
 
     """
+    # Pitch values are multiplied by this scale to be turned into exact
+    # integers in the moments of the regressions.
+    Y_SCALE = 2 ** 40
+
     def __init__(self):
         """ Create a new Momel instance. """
 
@@ -232,23 +236,29 @@ class Momel(object):
         """
         Find momel target points.
 
+        The values of each analysis window are selected by successive
+        weighted quadratic regressions. They are estimated from the moments
+        of the pitch values: the moments of the window are obtained from
+        cumulative sums, then the values rejected by a regression are
+        removed. The moments are exact integers: pitch values are turned
+        into fixed-point numbers (see Y_SCALE). The target is estimated by
+        calcrgp() on the selected values.
+
         """
         if len(self.hzptr) == 0:
             raise IOError('Empty pitch array')
         if self.hzsup < self.hzinf:
             raise ValueError('F0 ceiling > F0 threshold')
 
-        pond = []
-        pondloc = []  # local copy of pond
-        hzes = []
-        for ix in range(self.nval):
-            hzes.append(0.)
-            if self.hzptr[ix] > self.SEUILV:
-                pond.append(1.0)
-                pondloc.append(1.0)
-            else:
-                pond.append(0.0)
-                pondloc.append(0.0)
+        hzptr = self.hzptr
+        maxec = self.maxec
+        prefix = self.__cumulated_moments()
+        voiced = [h > self.SEUILV for h in hzptr]
+        pond = [1.0 if v is True else 0.0 for v in voiced]
+        pondloc = list(pond)
+        yint = [int(round(h * Momel.Y_SCALE)) for h in hzptr]
+        indexes = list(range(self.lfen1 + 1))
+        positions = [float(u) for u in indexes]
 
         # Examinate each pitch value
         for ix in range(self.nval):
@@ -262,33 +272,46 @@ class Momel(object):
             if fpx > self.nval:
                 fpx = self.nval
 
-            # copy original pond values for the current interval
-            for i in range(dpx, fpx):
-                pondloc[i] = pond[i]
+            # moments of the voiced values of the interval, with x=0 at dpx
+            moments = Momel.__window_moments(prefix, dpx, fpx)
+            values = hzptr[dpx:fpx]
+            active = voiced[dpx:fpx]
+            removed = list()
 
             nsup = 0
             nsupr = -1
             xc = yc = 0.0
-            ret_rgp = True
+            nused = -1
             while nsup > nsupr:
                 nsupr = nsup
-                nsup = 0
+                coefs = Momel.__regression(moments)
+                if coefs is None:
+                    nused = -1
+                    break
+                nused = len(removed)
+
+                # Estimate hzes and reject the values too far from it
+                a0, a1, a2 = coefs
+                rejected = [k for k, u, h in zip(indexes, positions, values)
+                            if h == 0. or (a0 + (a1 + a2 * u) * u) / h > maxec]
+                nsup = len(rejected)
+                for k in [k for k in rejected if active[k] is True]:
+                    active[k] = False
+                    removed.append(k)
+                    Momel.__remove_moments(moments, k, yint[dpx + k])
+
+            # Estimate a0, a1, a2 of the selected values with calcrgp(),
+            # so that the targets are exactly the same than before.
+            ret_rgp = False
+            if nused >= 0:
+                pondloc[dpx:fpx] = pond[dpx:fpx]
+                for k in removed[:nused]:
+                    pondloc[dpx + k] = 0.
                 try:
-                    # Estimate values of: a0, a1, a2
                     self.calcrgp(pondloc, dpx, fpx-1)
+                    ret_rgp = True
                 except Exception:
-                    # if calcrgp failed.
-                    # print "calcrgp failed: ",e
-                    ret_rgp = False
-                    break
-                else:
-                    # Estimate hzes
-                    for ix2 in range(dpx, fpx):
-                        hzes[ix2] = self.a0 + (self.a1 + self.a2 * float(ix2)) * float(ix2)
-                    for x in range(dpx, fpx):
-                        if self.hzptr[x] == 0. or (hzes[x] / self.hzptr[x]) > self.maxec:
-                            nsup += 1
-                            pondloc[x] = 0.
+                    pass
 
             # Now estimate xc and yc for the new 'cible'
             if ret_rgp is True and self.a2 != 0.:
@@ -324,6 +347,11 @@ class Momel(object):
         xds = yds = 0.
         np = 0
 
+        # x and y of the targets with a value more than SEUILV
+        xs = [c.get_x() for c in self.cib]
+        ys = [c.get_y() for c in self.cib]
+        valid = [y > self.SEUILV for y in ys]
+
         # xdist and ydist estimations
         for i in range(self.nval-1):
             # j1 and j2 estimations (interval min and max values)
@@ -334,26 +362,18 @@ class Momel(object):
             if i+lf < self.nval-1:
                 j2 = i + lf
 
-            # left (g means left)
-            sxg = syg = 0.
-            ng = 0
-            for j in range(j1, i+1):
-                if self.cib[j].get_y() > self.SEUILV:
-                    sxg = sxg + self.cib[j].get_x()
-                    syg = syg + self.cib[j].get_y()
-                    ng += 1
-
-            # right (d means right)
-            sxd = syd = 0.
-            nd = 0
-            for j in range(i+1, j2):
-                if self.cib[j].get_y() > self.SEUILV:
-                    sxd = sxd + self.cib[j].get_x()
-                    syd = syd + self.cib[j].get_y()
-                    nd += 1
+            # left (g means left) and right (d means right)
+            left = [j for j in range(j1, i+1) if valid[j]]
+            right = [j for j in range(i+1, j2) if valid[j]]
+            ng = len(left)
+            nd = len(right)
 
             # xdist[i] and ydist[i] evaluations
             if nd * ng > 0:
+                sxg = sum(xs[j] for j in left)
+                syg = sum(ys[j] for j in left)
+                sxd = sum(xs[j] for j in right)
+                syd = sum(ys[j] for j in right)
                 xdist[i] = math.fabs(sxg / ng - sxd / nd)
                 ydist[i] = math.fabs(syg / ng - syd / nd)
                 xds = xds + xdist[i]
@@ -492,8 +512,7 @@ class Momel(object):
             2eme filtrage des cibles trop proches en t [et Hz]
         """
         # classe ordre temporel croissant les cibred
-        c = quicksortcib(self.cibred)
-        self.cibred = c
+        self.cibred = sorted(self.cibred, key=lambda c: c.get_x())
 
         self.cibred2.append(self.cibred[0])
         pnred2 = 0
@@ -617,3 +636,106 @@ class Momel(object):
         self.borne()
 
         return self.cibred2
+
+    # ------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------
+
+    def __cumulated_moments(self):
+        """ Return the cumulative sums of the moments of the voiced values.
+
+        The i-th item is the list of the sums of x^k (k=0..4) and of
+        y*x^k (k=0..2) for x < i, with y in fixed-point.
+
+        """
+        prefix = [[0] * 8]
+        for x, h in enumerate(self.hzptr):
+            s = list(prefix[-1])
+            if h > self.SEUILV:
+                y = int(round(h * Momel.Y_SCALE))
+                x2 = x * x
+                s[0] += 1
+                s[1] += x
+                s[2] += x2
+                s[3] += x2 * x
+                s[4] += x2 * x2
+                s[5] += y
+                s[6] += y * x
+                s[7] += y * x2
+            prefix.append(s)
+
+        return prefix
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def __window_moments(prefix, dpx, fpx):
+        """ Return the moments of the values from dpx to fpx-1.
+
+        Moments are shifted so that x=0 at dpx.
+
+        """
+        s0, s1, s2, s3, s4, t0, t1, t2 = [e - b for b, e in zip(prefix[dpx], prefix[fpx])]
+        c = dpx
+        c2 = c * c
+        return [s0,
+                s1 - c * s0,
+                s2 - 2 * c * s1 + c2 * s0,
+                s3 - 3 * c * s2 + 3 * c2 * s1 - c2 * c * s0,
+                s4 - 4 * c * s3 + 6 * c2 * s2 - 4 * c2 * c * s1 + c2 * c2 * s0,
+                t0,
+                t1 - c * t0,
+                t2 - 2 * c * t1 + c2 * t0]
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def __remove_moments(moments, u, y):
+        """ Remove the value y at x=u from the moments. """
+
+        u2 = u * u
+        moments[0] -= 1
+        moments[1] -= u
+        moments[2] -= u2
+        moments[3] -= u2 * u
+        moments[4] -= u2 * u2
+        moments[5] -= y
+        moments[6] -= y * u
+        moments[7] -= y * u2
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def __regression(moments):
+        """ Return (a0, a1, a2) of the quadratic regression of the moments.
+
+        Like calcrgp(), but the coefficients are evaluated from exact
+        integers and rounded only once.
+
+        :returns: tuple of floats or None if the regression failed
+
+        """
+        pn, sx, sx2, sx3, sx4, sy, sxy, sx2y = moments
+        if pn < 3:
+            return None
+
+        # pn times spdx2, spdx3, spdx4, spdxy and spdx2y of calcrgp()
+        d2 = pn * sx2 - sx * sx
+        d3 = pn * sx3 - sx * sx2
+        d4 = pn * sx4 - sx2 * sx2
+        dy = pn * sxy - sx * sy
+        d2y = pn * sx2y - sx2 * sy
+
+        muet = d2 * d4 - d3 * d3
+        if d2 == 0 or muet == 0:
+            return None
+
+        n2 = d2y * d2 - dy * d3
+        n1 = dy * d4 - d3 * d2y
+        # the quotients of integers are correctly rounded to floats
+        d = muet * Momel.Y_SCALE
+        a2 = truediv(n2, d)
+        a1 = truediv(n1, d)
+        a0 = truediv(sy * muet - n1 * sx - n2 * sx2, d * pn)
+
+        return a0, a1, a2
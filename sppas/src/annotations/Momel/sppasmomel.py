@@ -34,12 +34,15 @@
 """
 
 import sys
+import os
 
 from sppas.src.annotationdata.transcription import Transcription
 from sppas.src.annotationdata.annotation import Annotation
 from sppas.src.annotationdata.ptime.point import TimePoint
 from sppas.src.annotationdata.label.label import Label
 import sppas.src.annotationdata.aio
+import sppas.src.audiodata.aio
+from sppas.src.audiodata.audiopitch import AudioPitch
 
 from ..baseannot import sppasBaseAnnotation
 from ..annotationsexc import AnnotationOptionError
@@ -147,6 +150,34 @@ class sppasMomel(sppasBaseAnnotation):
 
     # ------------------------------------------------------------------
 
+    def estimate_pitch(self, audio_filename, pitch=None):
+        """ Estimate pitch values from the first channel of an audio file.
+
+        Pitch values are estimated in the range of the hzinf and hzsup
+        options.
+
+        :param audio_filename: (str) Name of the audio file
+        :param pitch: (AudioPitch) The pitch estimator, or None to create it
+        :returns: A list of pitch values (one value each 10 ms).
+
+        """
+        audio = sppas.src.audiodata.aio.open(audio_filename)
+        try:
+            idx = audio.extract_channel(0)
+            channel = audio.get_channel(idx)
+        finally:
+            audio.close()
+
+        if pitch is None:
+            pitch = AudioPitch(self.PAS_TRAME/1000., self.momel.hzinf, self.momel.hzsup)
+        pitch_list = pitch.eval_pitch(channel)
+        if sum(1 for p in pitch_list if p > 0) == 0:
+            raise EmptyInputError(name="Pitch")
+
+        return pitch_list
+
+    # ------------------------------------------------------------------
+
     def __print_tgts(self, targets, output):
         for i in range(len(targets)):
             output.write(str("%g" % (targets[i].get_x() * self.PAS_TRAME)))
@@ -197,7 +228,7 @@ class sppasMomel(sppasBaseAnnotation):
 
     def run(self, input_filename, trsoutput=None, outputfile=None):
         """
-        Apply momel from a pitch file.
+        Apply momel from a pitch file, or from an audio file.
 
         """
         self.print_filename(input_filename)
@@ -205,7 +236,73 @@ class sppasMomel(sppasBaseAnnotation):
         self.print_diagnosis(input_filename)
 
         # Get pitch values from the input
-        pitch = self.set_pitch(input_filename)
+        ext = os.path.splitext(input_filename)[1].lower()
+        if ext in sppas.src.audiodata.aio.extensions:
+            pitch = self.estimate_pitch(input_filename)
+        else:
+            pitch = self.set_pitch(input_filename)
+
+        targets = self.estimate_targets(pitch)
+        self.__write_targets(targets, trsoutput, outputfile)
+
+    # ------------------------------------------------------------------
+
+    def run_files(self, input_filenames, output_format=".xra"):
+        """ Apply momel on a list of pitch files, or of audio files.
+
+        The options are fixed and printed once, and the same Momel engine
+        and pitch estimator are used for all the files. The targets of each
+        file are saved into a file with the same name followed by "-momel"
+        and the output format, and into a PitchTier file with the same name
+        followed by "-momel".
+
+        :param input_filenames: (list) Names of the pitch or audio files
+        :param output_format: (str) Extension of the annotated files
+        :returns: (list) Names of the annotated files, None for the files
+        which failed
+
+        """
+        self.print_options()
+
+        # the pitch estimator of the audio files, created when used
+        estimator = None
+
+        outputs = list()
+        for filename in input_filenames:
+            base = os.path.splitext(filename)[0]
+            trsoutput = base + "-momel" + output_format
+            self.print_filename(filename)
+            self.print_diagnosis(filename)
+            try:
+                ext = os.path.splitext(filename)[1].lower()
+                if ext in sppas.src.audiodata.aio.extensions:
+                    if estimator is None:
+                        estimator = AudioPitch(self.PAS_TRAME/1000., self.momel.hzinf, self.momel.hzsup)
+                    pitch = self.estimate_pitch(filename, estimator)
+                else:
+                    pitch = self.set_pitch(filename)
+
+                targets = self.estimate_targets(pitch)
+                self.__write_targets(targets, trsoutput, base + "-momel.PitchTier")
+                outputs.append(trsoutput)
+            except Exception as e:
+                if self.logfile is not None:
+                    self.logfile.print_message(trsoutput + ": %s" % str(e), indent=2, status=-1)
+                outputs.append(None)
+
+        return outputs
+
+    # ------------------------------------------------------------------
+
+    def estimate_targets(self, pitch):
+        """ Estimate the Momel targets of a list of pitch values.
+
+        Momel is applied on each estimated Inter-Pausal-Unit.
+
+        :param pitch: (list) Pitch values (one value each 10 ms)
+        :returns: list of targets, with x in number of pitch values
+
+        """
         # Selected values (Target points) for this set of pitch values
         targets = []
 
@@ -279,6 +376,13 @@ class sppasMomel(sppasBaseAnnotation):
                 iputargets[i].set_x(ipustarttime + x)
             targets = targets + iputargets
 
+        return targets
+
+    # ------------------------------------------------------------------
+
+    def __write_targets(self, targets, trsoutput=None, outputfile=None):
+        """ Save the targets into the output files, or print them. """
+
         # Print results and/or estimate INTSINT (if any)
         if trsoutput:
             trsm = Transcription("TrsMomel")
@@ -36,6 +36,9 @@
 
 """
 import re
+import heapq
+from itertools import islice
+from itertools import product
 
 from sppas import PHONEMES_SEPARATOR
 from sppas import VARIANTS_SEPARATOR
@@ -146,6 +149,54 @@ class sppasDAGPhonetizer(object):
 
     # -----------------------------------------------------------------------
 
+    def iter_variants(self, pron):
+        """ Generate the pronunciation variants of a phonetization.
+
+        Variants are generated lazily, in order of number of phones: the
+        graph of the segments is never fully developed, so that only the
+        first variants are evaluated. Equal-length variants are generated
+        in the order of the paths of the DAG.
+
+        :param pron: (str) Phonetization, segments are separated by spaces
+        and variants of a segment by VARIANTS_SEPARATOR.
+        :returns: yield tuples (variant, number of phones)
+
+        """
+        segments = [s.split(VARIANTS_SEPARATOR) for s in pron.split()]
+        if len(segments) == 0:
+            yield "", 1
+            return
+        nb_phones = [[len(v.split(PHONEMES_SEPARATOR)) for v in s]
+                     for s in segments]
+
+        # The variants of each segment, the shortest ones first
+        ranks = [sorted(range(len(s)), key=lambda i: n[i])
+                 for s, n in zip(segments, nb_phones)]
+
+        # Best-first search: each candidate is a rank in each segment, plus
+        # the first segment its successors are allowed to change, so that
+        # each path is pushed only once.
+        first = tuple(r[0] for r in ranks)
+        heap = [(sum(n[i] for n, i in zip(nb_phones, first)),
+                 first, (0,)*len(segments), 0)]
+        found = set()
+        while len(heap) > 0:
+            cost, path, rank, pos = heapq.heappop(heap)
+            phon = PHONEMES_SEPARATOR.join(s[i] for s, i in zip(segments, path))
+            if phon not in found:
+                found.add(phon)
+                yield phon, cost
+
+            for k in range(pos, len(segments)):
+                if rank[k] + 1 < len(segments[k]):
+                    new_rank = rank[:k] + (rank[k]+1,) + rank[k+1:]
+                    i = ranks[k][new_rank[k]]
+                    new_path = path[:k] + (i,) + path[k+1:]
+                    new_cost = cost - nb_phones[k][path[k]] + nb_phones[k][i]
+                    heapq.heappush(heap, (new_cost, new_path, new_rank, k))
+
+    # -----------------------------------------------------------------------
+
     def decompose(self, pron1, pron2=""):
         """ Create a decomposed phonetization from a string as follow:
 
@@ -153,43 +204,38 @@ class sppasDAGPhonetizer(object):
             >>> p1-p2-p3|p1-p2-x3|p1-x2-p3|p1-x2-x3
 
         The input string is converted into a DAG, then output corresponds
-        to all paths.
+        to all paths, or to the shortest ones if the number of variants
+        is fixed.
 
         """
         if len(pron1) == 0 and len(pron2) == 0:
             return ""
 
-        # Complex phonetization: converted into a DAG
-        (graph1, prongraph1) = self.phon2DAG(pron1)
-        (graph2, prongraph2) = DAG(), list()
-        if len(pron2) > 0:
-            (graph2, prongraph2) = self.phon2DAG(pron2)
-
-        # Create all pronunciations from the DAG
-        pron1 = self.DAG2phon(graph1, prongraph1)
-        if len(pron2) > 0:
-            pron2 = self.DAG2phon(graph2, prongraph2)
-        else:
-            pron2 = dict()
-
-        # Merge =======>
-        # TODO: MERGE DAGs instead of merging prons
-        pron = dict()
-        pron.update(pron1)
-        pron.update(pron2)
-
-        # Output selection
-
         v = VARIANTS_SEPARATOR
 
         # Return all variants
         if self.variants == 0:
-            return v.join(pron.keys())
-
-        # Choose the shorter variants
-        if self.variants == 1:
-            return min(pron.items(), key=lambda x: x[1])[0]
+            pron = list()
+            found = set()
+            for p in (pron1, pron2):
+                if p is pron2 and len(pron2) == 0:
+                    continue
+                segments = [s.split(v) for s in p.split()]
+                for path in product(*segments):
+                    phon = PHONEMES_SEPARATOR.join(path)
+                    if phon not in found:
+                        found.add(phon)
+                        pron.append(phon)
+            return v.join(pron)
+
+        # Other number of variants: choose shorters.
+        # The variants of pron1 come first, then the ones of pron2 if
+        # they're not already known.
+        pron = list(islice(self.iter_variants(pron1), self.variants))
+        if len(pron2) > 0:
+            found = set(p for p, n in pron)
+            pron2 = (x for x in self.iter_variants(pron2) if x[0] not in found)
+            pron.extend(islice(pron2, self.variants))
 
-        # Other number of variants: choose shorters
-        l = sorted(pron.items(), key=lambda x: x[1])[:self.variants]
-        return v.join(list(zip(*l))[0])
+        l = sorted(pron, key=lambda x: x[1])[:self.variants]
+        return v.join(p for p, n in l)
@@ -38,6 +38,8 @@
 import re
 
 from sppas.src.utils.makeunicode import sppasUnicode
+from sppas.src.resources.trie import sppasTrie
+from sppas.src.resources.dictpron import sppasDictPron
 from .dagphon import sppasDAGPhonetizer
 
 # ---------------------------------------------------------------------------
@@ -80,6 +82,11 @@ class sppasPhonUnk(object):
         self.prondict = pron_dict
         self.dagphon = sppasDAGPhonetizer(variants=4)
 
+        # Tries of the entries of the dictionary, to find the longest
+        # prefix and the longest suffix of a string. Created when used.
+        self._prefixes = None
+        self._suffixes = None
+
     # ------------------------------------------------------------------
     # Getters and Setters
     # ------------------------------------------------------------------
@@ -153,19 +160,30 @@ class sppasPhonUnk(object):
     # Private
     # -----------------------------------------------------------------------
 
+    def __get_tries(self):
+        """ Return the tries of prefixes and suffixes of the dictionary. """
+
+        if self._prefixes is None:
+            if isinstance(self.prondict, sppasDictPron):
+                self._prefixes = self.prondict.get_trie()
+                self._suffixes = self.prondict.get_trie(reverse=True)
+            else:
+                entries = list(self.prondict)
+                self._prefixes = sppasTrie(entries)
+                self._suffixes = sppasTrie(entries, reverse=True)
+
+        return self._prefixes, self._suffixes
+
+    # -----------------------------------------------------------------------
+
     def __longestlr(self, entry):
-        """ Select the longest phonetization of an entry, from the end. """
+        """ Select the longest phonetization of an entry, from the start.
 
-        i = len(entry)
-        while i > 0:
-            # Find in the dictionary a substring from 0 to i
-            if entry[:i] in self.prondict:
-                # Return index for the longest string
-                return i
-            i -= 1
+        :returns: (int) index of the end of the longest string, or 0.
 
-        # Did not find any pronunciation for this entry!
-        return 0
+        """
+        prefixes, suffixes = self.__get_tries()
+        return prefixes.longest(entry)
 
     # -----------------------------------------------------------------------
 
@@ -199,15 +217,12 @@ class sppasPhonUnk(object):
 
         # RIGHT:
         # ###########
+        # Use recursivity to phonetize: if the right part of the entry
+        # is in the dictionary, it is its longest string.
         right = entry[left_index:len(entry)]
         if len(right) == 0:
             return _phonleft
-        if right in self.prondict:
-            _phonright = self.prondict.get(right)
-        else:
-            # If right part of the entry is unknown...
-            # Use recursivity to phonetize
-            _phonright = self.__recurslr(right)
+        _phonright = self.__recurslr(right)
 
         if len(_phonleft) > 0 and len(_phonright) > 0:
             return _phonleft + " " + _phonright
@@ -217,18 +232,14 @@ class sppasPhonUnk(object):
     # -----------------------------------------------------------------------
 
     def __longestrl(self, entry):
-        """ Select the longest phonetization of an entry, from the start. """
+        """ Select the longest phonetization of an entry, from the end.
 
-        i = 0
-        while i < len(entry):
-            # Find in the dictionary a substring from i to the entry-length
-            if entry[i:] in self.prondict:
-                # Return index for the longest string
-                return i
-            i += 1
+        :returns: (int) index of the start of the longest string, or the
+        length of the entry.
 
-        # Did not find any pronunciation for this entry!
-        return len(entry)
+        """
+        prefixes, suffixes = self.__get_tries()
+        return len(entry) - suffixes.longest(entry)
 
     # -----------------------------------------------------------------------
 
@@ -261,15 +272,12 @@ class sppasPhonUnk(object):
 
         # LEFT:
         # ###########
+        # Use recursivity to phonetize: if the left part of the entry
+        # is in the dictionary, it is its longest string.
         left = enrty[0:right_index]
         if len(left) == 0:
             return _phonright
-        if left in self.prondict:
-            _phonleft = self.prondict.get(left)
-        else:
-            # If left part of the entry is unknown...
-            # Use recursivity to phonetize
-            _phonleft = self.__recursrl(left)
+        _phonleft = self.__recursrl(left)
 
         if len(_phonleft) > 0 and len(_phonright) > 0:
             return _phonleft + " " + _phonright
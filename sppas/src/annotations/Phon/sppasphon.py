@@ -46,8 +46,9 @@ from sppas.src.anndata import sppasLabel
 from sppas.src.anndata import sppasTag
 from sppas.src.resources.dictpron import sppasDictPron
 from sppas.src.resources.mapping import sppasMapping
+from sppas.src.structs.lrucache import sppasLRUCache
 
-from .. import ERROR_ID, WARNING_ID
+from .. import ERROR_ID, WARNING_ID, INFO_ID
 from .. import t
 from ..annotationsexc import AnnotationOptionError
 from ..annotationsexc import EmptyInputError
@@ -67,6 +68,9 @@ MSG_TRACK = (t.gettext(":INFO 1220: "))
 SIL = list(PHONE_SYMBOLS.keys())[list(PHONE_SYMBOLS.values()).index("silence")]
 SIL_ORTHO = list(ORTHO_SYMBOLS.keys())[list(ORTHO_SYMBOLS.values()).index("silence")]
 
+# Maximum number of tokens of the memo of the phonetizations
+MEMO_SIZE = 50000
+
 # ---------------------------------------------------------------------------
 
 
@@ -98,6 +102,10 @@ class sppasPhon(sppasBaseAnnotation):
         if map_filename is not None:
             self.maptable = sppasMapping(map_filename)
 
+        # Memo of the phonetization of the tokens, shared by all the files
+        # annotated by this instance.
+        self._memo = sppasLRUCache(MEMO_SIZE)
+
         self.phonetizer = None
         self.set_dict(dict_filename)
 
@@ -171,6 +179,21 @@ class sppasPhon(sppasBaseAnnotation):
         """
         pdict = sppasDictPron(dict_filename, nodump=False)
         self.phonetizer = sppasDictPhonetizer(pdict, self.maptable)
+        self._memo.clear()
+
+    # -----------------------------------------------------------------------
+
+    def get_memo(self):
+        """ Return the memo of the phonetization of the tokens.
+
+        The phonetization of a token is evaluated only the first time it
+        is phonetized with a given unk option, then it's taken from the memo.
+        The memo also gives the number of hits and misses.
+
+        :returns: (sppasLRUCache)
+
+        """
+        return self._memo
 
     # -----------------------------------------------------------------------
 
@@ -186,8 +209,16 @@ class sppasPhon(sppasBaseAnnotation):
         :returns: phonetization of the given entry
 
         """
-        tab = self.phonetizer.get_phon_tokens(entry.split(),
-                                              phonunk=self._options['phonunk'])
+        phonunk = self._options['phonunk']
+        tab = list()
+        for token in entry.split():
+            key = (token, phonunk)
+            phons = self._memo.get(key)
+            if phons is None:
+                phons = tuple(self.phonetizer.get_phon_tokens([token], phonunk=phonunk))
+                self._memo.add(key, phons)
+            tab.extend(phons)
+
         tab_phones = list()
         for tex, p, s in tab:
             message = None
@@ -256,11 +287,13 @@ class sppasPhon(sppasBaseAnnotation):
 
     # ------------------------------------------------------------------------
 
-    def run(self, input_filename, output_filename=None):
+    def run(self, input_filename, output_filename=None, trs_input=None):
         """ Run the Phonetization process on an input file.
 
         :param input_filename (str) Name of the file including a tokenization
         :param output_filename (str) Name of the resulting file with phonetization
+        :param trs_input: (sppasTranscription) Content of the input file, if
+        it was already read: the file is not read again.
         :returns: (sppasTranscription)
 
         """
@@ -272,8 +305,9 @@ class sppasPhon(sppasBaseAnnotation):
         pattern = ""
         if self._options['usestdtokens'] is True:
             pattern = "std"
-        parser = sppasRW(input_filename)
-        trs_input = parser.read()
+        if trs_input is None:
+            parser = sppasRW(input_filename)
+            trs_input = parser.read()
         tier_input = sppasFindTier.tokenization(trs_input, pattern)
 
         # Phonetize the tier
@@ -296,4 +330,10 @@ class sppasPhon(sppasBaseAnnotation):
             else:
                 raise EmptyOutputError
 
+        self.print_message("Memo of the phonetizations: {:d} hits, {:d} misses, "
+                           "{:d} tokens.".format(self._memo.get_hits(),
+                                                 self._memo.get_misses(),
+                                                 len(self._memo)),
+                           indent=2, status=INFO_ID)
+
         return trs_output
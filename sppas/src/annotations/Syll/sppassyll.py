@@ -268,11 +268,14 @@ class sppasSyll(sppasBaseAnnotation):
 
     # ----------------------------------------------------------------------
 
-    def run(self, input_filename, output_filename=None):
+    def run(self, input_filename, output_filename=None, trs_input=None):
         """ Perform the Syllabification process.
 
         :param input_filename: (str) Name of the input file with the aligned phonemes
         :param output_filename: (str) Name of the resulting file with syllabification
+        :param trs_input: (sppasTranscription) Content of the input file, if
+        it was already read: the file is not read again.
+        :returns: (sppasTranscription)
 
         """
         self.print_filename(input_filename)
@@ -280,8 +283,9 @@ class sppasSyll(sppasBaseAnnotation):
         self.print_diagnosis(input_filename)
 
         # Get the tier to syllabify
-        parser = sppasRW(input_filename)
-        trs_input = parser.read()
+        if trs_input is None:
+            parser = sppasRW(input_filename)
+            trs_input = parser.read()
         tier_input = sppasFindTier.aligned_phones(trs_input)
 
         # Create the transcription result
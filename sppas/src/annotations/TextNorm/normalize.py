@@ -57,10 +57,20 @@ class DictReplUTF8(sppasDictRepl):
 
     TODO: This class should read an external replacement file...
 
+    The regular expression of a set of replacements is compiled only once,
+    and shared by all the instances with the same replacements.
+
     """
+    # Key: the sorted replacements, value: their automaton and values
+    _automata = dict()
+
     def __init__(self):
         sppasDictRepl.__init__(self, None, nodump=True)
 
+        # all keys are searched at once with a regular expression
+        self._automaton = None
+        self._values = dict()
+
         self.add(u("æ"), u("ae"))
         self.add(u("œ"), u("oe"))
         self.add(u("，"), u(", "))
@@ -73,6 +83,54 @@ class DictReplUTF8(sppasDictRepl):
         self.add(u("»"), u('"'))
         self.add(u("’"), u("'"))
 
+    # -----------------------------------------------------------------------
+
+    def add(self, token, repl):
+        """ Add a new key,value into the dict.
+
+        :param token: (str) string of the token to add
+        :param repl: (str) the replacement token
+
+        """
+        sppasDictRepl.add(self, token, repl)
+        self._automaton = None
+
+    # -----------------------------------------------------------------------
+
+    def remove(self, entry):
+        """ Remove an entry, as key or value.
+
+        :param entry: (str) unicode string of the entry to remove
+
+        """
+        sppasDictRepl.remove(self, entry)
+        self._automaton = None
+
+    # -----------------------------------------------------------------------
+
+    def replace_all(self, entry):
+        """ Replace all the keys found in a string by their value.
+
+        The keys are compiled into a single regular expression, the longest
+        ones first, so that the string is examined only once.
+
+        :param entry: (str) The string in which keys are replaced
+        :returns: (str)
+
+        """
+        if len(self) == 0:
+            return entry
+
+        if self._automaton is None:
+            replacements = tuple(sorted((k, self.replace(k)) for k in self))
+            if replacements not in DictReplUTF8._automata:
+                keys = sorted(self, key=len, reverse=True)
+                automaton = re.compile(u("|").join(re.escape(k) for k in keys))
+                DictReplUTF8._automata[replacements] = (automaton, dict(replacements))
+            self._automaton, self._values = DictReplUTF8._automata[replacements]
+
+        return self._automaton.sub(lambda m: self._values[m.group(0)], entry)
+
 # ---------------------------------------------------------------------------
 
 
@@ -105,6 +163,14 @@ class TextNormalizer(object):
         self.lang = lang
         self.delimiter = ' '
 
+        # the segmenter of the vocab, created when used
+        self._segmenter = None
+
+        # workers, shared by all the utterances
+        self._ortho = sppasOrthoTranscription()
+        self._splitter = None
+        self._num2letter = None
+
     # ------------------------------------------------------------------
 
     def get_vocab_filename(self):
@@ -205,7 +271,9 @@ class TextNormalizer(object):
         :returns: (list)
 
         """
-        tok = sppasTokenSegmenter(self.vocab)
+        if self._segmenter is None or self._segmenter.get_vocab() is not self.vocab:
+            self._segmenter = sppasTokenSegmenter(self.vocab)
+        tok = self._segmenter
 
         # rules for - ' .
         unbind_result = tok.unbind(utt)
@@ -232,7 +300,9 @@ class TextNormalizer(object):
         :returns: (list)
 
         """
-        num2letter = sppasNum(self.lang)
+        if self._num2letter is None or self._num2letter[0] != self.lang:
+            self._num2letter = (self.lang, sppasNum(self.lang))
+        num2letter = self._num2letter[1]
 
         _result = list()
         for token in utt:
@@ -302,34 +372,94 @@ class TextNormalizer(object):
         An empty actions list or a list containing only "std" means to
         enable all actions.
 
+        """
+        return self.normalize_batch([entry], actions)[0]
+
+    # -----------------------------------------------------------------------
+
+    def normalize_batch(self, entries, actions=[]):
+        """ Tokenize a list of utterances, like the IPUs of a tier.
+
+        The workers are created and the actions are fixed only once, then
+        all the utterances are normalized.
+
+        :param entries: (list of str) the strings to normalize
+        :param actions: (list) the modules/options to enable. See normalize().
+        :returns: (list) the list of normalized tokens of each entry
+
+        """
+        if len(actions) == 0 or (len(actions) == 1 and "std" in actions):
+            actions = actions + ["replace", "tokenize", "numbers", "lower", "punct"]
+
+        if self._splitter is None or self._splitter[0] != self.lang or \
+                self._splitter[1] is not self.repl:
+            self._splitter = (self.lang, self.repl,
+                              sppasSimpleSplitter(self.lang, self.repl))
+        splitter = self._splitter[2]
+
+        return [self.__normalize(entry, actions, splitter) for entry in entries]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def variants(utt):
+        """ Convert strings that are variants in the utterance.
+
+        :param utt: (list)
+
+        """
+        c = " ".join(utt)
+        c = c.replace('{ ', '{')
+        c = c.replace(' }', '}')
+        c = c.replace(' | ', '|')
+
+        inside = False
+        cc = u("")
+        for i, character in enumerate(c):
+            if character == "{":
+                inside = True
+            elif character == "}":
+                inside = False
+
+            if inside is True:
+                if character == " ":
+                    cc += u("_")
+                else:
+                    cc += character
+            else:
+                cc += character
+        return cc.split()
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __normalize(self, entry, actions, splitter):
+        """ Tokenize an utterance with the given workers.
+
+        :param entry: (str) the string to normalize
+        :param actions: (list) the modules/options to enable.
+        :param splitter: (sppasSimpleSplitter)
+        :returns: (str) the list of normalized tokens
+
         """
         _str = sppasUnicode(entry).to_strip()
 
         # Remove UTF-8 specific characters that are not in our dictionaries!
-        for key in self.dicoutf:
-            _str = _str.replace(key, self.dicoutf.replace(key))
+        _str = self.dicoutf.replace_all(_str)
 
         # Clean the Enriched Orthographic Transcription
-        ortho = sppasOrthoTranscription()
-        _str = ortho.clean_toe(_str)
+        _str = self._ortho.clean_toe(_str)
         if "std" in actions:
-            _str = ortho.toe_spelling(_str, True)
+            _str = self._ortho.toe_spelling(_str, True)
         else:
-            _str = ortho.toe_spelling(_str, False)
+            _str = self._ortho.toe_spelling(_str, False)
 
         # Split using whitespace or characters.
-        splitter = sppasSimpleSplitter(self.lang, self.repl)
         utt = splitter.split(_str)
 
         # The entry is now a list of strings on which we'll perform actions
         # -----------------------------------------------------------------
-        if len(actions) == 0 or (len(actions) == 1 and "std" in actions):
-            actions.append("replace")
-            actions.append("tokenize")
-            actions.append("numbers")
-            actions.append("lower")
-            actions.append("punct")
-
         if "replace" in actions:
             utt = self.replace(utt)
 
@@ -358,34 +488,3 @@ class TextNormalizer(object):
         # if len(result) == 0:
         #     return ""  # Nothing valid!
         # return result.replace(" ", self.delimiter)
-
-    # -----------------------------------------------------------------------
-
-    @staticmethod
-    def variants(utt):
-        """ Convert strings that are variants in the utterance.
-
-        :param utt: (list)
-
-        """
-        c = " ".join(utt)
-        c = c.replace('{ ', '{')
-        c = c.replace(' }', '}')
-        c = c.replace(' | ', '|')
-
-        inside = False
-        cc = u("")
-        for i, character in enumerate(c):
-            if character == "{":
-                inside = True
-            elif character == "}":
-                inside = False
-
-            if inside is True:
-                if character == " ":
-                    cc += u("_")
-                else:
-                    cc += character
-            else:
-                cc += character
-        return cc.split()
@@ -44,6 +44,15 @@ from .language import sppasLangISO
 
 # ---------------------------------------------------------------------------
 
+# The patterns to split the tokens, compiled only once
+RE_NUM_ALPHA = re.compile(u('([0-9])([a-zA-Z])'))
+RE_ALPHA_NUM = re.compile(u('([a-zA-Z])([0-9])'))
+RE_BRACKETS = re.compile(u('\\[\\]'))
+RE_DOT_WORD = re.compile(u(' \.([\w-])'))
+RE_START_DOT_WORD = re.compile(u('^\.([\w-])'))
+
+# ---------------------------------------------------------------------------
+
 
 class sppasSimpleSplitter(object):
     """
@@ -75,6 +84,14 @@ class sppasSimpleSplitter(object):
         else:
             self.__repl = sppasDictRepl(None)
 
+        # All the replacement characters are searched at once, the longest
+        # ones first, at the end of the tokens.
+        self.__repl_end = None
+        if len(self.__repl) > 0:
+            keys = sorted(self.__repl, key=len, reverse=True)
+            self.__repl_end = re.compile(
+                u("(") + u("|").join(re.escape(k) for k in keys) + u(")$"))
+
     # ------------------------------------------------------------------
 
     def split_characters(self, utt):
@@ -112,7 +129,8 @@ class sppasSimpleSplitter(object):
 
         """
         s = utt
-        if sppasLangISO.without_whitespace(self.__lang) is True:
+        without_whitespace = sppasLangISO.without_whitespace(self.__lang)
+        if without_whitespace is True:
             s = self.split_characters(s)
 
         toks = list()
@@ -121,26 +139,24 @@ class sppasSimpleSplitter(object):
             # if not a phonetized entry
             if t.startswith("/") is False and t.endswith("/") is False:
 
-                if sppasLangISO.without_whitespace(self.__lang) is False:
+                if without_whitespace is False:
                     # Split numbers if stick to characters
                     # attention: do not replace [a-zA-Z] by [\w] (because \w includes numbers)
                     # and not on Asian languages: it can be a tone!
-                    t = re.sub(u('([0-9])([a-zA-Z])'), u(r'\1 \2'), t)
-                    t = re.sub(u('([a-zA-Z])([0-9])'), u(r'\1 \2'), t)
+                    t = RE_NUM_ALPHA.sub(u(r'\1 \2'), t)
+                    t = RE_ALPHA_NUM.sub(u(r'\1 \2'), t)
 
                 # Split some punctuation
-                t = re.sub(u('\\[\\]'), u(r'\\] \\['), t)
+                t = RE_BRACKETS.sub(u(r'\\] \\['), t)
 
                 # Split dots if stick to the beginning of a word
                 # info: a dot at the end of a word is analyzed by the tokenizer
-                t = re.sub(u(' \.([\w-])'), u(r' . \1'), t)
-                t = re.sub(u('^\.([\w-])'), u(r' . \1'), t)
+                t = RE_DOT_WORD.sub(u(r' . \1'), t)
+                t = RE_START_DOT_WORD.sub(u(r' . \1'), t)
 
                 # Split replacement characters
-                for r in self.__repl:
-                    if t.endswith(r):
-                        t = t[:-len(r)]
-                        t = t + ' ' + r
+                if self.__repl_end is not None:
+                    t = self.__repl_end.sub(u(r" \1"), t)
 
             toks.append(t.strip())
 
@@ -214,11 +214,13 @@ class sppasTextNorm(sppasBaseAnnotation):
 
     # ------------------------------------------------------------------------
 
-    def run(self, input_filename, output_filename=None):
+    def run(self, input_filename, output_filename=None, trs_input=None):
         """ Run the annotation process on an input file.
 
         :param input_filename: (str) Name of the input file with the transcription
         :param output_filename: (str) Name of the resulting file with normalization
+        :param trs_input: (sppasTranscription) Content of the input file, if
+        it was already read: the file is not read again.
         :returns: (sppasTranscription)
 
         """
@@ -227,8 +229,9 @@ class sppasTextNorm(sppasBaseAnnotation):
         self.print_diagnosis(input_filename)
 
         # Get input tier to tokenize
-        parser = sppasRW(input_filename)
-        trs_input = parser.read()
+        if trs_input is None:
+            parser = sppasRW(input_filename)
+            trs_input = parser.read()
         tier_input = sppasFindTier.transcription(trs_input)
 
         # Tokenize the tier
@@ -269,6 +272,15 @@ class sppasTextNorm(sppasBaseAnnotation):
         """ Normalize all tags of all labels of an annotation.
 
         """
+        # Normalize all the texts at once, or one by one in case of error
+        texts = [label.get_best().get_content()
+                 for ann in tier for label in ann.get_labels()
+                 if label.get_best().is_speech() is True]
+        try:
+            normalized = iter(self.normalizer.normalize_batch(texts, actions))
+        except Exception:
+            normalized = None
+
         tokens_tier = sppasTier("Tokens")
         for i, ann in enumerate(tier):
             self.print_message(MSG_TRACK.format(number=i+1), indent=2)
@@ -285,7 +297,10 @@ class sppasTextNorm(sppasBaseAnnotation):
                 # Do not tokenize an empty label, noises, laughter...
                 if text.is_speech() is True:
                     try:
-                        tokens = self.normalizer.normalize(text.get_content(), actions)
+                        if normalized is not None:
+                            tokens = next(normalized)
+                        else:
+                            tokens = self.normalizer.normalize(text.get_content(), actions)
                     except Exception as e:
                         tokens = list()
                         message = "Error while normalizing interval {:d}: {:s}".format(i, str(e))
@@ -84,6 +84,13 @@ class sppasTokenSegmenter(object):
 
     # -------------------------------------------------------------------------
 
+    def get_vocab(self):
+        """ Return the vocabulary. """
+
+        return self.__vocab
+
+    # -------------------------------------------------------------------------
+
     def set_aggregate_max(self, value=STICK_MAX):
         """ Fix the maximum number of words to stick. 
         This is a language dependant value. For French, it's 5 with the word:
@@ -128,24 +135,16 @@ class sppasTokenSegmenter(object):
         """
         tab_toks = phrase.split(" ")
         token = tab_toks[0]
-        i = len(tab_toks)
 
         if self.__vocab is None:
             return 1, token
 
-        while i > 0:
-            # try to aggregate all tokens
-            token = separator.join(tab_toks)
-
-            # next round will try without the last token
-            tab_toks.pop()
-            i -= 1
-
-            # find if this is a word in the vocabulary
-            if self.__vocab.is_unk(token) is False:
-                break
+        # find the longest aggregation which is a word in the vocabulary,
+        # or the first real token which is the first given token
+        trie = self.__vocab.get_trie()
+        i = max(0, trie.longest_sequence(tab_toks, separator) - 1)
+        token = separator.join(tab_toks[:i+1])
 
-        # the first real token is the first given token
         return i, sppasUnicode(token).to_strip()
 
     # -------------------------------------------------------------------------
@@ -0,0 +1,808 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+
+    src.annotations.batch.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Annotate the files of a corpus with the automatic annotations of SPPAS.
+
+    Each automatic annotation is performed on a file by a function of this
+    module, either in the main process or in a worker of a pool of
+    processes. A worker creates the annotation, and then loads its
+    resources, only once: when it starts. All the messages of a worker are
+    printed into a log in memory, and sent back to the main process with
+    the result of the annotation of each file, with the entries it added
+    to the cache of the annotations.
+
+"""
+import os
+
+from sppas.src.utils.fileutils import sppasFileUtils, sppasDirUtils
+import sppas.src.annotationdata.aio
+
+from sppas.src.annotations.log import sppasLog
+from sppas.src.annotations.cache import sppasAnnotationsCache
+from sppas.src.annotations.Momel.sppasmomel import sppasMomel
+from sppas.src.annotations.Intsint.sppasintsint import sppasIntsint
+from sppas.src.annotations.IPUs.sppasipusseg import sppasIPUseg
+from sppas.src.annotations.TextNorm.sppastextnorm import sppasTextNorm
+from sppas.src.annotations.Phon.sppasphon import sppasPhon
+from sppas.src.annotations.Chunks.sppaschunks import sppasChunks
+from sppas.src.annotations.Align.sppasalign import sppasAlign
+from sppas.src.annotations.Syll.sppassyll import sppasSyll
+from sppas.src.annotations.TGA.sppastga import sppasTGA
+from sppas.src.annotations.Repet.sppasrepet import sppasRepet
+
+from . import OK_ID, IGNORE_ID, INFO_ID
+
+# ----------------------------------------------------------------------------
+
+# Annotations which are not performed on the audio tracks of the IPUs
+NOT_TRACKS_STEPS = ("syll", "tga", "repet")
+
+# ----------------------------------------------------------------------------
+
+
+def get_filename(filename, extensions):
+    """ Return a filename corresponding to one of extensions.
+
+    :param filename: input file name
+    :param extensions: the list of expected extension
+    :returns: a file name of the first existing file with an expected extension or None
+
+    """
+    for ext in extensions:
+
+        ext_filename = os.path.splitext(filename)[0] + ext
+        new_filename = sppasFileUtils(ext_filename).exists()
+        if new_filename is not None and os.path.isfile(new_filename):
+            return new_filename
+
+    return None
+
+# ----------------------------------------------------------------------------
+
+
+def is_annotated(inname, outname):
+    """ Return True if the output file is more recent than the input file.
+
+    :param inname: (str) Name of the input file of an annotation
+    :param outname: (str) Name of the output file of the annotation
+    :returns: (bool)
+
+    """
+    if os.path.isfile(outname) is False:
+        return False
+
+    return os.path.getmtime(outname) >= os.path.getmtime(inname)
+
+# ----------------------------------------------------------------------------
+
+
+def _print_resumed(outname, logfile):
+    if logfile is not None:
+        logfile.print_message("%s: because a previous annotation is existing." % outname,
+                              indent=2, status=IGNORE_ID)
+
+# ----------------------------------------------------------------------------
+
+
+def _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+    """ Return True if the output file doesn't need to be annotated again. """
+
+    if (resume is True and is_annotated(inputs[0], outname)) or \
+            (cache is not None and cache.is_valid(step, inputs, outname)):
+        _print_resumed(outname, logfile)
+        return True
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _add_to_cache(cache, step, inputs, outname):
+    if cache is not None:
+        cache.add(step, inputs, outname)
+
+# ----------------------------------------------------------------------------
+
+
+def create_annotation(step, logfile=None):
+    """ Create the automatic annotation of a step and load its resources.
+
+    :param step: (annotationParam) Configuration of the annotation
+    :param logfile: (sppasLog) The log for the messages of the annotation
+    :returns: the annotation instance
+
+    """
+    key = step.get_key()
+
+    if key == "momel":
+        return sppasMomel(logfile)
+    if key == "intsint":
+        return sppasIntsint(logfile)
+    if key == "ipus":
+        return sppasIPUseg(logfile)
+    if key == "textnorm":
+        return sppasTextNorm(step.get_langresource(), logfile=logfile, lang=step.get_lang())
+    if key == "phon":
+        return sppasPhon(step.get_langresource(), logfile=logfile)
+    if key == "chunks":
+        return sppasChunks(step.get_langresource(), logfile=logfile)
+    if key == "align":
+        return sppasAlign(step.get_langresource(), logfile=logfile)
+    if key == "syll":
+        return sppasSyll(step.get_langresource(), logfile)
+    if key == "tga":
+        return sppasTGA(logfile)
+    if key == "repet":
+        return sppasRepet(step.get_langresource(), logfile)
+
+    raise KeyError('Unrecognized annotation step: %s' % key)
+
+# ----------------------------------------------------------------------------
+
+
+def annotate_file(step, annotation, filename, output_format, logfile=None, resume=False, results=None, cache=None):
+    """ Perform an automatic annotation on a file.
+
+    :param step: (annotationParam) Configuration of the annotation
+    :param annotation: The annotation instance, created by create_annotation()
+    :param filename: (str) Name of the audio file to annotate
+    :param output_format: (str) Extension of the output files
+    :param logfile: (sppasLog) The log for the messages
+    :param resume: (bool) Do not annotate again if the output file is
+    more recent than the input file.
+    :param results: (dict) The results of the previous annotations of the
+    file, which were kept in memory. The result of this annotation is added.
+    :param cache: (sppasAnnotationsCache) Do not annotate again if the
+    output file is valid in the cache, and add it if it is annotated.
+    :returns: (bool) the file was annotated successfully
+
+    An error is reported for the file only: it doesn't stop the annotation
+    of the other files, even in a worker of a pool of processes.
+
+    """
+    if results is None:
+        results = dict()
+    annotate = _ANNOTATE_FILE[step.get_key()]
+    try:
+        return annotate(step, annotation, filename, output_format, logfile, resume, results, cache)
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), filename), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def create_annotations(steps, logfile=None):
+    """ Create the automatic annotations of steps and load their resources.
+
+    :param steps: (list of annotationParam) Configuration of the annotations
+    :param logfile: (sppasLog) The log for the messages of the annotations
+    :returns: (tuple) the list of annotation instances and the list of
+    errors while creating them. An annotation is None if it failed.
+
+    """
+    annotations = list()
+    errors = list()
+    for step in steps:
+        try:
+            annotations.append(create_annotation(step, logfile))
+            errors.append(None)
+        except Exception as e:
+            annotations.append(None)
+            errors.append(str(e))
+
+    return annotations, errors
+
+# ----------------------------------------------------------------------------
+
+
+def annotate_pipeline(steps, annotations, filename, output_format, logfile=None, resume=False, cache=None,
+                      tracks=False):
+    """ Perform automatic annotations on a file, one after the other.
+
+    The result of an annotation is given in memory to the next one, when
+    possible: it is written in its output file but it is not read again.
+    If tracks is True, the audio tracks written by an annotation (i.e. the
+    IPUs of the file) are annotated by the next ones, as if they were
+    found in the input directory.
+
+    :param steps: (list of annotationParam) Configuration of the annotations
+    :param annotations: The annotation instances, created by create_annotations()
+    :param filename: (str) Name of the audio file to annotate
+    :param output_format: (str) Extension of the output files
+    :param logfile: (sppasLog) The log for the messages
+    :param resume: (bool) Do not annotate again if an output file is
+    more recent than the input file.
+    :param cache: (sppasAnnotationsCache) Do not annotate again if an
+    output file is valid in the cache, and add it if it is annotated.
+    :param tracks: (bool) Annotate the tracks written by the annotations
+    :returns: (list of int) number of files annotated successfully by each step
+
+    """
+    # The files to annotate, with the results of their annotations
+    files = [(filename, dict())]
+    success = list()
+
+    for step, annotation in zip(steps, annotations):
+        success.append(0)
+        if annotation is None:
+            continue
+
+        # The tracks of this step are annotated by the next ones only
+        for name, results in list(files):
+            is_track = os.path.basename(name).lower().startswith("track_")
+            if is_track and step.get_key() in NOT_TRACKS_STEPS:
+                continue
+
+            if logfile is not None:
+                if name == filename:
+                    logfile.print_message(step.get_name(), indent=1)
+                else:
+                    logfile.print_message(step.get_name() + " of file " + name, indent=1)
+            if annotate_file(step, annotation, name, output_format,
+                             logfile, resume, results, cache):
+                success[-1] += 1
+            if tracks is True:
+                files.extend((track, dict()) for track in results.pop("tracks", []))
+
+    return success
+
+# ----------------------------------------------------------------------------
+# Annotate a file
+# ----------------------------------------------------------------------------
+
+
+def _annotate_momel(step, m, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    m.fix_options(step.get_options())
+
+    # Indicate the file to be processed
+    if logfile is not None:
+        logfile.print_message(step.get_name()+" of file " + f, indent=1)
+
+    # Get the input file: pitch values are estimated from the audio file
+    # if there's no file with pitch values.
+    inname = get_filename(f, [".hz", ".PitchTier"])
+    if inname is None:
+        if os.path.isfile(f) is False:
+            if logfile is not None:
+                logfile.print_message("Failed to find a file with pitch values. "
+                                      "Read the documentation for details.", indent=2, status=2)
+            return False
+        if logfile is not None:
+            logfile.print_message("No file with pitch values: pitch is estimated "
+                                  "from the audio file.", indent=2, status=INFO_ID)
+        inname = f
+
+    # Fix output file names
+    outname = os.path.splitext(f)[0]+"-momel.PitchTier"
+    textgridoutname = os.path.splitext(f)[0] + '-momel' + output_format
+    inputs = [inname]
+    if _is_up_to_date(step, inputs, textgridoutname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        m.run(inname, trsoutput=textgridoutname, outputfile=outname)
+        _add_to_cache(cache, step, inputs, textgridoutname)
+        if logfile is not None:
+            logfile.print_message(textgridoutname, indent=2, status=0)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message(textgridoutname+": %s" % str(e), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_intsint(step, intsint, f, output_format, logfile, resume, results, cache):
+    # Get the input file
+    ext = ['-momel'+output_format]
+    for e in sppas.src.annotationdata.aio.extensions_out:
+        ext.append('-momel'+e)
+
+    inname = get_filename(f, ext)
+    if inname is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a file with anchors. "
+                                  "Read the documentation for details.", indent=2, status=2)
+        return False
+
+    # Fix output file names
+    outname = os.path.splitext(f)[0] + '-intsint' + output_format
+    inputs = [inname]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        intsint.run(inname, outname)
+        _add_to_cache(cache, step, inputs, outname)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message(outname+": %s" % str(e), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _add_tracks(seg, f, results):
+    """ Add the audio tracks written by the IPUs segmentation to the results. """
+
+    if seg.get_option('dirtracks') is True:
+        dirname = os.path.splitext(f)[0] + "-ipus"
+        if os.path.isdir(dirname):
+            results["tracks"] = sppasDirUtils(dirname).get_files(".wav", recurs=False)
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_ipus(step, seg, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    seg.reset()
+    seg.fix_options(step.get_options())
+
+    # Indicate the file to be processed
+    if logfile is not None:
+        logfile.print_message(step.get_name()+" of file "+f, indent=1)
+
+    # Fix input/output file name
+    outname = os.path.splitext(f)[0] + output_format
+
+    # Is there already an existing IPU-seg (in any format)!
+    ext = []
+    for e in sppas.src.annotationdata.aio.extensions_in:
+        if not e in ['.txt', '.hz', '.PitchTier']:
+            ext.append(e)
+    existoutname = get_filename(f, ext)
+
+    # it's existing... but not in the expected format: convert!
+    if existoutname is not None and existoutname != outname:
+        # just copy the file!
+        if logfile is not None:
+            logfile.print_message('Export '+existoutname, indent=2)
+            logfile.print_message('into '+outname, indent=2)
+        try:
+            t = sppas.src.annotationdata.aio.read(existoutname)
+            sppas.src.annotationdata.aio.write(outname, t)
+            # OK, now outname is as expected! (or not...)
+        except Exception:
+            pass
+
+    # Execute annotation
+    tgfname = sppasFileUtils(outname).exists()
+    if tgfname is None:
+        # No already existing IPU seg., but perhaps a txt.
+        txtfile = get_filename(f, [".txt"])
+        if logfile is not None:
+            if txtfile:
+                logfile.print_message("A transcription was found, "
+                                      "perform Silence/Speech segmentation "
+                                      "time-aligned with a transcription "
+                                      "%s" % txtfile, indent=2, status=3)
+            else:
+                logfile.print_message("No transcription was found, "
+                                      "perform Silence/Speech segmentation only."
+                                      "", indent=2, status=3)
+        try:
+            seg.run(f, trsinputfile=txtfile, ntracks=None, diroutput=None, tracksext=None, trsoutput=outname)
+            _add_tracks(seg, f, results)
+            if logfile is not None:
+                logfile.print_message(outname, indent=2, status=0)
+            return True
+        except Exception as e:
+            if logfile is not None:
+                logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+    else:
+        if seg.get_option('dirtracks') is True:
+            if logfile is not None:
+                logfile.print_message("A time-aligned transcription was found, "
+                                      "split into multiple files", indent=2, status=3)
+            try:
+                seg.run(f, trsinputfile=tgfname, ntracks=None, diroutput=None, tracksext=None, trsoutput=None)
+                _add_tracks(seg, f, results)
+                if logfile is not None:
+                    logfile.print_message(tgfname, indent=2, status=0)
+                return True
+            except Exception as e:
+                if logfile is not None:
+                    logfile.print_message("%s for file %s\n" % (str(e), tgfname), indent=2, status=-1)
+        else:
+            if logfile is not None:
+                logfile.print_message("because a previous segmentation is existing.", indent=2, status=2)
+
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_textnorm(step, t, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    t.fix_options(step.get_options())
+
+    # Get the input file
+    inname = get_filename(f, [output_format] + sppas.src.annotationdata.aio.extensions_out)
+    if inname is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a file with transcription. "
+                                  "Read the documentation for details.", indent=2, status=2)
+        return False
+
+    # Fix output file name
+    outname = os.path.splitext(f)[0] + '-token' + output_format
+    inputs = [inname]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        results["textnorm"] = t.run(inname, outname)
+        _add_to_cache(cache, step, inputs, outname)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_phon(step, p, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    p.fix_options(step.get_options())
+
+    # Get the input file
+    ext = ['-token'+output_format]
+    for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
+        ext.append('-token'+e)
+
+    trs_input = results.get("textnorm", None)
+    if trs_input is not None:
+        # Tokenization was just done: it was written in the expected file
+        inname = os.path.splitext(f)[0] + '-token' + output_format
+    else:
+        inname = get_filename(f, ext)
+    if inname is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a file with toketization. "
+                                  "Read the documentation for details.", indent=2, status=2)
+        return False
+
+    # Fix output file name
+    outname = os.path.splitext(f)[0] + '-phon' + output_format
+    inputs = [inname]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        p.run(inname, outname, trs_input)
+        _add_to_cache(cache, step, inputs, outname)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_chunks(step, a, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    a.fix_options(step.get_options())
+
+    # Get the input file: only txt and xra supports non-time-aligned data
+    extt = ['-token.txt', '-token.xra']
+    extp = ['-phon.txt', '-phon.xra']
+
+    inname = get_filename(f, extp)
+    intok = get_filename(f, extt)
+    if inname is None or intok is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a raw file with phonetization/tokenization."
+                                  "Read the documentation for details.", indent=2, status=2)
+        return False
+
+    # Fix output file name
+    outname = os.path.splitext(f)[0] + '-chunks' + output_format
+    inputs = [inname, intok, f]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        a.run(inname, intok, f, outname)
+        _add_to_cache(cache, step, inputs, outname)
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+        return False
+
+    if logfile is not None:
+        logfile.print_message(outname, indent=2, status=0)
+    return True
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_align(step, a, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    a.fix_options(step.get_options())
+
+    # Get the input file
+    extt = ['-token'+output_format]
+    extp = ['-phon'+output_format]
+    for e in sppas.src.annotationdata.aio.extensions_out:
+        extt.append('-token'+e)
+        extp.append('-phon'+e)
+    extt.append('-chunks'+output_format)
+    extp.append('-chunks'+output_format)
+
+    inname = get_filename(f, extp)
+    intok = get_filename(f, extt)
+    if inname is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a file with phonetization. "
+                                  "Read the documentation for details.",
+                                  indent=2, status=2)
+        return False
+
+    # Fix output file name
+    outname = os.path.splitext(f)[0] + '-palign' + output_format
+    inputs = [name for name in (inname, intok, f) if name is not None]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        a.run(inname, intok, f, outname)
+        _add_to_cache(cache, step, inputs, outname)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_syll(step, s, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    s.fix_options(step.get_options())
+
+    # Get the input file
+    ext = ['-palign'+output_format]
+    for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
+        ext.append('-palign'+e)
+
+    inname = get_filename(f, ext)
+    if inname is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a file with time-aligned phonemes. "
+                                  "Read the documentation for details.", indent=2, status=2)
+        return False
+
+    # Fix output file name
+    outname = os.path.splitext(f)[0] + '-salign' + output_format
+    inputs = [inname]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        results["syll"] = s.run(inname, outname)
+        _add_to_cache(cache, step, inputs, outname)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_tga(step, s, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    s.fix_options(step.get_options())
+
+    # Get the input file
+    ext = ['-salign'+output_format]
+    for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
+        ext.append('-salign'+e)
+
+    trs_input = results.get("syll", None)
+    if trs_input is not None:
+        # Syllabification was just done: it was written in the expected file
+        inname = os.path.splitext(f)[0] + '-salign' + output_format
+    else:
+        inname = get_filename(f, ext)
+    if inname is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a file with time-aligned syllables. "
+                                  "Read the documentation for details.", indent=2, status=2)
+        return False
+
+    # Fix output file name
+    outname = os.path.splitext(f)[0] + '-tga' + output_format
+    inputs = [inname]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        s.run(inname, outname, trs_input)
+        _add_to_cache(cache, step, inputs, outname)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def _annotate_repet(step, r, f, output_format, logfile, resume, results, cache):
+    # fix the default values
+    r.fix_options(step.get_options())
+
+    # Get the input file
+    ext = ['-palign'+output_format]
+    for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
+        ext.append('-palign'+e)
+
+    inname = get_filename(f, ext)
+    if inname is None:
+        if logfile is not None:
+            logfile.print_message("Failed to find a file with time-aligned tokens. "
+                                  "Read the documentation for details.", indent=2, status=2)
+        return False
+
+    # Fix output file name
+    outname = os.path.splitext(f)[0] + '-ralign' + output_format
+    inputs = [inname]
+    if _is_up_to_date(step, inputs, outname, logfile, resume, cache):
+        return True
+
+    # Execute annotation
+    try:
+        r.run(inname, None, outname)
+        _add_to_cache(cache, step, inputs, outname)
+        if logfile is not None:
+            logfile.print_message(outname, indent=2, status=OK_ID)
+        return True
+    except Exception as e:
+        if logfile is not None:
+            logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+    return False
+
+# ----------------------------------------------------------------------------
+
+_ANNOTATE_FILE = {
+    "momel": _annotate_momel,
+    "intsint": _annotate_intsint,
+    "ipus": _annotate_ipus,
+    "textnorm": _annotate_textnorm,
+    "phon": _annotate_phon,
+    "chunks": _annotate_chunks,
+    "align": _annotate_align,
+    "syll": _annotate_syll,
+    "tga": _annotate_tga,
+    "repet": _annotate_repet,
+}
+
+# ----------------------------------------------------------------------------
+# Workers of a pool of processes
+# ----------------------------------------------------------------------------
+
+# The annotation of the worker, its log, its cache and the error while creating it.
+_worker = dict()
+
+# ----------------------------------------------------------------------------
+
+
+def init_worker(step):
+    """ Initialize a worker: create the annotation and load its resources.
+
+    :param step: (annotationParam) Configuration of the annotation
+
+    """
+    logfile = sppasLog(None)
+    logfile.create_buffer()
+    _worker['logfile'] = logfile
+    _worker['cache'] = sppasAnnotationsCache()
+    _worker['error'] = None
+    try:
+        _worker['annotation'] = create_annotation(step, logfile)
+    except Exception as e:
+        _worker['annotation'] = None
+        _worker['error'] = str(e)
+
+# ----------------------------------------------------------------------------
+
+
+def run_worker(task):
+    """ Annotate a file in a worker.
+
+    :param task: (tuple) step, filename, output_format, resume, use_cache
+    :returns: (tuple) filename, success, log messages, error while
+    creating the annotation or None, entries added to the cache
+
+    """
+    step, filename, output_format, resume, use_cache = task
+    logfile = _worker['logfile']
+    if _worker['error'] is not None:
+        return filename, False, logfile.pop_buffer(), _worker['error'], []
+
+    cache = _worker['cache'] if use_cache is True else None
+    success = annotate_file(step, _worker['annotation'], filename,
+                            output_format, logfile, resume, cache=cache)
+
+    return filename, success, logfile.pop_buffer(), None, _worker['cache'].pop_updates()
+
+# ----------------------------------------------------------------------------
+
+
+def init_pipeline_worker(steps):
+    """ Initialize a worker: create the annotations and load their resources.
+
+    :param steps: (list of annotationParam) Configuration of the annotations
+
+    """
+    logfile = sppasLog(None)
+    logfile.create_buffer()
+    _worker['logfile'] = logfile
+    _worker['cache'] = sppasAnnotationsCache()
+    _worker['annotations'], _worker['errors'] = create_annotations(steps, logfile)
+
+# ----------------------------------------------------------------------------
+
+
+def run_pipeline_worker(task):
+    """ Annotate a file by all the annotations in a worker.
+
+    :param task: (tuple) steps, filename, output_format, resume, use_cache, tracks
+    :returns: (tuple) filename, number of files annotated successfully by
+    each step, log messages, errors while creating the annotations,
+    entries added to the cache
+
+    """
+    steps, filename, output_format, resume, use_cache, tracks = task
+    logfile = _worker['logfile']
+    cache = _worker['cache'] if use_cache is True else None
+    success = annotate_pipeline(steps, _worker['annotations'], filename,
+                                output_format, logfile, resume, cache, tracks)
+
+    return filename, success, logfile.pop_buffer(), _worker['errors'], _worker['cache'].pop_updates()
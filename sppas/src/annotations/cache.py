@@ -0,0 +1,345 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.annotations.cache.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Cache of the outputs of the automatic annotations.
+
+    An output file of an annotation is still valid if the annotation would
+    produce it again: same content of the input files, same values of the
+    options, same versions of the language resources and of SPPAS. All of
+    them are hashed into a key which is stored with the output file name,
+    in a cache file of the directory of the output. The cache file is a
+    JSON file: it contains the digests only, and nothing of it is executed
+    when it is loaded.
+
+"""
+import os
+import json
+import hashlib
+import logging
+
+import sppas
+from sppas.src.utils.makeunicode import text_type
+
+# ----------------------------------------------------------------------------
+
+
+class sppasAnnotationsCache(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Cache of the output files of the annotations.
+
+    The content of a file is hashed only once: its digest is stored with
+    its size and modification time, and it is re-used while they are not
+    changed. The version of a language resource is estimated only once.
+
+    >>> cache = sppasAnnotationsCache()
+    >>> if cache.is_valid(step, [inputfile], outputfile) is False:
+    >>>     annotate(inputfile, outputfile)
+    >>>     cache.add(step, [inputfile], outputfile)
+    >>> cache.save()
+
+    """
+    CACHE_FILENAME = ".sppas-cache.json"
+    BLOCK_SIZE = 1 << 20
+
+    # -----------------------------------------------------------------------
+
+    def __init__(self):
+        """ Create a sppasAnnotationsCache instance. """
+
+        # Key: a directory, value: its cache (dict of output base names)
+        self.__dirs = dict()
+        # The directories with a modified cache
+        self.__modified = set()
+        # The entries added since the last pop_updates()
+        self.__updates = list()
+        # Key: a file name, value: its size, modification time and digest
+        self.__digests = dict()
+        # Key: a language resource, value: its version
+        self.__resources = dict()
+
+    # -----------------------------------------------------------------------
+    # Hash of files
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def get_signature(filename):
+        """ Return the size and modification time of a file.
+
+        :param filename: (str)
+        :returns: (tuple) or None if the file does not exist
+
+        """
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime
+
+    # -----------------------------------------------------------------------
+
+    def get_digest(self, filename):
+        """ Return the hash of the content of a file.
+
+        :param filename: (str)
+        :returns: (str) hexadecimal digest or None if the file does not exist
+
+        """
+        filename = os.path.abspath(filename)
+        signature = sppasAnnotationsCache.get_signature(filename)
+        if signature is None:
+            return None
+
+        known = self.__digests.get(filename, None)
+        if known is not None and known[0] == signature:
+            return known[1]
+
+        sha = hashlib.sha1()
+        with open(filename, 'rb') as fp:
+            while True:
+                data = fp.read(sppasAnnotationsCache.BLOCK_SIZE)
+                if not data:
+                    break
+                sha.update(data)
+        digest = sha.hexdigest()
+        self.__digests[filename] = (signature, digest)
+
+        return digest
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def get_resource_version(resource):
+        """ Return the version of a language resource.
+
+        The version of a file is its size and modification time; the one of
+        a directory is the version of all its files.
+
+        :param resource: (str) File or directory name
+        :returns: (list)
+
+        """
+        if os.path.isdir(resource) is False:
+            return [(os.path.basename(resource),
+                     sppasAnnotationsCache.get_signature(resource))]
+
+        version = list()
+        for root, dirs, files in os.walk(resource):
+            dirs.sort()
+            for name in sorted(files):
+                filename = os.path.join(root, name)
+                version.append((os.path.relpath(filename, resource),
+                                sppasAnnotationsCache.get_signature(filename)))
+
+        return version
+
+    # -----------------------------------------------------------------------
+
+    def get_key(self, step, inputs):
+        """ Return the key of the annotation of input files.
+
+        :param step: (annotationParam) Configuration of the annotation
+        :param inputs: (list) Names of the input files
+        :returns: (str) hexadecimal digest or None if an input file is missing
+
+        """
+        digests = [self.get_digest(f) for f in inputs]
+        if None in digests:
+            return None
+
+        options = sorted((opt.get_key(), repr(opt.get_value()))
+                         for opt in step.get_options())
+        resource = step.get_langresource()
+        if resource:
+            if resource not in self.__resources:
+                self.__resources[resource] = sppasAnnotationsCache.get_resource_version(resource)
+            resource = self.__resources[resource]
+
+        key = repr((sppas.__version__, step.get_key(), step.get_lang(),
+                    options, resource, digests))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    # -----------------------------------------------------------------------
+    # Entries
+    # -----------------------------------------------------------------------
+
+    def is_valid(self, step, inputs, output):
+        """ Return True if the output is the one of the annotation of inputs.
+
+        :param step: (annotationParam) Configuration of the annotation
+        :param inputs: (list) Names of the input files
+        :param output: (str) Name of the output file
+        :returns: (bool)
+
+        """
+        output = os.path.abspath(output)
+        entries = self.__get_dir(os.path.dirname(output))
+        entry = entries.get(sppasAnnotationsCache.__get_name(output), None)
+        if entry is None:
+            return False
+
+        if entry[1] != self.get_digest(output):
+            # the output file was modified or removed
+            return False
+
+        return entry[0] == self.get_key(step, inputs)
+
+    # -----------------------------------------------------------------------
+
+    def add(self, step, inputs, output):
+        """ Store that output is the annotation of inputs.
+
+        :param step: (annotationParam) Configuration of the annotation
+        :param inputs: (list) Names of the input files
+        :param output: (str) Name of the output file
+
+        """
+        output = os.path.abspath(output)
+        key = self.get_key(step, inputs)
+        digest = self.get_digest(output)
+        if key is None or digest is None:
+            return
+
+        self.update([(output, (key, digest))])
+        self.__updates.append((output, (key, digest)))
+
+    # -----------------------------------------------------------------------
+
+    def update(self, entries):
+        """ Add entries in the cache.
+
+        :param entries: (list) Entries returned by pop_updates()
+
+        """
+        for output, entry in entries:
+            dirname = os.path.dirname(output)
+            self.__get_dir(dirname)[sppasAnnotationsCache.__get_name(output)] = entry
+            self.__modified.add(dirname)
+
+    # -----------------------------------------------------------------------
+
+    def pop_updates(self):
+        """ Return the entries added since the last call, and forget them.
+
+        It allows to send the entries added by a worker of a pool of
+        processes to the cache of the main process.
+
+        :returns: (list)
+
+        """
+        updates = self.__updates
+        self.__updates = list()
+        return updates
+
+    # -----------------------------------------------------------------------
+
+    def invalidate(self, dirname):
+        """ Remove all the entries of the outputs of a directory.
+
+        Nothing is done if the directory has no cache.
+
+        :param dirname: (str) Name of a directory
+
+        """
+        dirname = os.path.abspath(dirname)
+        filename = os.path.join(dirname, sppasAnnotationsCache.CACHE_FILENAME)
+        if dirname in self.__dirs or os.path.isfile(filename):
+            self.__dirs[dirname] = dict()
+            self.__modified.add(dirname)
+
+    # -----------------------------------------------------------------------
+    # Files
+    # -----------------------------------------------------------------------
+
+    def save(self):
+        """ Save the modified caches in the directories of the outputs.
+
+        :returns: (bool) all caches were saved successfully
+
+        """
+        success = True
+        for dirname in self.__modified:
+            filename = os.path.join(dirname, sppasAnnotationsCache.CACHE_FILENAME)
+            try:
+                tmp_filename = filename + ".tmp"
+                with open(tmp_filename, 'w') as fp:
+                    json.dump(self.__dirs[dirname], fp, indent=0, sort_keys=True)
+                if os.path.exists(filename):
+                    os.remove(filename)
+                os.rename(tmp_filename, filename)
+            except Exception as e:
+                logging.info('Save the cache of annotations failed: {:s}'.format(str(e)))
+                success = False
+
+        self.__modified = set()
+        return success
+
+    # -----------------------------------------------------------------------
+
+    def __get_dir(self, dirname):
+        """ Return the cache of a directory, loaded from its file if any.
+
+        The entries which are not a couple of digests are ignored.
+
+        """
+        if dirname not in self.__dirs:
+            entries = dict()
+            filename = os.path.join(dirname, sppasAnnotationsCache.CACHE_FILENAME)
+            if os.path.isfile(filename):
+                try:
+                    with open(filename, 'r') as fp:
+                        data = json.load(fp)
+                    for name, entry in data.items():
+                        if isinstance(entry, list) and len(entry) == 2 and \
+                                all(isinstance(d, text_type) and len(d) == 40 for d in entry):
+                            entries[name] = (str(entry[0]), str(entry[1]))
+                except Exception as e:
+                    logging.info('Load the cache of annotations failed: {:s}'.format(str(e)))
+            self.__dirs[dirname] = entries
+
+        return self.__dirs[dirname]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __get_name(filename):
+        """ Return the base name of a file, as stored in the cache file. """
+
+        name = os.path.basename(filename)
+        if isinstance(name, text_type) is False:
+            name = name.decode(sppas.encoding)
+        return name
@@ -36,6 +36,10 @@ import datetime
 import codecs
 import logging
 import os
+try:
+    from StringIO import StringIO  # Python 2.7: accept both str and unicode
+except ImportError:
+    from io import StringIO
 
 import sppas
 from sppas import encoding
@@ -132,6 +136,36 @@ class sppasLog(object):
 
         self.logfp = codecs.open(filename, 'a+', encoding)
 
+    # ----------------------------------------------------------------------
+
+    def create_buffer(self):
+        """ Create and open a new output stream in memory.
+
+        It allows a process to send its messages to another one, which
+        prints them into the log file with print_raw_text().
+
+        """
+        try:
+            self.close()
+        except:
+            pass
+
+        self.logfp = StringIO()
+
+    # ----------------------------------------------------------------------
+
+    def pop_buffer(self):
+        """ Return the content of the output stream in memory and clear it.
+
+        :returns: (str)
+
+        """
+        text = self.logfp.getvalue()
+        self.logfp.seek(0)
+        self.logfp.truncate()
+
+        return text
+
     # ----------------------------------------------------------------------
     # Write data
     # ----------------------------------------------------------------------
@@ -34,8 +34,8 @@
 """
 import os
 from threading import Thread
+from multiprocessing import Pool
 
-from sppas.src.utils.fileutils import sppasFileUtils
 from sppas.src.utils.fileutils import sppasDirUtils
 from sppas.src.annotationdata.transcription import Transcription
 
@@ -43,18 +43,13 @@ import sppas.src.audiodata.aio
 import sppas.src.annotationdata.aio
 from sppas.src.annotations.infotier import sppasMetaInfoTier
 from sppas.src.annotations.log import sppasLog
+from sppas.src.annotations.cache import sppasAnnotationsCache
 
-from sppas.src.annotations.Momel.sppasmomel import sppasMomel
-from sppas.src.annotations.Intsint.sppasintsint import sppasIntsint
-from sppas.src.annotations.IPUs.sppasipusseg import sppasIPUseg
-from sppas.src.annotations.TextNorm.sppastextnorm import sppasTextNorm
-from sppas.src.annotations.Phon.sppasphon import sppasPhon
-from sppas.src.annotations.Chunks.sppaschunks import sppasChunks
-from sppas.src.annotations.Align.sppasalign import sppasAlign
-from sppas.src.annotations.Syll.sppassyll import sppasSyll
-from sppas.src.annotations.TGA.sppastga import sppasTGA
-from sppas.src.annotations.Repet.sppasrepet import sppasRepet
-
+from .batch import NOT_TRACKS_STEPS
+from .batch import get_filename, create_annotation, annotate_file
+from .batch import create_annotations, annotate_pipeline
+from .batch import init_worker, run_worker
+from .batch import init_pipeline_worker, run_pipeline_worker
 from .annotationsexc import AnnotationOptionError
 
 # ----------------------------------------------------------------------------
@@ -87,6 +82,11 @@ class sppasAnnotationsManager(Thread):
         self._progress = None
         self._logfile = None
         self.__do_merge = True
+        self.__resume = False
+        self.__pipeline = False
+        self.__use_cache = False
+        self.__invalidate = False
+        self.__cache = sppasAnnotationsCache()
 
         self.start()
 
@@ -98,6 +98,10 @@ class sppasAnnotationsManager(Thread):
         Available options are:
 
             - domerge (bool) create a merged TextGrid file.
+            - resume (bool) do not annotate again the up-to-date files.
+            - pipeline (bool) perform all the annotations on a file before the next one.
+            - cache (bool) do not annotate again the files with a valid output in the cache.
+            - invalidate (bool) clear the cache before annotating.
 
         :param options: (option)
 
@@ -107,6 +111,14 @@ class sppasAnnotationsManager(Thread):
             key = opt.get_key()
             if key == "domerge":
                 self.set_do_merge(opt.get_value())
+            elif key == "resume":
+                self.set_resume(opt.get_value())
+            elif key == "pipeline":
+                self.set_pipeline(opt.get_value())
+            elif key == "cache":
+                self.set_cache(opt.get_value())
+            elif key == "invalidate":
+                self.set_invalidate(opt.get_value())
             else:
                 raise AnnotationOptionError(key)
 
@@ -121,7 +133,81 @@ class sppasAnnotationsManager(Thread):
         """
         self.__do_merge = do_merge
 
-    # ----------------------------------------------------------------------
+    # -----------------------------------------------------------------------
+
+    def set_resume(self, resume):
+        """ Fix the resume option.
+        If resume is set to True, a file is not annotated again if the
+        output of the annotation is more recent than its input: an
+        interrupted batch can then be continued where it stopped.
+
+        :param resume: (bool)
+
+        """
+        self.__resume = bool(resume)
+
+    # -----------------------------------------------------------------------
+
+    def set_pipeline(self, pipeline):
+        """ Fix the pipeline option.
+        If pipeline is set to True, each file is annotated by all the
+        activated annotations before the next file, instead of performing
+        each annotation on all the files before the next annotation.
+        The result of an annotation is then given in memory to the next
+        one, when possible.
+
+        :param pipeline: (bool)
+
+        """
+        self.__pipeline = bool(pipeline)
+
+    # -----------------------------------------------------------------------
+
+    def set_cache(self, use_cache):
+        """ Fix the cache option.
+        If cache is set to True, a file is not annotated again if its output
+        is valid in the cache of the annotations: the input files, the
+        options of the annotation and its resources did not changed since
+        the output was created. The cache is not used by default: it is
+        saved in the directories of the outputs.
+
+        :param use_cache: (bool)
+
+        """
+        self.__use_cache = bool(use_cache)
+
+    # -----------------------------------------------------------------------
+
+    def set_invalidate(self, invalidate):
+        """ Fix the invalidate option.
+        If invalidate is set to True, the cache of the annotations of the
+        input directories is cleared before annotating: all the files are
+        annotated again.
+
+        :param invalidate: (bool)
+
+        """
+        self.__invalidate = bool(invalidate)
+
+    # -----------------------------------------------------------------------
+
+    def invalidate_cache(self):
+        """ Clear the cache of the annotations of the input files. """
+
+        dirnames = set(os.path.dirname(os.path.abspath(f))
+                       for f in self.set_filelist(".wav"))
+        for dirname in dirnames:
+            self.__cache.invalidate(dirname)
+        self.__cache.save()
+
+    # -----------------------------------------------------------------------
+
+    def __get_cache(self):
+        """ Return the cache of the annotations, or None if it is not used. """
+
+        if self.__use_cache is True:
+            return self.__cache
+        return None
 
     # -----------------------------------------------------------------------
 
@@ -188,788 +274,403 @@ class sppasAnnotationsManager(Thread):
         :returns: a file name of the first existing file with an expected extension or None
 
         """
-        for ext in extensions:
-
-            ext_filename = os.path.splitext(filename)[0] + ext
-            new_filename = sppasFileUtils(ext_filename).exists()
-            if new_filename is not None and os.path.isfile(new_filename):
-                return new_filename
-
-        return None
+        return get_filename(filename, extensions)
 
     # ------------------------------------------------------------------------
     # Run annotations.
     # ------------------------------------------------------------------------
 
-    def run_momel(self, stepidx):
-        """
-        Execute the SPPAS implementation of momel.
+    def run_step(self, stepidx):
+        """ Execute an annotation on all the files.
 
-        @param stepidx index of this annotations in the parameters
-        @return number of files processed successfully
+        The files are annotated by a pool of processes if the number of
+        workers of the parameters is greater than 1: each worker creates
+        the annotation, and so loads its resources, only once.
+
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
         """
         # Initializations
         step = self.parameters.get_step(stepidx)
         stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
         self._progress.set_header(stepname)
         self._progress.update(0, "")
 
         # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")  #,not_start=["track_"])
+        if step.get_key() in NOT_TRACKS_STEPS:
+            filelist = self.set_filelist(".wav", not_start=["track_"])
+        else:
+            filelist = self.set_filelist(".wav")
         if len(filelist) == 0:
             return 0
-        total = len(filelist)
 
-        # Create annotation instance
-        try:
-            m = sppasMomel(self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n" % str(e), indent=1, status=1)
+        nb_workers = min(self.parameters.get_nb_workers(), len(filelist))
+        if nb_workers > 1:
+            files_processed_success = self.__run_pool(step, filelist, nb_workers)
+        else:
+            files_processed_success = self.__run_serial(step, filelist)
+        self.__cache.save()
+        if files_processed_success is None:
             return 0
 
-        # Execute annotation for each file in the list
-        for i, f in enumerate(filelist):
-
-            # fix the default values
-            m.fix_options(step.get_options())
-
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
-
-            # Get the input file
-            inname = self._get_filename(f, [".hz", ".PitchTier"])
-            if inname is not None:
-
-                # Fix output file names
-                outname = os.path.splitext(f)[0]+"-momel.PitchTier"
-                textgridoutname = os.path.splitext(f)[0] + '-momel' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    m.run(inname, trsoutput=textgridoutname, outputfile=outname)
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(textgridoutname, indent=2, status=0)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message(textgridoutname+": %s" % str(e), indent=2, status=-1)
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with pitch values. "
-                                                "Read the documentation for details.", indent=2, status=2)
-
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
-
         # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files).\n" % (files_processed_success,total))
+        self._progress.update(1, "Completed (%d files successfully over %d files).\n"
+                                 "" % (files_processed_success, len(filelist)))
         self._progress.set_header("")
 
         return files_processed_success
 
     # ------------------------------------------------------------------------
 
-    def run_intsint(self, stepidx):
-        """ Execute the SPPAS implementation of Intsint.
+    def run_momel(self, stepidx):
+        """ Execute the SPPAS implementation of momel.
 
         :param stepidx: index of this annotations in the parameters
         :returns: number of files processed successfully
 
         """
-        # Initializations
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0, "")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")  #,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
-
-        # Create annotation instance
-        try:
-            intsint = sppasIntsint(self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=1)
-            return 0
-
-        # Execute annotation for each file in the list
-        for i,f in enumerate(filelist):
-
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+        return self.run_step(stepidx)
 
-            # Get the input file
-            ext = ['-momel'+self.parameters.get_output_format()]
-            for e in sppas.src.annotationdata.aio.extensions_out:
-                ext.append('-momel'+e)
-
-            inname = self._get_filename(f, ext)
-            if inname is not None:
-
-                # Fix output file names
-                outname = os.path.splitext(f)[0] + '-intsint' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    intsint.run(inname, outname)
-                    files_processed_success += 1
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname+": %s" % str(e), indent=2, status=-1)
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with anchors. "
-                                                "Read the documentation for details.", indent=2, status=2)
+    # ------------------------------------------------------------------------
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+    def run_intsint(self, stepidx):
+        """ Execute the SPPAS implementation of Intsint.
 
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files).\n" % (files_processed_success,total))
-        self._progress.set_header("")
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
-        return files_processed_success
+        """
+        return self.run_step(stepidx)
 
     # ------------------------------------------------------------------------
 
     def run_ipusegmentation(self, stepidx):
-        """
-        Execute the SPPAS-IPUSegmentation program.
+        """ Execute the SPPAS-IPUSegmentation program.
 
-        @return number of files processed successfully
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
+        return self.run_step(stepidx)
 
-        # Get the list of input file names, with the ".wav" extension
-        filelist = self.set_filelist(".wav")
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
+    # ------------------------------------------------------------------------
 
-        # Create annotation instance, and fix options
-        try:
-            seg = sppasIPUseg(self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
-            return 0
+    def run_tokenization(self, stepidx):
+        """ Execute the SPPAS-Tokenization program.
 
-        # Execute the annotation for each file in the list
-        for i,f in enumerate(filelist):
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
-            # fix the default values
-            seg.reset()
-            seg.fix_options(step.get_options())
+        """
+        return self.run_step(stepidx)
 
-            # Indicate the file to be processed
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file "+f, indent=1)
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+    # ------------------------------------------------------------------------
 
-            # Fix input/output file name
-            outname = os.path.splitext(f)[0] + self.parameters.get_output_format()
+    def run_phonetization(self, stepidx):
+        """ Execute the SPPAS-Phonetization program.
 
-            # Is there already an existing IPU-seg (in any format)!
-            ext = []
-            for e in sppas.src.annotationdata.aio.extensions_in:
-                if not e in ['.txt','.hz', '.PitchTier']:
-                    ext.append(e)
-            existoutname = self._get_filename(f, ext)
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
-            # it's existing... but not in the expected format: convert!
-            if existoutname is not None and existoutname != outname:
-                # just copy the file!
-                if self._logfile is not None:
-                    self._logfile.print_message('Export '+existoutname, indent=2)
-                    self._logfile.print_message('into '+outname, indent=2)
-                try:
-                    t = sppas.src.annotationdata.aio.read(existoutname)
-                    sppas.src.annotationdata.aio.write(outname,t)
-                    # OK, now outname is as expected! (or not...)
-                except Exception:
-                    pass
-
-            # Execute annotation
-            tgfname = sppasFileUtils(outname).exists()
-            if tgfname is None:
-                # No already existing IPU seg., but perhaps a txt.
-                txtfile = self._get_filename(f, [".txt"])
-                if self._logfile is not None:
-                    if txtfile:
-                        self._logfile.print_message("A transcription was found, "
-                                                    "perform Silence/Speech segmentation "
-                                                    "time-aligned with a transcription "
-                                                    "%s" % txtfile, indent=2,status=3)
-                    else:
-                        self._logfile.print_message("No transcription was found, "
-                                                    "perform Silence/Speech segmentation only."
-                                                    "", indent=2,status=3)
-                try:
-                    seg.run(f, trsinputfile=txtfile, ntracks=None, diroutput=None, tracksext=None, trsoutput=outname)
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2,status=-1)
-            else:
-                if seg.get_option('dirtracks') is True:
-                    self._logfile.print_message("A time-aligned transcription was found, "
-                                                "split into multiple files", indent=2, status=3)
-                    try:
-                        seg.run(f, trsinputfile=tgfname, ntracks=None, diroutput=None, tracksext=None, trsoutput=None)
-                        files_processed_success += 1
-                        if self._logfile is not None:
-                            self._logfile.print_message(tgfname, indent=2,status=0)
-                    except Exception as e:
-                        if self._logfile is not None:
-                            self._logfile.print_message("%s for file %s\n" % (str(e), tgfname), indent=2,status=-1)
-                else:
-                    if self._logfile is not None:
-                        self._logfile.print_message("because a previous segmentation is existing.", indent=2,status=2)
+        """
+        return self.run_step(stepidx)
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+    # ------------------------------------------------------------------------
 
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files).\n" % (files_processed_success,total))
-        self._progress.set_header("")
+    def run_chunks_alignment(self, stepidx):
+        """ Execute the SPPAS Chunks alignment program.
 
-        return files_processed_success
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
+
+        """
+        return self.run_step(stepidx)
 
     # ------------------------------------------------------------------------
 
-    def run_tokenization(self, stepidx):
-        """
-        Execute the SPPAS-Tokenization program.
+    def run_alignment(self, stepidx):
+        """ Execute the SPPAS-Alignment program.
 
-        @return number of files processed successfully
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
+        return self.run_step(stepidx)
 
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")  # ,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
+    # ------------------------------------------------------------------------
 
-        # Create annotation instance
-        try:
-            self._progress.set_text("Loading resources...")
-            t = sppasTextNorm(step.get_langresource(), logfile=self._logfile, lang=step.get_lang())
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
-            return 0
+    def run_syllabification(self, stepidx):
+        """ Execute the SPPAS syllabification.
 
-        # Execute the annotation for each file in the list
-        for i, f in enumerate(filelist):
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
-            # fix the default values
-            t.fix_options(step.get_options())
+        """
+        return self.run_step(stepidx)
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+    # ------------------------------------------------------------------------
 
-            # Get the input file
-            inname = self._get_filename(f, [self.parameters.get_output_format()] + sppas.src.annotationdata.aio.extensions_out)
-            if inname is not None:
+    def run_tga(self, stepidx):
+        """ Execute the SPPAS TGA.
 
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-token' + self.parameters.get_output_format()
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
-                # Execute annotation
-                try:
-                    t.run(inname, outname)
-                    files_processed_success += 1
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+        """
+        return self.run_step(stepidx)
 
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with transcription. "
-                                                "Read the documentation for details.", indent=2, status=2)
+    # ------------------------------------------------------------------------
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+    def run_repetition(self, stepidx):
+        """ Execute the automatic repetitions detection.
 
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files).\n" % (files_processed_success,total))
-        self._progress.set_header("")
+        :param stepidx: index of this annotations in the parameters
+        :returns: number of files processed successfully
 
-        return files_processed_success
+        """
+        return self.run_step(stepidx)
 
     # ------------------------------------------------------------------------
 
-    def run_phonetization(self, stepidx):
-        """
-        Execute the SPPAS-Phonetization program.
+    def __run_serial(self, step, filelist):
+        """ Annotate the files one after the other in this process.
 
-        @return number of files processed successfully
+        :returns: number of files processed successfully, or None if the
+        annotation can't be created.
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")  #,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
-
         # Create annotation instance
         try:
             self._progress.set_text("Loading resources...")
-            p = sppasPhon(step.get_langresource(), logfile=self._logfile)
+            annotation = create_annotation(step, self._logfile)
         except Exception as e:
             if self._logfile is not None:
-                self._logfile.print_message("%s\n" % e, indent=1,status=4)
-            return 0
+                self._logfile.print_message("%s\n" % str(e), indent=1, status=4)
+            return None
 
         # Execute the annotation for each file in the list
+        files_processed_success = 0
+        total = len(filelist)
         for i, f in enumerate(filelist):
 
-            # fix the default values
-            p.fix_options(step.get_options())
-
             # Indicate the file to be processed
             self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
 
-            # Get the input file
-            ext = ['-token'+self.parameters.get_output_format()]
-            for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
-                ext.append('-token'+e)
-
-            inname = self._get_filename(f, ext)
-            if inname is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-phon' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    p.run(inname, outname)
-                    files_processed_success += 1
-                except Exception as e:
-                    #import traceback
-                    #print traceback.format_exc()
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
-
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with toketization. "
-                                                "Read the documentation for details.", indent=2, status=2)
+            if annotate_file(step, annotation, f,
+                             self.parameters.get_output_format(),
+                             self._logfile, self.__resume,
+                             cache=self.__get_cache()):
+                files_processed_success += 1
 
             # Indicate progress
             self._progress.set_fraction(float((i+1))/float(total))
             if self._logfile is not None:
                 self._logfile.print_newline()
 
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files).\n" % (files_processed_success,total))
-        self._progress.set_header("")
-
         return files_processed_success
 
     # ------------------------------------------------------------------------
 
-    def run_chunks_alignment(self, stepidx):
-        """
-        Execute the SPPAS Chunks alignment program.
+    def __run_pool(self, step, filelist, nb_workers):
+        """ Annotate the files by a pool of processes.
+
+        The messages of the workers are printed in the log file and the
+        progress is updated in the order of the list of files.
+
+        :returns: number of files processed successfully, or None if the
+        annotation can't be created.
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0, "")
+        self._progress.set_text("Loading resources...")
+        tasks = [(step, f, self.parameters.get_output_format(), self.__resume, self.__use_cache)
+                 for f in filelist]
 
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")#,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
+        files_processed_success = 0
         total = len(filelist)
-
-        # Create annotation instance
+        pool = Pool(nb_workers, init_worker, (step, ))
         try:
-            a = sppasChunks(step.get_langresource(), logfile=self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n" % str(e), indent=1,status=4)
-            return 0
-
-        # Execute the annotation for each file in the list
-        for i, f in enumerate(filelist):
-
-            # fix the default values
-            a.fix_options(step.get_options())
-
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-
-            # Get the input file: only txt and xra supports non-time-aligned data
-            extt = ['-token.txt', '-token.xra']
-            extp = ['-phon.txt', '-phon.xra']
-
-            inname = self._get_filename(f, extp)
-            intok  = self._get_filename(f, extt)
-            if inname is not None and intok is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-chunks' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    a.run(inname, intok, f, outname)
-                except Exception as e:
+            for i, (f, success, text, error, updates) in enumerate(pool.imap(run_worker, tasks)):
+                if error is not None:
+                    # The annotation can't be created: workers are useless
                     if self._logfile is not None:
-                        stre = unicode(e.message).encode("utf-8")
-                        self._logfile.print_message("%s for file %s\n"%(stre,outname), indent=2, status=-1)
-                else:
+                        self._logfile.print_message("%s\n" % error, indent=1, status=4)
+                    pool.terminate()
+                    return None
+
+                # Indicate the file which was processed
+                self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+                self.__cache.update(updates)
+                if success is True:
                     files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
-
-            else:
                 if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a raw file with phonetization/tokenization."
-                                                "Read the documentation for details.", indent=2, status=2)
+                    self._logfile.print_raw_text(text)
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
-
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files).\n" % (files_processed_success,total))
-        self._progress.set_header("")
+                # Indicate progress
+                self._progress.set_fraction(float((i+1))/float(total))
+                if self._logfile is not None:
+                    self._logfile.print_newline()
+        finally:
+            pool.close()
+            pool.join()
 
         return files_processed_success
 
     # ------------------------------------------------------------------------
 
-    def run_alignment(self, stepidx):
-        """
-        Execute the SPPAS-Alignment program.
+    def run_pipeline(self):
+        """ Execute the activated annotations on each file.
+
+        All the activated annotations are performed on a file before the
+        next one: the results of a file are available as soon as possible.
+        The files are annotated by a pool of processes if the number of
+        workers of the parameters is greater than 1.
+
+        :returns: (list) number of files processed successfully by each step,
+        or -1 if the step is not activated.
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
+        nbruns = [-1] * self.parameters.get_step_numbers()
+        indexes = [i for i in range(self.parameters.get_step_numbers())
+                   if self.parameters.get_step_status(i) is True]
+        if len(indexes) == 0:
+            return nbruns
+        steps = [self.parameters.get_step(i) for i in indexes]
+        for i in indexes:
+            nbruns[i] = 0
+
+        self._progress.set_header(", ".join(step.get_name() for step in steps))
+        self._progress.update(0, "")
+        if self._logfile is not None:
+            self._logfile.print_separator()
 
         # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")  #,not_start=["track_"])
+        filelist = self.set_filelist(".wav")
         if len(filelist) == 0:
-            return 0
-        total = len(filelist)
-
-        # Create annotation instance
-        try:
-            a = sppasAlign(step.get_langresource(), logfile=self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n" % str(e), indent=1,status=4)
-            return 0
-
-        # Execute the annotation for each file in the list
-        for i, f in enumerate(filelist):
-
-            # fix the default values
-            a.fix_options(step.get_options())
-
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-
-            # Get the input file
-            extt = ['-token'+self.parameters.get_output_format()]
-            extp = ['-phon'+self.parameters.get_output_format()]
-            for e in sppas.src.annotationdata.aio.extensions_out:
-                extt.append('-token'+e)
-                extp.append('-phon'+e)
-            extt.append('-chunks'+self.parameters.get_output_format())
-            extp.append('-chunks'+self.parameters.get_output_format())
-
-            inname = self._get_filename(f, extp)
-            intok = self._get_filename(f, extt)
-            if inname is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-palign' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    a.run(inname, intok, f, outname)
-                    files_processed_success += 1
-                except Exception as e:
-                    if self._logfile is not None:
-                        stre = unicode(e.message).encode("utf-8")
-                        self._logfile.print_message("%s for file %s\n" % (stre, outname), indent=2, status=-1)
+            return nbruns
 
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with phonetization. "
-                                                "Read the documentation for details.",
-                                                indent=2, status=2)
-
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+        nb_workers = min(self.parameters.get_nb_workers(), len(filelist))
+        if nb_workers > 1:
+            success = self.__run_pipeline_pool(steps, filelist, nb_workers)
+        else:
+            success = self.__run_pipeline_serial(steps, filelist)
+        self.__cache.save()
+        for i, s in zip(indexes, success):
+            nbruns[i] = s
 
         # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files).\n" % (files_processed_success,total))
+        self._progress.update(1, "Completed (%d files).\n" % len(filelist))
         self._progress.set_header("")
 
-        return files_processed_success
+        return nbruns
 
     # ------------------------------------------------------------------------
 
-    def run_syllabification(self, stepidx):
-        """
-        Execute the SPPAS syllabification.
-
-        """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav",not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
-
-        # Create annotation instance
-        try:
-            s = sppasSyll(step.get_langresource(), self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
-            return 0
-
-        for i, f in enumerate(filelist):
-
-            # fix the default values
-            s.fix_options(step.get_options())
+    def __print_errors(self, steps, errors):
+        """ Print the errors while creating the annotations. """
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+        if self._logfile is not None:
+            for step, error in zip(steps, errors):
+                if error is not None:
+                    self._logfile.print_message("%s: %s\n" % (step.get_name(), error), indent=1, status=4)
 
-            # Get the input file
-            ext = ['-palign'+self.parameters.get_output_format()]
-            for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
-                ext.append('-palign'+e)
+    # ------------------------------------------------------------------------
 
-            inname = self._get_filename(f,ext)
-            if inname is not None:
+    def __get_tracks_status(self, filelist):
+        """ Return whether the tracks of each file have to be annotated.
 
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-salign' + self.parameters.get_output_format()
+        Like in the step-by-step mode, the tracks written by the IPUs
+        segmentation of a file are annotated if the file was found in an
+        input directory, and if they are not already in the list of files.
 
-                # Execute annotation
-                try:
-                    s.run(inname, outname)
-                    files_processed_success += 1
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
+        :param filelist: (list) Names of the audio files to annotate
+        :returns: (list of bool)
 
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with time-aligned phonemes. "
-                                                "Read the documentation for details.", indent=2, status=2)
-
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+        """
+        dirnames = [os.path.abspath(s) for s in self.parameters.get_sppasinput()
+                    if os.path.isdir(s)]
+        listed = set(os.path.dirname(os.path.abspath(f)) for f in filelist)
 
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files)."
-                                 "\n" % (files_processed_success,total))
-        self._progress.set_header("")
+        status = list()
+        for f in filelist:
+            f = os.path.abspath(f)
+            in_dir = any(f.startswith(os.path.join(d, "")) for d in dirnames)
+            status.append(in_dir and os.path.splitext(f)[0] + "-ipus" not in listed)
 
-        return files_processed_success
+        return status
 
     # ------------------------------------------------------------------------
 
-    def run_tga(self, stepidx):
-        """ Execute the SPPAS TGA. """
+    def __run_pipeline_serial(self, steps, filelist):
+        """ Annotate the files one after the other in this process.
 
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        step_name = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(step_name)
-        self._progress.update(0, "")
+        :returns: (list) number of files processed successfully by each step
 
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav", not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
-
-        # Create annotation instance
-        s = sppasTGA(self._logfile)
+        """
+        self._progress.set_text("Loading resources...")
+        annotations, errors = create_annotations(steps, self._logfile)
+        self.__print_errors(steps, errors)
 
+        tracks = self.__get_tracks_status(filelist)
+        files_processed_success = [0] * len(steps)
+        total = len(filelist)
         for i, f in enumerate(filelist):
 
-            # fix the default values
-            s.fix_options(step.get_options())
-
             # Indicate the file to be processed
             self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+            if self._logfile is not None:
+                self._logfile.print_message(f)
 
-            # Get the input file
-            ext = ['-salign'+self.parameters.get_output_format()]
-            for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
-                ext.append('-salign'+e)
-
-            inname = self._get_filename(f, ext)
-            if inname is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-tga' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    s.run(inname, outname)
-                    files_processed_success += 1
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
-
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with time-aligned syllables. "
-                                                "Read the documentation for details.", indent=2, status=2)
+            success = annotate_pipeline(steps, annotations, f,
+                                        self.parameters.get_output_format(),
+                                        self._logfile, self.__resume,
+                                        self.__get_cache(), tracks[i])
+            for j, s in enumerate(success):
+                files_processed_success[j] += s
 
             # Indicate progress
             self._progress.set_fraction(float((i+1))/float(total))
             if self._logfile is not None:
                 self._logfile.print_newline()
 
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files)."
-                                 "\n" % (files_processed_success,total))
-        self._progress.set_header("")
-
         return files_processed_success
 
     # ------------------------------------------------------------------------
 
-    def run_repetition(self, stepidx):
-        """
-        Execute the automatic repetitions detection.
+    def __run_pipeline_pool(self, steps, filelist, nb_workers):
+        """ Annotate the files by a pool of processes.
+
+        :returns: (list) number of files processed successfully by each step
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0, "")
+        self._progress.set_text("Loading resources...")
+        tasks = [(steps, f, self.parameters.get_output_format(), self.__resume, self.__use_cache, t)
+                 for f, t in zip(filelist, self.__get_tracks_status(filelist))]
 
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav", not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
+        files_processed_success = [0] * len(steps)
         total = len(filelist)
-
-        # Create annotation instance
+        pool = Pool(nb_workers, init_pipeline_worker, (steps, ))
         try:
-            self._progress.set_text("Loading resources...")
-            r = sppasRepet(step.get_langresource(), self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n" % str(e), indent=1,status=4)
-            return 0
-
-        for i, f in enumerate(filelist):
-
-            # fix the default values
-            r.fix_options(step.get_options())
-
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-
-            # Get the input file
-            ext = ['-palign'+self.parameters.get_output_format()]
-            for e in sppas.src.annotationdata.aio.extensions_out_multitiers:
-                ext.append('-palign'+e)
-
-            inname = self._get_filename(f, ext)
-            if inname is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-ralign' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    r.run(inname, None, outname)
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2, status=0)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n" % (str(e), outname), indent=2, status=-1)
-
-            else:
+            for i, (f, success, text, errors, updates) in enumerate(pool.imap(run_pipeline_worker, tasks)):
+                if i == 0:
+                    self.__print_errors(steps, errors)
+
+                # Indicate the file which was processed
+                self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+                self.__cache.update(updates)
+                for j, s in enumerate(success):
+                    files_processed_success[j] += s
                 if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with time-aligned tokens. "
-                                                "Read the documentation for details.", indent=2, status=2)
-
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+                    self._logfile.print_message(f)
+                    self._logfile.print_raw_text(text)
 
-        # Indicate completed!
-        self._progress.update(1, "Completed (%d files successfully over %d files)."
-                                 "\n" % (files_processed_success, total))
-        self._progress.set_header("")
+                # Indicate progress
+                self._progress.set_fraction(float((i+1))/float(total))
+                if self._logfile is not None:
+                    self._logfile.print_newline()
+        finally:
+            pool.close()
+            pool.join()
 
         return files_processed_success
 
@@ -1094,29 +795,13 @@ class sppasAnnotationsManager(Thread):
 
     # ------------------------------------------------------------------------
 
-    def run_annotations(self, progress):
-        """
-        Execute activated SPPAS steps.
-        Get execution information from the 'parameters' object.
-
-        """
-        self._progress = progress
+    def __run_steps(self):
+        """ Execute the activated annotations, one after the other.
 
-        # ##################################################################### #
-        # Print header message in the log file
-        # ##################################################################### #
-        try:
-            self._logfile = sppasLog(self.parameters)
-            self._logfile.create(self.parameters.get_logfilename())
-            self._logfile.print_header()
-            self._logfile.print_annotations_header()
-        except:
-            self._logfile = None
-            pass
+        :returns: (list) number of files processed successfully by each step,
+        or -1 if the step is not activated.
 
-        # ##################################################################### #
-        # Run!
-        # ##################################################################### #
+        """
         nbruns = []
         steps = False
 
@@ -1157,6 +842,41 @@ class sppasAnnotationsManager(Thread):
                     self._logfile.print_message('Unrecognized annotation step:'
                                                 '%s' % self.parameters.get_step_name(i))
 
+        return nbruns
+
+    # ------------------------------------------------------------------------
+
+    def run_annotations(self, progress):
+        """
+        Execute activated SPPAS steps.
+        Get execution information from the 'parameters' object.
+
+        """
+        self._progress = progress
+
+        # ##################################################################### #
+        # Print header message in the log file
+        # ##################################################################### #
+        try:
+            self._logfile = sppasLog(self.parameters)
+            self._logfile.create(self.parameters.get_logfilename())
+            self._logfile.print_header()
+            self._logfile.print_annotations_header()
+        except:
+            self._logfile = None
+            pass
+
+        # ##################################################################### #
+        # Run!
+        # ##################################################################### #
+        if self.__invalidate is True:
+            self.invalidate_cache()
+
+        if self.__pipeline is True:
+            nbruns = self.run_pipeline()
+        else:
+            nbruns = self.__run_steps()
+
         if self._logfile is not None:
             self._logfile.print_separator()
             self._logfile.print_newline()
@@ -33,6 +33,7 @@
 
 """
 import os.path
+from multiprocessing import cpu_count
 
 from sppas import SPPAS_CONFIG_DIR
 from sppas.src.annotations.cfgparser import sppasAnnotationConfigParser
@@ -234,6 +235,7 @@ class sppasParam(object):
         # User
         self.logfilename = ""
         self.output_format = DEFAULT_OUTPUT_EXTENSION
+        self.nb_workers = 1
 
         # SPPAS parameters
         self.sppasinput = []
@@ -348,6 +350,20 @@ class sppasParam(object):
     def set_output_format(self, output_format):
         self.output_format = output_format
 
+    def get_nb_workers(self):
+        return self.nb_workers
+
+    def set_nb_workers(self, nb_workers):
+        """ Fix the number of processes annotating files at the same time.
+
+        :param nb_workers: (int) 0 means the number of CPUs.
+
+        """
+        nb_workers = int(nb_workers)
+        if nb_workers == 0:
+            nb_workers = cpu_count()
+        self.nb_workers = max(1, nb_workers)
+
     # ------------------------------------------------------------------------
     # Continue: everything is ok?
     # ------------------------------------------------------------------------
@@ -2,6 +2,9 @@
 
 import unittest
 import os.path
+import shutil
+import tempfile
+from multiprocessing import Pool
 
 from sppas import RESOURCES_PATH
 from sppas import SAMPLES_PATH
@@ -11,8 +14,12 @@ from ..Align.aligners import check as aligners_check
 from ..Align.aligners import aligner_names
 from ..Align.aligners.basealigner import BaseAligner
 from ..Align.aligners.basicalign import BasicAligner
+from ..Align.aligners.alignerio import AlignerIO
 from ..Align.aligners.juliusalign import JuliusAligner
 from ..Align.aligners.hvitealign import HviteAligner
+from ..Align.aligners.viterbialign import ViterbiAligner
+from sppas.src.models.acm.acmodel import sppasAcModel
+from sppas.src.models.acm.hmm import sppasHMM
 
 # ---------------------------------------------------------------------------
 
@@ -22,6 +29,13 @@ sample_1 = os.path.join(SAMPLES_PATH, "samples-eng", "oriana1.wav")  # mono; 160
 # ---------------------------------------------------------------------------
 
 
+def add_tiedlist(args):
+    modeldir, entries = args
+    return BaseAligner(modeldir).add_tiedlist(entries)
+
+# ---------------------------------------------------------------------------
+
+
 class TestBaseAligner( unittest.TestCase ):
 
     def setUp(self):
@@ -48,6 +62,35 @@ class TestBaseAligner( unittest.TestCase ):
         with self.assertRaises(NotImplementedError):
             self._aligner.run_alignment( "audio", "output")
 
+    def test_run_alignments(self):
+        results = self._aligner.run_alignments([("audio", "a b", "w1 w2", "output"),
+                                                ("audio", "", "", "output")])
+        self.assertEqual(2, len(results))
+        self.assertTrue(isinstance(results[0], NotImplementedError))
+        self.assertTrue(isinstance(results[1], IOError))
+
+    def test_add_tiedlist(self):
+        modeldir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(modeldir, "tiedlist"), "w") as fp:
+                fp.write("a\na+a\na+b a+a\n")
+            tasks = [(modeldir, ["a+x%d_%d" % (p, i) for i in range(10)]) for p in range(4)]
+            pool = Pool(4)
+            try:
+                added = pool.map(add_tiedlist, tasks)
+            finally:
+                pool.close()
+                pool.join()
+
+            # the processes did not erase the entries added by the others
+            self.assertEqual([t[1] for t in tasks], added)
+            with open(os.path.join(modeldir, "tiedlist"), "r") as fp:
+                lines = fp.readlines()
+            self.assertEqual(43, len(lines))
+            self.assertFalse(os.path.exists(os.path.join(modeldir, "tiedlist.lock")))
+        finally:
+            shutil.rmtree(modeldir)
+
 # ---------------------------------------------------------------------------
 
 
@@ -100,6 +143,20 @@ class TestBasicAlign( unittest.TestCase ):
         a = self._aligner.run_basic( 0.2 )
         self.assertEquals(a, [(0, 9, "a"),(10, 19, "b")] )
 
+    def test_run_aligned(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            alignerio = AlignerIO()
+            for phones, tokens in (("", ""), ("a", "w1"), ("a|aa b-c", "w1 w2")):
+                self._aligner.set_phones(phones)
+                self._aligner.set_tokens(tokens)
+                outputalign = os.path.join(tmpdir, "track")
+                self._aligner.run_basic(0.2, outputalign)
+                self.assertEqual(alignerio.read_aligned(outputalign),
+                                 self._aligner.run_aligned(0.2))
+        finally:
+            shutil.rmtree(tmpdir)
+
 # ---------------------------------------------------------------------------
 
 
@@ -117,6 +174,94 @@ class TestHviteAlign( unittest.TestCase ):
     def setUp(self):
         self._modeldir = os.path.join(MODELDIR, "models-fra")
         self._aligner = HviteAligner( self._modeldir )
+        self._tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp)
+
+    def test_split_mlf(self):
+        tracks = list()
+        for i in range(3):
+            basename = os.path.join(self._tmp, "track_%.06d" % (i+1))
+            tracks.append((basename + ".wav", "", "", basename))
+        mlfname = os.path.join(self._tmp, "track_000001-batch.mlf")
+        with open(mlfname, "w") as fp:
+            fp.write('#!MLF!#\n')
+            fp.write('"*/track_000001.rec"\n')
+            fp.write('0 1000000 b -100.0 t0_bonjour\n')
+            fp.write('1000000 2000000 o -100.0\n')
+            fp.write('.\n')
+            fp.write('"*/track_000003.rec"\n')
+            fp.write('0 1000000 a -100.0 t2_a\n')
+            fp.write('.\n')
+
+        outputs = self._aligner.split_mlf(mlfname, tracks, {"track_000001": 0,
+                                                            "track_000002": 1,
+                                                            "track_000003": 2})
+        self.assertEqual(outputs, set([0, 2]))
+        self.assertFalse(os.path.exists(tracks[1][3] + ".mlf"))
+        with open(tracks[0][3] + ".mlf") as fp:
+            lines = fp.readlines()
+        self.assertEqual(5, len(lines))
+        self.assertEqual("0 1000000 b -100.0 bonjour", lines[2].strip())
+        with open(tracks[2][3] + ".mlf") as fp:
+            lines = fp.readlines()
+        self.assertEqual("0 1000000 a -100.0 a", lines[2].strip())
+
+# ---------------------------------------------------------------------------
+
+
+class TestViterbiAlign(unittest.TestCase):
+
+    def setUp(self):
+        # 1 phone = 1 HMM of 3 states, with the same mean for all of them
+        acmodel = sppasAcModel()
+        for name, mean, nstates in (("a", 0., 3), ("b", 10., 3), ("c", 20., 3), ("sp", -10., 1)):
+            states = [sppasHMM.create_gmm([[mean, 0.]], [[1., 1.]]) for i in range(nstates)]
+            hmm = sppasHMM()
+            hmm.create(states, sppasHMM.create_transition([0.6]*nstates), name)
+            acmodel.append_hmm(hmm)
+
+        self._aligner = ViterbiAligner(None)
+        self._aligner.set_acmodel(acmodel)
+        self._features = [[0., 0.]]*10 + [[10., 0.]]*8 + [[-10., 0.]]*5 + [[20., 0.]]*7
+
+    def test_outext(self):
+        self.assertEqual(self._aligner.get_outext(), "palign")
+        with self.assertRaises(ValueError):
+            self._aligner.set_outext("mlf")
+
+    def test_run_viterbi(self):
+        self._aligner.set_phones("a-b c")
+        self._aligner.set_tokens("w1 w2")
+        self.assertEqual(self._aligner.run_viterbi(self._features),
+                         (["a b", "c"], ["w1", "w2"], [(0, 9, "a"), (10, 22, "b"), (23, 29, "c")]))
+
+        # variants
+        self._aligner.set_phones("a-c|a-b c|b")
+        self.assertEqual(self._aligner.run_viterbi(self._features),
+                         (["a b", "c"], ["w1", "w2"], [(0, 9, "a"), (10, 22, "b"), (23, 29, "c")]))
+
+        # short pauses
+        self._aligner.set_infersp(True)
+        self.assertEqual(self._aligner.run_viterbi(self._features),
+                         (["a b sp", "c"], ["w1", "w2"],
+                          [(0, 9, "a"), (10, 17, "b"), (18, 22, "sp"), (23, 29, "c")]))
+
+    def test_run_viterbi_errors(self):
+        # not enough frames
+        self._aligner.set_phones(" ".join(["a-b-c"]*4))
+        with self.assertRaises(Exception):
+            self._aligner.run_viterbi(self._features)
+
+        # unknown phone
+        self._aligner.set_phones("a-x c")
+        with self.assertRaises(ValueError):
+            self._aligner.run_viterbi(self._features)
+
+        # no model
+        with self.assertRaises(IOError):
+            ViterbiAligner(None).get_acmodel()
 
 # ---------------------------------------------------------------------------
 
@@ -132,5 +277,7 @@ class TestAlignersPackage(unittest.TestCase):
     def test_instantiate(self):
         aligner = aligners_instantiate(None,"basic")
         self.assertTrue(isinstance(aligner, BasicAligner))
+        aligner = aligners_instantiate(None, "viterbi")
+        self.assertTrue(isinstance(aligner, ViterbiAligner))
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,146 @@
+# -*- coding:utf-8 -*-
+
+import unittest
+import os.path
+import json
+import shutil
+import tempfile
+
+from sppas import BASE_PATH
+
+from ..param import annotationParam
+from ..cache import sppasAnnotationsCache
+
+INITOK = os.path.join(BASE_PATH, "etc", "TextNorm.ini")
+
+# ---------------------------------------------------------------------------
+
+
+class TestAnnotationsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.step = annotationParam(INITOK)
+        self.step.set_lang("eng")
+        self.inname = os.path.join(self.tmp, "file.TextGrid")
+        self.outname = os.path.join(self.tmp, "file-token.TextGrid")
+        self.__write(self.inname, "input")
+        self.__write(self.outname, "output")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def __write(self, filename, content):
+        with open(filename, "w") as fp:
+            fp.write(content)
+
+    # -----------------------------------------------------------------------
+
+    def test_digest(self):
+        cache = sppasAnnotationsCache()
+        d = cache.get_digest(self.inname)
+        self.assertEqual(40, len(d))
+        self.assertEqual(d, cache.get_digest(self.inname))
+        self.assertNotEqual(d, cache.get_digest(self.outname))
+        self.assertIsNone(cache.get_digest(os.path.join(self.tmp, "x")))
+
+    # -----------------------------------------------------------------------
+
+    def test_valid(self):
+        cache = sppasAnnotationsCache()
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+        cache.add(self.step, [self.inname], self.outname)
+        self.assertTrue(cache.is_valid(self.step, [self.inname], self.outname))
+
+        # the same content is written again into the input
+        self.__write(self.inname, "input")
+        self.assertTrue(cache.is_valid(self.step, [self.inname], self.outname))
+
+        # another content
+        self.__write(self.inname, "another input")
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+
+    # -----------------------------------------------------------------------
+
+    def test_invalid_output(self):
+        cache = sppasAnnotationsCache()
+        cache.add(self.step, [self.inname], self.outname)
+        self.__write(self.outname, "modified output")
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+        os.remove(self.outname)
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+
+    # -----------------------------------------------------------------------
+
+    def test_invalid_options(self):
+        cache = sppasAnnotationsCache()
+        cache.add(self.step, [self.inname], self.outname)
+        opt = self.step.get_option(0)
+        opt.set_value(not opt.get_value())
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+        opt.set_value(not opt.get_value())
+        self.assertTrue(cache.is_valid(self.step, [self.inname], self.outname))
+
+    # -----------------------------------------------------------------------
+
+    def test_save(self):
+        cache = sppasAnnotationsCache()
+        cache.add(self.step, [self.inname], self.outname)
+        self.assertTrue(cache.save())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, sppasAnnotationsCache.CACHE_FILENAME)))
+
+        cache = sppasAnnotationsCache()
+        self.assertTrue(cache.is_valid(self.step, [self.inname], self.outname))
+        cache.invalidate(self.tmp)
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+        cache.save()
+        cache = sppasAnnotationsCache()
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+
+    # -----------------------------------------------------------------------
+
+    def test_updates(self):
+        worker_cache = sppasAnnotationsCache()
+        worker_cache.add(self.step, [self.inname], self.outname)
+        updates = worker_cache.pop_updates()
+        self.assertEqual(1, len(updates))
+        self.assertEqual(0, len(worker_cache.pop_updates()))
+
+        cache = sppasAnnotationsCache()
+        cache.update(updates)
+        self.assertTrue(cache.is_valid(self.step, [self.inname], self.outname))
+
+    # -----------------------------------------------------------------------
+
+    def test_load(self):
+        cache = sppasAnnotationsCache()
+        cache.add(self.step, [self.inname], self.outname)
+        cache.save()
+        filename = os.path.join(self.tmp, sppasAnnotationsCache.CACHE_FILENAME)
+        with open(filename, "r") as fp:
+            entries = json.load(fp)
+        self.assertEqual(["file-token.TextGrid"], list(entries.keys()))
+
+        # invalid entries are ignored
+        entries["file.TextGrid"] = "import os"
+        entries["x.TextGrid"] = [1, 2]
+        with open(filename, "w") as fp:
+            json.dump(entries, fp)
+        cache = sppasAnnotationsCache()
+        self.assertTrue(cache.is_valid(self.step, [self.inname], self.outname))
+        self.assertFalse(cache.is_valid(self.step, [self.outname], self.inname))
+
+        # an invalid file is ignored
+        with open(filename, "wb") as fp:
+            fp.write(b"\x80\x02}q\x00.")
+        cache = sppasAnnotationsCache()
+        self.assertFalse(cache.is_valid(self.step, [self.inname], self.outname))
+
+    # -----------------------------------------------------------------------
+
+    def test_invalidate(self):
+        # no cache file is created in a directory without cache
+        cache = sppasAnnotationsCache()
+        cache.invalidate(self.tmp)
+        cache.save()
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, sppasAnnotationsCache.CACHE_FILENAME)))
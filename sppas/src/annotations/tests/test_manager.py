@@ -0,0 +1,196 @@
+# -*- coding:utf-8 -*-
+
+import unittest
+import os.path
+import shutil
+import tempfile
+
+from sppas import SAMPLES_PATH
+import sppas.src.annotationdata.aio
+
+from ..param import sppasParam
+from ..log import sppasLog
+from ..manager import sppasAnnotationsManager
+
+SAMPLES = [os.path.join(SAMPLES_PATH, "samples-fra", "F_F_B003-P8.wav"),
+           os.path.join(SAMPLES_PATH, "samples-fra", "F_F_C006-P6.wav"),
+           os.path.join(SAMPLES_PATH, "samples-fra", "AC track_0379.wav")]
+SAMPLE_ENG = os.path.join(SAMPLES_PATH, "samples-eng", "oriana1")
+
+# ---------------------------------------------------------------------------
+
+
+class NoProgress(object):
+    """ A progress which doesn't display anything. """
+
+    def set_header(self, header):
+        pass
+
+    def update(self, percent, message):
+        pass
+
+    def set_text(self, text):
+        pass
+
+    def set_fraction(self, fraction):
+        pass
+
+    def set_new(self):
+        pass
+
+# ---------------------------------------------------------------------------
+
+
+class TestAnnotationsManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    # -----------------------------------------------------------------------
+
+    def __create_manager(self, dirname, nb_workers, keys):
+        """ Create a manager of the annotations of dirname.
+
+        :returns: the manager and the parameters
+
+        """
+        parameters = sppasParam()
+        parameters.add_sppasinput(dirname)
+        parameters.set_nb_workers(nb_workers)
+        parameters.set_lang("eng")
+        for key in keys:
+            parameters.activate_annotation(key)
+
+        manager = sppasAnnotationsManager(parameters)
+        manager.join()
+        manager._progress = NoProgress()
+        manager._logfile = sppasLog(parameters)
+        manager._logfile.create_buffer()
+
+        return manager, parameters
+
+    # -----------------------------------------------------------------------
+
+    def __run_ipus(self, dirname, nb_workers, bad_file=False):
+        """ Search for the IPUs of the samples copied into dirname.
+
+        :returns: number of files processed successfully and the log
+
+        """
+        os.mkdir(dirname)
+        for filename in SAMPLES:
+            shutil.copy(filename, dirname)
+        if bad_file is True:
+            with open(os.path.join(dirname, "bad.wav"), "w") as fp:
+                fp.write("not an audio file")
+
+        manager, parameters = self.__create_manager(dirname, nb_workers, ["ipus"])
+        stepidx = [i for i in range(parameters.get_step_numbers())
+                   if parameters.get_step_key(i) == "ipus"][0]
+        nb = manager.run_step(stepidx)
+
+        return nb, manager._logfile.pop_buffer().replace(dirname, "")
+
+    # -----------------------------------------------------------------------
+
+    def __run_tracks(self, dirname, nb_workers, pipeline):
+        """ Annotate the IPUs of two samples copied into dirname, and their tracks.
+
+        :returns: number of files processed successfully by each step
+
+        """
+        os.mkdir(dirname)
+        for name in ("a", "b"):
+            for ext in (".wav", ".txt"):
+                shutil.copy(SAMPLE_ENG + ext, os.path.join(dirname, name + ext))
+
+        manager, parameters = self.__create_manager(dirname, nb_workers,
+                                                    ["ipus", "textnorm", "phon"])
+        indexes = [i for i in range(parameters.get_step_numbers())
+                   if parameters.get_step_status(i) is True]
+        step = parameters.get_step(indexes[0])
+        step.get_option_by_key("tracks").set_value(True)
+        step.get_option_by_key("save_as_trs").set_value(True)
+
+        if pipeline is True:
+            return [nb for nb in manager.run_pipeline() if nb > -1]
+        return [manager.run_step(i) for i in indexes]
+
+    # -----------------------------------------------------------------------
+
+    def __get_files(self, dirname):
+        """ Return the names of the files of dirname and its sub-directories. """
+
+        files = list()
+        for root, dirs, names in os.walk(dirname):
+            files.extend(os.path.relpath(os.path.join(root, name), dirname) for name in names)
+        return sorted(files)
+
+    # -----------------------------------------------------------------------
+
+    def __read(self, filename):
+        """ Return the annotations of a file: their ids and dates differ. """
+
+        if filename.endswith(".wav"):
+            return None
+        trs = sppas.src.annotationdata.aio.read(filename)
+        return [(tier.GetName(),
+                 [(str(ann.GetLocation()), ann.GetLabel().GetValue()) for ann in tier])
+                for tier in trs]
+
+    # -----------------------------------------------------------------------
+
+    def test_pool(self):
+        serial = os.path.join(self.tmp, "serial")
+        pool = os.path.join(self.tmp, "pool")
+        nb_serial, log_serial = self.__run_ipus(serial, 1)
+        nb_pool, log_pool = self.__run_ipus(pool, 2)
+
+        self.assertEqual(len(SAMPLES), nb_serial)
+        self.assertEqual(nb_serial, nb_pool)
+        self.assertEqual(log_serial, log_pool)
+        self.assertEqual(sorted(os.listdir(serial)), sorted(os.listdir(pool)))
+        for filename in os.listdir(serial):
+            self.assertEqual(self.__read(os.path.join(serial, filename)),
+                             self.__read(os.path.join(pool, filename)))
+
+    # -----------------------------------------------------------------------
+
+    def test_pool_errors(self):
+        serial = os.path.join(self.tmp, "serial")
+        pool = os.path.join(self.tmp, "pool")
+        nb_serial, log_serial = self.__run_ipus(serial, 1, bad_file=True)
+        nb_pool, log_pool = self.__run_ipus(pool, 2, bad_file=True)
+
+        # the bad file is reported, and the other ones are annotated
+        self.assertEqual(len(SAMPLES), nb_pool)
+        self.assertEqual(nb_serial, nb_pool)
+        self.assertEqual(log_serial, log_pool)
+        self.assertTrue("bad.xra" in log_pool)
+        self.assertFalse(os.path.exists(os.path.join(pool, "bad.xra")))
+        for filename in SAMPLES:
+            name = os.path.splitext(os.path.basename(filename))[0] + ".xra"
+            self.assertTrue(os.path.exists(os.path.join(pool, name)))
+
+    # -----------------------------------------------------------------------
+
+    def test_pipeline(self):
+        steps = os.path.join(self.tmp, "steps")
+        nb_steps = self.__run_tracks(steps, 1, pipeline=False)
+        files = self.__get_files(steps)
+
+        # the tracks were annotated by the steps after the IPUs segmentation
+        self.assertEqual([2, 8, 8], nb_steps)
+        self.assertTrue(os.path.join("a-ipus", "track_000001-phon.xra") in files)
+
+        for nb_workers in (1, 2):
+            pipeline = os.path.join(self.tmp, "pipeline%d" % nb_workers)
+            nb_pipeline = self.__run_tracks(pipeline, nb_workers, pipeline=True)
+            self.assertEqual(nb_steps, nb_pipeline)
+            self.assertEqual(files, self.__get_files(pipeline))
+            for filename in files:
+                self.assertEqual(self.__read(os.path.join(steps, filename)),
+                                 self.__read(os.path.join(pipeline, filename)))
@@ -0,0 +1,197 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.annotations.tests.test_momel.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Test Momel.
+
+"""
+import math
+import random
+import unittest
+import os.path
+import shutil
+import tempfile
+
+from sppas import SAMPLES_PATH
+
+from ..Momel.momel import Momel
+from ..Momel.sppasmomel import sppasMomel
+
+SAMPLES = [os.path.join(SAMPLES_PATH, "samples-fra", "F_F_B003-P9.hz"),
+           os.path.join(SAMPLES_PATH, "samples-eng", "ENG_M15_ENG_T02.PitchTier")]
+
+# ---------------------------------------------------------------------------
+
+
+class TestMomel(unittest.TestCase):
+    """ Test of the class Momel. """
+
+    def setUp(self):
+        self.pitch = [150. + 50. * math.sin(2. * math.pi * x / 200.)
+                      for x in range(401)]
+
+    # -----------------------------------------------------------------------
+
+    def test_annotate(self):
+        targets = Momel().annotate(self.pitch)
+        self.assertEqual(4, len(targets))
+        expected = [(50.1, 200.), (150.1, 100.), (250.1, 200.), (350.1, 100.)]
+        for t, (x, y) in zip(targets, expected):
+            self.assertAlmostEqual(x, t.get_x(), places=1)
+            self.assertAlmostEqual(y, t.get_y(), places=1)
+
+        # unvoiced values are not targets
+        pitch = list(self.pitch)
+        pitch[100:120] = [0.] * 20
+        targets = Momel().annotate(pitch)
+        self.assertEqual(4, len(targets))
+        self.assertAlmostEqual(149.9, targets[1].get_x(), places=1)
+
+    # -----------------------------------------------------------------------
+
+    def test_cible(self):
+        """ Targets are the ones of the successive calcrgp() regressions. """
+
+        random.seed(4)
+        pitch = list()
+        for x in range(600):
+            if 220 < x < 260 or x % 97 == 0:
+                pitch.append(0.)
+            else:
+                h = 180. + 60. * math.sin(x / 23.) + random.uniform(-8., 8.)
+                if x % 41 == 0:
+                    h *= 2.
+                pitch.append(h)
+
+        m = Momel()
+        m.initialize()
+        m.set_pitch_array(list(pitch))
+        m.elim_glitch()
+        expected = TestMomel.__cible(m)
+
+        m.initialize()
+        m.set_pitch_array(list(pitch))
+        m.elim_glitch()
+        m.cible()
+        self.assertEqual(expected, [(c.get_x(), c.get_y()) for c in m.cib])
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __cible(m):
+        """ Return the targets estimated by calcrgp() only. """
+
+        pond = [1. if h > m.SEUILV else 0. for h in m.hzptr]
+        pondloc = list(pond)
+        result = list()
+        for ix in range(m.nval):
+            dpx = ix - int(m.lfen1 / 2)
+            fpx = min(m.nval, dpx + m.lfen1 + 1)
+            dpx = max(0, dpx)
+            pondloc[dpx:fpx] = pond[dpx:fpx]
+            nsup = 0
+            nsupr = -1
+            xc = yc = 0.
+            ret_rgp = True
+            while nsup > nsupr:
+                nsupr = nsup
+                nsup = 0
+                try:
+                    m.calcrgp(pondloc, dpx, fpx-1)
+                except Exception:
+                    ret_rgp = False
+                    break
+                for x in range(dpx, fpx):
+                    hzes = m.a0 + (m.a1 + m.a2 * float(x)) * float(x)
+                    if m.hzptr[x] == 0. or hzes / m.hzptr[x] > m.maxec:
+                        nsup += 1
+                        pondloc[x] = 0.
+
+            if ret_rgp is True and m.a2 != 0.:
+                vxc = (0. - m.a1) / (m.a2 + m.a2)
+                if ix - m.lfen1 < vxc < ix + m.lfen1:
+                    vyc = m.a0 + (m.a1 + m.a2 * vxc) * vxc
+                    if m.hzinf < vyc < m.hzsup:
+                        xc = vxc
+                        yc = vyc
+            result.append((xc, yc))
+
+        return result
+
+# ---------------------------------------------------------------------------
+
+
+class TestSppasMomel(unittest.TestCase):
+    """ Test of the annotation of files with Momel. """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    # -----------------------------------------------------------------------
+
+    def test_run_files(self):
+        filenames = list()
+        for i, sample in enumerate(SAMPLES):
+            for folder in ("batch", "single"):
+                if os.path.exists(os.path.join(self.tmp, folder)) is False:
+                    os.mkdir(os.path.join(self.tmp, folder))
+                shutil.copy(sample, os.path.join(self.tmp, folder))
+            filenames.append(os.path.join(self.tmp, "batch", os.path.basename(sample)))
+
+        # a missing file is reported but the other ones are annotated
+        missing = os.path.join(self.tmp, "batch", "missing.hz")
+        outputs = sppasMomel().run_files(filenames + [missing], ".TextGrid")
+        self.assertEqual(3, len(outputs))
+        self.assertIsNone(outputs[2])
+
+        # same targets than the annotation of each file
+        for filename, output in zip(filenames, outputs):
+            base = os.path.splitext(filename)[0]
+            self.assertEqual(base + "-momel.TextGrid", output)
+            self.assertTrue(os.path.exists(output))
+
+            single = os.path.join(self.tmp, "single", os.path.basename(base))
+            sppasMomel().run(single + os.path.splitext(filename)[1],
+                             trsoutput=single + "-momel.TextGrid",
+                             outputfile=single + "-momel.PitchTier")
+            for ext in ("-momel.PitchTier", "-momel.TextGrid"):
+                with open(base + ext) as fp1, open(single + ext) as fp2:
+                    self.assertEqual(fp2.read(), fp1.read())
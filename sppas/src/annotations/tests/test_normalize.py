@@ -50,7 +50,7 @@ from sppas.src.resources.vocab import sppasVocabulary
 from sppas.src.resources.dictrepl import sppasDictRepl
 from sppas.src.anndata import sppasRW
 
-from ..TextNorm.normalize import TextNormalizer
+from ..TextNorm.normalize import TextNormalizer, DictReplUTF8
 from ..TextNorm.orthotranscription import sppasOrthoTranscription
 from ..TextNorm.tokenize import sppasTokenSegmenter
 from ..TextNorm.num2letter import sppasNum
@@ -342,6 +342,22 @@ class TestNormalizer(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_replace_utf8(self):
+        """ ... Replace the UTF8 characters, with a shared automaton. """
+
+        d1 = DictReplUTF8()
+        d2 = DictReplUTF8()
+        self.assertEqual(d1.replace_all(u("« cœur »")), u('" coeur "'))
+        self.assertEqual(d2.replace_all(u("un，deux。")), d1.replace_all(u("un，deux。")))
+        self.assertTrue(d1._automaton is d2._automaton)
+
+        d2.add(u("ß"), u("ss"))
+        self.assertEqual(d2.replace_all(u("straße»")), u('strasse"'))
+        self.assertEqual(d1.replace_all(u("straße»")), u('straße"'))
+        self.assertFalse(d1._automaton is d2._automaton)
+
+    # -----------------------------------------------------------------------
+
     def test_tokenize(self):
         """ ... Tokenize is the text segmentation, i.e. to segment into tokens. """
 
@@ -416,6 +432,25 @@ class TestNormalizer(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_normalize_batch(self):
+        """ ... Normalization of a list of utterances. """
+
+        entries = [u("« Le  Chat »"), u("l’œuf"), u(""), u("[le mot,/lemot/]")]
+        result = self.tok.normalize_batch(entries)
+        self.assertEqual([self.tok.normalize(e) for e in entries], result)
+        self.assertEqual([u("le"), u("chat")], result[0])
+        self.assertEqual([u("l'"), u("oeuf")], result[1])
+        self.assertEqual([], result[2])
+        self.assertEqual([[u("le_mot")]],
+                         self.tok.normalize_batch([u("[le mot,/lemot/]")], ["std"]))
+
+        # the replacements of UTF-8 characters are searched all at once
+        self.assertEqual(u('"aeoe,ab'), self.tok.dicoutf.replace_all(u("«æœ，ab")))
+        self.tok.dicoutf.add(u("ab"), u("AB"))
+        self.assertEqual(u('"aeoe,AB'), self.tok.dicoutf.replace_all(u("«æœ，ab")))
+
+    # -----------------------------------------------------------------------
+
     def test_code_switching(self):
         """ ... [TO DO] support of language switching. """
 
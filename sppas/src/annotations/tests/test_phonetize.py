@@ -52,6 +52,7 @@ from sppas.src.resources.mapping import sppasMapping
 from sppas.src.anndata import sppasRW
 
 from .. import ERROR_ID, WARNING_ID, OK_ID
+from ..log import sppasLog
 from ..Phon.phonetize import sppasDictPhonetizer
 from ..Phon.dagphon import sppasDAGPhonetizer
 from ..Phon.phonunk import sppasPhonUnk
@@ -295,6 +296,21 @@ class TestDAGPhon(unittest.TestCase):
         self.assertEqual(set(result.split("|")),
                          set(self.dd.decompose("p1 p2|x2 p3", "x1 x2 x3").split("|")))
 
+    # -----------------------------------------------------------------------
+
+    def test_iter_variants(self):
+        """ ... Generate the variants, the shortest ones first. """
+        variants = list(self.dd.iter_variants("a|b-c d-e|f"))
+        self.assertEqual([("a-f", 2), ("a-d-e", 3), ("b-c-f", 3), ("b-c-d-e", 4)],
+                         variants)
+        self.assertEqual([("", 1)], list(self.dd.iter_variants("")))
+
+        # only the shortest variants are evaluated
+        dd = sppasDAGPhonetizer(variants=2)
+        result = dd.decompose(" ".join(["a-b|c|d-e-f"] * 100))
+        self.assertEqual("-".join(["c"] * 100) + "|" + "-".join(["a-b"] + ["c"] * 99),
+                         result)
+
 # ---------------------------------------------------------------------------
 
 
@@ -379,6 +395,42 @@ class TestPhonetization(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_memo(self):
+        """ ... Phonetization of the repeated tokens is taken from the memo. """
+
+        self.sp.set_unk(True)
+        memo = self.sp.get_memo()
+        self.assertEqual(0, len(memo))
+        self.assertEqual(["h-i:", "h-i:"], self.sp.phonetize("HE HE"))
+        self.assertEqual((1, 1), (memo.get_hits(), memo.get_misses()))
+        self.assertEqual(["h-i:"], self.sp.phonetize("HE"))
+        self.assertEqual(2, memo.get_hits())
+
+        # the unk option is part of the key
+        self.sp.set_unk(False)
+        self.assertEqual(unk_stamp, self.sp.phonetize("BANCI"))
+        self.sp.set_unk(True)
+        self.assertNotEqual(unk_stamp, self.sp.phonetize("BANCI"))
+        self.assertEqual(3, len(memo))
+
+    # -----------------------------------------------------------------------
+
+    def test_run_memo_report(self):
+        """ ... The statistics of the memo are reported at the end of run. """
+
+        log = sppasLog(None)
+        log.create_buffer()
+        self.sp.logfile = log
+        self.sp.run(os.path.join(SAMPLES_PATH, "annotation-results",
+                                 "samples-eng", "oriana1-token.xra"))
+        memo = self.sp.get_memo()
+        self.assertGreater(memo.get_hits(), 0)
+        report = "Memo of the phonetizations: {:d} hits, {:d} misses, " \
+                 "{:d} tokens.".format(memo.get_hits(), memo.get_misses(), len(memo))
+        self.assertIn(report, log.pop_buffer())
+
+    # -----------------------------------------------------------------------
+
     def test_phonetize_learners(self):
         """ ... Phonetization of an utterance with a map table defined. """
 
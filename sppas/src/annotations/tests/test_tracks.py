@@ -5,6 +5,7 @@ import unittest
 import os.path
 
 from ..Align.aligners.alignerio import AlignerIO
+from ..Align.tracks import TracksStore
 from ..Chunks.anchors import AnchorTier
 from sppas.src.annotationdata import Annotation, TimeInterval, TimePoint, Label, Text
 from sppas.src.resources.patterns import sppasPatterns
@@ -248,3 +249,30 @@ class TestTracksAlign(unittest.TestCase):
         m1 = pattern.ngram_alignments(newref, newhyp)
         newm1 = [(v[0]+minr, v[1]+minh) for v in m1]
         self.assertEqual(newm1, [(6, 6)])
+
+# --------------------------------------------------------------------------
+
+
+class TestTracksStore(unittest.TestCase):
+
+    def setUp(self):
+        self._store = TracksStore()
+
+    def test_append(self):
+        self.assertEqual(len(self._store), 0)
+        self.assertEqual(self._store.append(0.1234567, 1.5, u"a b", u"w1"), 1)
+        self.assertEqual(self._store.append(1.5, 2., u"", u""), 2)
+        self.assertEqual(len(self._store), 2)
+        self.assertEqual(self._store.get_units(), [(0.123457, 1.5), (1.5, 2.)])
+        self.assertEqual(self._store.get_phones(1), u"a b")
+        self.assertEqual(self._store.get_tokens(1), u"w1")
+        self.assertEqual(self._store.get_duration(1), 0.)
+
+    def test_aligned(self):
+        self._store.append(0., 1., u"a", u"w1")
+        with self.assertRaises(IOError):
+            self._store.get_aligned(1)
+        phones = [[0., 1., u"a", None]]
+        words = [[0., 1., u"w1", None]]
+        self._store.set_aligned(1, phones, words)
+        self.assertEqual(self._store.get_aligned(1), (phones, words))
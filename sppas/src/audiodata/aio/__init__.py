@@ -119,3 +119,28 @@ def save_fragment(filename, audio, frames):
 
     output.set(audio)
     output.save_fragment(filename, frames)
+
+# ----------------------------------------------------------------------------
+
+
+def save_blocks(filename, audio, blocks):
+    """ Write an audio file from blocks of frames.
+
+    The frames are written block by block: this is useful to save a
+    content which is too large to be stored in memory.
+
+    :param filename: (str) the file name (including path)
+    :param audio: (sppasAudioPCM) the Audio with the parameters to write.
+    :param blocks: (iterable) the frames to write, block by block
+    :raises: IOError
+
+    >>> mixer = sppasChannelMixer()
+    >>> ...
+    >>> audiodata.aio.save_blocks(filename, audio, mixer.mix_blocks())
+
+    """
+    ext = get_extension(filename).lower()
+    output = sppasAudioFactory.new_audio_pcm(ext)
+
+    output.set(audio)
+    output.save_blocks(u(filename), blocks)
@@ -132,3 +132,25 @@ class WaveIO(sppasAudioPCM):
             f.writeframes(frames)
         finally:
             f.close()
+
+    # -----------------------------------------------------------------------
+
+    def save_blocks(self, filename, blocks):
+        """ Write an audio content as a Waveform Audio File Format file.
+
+        Blocks are written as soon as they are available, so that the whole
+        content has never to be stored in memory.
+
+        :param filename: (str) output filename.
+        :param blocks: (iterable) the frames to write, block by block
+
+        """
+        f = wave.Wave_write(u(filename))
+        f.setnchannels(self.get_nchannels())
+        f.setsampwidth(self.get_sampwidth())
+        f.setframerate(self.get_framerate())
+        try:
+            for frames in blocks:
+                f.writeframes(frames)
+        finally:
+            f.close()
@@ -228,10 +228,7 @@ class sppasAudioPCM(object):
             channel = sppasChannel(self.get_framerate(), self.get_sampwidth(), data)
             return self.append_channel(channel)
 
-        frames = ""
-        sw = self.get_sampwidth()
-        for i in range(index*sw, len(data), nc*sw):
-            frames += data[i:i+sw]
+        frames = sppasAudioConverter.deinterleave(data, self.get_sampwidth(), nc, [index])[0]
         channel = sppasChannel(self.get_framerate(), self.get_sampwidth(), frames)
 
         return self.append_channel(channel)
@@ -242,6 +239,8 @@ class sppasAudioPCM(object):
         """ Extract all channels from the Audio File Pointer,
          and append them to the list of channels.
 
+        The channels are de-interleaved in a single pass over the data.
+
         """
         if self._audio_fp is None:
             raise AudioError
@@ -254,11 +253,8 @@ class sppasAudioPCM(object):
         if nc == 0:
             raise AudioDataError
 
-        for index in range(nc):
-            frames = ""
-            for i in range(index*sw, len(data), nc*sw):
-                frames = frames + data[i:i+sw]
-            channel = sppasChannel(self.get_framerate(), self.get_sampwidth(), frames)
+        for frames in sppasAudioConverter.deinterleave(data, sw, nc):
+            channel = sppasChannel(self.get_framerate(), sw, frames)
             self.append_channel(channel)
 
     # ----------------------------------------------------------------------
@@ -504,6 +500,13 @@ class sppasAudioPCM(object):
 
     # ------------------------------------------------------------------------
 
+    def save_blocks(self, filename, blocks):
+        """ Save an audio file from blocks of frames. """
+        name = self.__class__.__name__
+        raise NotImplementedError("%s does not support save_blocks()." % name)
+
+    # ------------------------------------------------------------------------
+
     def close(self):
         """ Close the audio file. """
 
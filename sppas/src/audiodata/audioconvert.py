@@ -35,11 +35,24 @@
 """
 import struct
 import math
+import sys
+import array
 
+from sppas.src.utils.makeunicode import text_type
 from .audiodataexc import SampleWidthError, ChannelIndexError
 
 # ---------------------------------------------------------------------------
 
+# Typecode of the array.array storing one sample, for each sample width.
+# The 4 bytes one depends on the platform: 'i' or 'l'.
+ARRAY_TYPECODES = {
+    1: 'b',
+    2: 'h',
+    4: 'i' if array.array('i').itemsize == 4 else 'l'
+}
+
+# ---------------------------------------------------------------------------
+
 
 class sppasAudioConverter(object):
     """
@@ -87,7 +100,7 @@ class sppasAudioConverter(object):
         if nchannels > 1:
             # Split channels
             for i in range(nchannels):
-                samples.append([data[j] for j in range(i, len(data), nchannels)])
+                samples.append(data[i::nchannels])
         else:
             samples.append(list(data))
 
@@ -95,6 +108,158 @@ class sppasAudioConverter(object):
 
     # ----------------------------------------------------------------------------
 
+    @staticmethod
+    def to_view(frames):
+        """ Return a view on frames: slicing the view does not copy the frames.
+
+        With Python 2.7, audioop and wave do not support memoryview: the
+        frames are returned as they are, and slicing them makes a copy.
+
+        :param frames: (bytes or memoryview) Audio frames
+        :returns: memoryview
+
+        """
+        if sys.version_info < (3,):
+            if isinstance(frames, memoryview):
+                return frames.tobytes()
+            return frames
+
+        return memoryview(frames)
+
+    # ----------------------------------------------------------------------------
+
+    @staticmethod
+    def to_bytes(frames):
+        """ Return frames as bytes, i.e. a copy of a view.
+
+        :param frames: (bytes or memoryview) Audio frames
+        :returns: bytes
+
+        """
+        if isinstance(frames, memoryview):
+            return frames.tobytes()
+
+        return frames
+
+    # ----------------------------------------------------------------------------
+
+    @staticmethod
+    def to_buffer(frames):
+        """ Return frames as an object supporting the buffer protocol.
+
+        Bytes and memoryviews are returned as they are: no copy is done.
+        Other types (text, bytearray, array) are turned into bytes.
+
+        :param frames: (str, bytes, memoryview, bytearray or array) Audio frames
+        :returns: bytes or memoryview
+
+        """
+        if isinstance(frames, (bytes, memoryview)):
+            return frames
+        if isinstance(frames, array.array):
+            return sppasAudioConverter.array2frames(frames)
+        if isinstance(frames, text_type):
+            # frames were stored into a string of Python 2.
+            return frames.encode("latin-1")
+
+        return bytes(frames)
+
+    # ----------------------------------------------------------------------------
+
+    @staticmethod
+    def frames2array(frames, samples_width):
+        """ Turn frames into a typed array of samples.
+
+        The array is filled in one pass, at the C level. Samples are signed,
+        like for audioop, and interleaved if frames contains several channels.
+
+        :param frames: (bytes or memoryview) Audio frames, little-endian
+        :param samples_width: (int) 1, 2 or 4
+        :returns: (array.array)
+
+        """
+        samples_width = int(samples_width)
+        if samples_width not in ARRAY_TYPECODES:
+            raise SampleWidthError(samples_width)
+
+        samples = array.array(ARRAY_TYPECODES[samples_width])
+        if hasattr(samples, "frombytes"):
+            samples.frombytes(frames)
+        else:
+            # Python 2.7
+            if isinstance(frames, memoryview):
+                frames = frames.tobytes()
+            samples.fromstring(frames)
+        if sys.byteorder == "big" and samples_width > 1:
+            samples.byteswap()
+
+        return samples
+
+    # ----------------------------------------------------------------------------
+
+    @staticmethod
+    def array2frames(samples):
+        """ Turn a typed array of samples into little-endian frames.
+
+        :param samples: (array.array) Samples
+        :returns: (bytes) frames
+
+        """
+        if sys.byteorder == "big" and samples.itemsize > 1:
+            samples = array.array(samples.typecode, samples)
+            samples.byteswap()
+        if hasattr(samples, "tobytes"):
+            return samples.tobytes()
+        return samples.tostring()  # Python 2.7
+
+    # ----------------------------------------------------------------------------
+
+    @staticmethod
+    def deinterleave(frames, samples_width, nchannels, indexes=None):
+        """ Split interleaved frames into the frames of each channel.
+
+        Channels are extracted with strided slices of one array of samples,
+        so that each byte of the frames is copied only once.
+
+        :param frames: (bytes or memoryview) Interleaved audio frames
+        :param samples_width: (int) 1, 2 or 4
+        :param nchannels: (int) number of channels in the frames
+        :param indexes: (list of int) indexes of the channels to extract.
+        None to extract all of them.
+        :returns: (list of bytes) the frames of each extracted channel
+
+        """
+        samples_width = int(samples_width)
+        nchannels = int(nchannels)
+        if nchannels < 1:
+            raise ChannelIndexError(nchannels)
+        if samples_width not in ARRAY_TYPECODES:
+            raise SampleWidthError(samples_width)
+        if indexes is None:
+            indexes = range(nchannels)
+        for i in indexes:
+            if i < 0 or i >= nchannels:
+                raise ChannelIndexError(i)
+
+        # Incomplete frames at the end are ignored
+        frames = memoryview(frames)
+        frames = frames[:len(frames) - len(frames) % (samples_width*nchannels)]
+        if nchannels == 1:
+            return [frames.tobytes() for i in indexes]
+        if samples_width == 1:
+            frames = frames.tobytes()
+            return [frames[i::nchannels] for i in indexes]
+
+        # Frames are only moved, not read: the byte order does not matter
+        samples = array.array(ARRAY_TYPECODES[samples_width])
+        if hasattr(samples, "frombytes"):
+            samples.frombytes(frames)
+            return [samples[i::nchannels].tobytes() for i in indexes]
+        samples.fromstring(frames.tobytes())  # Python 2.7
+        return [samples[i::nchannels].tostring() for i in indexes]
+
+    # ----------------------------------------------------------------------------
+
     @staticmethod
     def samples2frames(samples, samples_width, nchannels=1):
         """ Turn samples into frames.
@@ -36,6 +36,7 @@
 import audioop
 import struct
 
+from .audioconvert import sppasAudioConverter
 from .audiodataexc import SampleWidthError, ChannelIndexError
 
 # ---------------------------------------------------------------------------
@@ -53,16 +54,18 @@ class sppasAudioFrames(object):
     TODO: There's no unittests of this class.
 
     """
-    def __init__(self, frames="", sampwidth=2, nchannels=1):
+    def __init__(self, frames=b"", sampwidth=2, nchannels=1):
         """ Create an sppasAudioFrames instance.
 
-        :param frames: (str) input frames.
+        The frames are not copied if they are bytes or a memoryview.
+
+        :param frames: (str, bytes or memoryview) input frames.
         :param sampwidth: (int) sample width of the frames.
         :param nchannels: (int) number of channels in the samples
 
         """
         # Check the type and if values are appropriate
-        frames = str(frames)
+        frames = sppasAudioConverter.to_buffer(frames)
         if sampwidth not in [1, 2, 4]:
             raise SampleWidthError
         nchannels = int(nchannels)
@@ -175,12 +178,10 @@ class sppasAudioFrames(object):
             return audioop.rms(self._frames, self._sampwidth)
         else:
             rms_sum = 0
-            for i in range(self._nchannels):
-                new_frames = ""
-                for j in range(i*self._sampwidth, len(self._frames), self._sampwidth*self._nchannels):
-                    for k in range(self._sampwidth):
-                        new_frames = new_frames + self._frames[j+k]
-                rms_sum += audioop.rms(new_frames, self._sampwidth)
+            for frames in sppasAudioConverter.deinterleave(self._frames,
+                                                           self._sampwidth,
+                                                           self._nchannels):
+                rms_sum += audioop.rms(frames, self._sampwidth)
 
             return int(rms_sum/self._nchannels)
 
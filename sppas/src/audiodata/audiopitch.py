@@ -32,8 +32,16 @@
     src.audiodata.audiopitch.py
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    TO BE IMPLEMENTED.
+    Estimation of the fundamental frequency (F0) of a channel.
+
 """
+import math
+import operator
+
+from .audioframes import sppasAudioFrames
+from .audioconvert import sppasAudioConverter
+
+# ---------------------------------------------------------------------------
 
 
 class AudioPitch(object):
@@ -42,15 +50,48 @@ class AudioPitch(object):
     :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
     :contact:      brigitte.bigi@gmail.com
     :license:      GPL, v3
-    :copyright:    Copyright (C) 2011-2017  Brigitte Bigi
-    :summary:      A pitch audio utility class. NOT IMPLEMENTED!!!!
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      A pitch audio utility class.
+
+    Pitch is estimated by the normalized autocorrelation of the frames
+    of a channel, in the range [hzinf, hzsup]. A value is evaluated each
+    delta seconds: the i-th value is the pitch at time (i+0.5)*delta, and
+    it is 0 for unvoiced frames. It is the list of pitch values expected
+    by Momel.
+
+    >>> pitch = AudioPitch(delta=0.01, hzinf=50, hzsup=600)
+    >>> pitch.eval_pitch(channel)
+    >>> values = pitch.get_pitch_list()
 
     """
-    def __init__(self, delta=0.01):
-        """ Create a new AudioPitch instance. """
+    # Frames are down-sampled to this rate before estimating pitch
+    MAX_FRAMERATE = 8000
+
+    # Frames with a peak lower than this ratio of the peak of the channel
+    # are unvoiced
+    SILENCE_THRESHOLD = 0.03
 
+    # Frames with a lower autocorrelation are unvoiced
+    VOICING_THRESHOLD = 0.45
+
+    # Favor the higher pitch candidates, to avoid octave jumps
+    OCTAVE_COST = 0.01
+
+    # Number of candidates evaluated at the frame rate
+    NB_CANDIDATES = 3
+
+    def __init__(self, delta=0.01, hzinf=50, hzsup=600):
+        """ Create a new AudioPitch instance.
+
+        :param delta: (float) Time between two pitch values, in seconds
+        :param hzinf: (int) Minimum pitch value, in Hz
+        :param hzsup: (int) Maximum pitch value, in Hz
+
+        """
         self.pitch = []
         self.delta = delta
+        self.hzinf = hzinf
+        self.hzsup = hzsup
 
     # ------------------------------------------------------------------
 
@@ -61,8 +102,8 @@ class AudioPitch(object):
         :returns: float
 
         """
-        idx = int(time/self.delta) + 1
-        if len(self.pitch) < idx:
+        idx = int(time/self.delta)
+        if 0 <= idx < len(self.pitch):
             return self.pitch[idx]
         else:
             raise ValueError('%d not in range' % idx)
@@ -83,11 +124,147 @@ class AudioPitch(object):
 
     # ------------------------------------------------------------------
 
-    def eval_pitch(self, filename):
-        """ WILL evaluate pitch values...
+    def eval_pitch(self, channel):
+        """ Evaluate pitch values of a channel.
+
+        :param channel: (sppasChannel) The channel to work on
+        :returns: (list) pitch values, one each delta seconds
+
+        """
+        if self.hzinf <= 0 or self.hzsup <= self.hzinf:
+            raise ValueError('Invalid pitch range [%s, %s]' % (self.hzinf, self.hzsup))
+
+        framerate = channel.get_framerate()
+        nframes = channel.get_nframes()
+        samples = channel.get_samples()
+        if framerate > AudioPitch.MAX_FRAMERATE:
+            frames = sppasAudioFrames(channel.get_frames(), channel.get_sampwidth(), 1)
+            frames = frames.resample(framerate, AudioPitch.MAX_FRAMERATE)
+            samples = sppasAudioConverter.frames2array(frames, channel.get_sampwidth())
+            framerate = AudioPitch.MAX_FRAMERATE
+        samples = [float(s) for s in samples]
+
+        npitch = int(float(nframes) / channel.get_framerate() / self.delta)
+        self.pitch = [0.] * npitch
+        if len(samples) == 0:
+            return self.pitch
+
+        win_size = 3 * self.__lags(framerate)[1]
+        half = win_size // 2
+        silence = AudioPitch.SILENCE_THRESHOLD * max(abs(s) for s in samples)
+
+        for i in range(npitch):
+            center = int((i + 0.5) * self.delta * framerate)
+            start = center - half
+            if start < 0 or start + win_size > len(samples):
+                continue
+            frame = samples[start:start+win_size]
+            mean = sum(frame) / win_size
+            frame = [s - mean for s in frame]
+            if max(abs(s) for s in frame) < silence:
+                continue
+            self.pitch[i] = self.__frame_pitch(frame, framerate)
+
+        return self.pitch
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __frame_pitch(self, frame, framerate):
+        """ Return the pitch of a frame, or 0 if it is unvoiced.
+
+        Candidates are searched at half the frame rate, then the best ones
+        are evaluated again at the frame rate.
+
+        """
+        # Search for candidates at half the frame rate
+        coarse = [(frame[2*i] + frame[2*i+1]) / 2. for i in range(len(frame) // 2)]
+        rate = framerate / 2.
+        min_lag, max_lag = self.__lags(rate)
+        energy = AudioPitch.__cumulated_energy(coarse)
+        r = dict()
+        for lag in range(min_lag - 1, max_lag + 2):
+            r[lag] = AudioPitch.__autocorrelation(coarse, energy, lag)
+
+        candidates = list()
+        for lag in range(min_lag, max_lag + 1):
+            if r[lag] >= AudioPitch.VOICING_THRESHOLD and r[lag-1] <= r[lag] >= r[lag+1]:
+                candidates.append((self.__strength(r[lag], lag, rate), lag))
+        candidates = sorted(candidates, reverse=True)[:AudioPitch.NB_CANDIDATES]
+
+        # Evaluate the candidates at the frame rate
+        min_lag, max_lag = self.__lags(framerate)
+        energy = AudioPitch.__cumulated_energy(frame)
+        best_lag = 0
+        best_strength = None
+        for s, c in candidates:
+            r = dict()
+            for lag in range(max(1, 2*c - 2), min(len(frame) - 1, 2*c + 3)):
+                r[lag] = AudioPitch.__autocorrelation(frame, energy, lag)
+            lag = max([l for l in (2*c - 1, 2*c, 2*c + 1) if min_lag <= l <= max_lag and l in r],
+                      key=r.get)
+            if r[lag] < AudioPitch.VOICING_THRESHOLD:
+                continue
+            strength = self.__strength(r[lag], lag, framerate)
+            if best_strength is None or strength > best_strength:
+                best_strength = strength
+                # parabolic interpolation of the lag
+                best_lag = float(lag)
+                denominator = r[lag-1] - 2. * r[lag] + r[lag+1]
+                if denominator < 0.:
+                    best_lag += 0.5 * (r[lag-1] - r[lag+1]) / denominator
+
+        if best_lag == 0:
+            return 0.
+        pitch = framerate / best_lag
+        if pitch < self.hzinf or pitch > self.hzsup:
+            return 0.
+        return pitch
+
+    # -----------------------------------------------------------------------
+
+    def __lags(self, framerate):
+        """ Return the min and max lags of the pitch range. """
+
+        return (max(2, int(framerate / float(self.hzsup))),
+                int(math.ceil(framerate / float(self.hzinf))))
+
+    # -----------------------------------------------------------------------
+
+    def __strength(self, r, lag, framerate):
+        """ Return the strength of a candidate: the higher, the better. """
+
+        return r - AudioPitch.OCTAVE_COST * math.log(float(self.hzinf * lag) / framerate, 2)
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __cumulated_energy(frame):
+        """ Return the cumulated energy of the samples of a frame. """
+
+        energy = [0.]
+        for s in frame:
+            energy.append(energy[-1] + s * s)
+        return energy
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __autocorrelation(frame, energy, lag):
+        """ Return the normalized autocorrelation of a frame at a given lag.
+
+        :param frame: (list) samples of the frame
+        :param energy: (list) cumulated energy of the frame
+        :param lag: (int) the lag, in number of samples
 
         """
-        raise NotImplementedError
+        n = len(frame)
+        e1 = energy[n - lag]
+        e2 = energy[n] - energy[lag]
+        if e1 <= 0. or e2 <= 0.:
+            return 0.
+        return sum(map(operator.mul, frame[:n-lag], frame[lag:])) / math.sqrt(e1 * e2)
 
     # -----------------------------------------------------------------------
     # Overloads
@@ -32,7 +32,10 @@
     ~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
+import audioop
+
 from .audioframes import sppasAudioFrames
+from .audioconvert import sppasAudioConverter
 from .audiodataexc import IntervalError, SampleWidthError, FrameRateError
 
 # ----------------------------------------------------------------------------
@@ -47,18 +50,27 @@ class sppasChannel(object):
     :copyright:    Copyright (C) 2011-2017  Brigitte Bigi
     :summary:      A class to manage a channel.
 
+    The frames are stored in an immutable buffer. Windows of frames can be
+    accessed with get_view() and fragments can be extracted without any copy:
+    they share the buffer of the channel they were extracted from. The
+    samples can be obtained as a typed array with get_samples(): it is
+    evaluated once and then cached. The same is done for the RMS values of
+    the windows returned by get_volumes().
+
     """
-    def __init__(self, framerate=16000, sampwidth=2, frames=""):
+    def __init__(self, framerate=16000, sampwidth=2, frames=b""):
         """ Create a sppasChannel instance.
 
         :param framerate: (int) The frame rate of this channel, in Hertz.
         :param sampwidth: (int) 1 for 8 bits, 2 for 16 bits, 4 for 32 bits.
-        :param frames: (str) The frames represented by a string.
+        :param frames: (str, bytes or memoryview) The frames.
 
         """
         self._framerate = 16000
         self._sampwidth = 2
-        self._frames = ""
+        self._frames = b""
+        self._samples = None
+        self._volumes = dict()
         self._position = 0
 
         self.set_framerate(framerate)
@@ -74,10 +86,14 @@ class sppasChannel(object):
         It is supposed the sampwidth and framerate are the same as the 
         current ones.
 
-        :param frames: (str) the new frames
+        If frames is a memoryview, it is shared and not copied.
+
+        :param frames: (str, bytes or memoryview) the new frames
 
         """
-        self._frames = str(frames)
+        self._frames = sppasAudioConverter.to_buffer(frames)
+        self._samples = None
+        self._volumes = dict()
 
     # ----------------------------------------------------------------------
 
@@ -92,6 +108,8 @@ class sppasChannel(object):
             raise SampleWidthError(sampwidth)
 
         self._sampwidth = sampwidth
+        self._samples = None
+        self._volumes = dict()
 
     # ----------------------------------------------------------------------
 
@@ -107,6 +125,7 @@ class sppasChannel(object):
             self._framerate = framerate
         else:
             raise FrameRateError(framerate)
+        self._volumes = dict()
 
     # ----------------------------------------------------------------------
     # Getters
@@ -117,21 +136,54 @@ class sppasChannel(object):
 
         :param chunck_size: (int) the size of the chunk to return.
         None for all frames of the channel.
-        :returns: (str) the frames
+        :returns: (bytes) the frames
+
+        """
+        if chunck_size is None:
+            return sppasAudioConverter.to_bytes(self._frames)
+
+        return sppasAudioConverter.to_bytes(self.get_view(chunck_size))
+
+    # -----------------------------------------------------------------------
+
+    def get_view(self, chunck_size=None):
+        """ Return a view on some frames from the current position.
+
+        Contrariwise to get_frames(), the frames are not copied: the returned
+        memoryview shares the buffer of the channel.
+
+        :param chunck_size: (int) the size of the chunk to return.
+        None for all frames of the channel.
+        :returns: (memoryview) the frames
 
         """
+        view = sppasAudioConverter.to_view(self._frames)
         if chunck_size is None:
-            return self._frames
+            return view
 
         chunck_size = int(chunck_size)
         p = self._position
-        m = len(self._frames)
         s = p*self._sampwidth
-        e = min(m, s + chunck_size*self._sampwidth)
-        f = ''.join(self._frames[i] for i in range(s, e))
+        e = min(len(view), s + chunck_size*self._sampwidth)
         self._position = p + chunck_size
 
-        return f
+        return view[s:e]
+
+    # -----------------------------------------------------------------------
+
+    def get_samples(self):
+        """ Return all the samples of the channel in a typed array.
+
+        The array is created at the first call then it is cached until the
+        frames are changed. It must not be modified.
+
+        :returns: (array.array) signed samples values
+
+        """
+        if self._samples is None:
+            self._samples = sppasAudioConverter.frames2array(self._frames,
+                                                             self._sampwidth)
+        return self._samples
 
     # -----------------------------------------------------------------------
 
@@ -142,7 +194,7 @@ class sppasChannel(object):
         :returns: (int) the total number of frames
 
         """
-        return len(self._frames)/self._sampwidth
+        return len(self._frames) // self._sampwidth
 
     # -----------------------------------------------------------------------
 
@@ -188,6 +240,48 @@ class sppasChannel(object):
 
     # -----------------------------------------------------------------------
 
+    def get_volumes(self, win_len=0.01, hop_len=None):
+        """ Return the RMS values of the windows of the channel.
+
+        The i-th window starts at i*hop_len and lasts win_len. All the values
+        are estimated in one pass over the frames, then they are cached: the
+        next calls with the same lengths do not estimate them again.
+        The last value is removed if it is 0, i.e. if the last window is
+        empty or silent.
+
+        :param win_len: (float) Window length, in seconds.
+        :param hop_len: (float) Time between the start of two successive
+        windows, in seconds. Default is win_len.
+        :returns: (list of int) The RMS values. The list must not be modified.
+
+        """
+        win_nframes = int(win_len * self._framerate)
+        if hop_len is None:
+            hop_nframes = win_nframes
+        else:
+            hop_nframes = int(hop_len * self._framerate)
+        if win_nframes <= 0:
+            raise ValueError("Invalid window length %f" % win_len)
+        if hop_nframes <= 0:
+            raise ValueError("Invalid hop length %f" % hop_len)
+
+        key = (win_nframes, hop_nframes)
+        if key not in self._volumes:
+            frames = sppasAudioConverter.to_view(self._frames)
+            sw = self._sampwidth
+            win_size = win_nframes * sw
+            hop_size = hop_nframes * sw
+            nbvols = self.get_nframes() // hop_nframes + 1
+            volumes = [audioop.rms(frames[i:i+win_size], sw)
+                       for i in range(0, nbvols*hop_size, hop_size)]
+            if volumes[-1] == 0:
+                volumes.pop()
+            self._volumes[key] = volumes
+
+        return self._volumes[key]
+
+    # -----------------------------------------------------------------------
+
     def clipping_rate(self, factor):
         """ Return the clipping rate of the frames.
 
@@ -215,6 +309,9 @@ class sppasChannel(object):
     def extract_fragment(self, begin=None, end=None):
         """ Extract a fragment between the beginning and the end.
 
+        The frames of the returned channel are a view on the ones of this
+        channel: they are not copied.
+
         :param begin: (int: number of frames) the beginning of the fragment to extract
         :param end: (int: number of frames) the end of the fragment to extract
 
@@ -233,7 +330,7 @@ class sppasChannel(object):
             end = nframes
 
         if begin > nframes:
-            return sppasChannel(self._framerate, self._sampwidth, "")
+            return sppasChannel(self._framerate, self._sampwidth, b"")
         if begin < 0:
             begin = 0
 
@@ -244,11 +341,8 @@ class sppasChannel(object):
             raise IntervalError(begin, end)
 
         pos_begin = int(begin*self._sampwidth)
-        if end == self.get_nframes():
-            frames = self._frames[pos_begin:]
-        else:
-            pos_end = int(end*self._sampwidth)
-            frames = self._frames[pos_begin:pos_end]
+        pos_end = int(end*self._sampwidth)
+        frames = sppasAudioConverter.to_view(self._frames)[pos_begin:pos_end]
 
         return sppasChannel(self._framerate, self._sampwidth, frames)
 
@@ -276,7 +370,7 @@ class sppasChannel(object):
         :param position: (int)
 
         """
-        self._position = max(0, min(position, len(self._frames)/self._sampwidth))
+        self._position = max(0, min(position, self.get_nframes()))
 
     # ------------------------------------------------------------------------
 
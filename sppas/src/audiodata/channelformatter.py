@@ -126,7 +126,7 @@ class sppasChannelFormatter(object):
 
         """
         new_channel = sppasChannel()
-        new_channel.set_frames(self.__convert_frames(self._channel.get_frames()))
+        new_channel.set_frames(self.__convert_frames(self._channel.get_view()))
         new_channel.set_sampwidth(self._sampwidth)
         new_channel.set_framerate(self._framerate)
 
@@ -148,7 +148,7 @@ class sppasChannelFormatter(object):
         new_channel = sppasChannel()
         new_channel.set_sampwidth(self._sampwidth)
         new_channel.set_framerate(self._framerate)
-        a = sppasAudioFrames(self._channel.get_frames(self._channel.get_nframes()), self._channel.get_sampwidth(), 1)
+        a = sppasAudioFrames(self._channel.get_view(), self._channel.get_sampwidth(), 1)
         new_channel.set_frames(a.bias(bias_value))
 
         self._channel = new_channel
@@ -169,7 +169,7 @@ class sppasChannelFormatter(object):
         new_channel = sppasChannel()
         new_channel.set_sampwidth(self._sampwidth)
         new_channel.set_framerate(self._framerate)
-        a = sppasAudioFrames(self._channel.get_frames(self._channel.get_nframes()), self._channel.get_sampwidth(), 1)
+        a = sppasAudioFrames(self._channel.get_view(), self._channel.get_sampwidth(), 1)
         new_channel.set_frames(a.mul(factor))
 
         self._channel = new_channel
@@ -182,7 +182,7 @@ class sppasChannelFormatter(object):
         new_channel = sppasChannel()
         new_channel.set_sampwidth(self._sampwidth)
         new_channel.set_framerate(self._framerate)
-        a = sppasAudioFrames(self._channel.get_frames(self._channel.get_nframes()), self._channel.get_sampwidth(), 1)
+        a = sppasAudioFrames(self._channel.get_view(), self._channel.get_sampwidth(), 1)
         avg = a.avg()
         new_channel.set_frames(a.bias(- avg))
 
@@ -217,8 +217,9 @@ class sppasChannelFormatter(object):
         if end < begin:
             raise ValueError
         new_channel = sppasChannel()
-        f = self._channel.get_frames()
-        new_channel.set_frames(f[:begin*self._sampwidth] + f[end*self._sampwidth:])
+        f = self._channel.get_view()
+        new_channel.set_frames(b"".join((f[:begin*self._sampwidth],
+                                         f[end*self._sampwidth:])))
         new_channel.set_sampwidth(self._sampwidth)
         new_channel.set_framerate(self._framerate)
         self._channel = new_channel
@@ -235,8 +236,10 @@ class sppasChannelFormatter(object):
         if len(frames) == 0:
             return
         new_channel = sppasChannel()
-        f = self._channel.get_frames()
-        new_channel.set_frames(f[:position*self._sampwidth] + frames + f[position*self._sampwidth:])
+        f = self._channel.get_view()
+        new_channel.set_frames(b"".join((f[:position*self._sampwidth],
+                                         frames,
+                                         f[position*self._sampwidth:])))
         new_channel.set_sampwidth(self._sampwidth)
         new_channel.set_framerate(self._framerate)
         self._channel = new_channel
@@ -252,7 +255,7 @@ class sppasChannelFormatter(object):
         if len(frames) == 0:
             return
         new_channel = sppasChannel()
-        new_channel.set_frames(self._channel.get_frames() + frames)
+        new_channel.set_frames(b"".join((self._channel.get_view(), frames)))
         new_channel.set_sampwidth(self._sampwidth)
         new_channel.set_framerate(self._framerate)
         self._channel = new_channel
@@ -264,7 +267,7 @@ class sppasChannelFormatter(object):
     def __convert_frames(self, frames):
         """ Convert frames to the expected sample width and frame rate.
 
-        :param frames: (str) the frames to convert
+        :param frames: (bytes or memoryview) the frames to convert
 
         """
         f = frames
@@ -33,6 +33,7 @@
 
 """
 from .audioframes import sppasAudioFrames
+from .audioconvert import sppasAudioConverter
 
 # ---------------------------------------------------------------------------
 
@@ -47,13 +48,13 @@ class sppasChannelFrames(object):
     :summary:      An utility for frames of one channel only.
 
     """
-    def __init__(self, frames=""):
+    def __init__(self, frames=b""):
         """ Create a sppasChannelFrames instance.
 
-        :param frames: (str) Frames that must be MONO ONLY.
+        :param frames: (str, bytes or memoryview) Frames that must be MONO ONLY.
 
         """
-        self._frames = frames
+        self._frames = sppasAudioConverter.to_buffer(frames)
 
     # -----------------------------------------------------------------------
 
@@ -70,10 +71,10 @@ class sppasChannelFrames(object):
     def set_frames(self, frames):
         """ Set the frames.
 
-        :param frames: (str) the frames to set
+        :param frames: (str, bytes or memoryview) the frames to set
 
         """
-        self._frames = frames
+        self._frames = sppasAudioConverter.to_buffer(frames)
 
     # ----------------------------------------------------------------------------
 
@@ -87,7 +88,7 @@ class sppasChannelFrames(object):
         if nframes <= 0:
             return False
 
-        self._frames += " \x00"*nframes
+        self._frames = b"".join((self._frames, b" \x00"*nframes))
         return True
 
     # ----------------------------------------------------------------------------
@@ -102,7 +103,7 @@ class sppasChannelFrames(object):
         if nframes <= 0:
             return False
 
-        self._frames = " \x00"*nframes + self._frames
+        self._frames = b"".join((b" \x00"*nframes, self._frames))
         return True
 
     # ----------------------------------------------------------------------------
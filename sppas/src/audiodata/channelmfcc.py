@@ -31,7 +31,8 @@
     src.audiodata.channelmfcc.py
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    Requires HTK to be installed.
+    MFCC can be either evaluated in-process from the samples of a channel,
+    or created by HTK HCopy (requires HTK to be installed).
 
 
     Mel-frequency cepstrum (MFC) is a representation of the short-term power
@@ -48,8 +49,50 @@
 
 """
 import os
+import math
+import struct
 import subprocess
 
+from .audiodataexc import ChannelError
+from .audiodataexc import AudioDataError
+
+# ---------------------------------------------------------------------------
+
+# HTK base parameter kinds and qualifiers.
+HTK_BASE_KINDS = {"WAVEFORM": 0, "LPC": 1, "LPREFC": 2, "LPCEPSTRA": 3,
+                  "LPDELCEP": 4, "IREFC": 5, "MFCC": 6, "FBANK": 7,
+                  "MELSPEC": 8, "USER": 9, "DISCRETE": 10, "PLP": 11}
+
+HTK_QUALIFIERS = {"E": 0o100, "N": 0o200, "D": 0o400, "A": 0o1000,
+                  "C": 0o2000, "Z": 0o4000, "K": 0o10000, "0": 0o20000}
+
+# HTK base parameter kinds evaluated by sppasChannelMFCC.
+SUPPORTED_BASE_KINDS = ("MFCC", "FBANK", "MELSPEC")
+
+# HTK default values of the configuration keys used by the front-end.
+HTK_DEFAULT_CONFIG = {
+    "TARGETKIND": "MFCC",
+    "TARGETRATE": 100000.,
+    "WINDOWSIZE": 256000.,
+    "ZMEANSOURCE": False,
+    "USEHAMMING": True,
+    "PREEMCOEF": 0.97,
+    "USEPOWER": False,
+    "NUMCHANS": 20,
+    "LOFREQ": -1.,
+    "HIFREQ": -1.,
+    "NUMCEPS": 12,
+    "CEPLIFTER": 22,
+    "RAWENERGY": True,
+    "ENORMALISE": True,
+    "ESCALE": 0.1,
+    "SILFLOOR": 50.,
+    "DELTAWINDOW": 2,
+    "ACCWINDOW": 2,
+    "SAVECOMPRESSED": False,
+    "SAVEWITHCRC": True
+}
+
 # ---------------------------------------------------------------------------
 
 
@@ -76,14 +119,24 @@ class sppasChannelMFCC(object):
     :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
     :contact:      brigitte.bigi@gmail.com
     :license:      GPL, v3
-    :copyright:    Copyright (C) 2011-2016  Brigitte Bigi
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
     :summary:      A channel MFCC extractor class.
 
+    The features are evaluated like HTK HCopy does, from the same
+    configuration keys: TARGETKIND, TARGETRATE, WINDOWSIZE, PREEMCOEF,
+    NUMCHANS, NUMCEPS, CEPLIFTER, DELTAWINDOW, ACCWINDOW, etc.
+    The supported base kinds are MFCC, FBANK and MELSPEC, with the
+    qualifiers _E, _0, _N, _Z, _D and _A.
+
+    >>> mfcc = sppasChannelMFCC(channel)
+    >>> vectors = mfcc.evaluate({"TARGETKIND": "MFCC_0_D", "NUMCHANS": 26})
+    >>> mfcc.write_mfc("file.mfc", "mfc_config")
+
     """
     def __init__(self, channel=None):
         """ Create a sppasChannelMFCC instance.
 
-        :param channel: (sppasChannel) The channel to work on. Currently not used...!!!
+        :param channel: (sppasChannel) The channel to work on.
 
         """
         self._channel = channel
@@ -113,6 +166,539 @@ class sppasChannelMFCC(object):
     # ----------------------------------------------------------------------
 
     def evaluate(self, features):
-        """ Evaluate MFCC of the given channel. """
+        """ Evaluate MFCC of the given channel.
+
+        :param features: (dict or str) HTK configuration: either a dict of
+        keys/values or the name of a configuration file.
+        :returns: list of feature vectors, one per frame
+        :raises: ValueError if the parameter kind is not supported
+
+        """
+        config = sppasChannelMFCC.__get_config(features)
+        if self._channel is None:
+            raise ChannelError
+
+        base, qualifiers = sppasChannelMFCC.get_parm_kind(config["TARGETKIND"])
+
+        static = self.__static(base, qualifiers, config)
+        if len(static) == 0:
+            return static
+
+        nceps = config["NUMCEPS"] if base == "MFCC" else config["NUMCHANS"]
+        if "E" in qualifiers and config["ENORMALISE"] is True:
+            sppasChannelMFCC.__normalise_energy(static, len(static[0]) - 1,
+                                                config["SILFLOOR"],
+                                                config["ESCALE"])
+        if "Z" in qualifiers:
+            sppasChannelMFCC.__zero_mean(static, nceps)
+
+        vectors = static
+        if "D" in qualifiers:
+            deltas = sppasChannelMFCC.__regress(static, config["DELTAWINDOW"])
+            vectors = [s + d for s, d in zip(vectors, deltas)]
+            if "A" in qualifiers:
+                acc = sppasChannelMFCC.__regress(deltas, config["ACCWINDOW"])
+                vectors = [v + a for v, a in zip(vectors, acc)]
+
+        if "N" in qualifiers and len(static[0]) > nceps:
+            # the last static coefficient is the absolute energy
+            idx = len(static[0]) - 1
+            vectors = [v[:idx] + v[idx+1:] for v in vectors]
+
+        return vectors
+
+    # ----------------------------------------------------------------------
+
+    def write_mfc(self, filename, features):
+        """ Evaluate MFCC of the given channel and save them in HTK format.
+
+        :param filename: (str) Name of the output file (.mfc)
+        :param features: (dict or str) HTK configuration: either a dict of
+        keys/values or the name of a configuration file.
+        :returns: (int) number of frames
+        :raises: ValueError if the parameter kind is not supported
+
+        """
+        config = sppasChannelMFCC.__get_config(features)
+        vectors = self.evaluate(config)
+        kind = config["TARGETKIND"]
+        if config["SAVECOMPRESSED"] is True:
+            kind += "_C"
+        if config["SAVEWITHCRC"] is True:
+            kind += "_K"
+
+        sppasChannelMFCC.write_htk(filename, vectors,
+                                   int(round(config["TARGETRATE"])),
+                                   sppasChannelMFCC.get_parm_code(kind))
+        return len(vectors)
+
+    # ----------------------------------------------------------------------
+    # HTK formats
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def read_config(filename):
+        """ Read an HTK configuration file.
+
+        Module names, like in "HPARM: TARGETKIND = MFCC", are ignored.
+
+        :param filename: (str) Name of the configuration file
+        :returns: (dict) keys/values, with values as strings
+
+        """
+        config = dict()
+        with open(filename, "r") as fp:
+            for line in fp:
+                line = line.split("#")[0].strip()
+                if "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                key = key.split(":")[-1].strip().upper()
+                config[key] = value.strip().strip("'\"")
+
+        return config
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def get_parm_kind(targetkind):
+        """ Split an HTK parameter kind into its base and qualifiers.
+
+        :param targetkind: (str) Parameter kind, like "MFCC_0_D_N_Z"
+        :returns: (str, list) base name and list of qualifiers
+
+        """
+        tab = targetkind.strip().upper().split("_")
+        base = tab[0]
+        qualifiers = [q for q in tab[1:] if len(q) > 0]
+        for q in qualifiers:
+            if q not in HTK_QUALIFIERS:
+                raise ValueError("Unknown qualifier _%s." % q)
+
+        return base, qualifiers
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def get_parm_code(targetkind):
+        """ Return the HTK code of a parameter kind.
+
+        :param targetkind: (str) Parameter kind, like "MFCC_0_D_N_Z"
+        :returns: (int)
+
+        """
+        base, qualifiers = sppasChannelMFCC.get_parm_kind(targetkind)
+        if base not in HTK_BASE_KINDS:
+            raise ValueError("Unknown parameter kind %s." % base)
+        code = HTK_BASE_KINDS[base]
+        for q in set(qualifiers):
+            code += HTK_QUALIFIERS[q]
+
+        return code
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def write_htk(filename, vectors, samp_period, parm_code):
+        """ Write feature vectors into a file in HTK format.
+
+        The file is compressed if parm_code has the _C qualifier, and
+        a CRC is appended if it has the _K qualifier.
+
+        :param filename: (str) Name of the output file
+        :param vectors: (list) List of feature vectors
+        :param samp_period: (int) Sample period in 100ns units
+        :param parm_code: (int) Parameter kind (see get_parm_code())
+
+        """
+        nsamples = len(vectors)
+        vsize = len(vectors[0]) if nsamples > 0 else 0
+
+        if parm_code & HTK_QUALIFIERS["C"]:
+            a = list()
+            b = list()
+            for col in zip(*vectors):
+                xmax = max(col)
+                xmin = min(col)
+                if xmax > xmin:
+                    a.append(2. * 32767. / (xmax - xmin))
+                    b.append((xmax + xmin) * 32767. / (xmax - xmin))
+                else:
+                    a.append(1.)
+                    b.append(0.)
+
+            data = struct.pack(">%df" % vsize, *a)
+            data += struct.pack(">%df" % vsize, *b)
+            values = list()
+            for v in vectors:
+                for x, ai, bi in zip(v, a, b):
+                    s = int(round(x * ai - bi))
+                    values.append(max(-32767, min(32767, s)))
+            data += struct.pack(">%dh" % len(values), *values)
+            header = struct.pack(">iihh", nsamples + 4, samp_period,
+                                 2 * vsize, parm_code)
+        else:
+            values = [x for v in vectors for x in v]
+            data = struct.pack(">%df" % len(values), *values)
+            header = struct.pack(">iihh", nsamples, samp_period,
+                                 4 * vsize, parm_code)
+
+        with open(filename, "wb") as fp:
+            fp.write(header)
+            fp.write(data)
+            if parm_code & HTK_QUALIFIERS["K"]:
+                fp.write(struct.pack(">H", sppasChannelMFCC.__crc(data)))
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def read_htk(filename):
+        """ Read feature vectors from a file in HTK format.
+
+        :param filename: (str) Name of the input file
+        :returns: (list, int, int) vectors, sample period and parameter kind
+
+        """
+        with open(filename, "rb") as fp:
+            data = fp.read()
+        if len(data) < 12:
+            raise AudioDataError(filename)
+
+        nsamples, samp_period, samp_size, parm_code = \
+            struct.unpack(">iihh", data[:12])
+        data = data[12:]
+
+        if parm_code & HTK_QUALIFIERS["C"]:
+            vsize = samp_size // 2
+            nsamples -= 4
+            size = 8 * vsize + 2 * vsize * nsamples
+        else:
+            vsize = samp_size // 4
+            size = 4 * vsize * nsamples
+        if len(data) < size:
+            raise AudioDataError(filename)
+
+        if parm_code & HTK_QUALIFIERS["C"]:
+            a = struct.unpack(">%df" % vsize, data[:4*vsize])
+            b = struct.unpack(">%df" % vsize, data[4*vsize:8*vsize])
+            values = struct.unpack(">%dh" % (vsize*nsamples), data[8*vsize:size])
+            vectors = [[(values[i*vsize+j] + b[j]) / a[j] for j in range(vsize)]
+                       for i in range(nsamples)]
+        else:
+            values = struct.unpack(">%df" % (vsize*nsamples), data[:size])
+            vectors = [list(values[i*vsize:(i+1)*vsize])
+                       for i in range(nsamples)]
+
+        return vectors, samp_period, parm_code
+
+    # ----------------------------------------------------------------------
+    # Private
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __get_config(features):
+        """ Return the configuration with the expected types. """
+
+        if isinstance(features, dict) is False:
+            features = sppasChannelMFCC.read_config(features)
+
+        config = dict(HTK_DEFAULT_CONFIG)
+        for key in HTK_DEFAULT_CONFIG:
+            if key not in features:
+                continue
+            value = features[key]
+            default = HTK_DEFAULT_CONFIG[key]
+            if isinstance(default, bool):
+                if isinstance(value, bool) is False:
+                    value = str(value).strip().upper() in ("T", "TRUE")
+            elif isinstance(default, int):
+                value = int(float(value))
+            elif isinstance(default, float):
+                value = float(value)
+            else:
+                value = str(value).strip().upper()
+            config[key] = value
+
+        # Reject the parameter kinds HCopy can create but not this front-end
+        base, qualifiers = sppasChannelMFCC.get_parm_kind(config["TARGETKIND"])
+        if base not in SUPPORTED_BASE_KINDS:
+            raise ValueError("Parameter kind %s is not supported: only %s "
+                             "are evaluated. Use HCopy instead."
+                             "" % (base, ", ".join(SUPPORTED_BASE_KINDS)))
+
+        return config
+
+    # ----------------------------------------------------------------------
+
+    def __static(self, base, qualifiers, config):
+        """ Return the static coefficients of all frames. """
+
+        samples = self._channel.get_samples()
+        samp_period = 1e7 / float(self._channel.get_framerate())
+        win_size = int(config["WINDOWSIZE"] / samp_period)
+        shift = int(config["TARGETRATE"] / samp_period)
+        if win_size < 2 or shift < 1:
+            raise ValueError("Invalid window size or target rate.")
+        if len(samples) < win_size:
+            return list()
+        nframes = (len(samples) - win_size) // shift + 1
+
+        fft_n = 2
+        while fft_n < win_size:
+            fft_n *= 2
+
+        # Pre-computed tables
+        num_chans = config["NUMCHANS"]
+        num_ceps = config["NUMCEPS"]
+        k_coef = config["PREEMCOEF"]
+        use_power = config["USEPOWER"]
+        fft_tables = sppasChannelMFCC.__fft_tables(fft_n)
+        filters = sppasChannelMFCC.__mel_filters(fft_n, samp_period, num_chans,
+                                                 config["LOFREQ"],
+                                                 config["HIFREQ"])
+        if config["USEHAMMING"] is True:
+            a = 2. * math.pi / (win_size - 1)
+            window = [0.54 - 0.46 * math.cos(a * i) for i in range(win_size)]
+        else:
+            window = [1.] * win_size
+        if base == "MFCC":
+            mfnorm = math.sqrt(2. / num_chans)
+            x = math.pi / num_chans
+            lifter = config["CEPLIFTER"]
+            dct = list()
+            for j in range(1, num_ceps+1):
+                lift = 1.
+                if lifter > 0:
+                    lift += lifter / 2. * math.sin(j * math.pi / lifter)
+                dct.append([mfnorm * lift * math.cos(j * x * (k - 0.5))
+                            for k in range(1, num_chans+1)])
+
+        padding = [0.] * (fft_n - win_size)
+        static = list()
+        for f in range(nframes):
+            frame = [float(s) for s in samples[f*shift:f*shift+win_size]]
+            if config["ZMEANSOURCE"] is True:
+                mean = sum(frame) / win_size
+                frame = [s - mean for s in frame]
+            energy = sum(s * s for s in frame)
+
+            # Pre-emphasis and windowing
+            if k_coef > 0.:
+                frame = [frame[0] * (1. - k_coef)] + \
+                        [frame[i] - k_coef * frame[i-1]
+                         for i in range(1, win_size)]
+            frame = [s * w for s, w in zip(frame, window)]
+            if config["RAWENERGY"] is False:
+                energy = sum(s * s for s in frame)
+
+            # Mel filterbank
+            spectrum = sppasChannelMFCC.__spectrum(frame + padding,
+                                                   fft_tables, use_power)
+            fbank = [0.] * (num_chans + 2)
+            for k, chan, weight in filters:
+                ek = spectrum[k]
+                t1 = weight * ek
+                fbank[chan] += t1
+                fbank[chan+1] += ek - t1
+            fbank = fbank[1:num_chans+1]
+
+            if base == "MELSPEC":
+                coefs = fbank
+            else:
+                fbank = [math.log(max(1., e)) for e in fbank]
+                if base == "FBANK":
+                    coefs = fbank
+                else:
+                    coefs = [sum(c * e for c, e in zip(row, fbank))
+                             for row in dct]
+                    if "0" in qualifiers:
+                        coefs.append(mfnorm * sum(fbank))
+
+            if "E" in qualifiers:
+                coefs.append(math.log(energy) if energy > 0. else -1e10)
+            static.append(coefs)
+
+        return static
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __fft_tables(fft_n):
+        """ Return the tables of a real FFT of size fft_n.
+
+        The real FFT is done by a complex FFT of size fft_n/2.
+
+        """
+        n = fft_n // 2
+        bits = n.bit_length() - 1
+        rev = [int(format(i, "0%db" % bits)[::-1], 2) if bits > 0 else 0
+               for i in range(n)]
+        cos_t = [math.cos(2. * math.pi * k / n) for k in range(n // 2)]
+        sin_t = [-math.sin(2. * math.pi * k / n) for k in range(n // 2)]
+        cos_r = [math.cos(2. * math.pi * k / fft_n) for k in range(n)]
+        sin_r = [-math.sin(2. * math.pi * k / fft_n) for k in range(n)]
+
+        return rev, cos_t, sin_t, cos_r, sin_r
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __spectrum(frame, tables, use_power=False):
+        """ Return the magnitude spectrum of a real frame.
+
+        :returns: list of fft_n/2 values; index 0 (DC) is not evaluated.
+
+        """
+        rev, cos_t, sin_t, cos_r, sin_r = tables
+        n = len(rev)
+        re = [frame[2*i] for i in rev]
+        im = [frame[2*i+1] for i in rev]
+
+        # iterative radix-2 complex FFT of size n
+        size = 2
+        while size <= n:
+            half = size // 2
+            step = n // size
+            for start in range(0, n, size):
+                k = 0
+                for j in range(start, start + half):
+                    l = j + half
+                    wr = cos_t[k]
+                    wi = sin_t[k]
+                    tr = wr * re[l] - wi * im[l]
+                    ti = wr * im[l] + wi * re[l]
+                    re[l] = re[j] - tr
+                    im[l] = im[j] - ti
+                    re[j] += tr
+                    im[j] += ti
+                    k += step
+            size *= 2
+
+        # split into the spectrum of the real frame
+        spectrum = [0.] * n
+        for k in range(1, n):
+            ar = re[k]
+            ai = im[k]
+            br = re[n-k]
+            bi = im[n-k]
+            er = (ar + br) / 2.
+            ei = (ai - bi) / 2.
+            o_r = (ai + bi) / 2.
+            o_i = (br - ar) / 2.
+            xr = er + cos_r[k] * o_r - sin_r[k] * o_i
+            xi = ei + cos_r[k] * o_i + sin_r[k] * o_r
+            if use_power is True:
+                spectrum[k] = xr * xr + xi * xi
+            else:
+                spectrum[k] = math.sqrt(xr * xr + xi * xi)
+
+        return spectrum
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __mel_filters(fft_n, samp_period, num_chans, lofreq, hifreq):
+        """ Return the mel filterbank like in HTK.
+
+        :returns: list of (fft index, lower channel, lower weight)
+
+        """
+        nby2 = fft_n // 2
+        fres = 1e7 / (samp_period * fft_n * 700.)
+
+        def mel(k):
+            return 1127. * math.log(1. + (k - 1) * fres)
+
+        klo = 2
+        khi = nby2
+        mlo = 0.
+        mhi = mel(nby2 + 1)
+        if lofreq >= 0.:
+            klo = max(2, int(lofreq * samp_period * 1e-7 * fft_n + 2.5))
+            mlo = 1127. * math.log(1. + lofreq / 700.)
+        if hifreq >= 0.:
+            khi = min(nby2, int(hifreq * samp_period * 1e-7 * fft_n + 0.5))
+            mhi = 1127. * math.log(1. + hifreq / 700.)
+
+        max_chan = num_chans + 1
+        cf = [mlo] + [float(c) / max_chan * (mhi - mlo) + mlo
+                      for c in range(1, max_chan + 1)]
+
+        filters = list()
+        chan = 1
+        for k in range(klo, khi + 1):
+            melk = mel(k)
+            while chan <= max_chan and cf[chan] < melk:
+                chan += 1
+            lo_chan = chan - 1
+            if lo_chan > 0:
+                weight = (cf[lo_chan+1] - melk) / (cf[lo_chan+1] - cf[lo_chan])
+            else:
+                weight = (cf[1] - melk) / (cf[1] - mlo)
+            # HTK index k is the fft index k-1
+            filters.append((k - 1, lo_chan, weight))
+
+        return filters
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __normalise_energy(vectors, idx, sil_floor, escale):
+        """ Normalise the log energy of all vectors, like HTK does. """
+
+        emax = max(v[idx] for v in vectors)
+        emin = emax - (sil_floor * math.log(10.)) / 10.
+        for v in vectors:
+            v[idx] = 1. - (emax - max(emin, v[idx])) * escale
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __zero_mean(vectors, ncoefs):
+        """ Subtract the mean of the ncoefs first coefficients. """
+
+        nb = float(len(vectors))
+        means = [sum(v[j] for v in vectors) / nb for j in range(ncoefs)]
+        for v in vectors:
+            for j in range(ncoefs):
+                v[j] -= means[j]
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __regress(vectors, win):
+        """ Return the regression coefficients (deltas) of the vectors.
+
+        The first and last vectors are replicated at the edges.
+
+        """
+        last = len(vectors) - 1
+        norm = 2. * sum(t * t for t in range(1, win + 1))
+        deltas = list()
+        for i in range(len(vectors)):
+            d = [0.] * len(vectors[i])
+            for t in range(1, win + 1):
+                fore = vectors[min(i + t, last)]
+                back = vectors[max(i - t, 0)]
+                for j in range(len(d)):
+                    d[j] += t * (fore[j] - back[j])
+            deltas.append([x / norm for x in d])
+
+        return deltas
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def __crc(data):
+        """ Return the CCITT CRC-16 of a bytes string. """
+
+        crc = 0
+        for c in bytearray(data):
+            crc ^= c << 8
+            for i in range(8):
+                if crc & 0x8000:
+                    crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+                else:
+                    crc = (crc << 1) & 0xFFFF
 
-        raise NotImplementedError
+        return crc
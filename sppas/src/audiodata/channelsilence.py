@@ -33,7 +33,6 @@
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
-from .channel import sppasChannel
 from .channelvolume import sppasChannelVolume
 
 # ----------------------------------------------------------------------------
@@ -49,15 +48,17 @@ class sppasChannelSilence(object):
     :summary:      This class implements the silence finding on a channel.
 
     """
-    def __init__(self, channel, win_len=0.01):
+    def __init__(self, channel, win_len=0.01, hop_len=None):
         """ Create a sppasChannelSilence instance.
 
         :param channel (sppasChannel) the input channel object
         :param win_len (float) duration of a window for the estimation of the volume
+        :param hop_len (float) time between the start of two successive windows.
+        Default is win_len.
 
         """
         self._channel = channel
-        self._volume_stats = sppasChannelVolume(channel, win_len)
+        self._volume_stats = sppasChannelVolume(channel, win_len, hop_len)
         self.__silences = []
 
     # -----------------------------------------------------------------------
@@ -81,6 +82,8 @@ class sppasChannelSilence(object):
     def track_data(self, tracks):
         """ Get the track data: a set of frames for each track.
 
+        Frames are views on the ones of the channel, they are not copied.
+
         :param tracks: (list of tuples) List of (from_pos,to_pos)
 
         """
@@ -95,13 +98,17 @@ class sppasChannelSilence(object):
             # Go to the provided position
             self._channel.seek(from_pos)
             # Keep in mind the related frames
-            yield self._channel.get_frames(to_pos - from_pos)
+            yield self._channel.get_view(to_pos - from_pos)
 
     # -----------------------------------------------------------------------
 
     def refine(self, pos, threshold, win_length=0.005, direction=1):
         """ Refine the position of a silence around a given position.
 
+        The RMS values are estimated only for the windows around the given
+        position, on fragments sharing the frames of the channel. They are
+        the ones of the windows of sppasChannel.get_volumes(win_length).
+
         :param pos: (int) Initial position of the silence
         :param threshold: (int) RMS threshold value for a silence
         :param win_length: (float) Windows duration to estimate the RMS
@@ -109,23 +116,32 @@ class sppasChannelSilence(object):
         :returns: new position
 
         """
-        delta = int(self._volume_stats.get_winlen() * self._channel.get_framerate())
+        framerate = self._channel.get_framerate()
+        delta = int(self._volume_stats.get_winlen() * framerate)
         from_pos = max(pos-delta, 0)
-        self._channel.seek(from_pos)
-        frames = self._channel.get_frames(delta*2)
-        c = sppasChannel(self._channel.get_framerate(), self._channel.get_sampwidth(), frames)
-        vol_stats = sppasChannelVolume(c, win_length)
-
-        if direction == 1:
-            for i, v in enumerate(vol_stats):
-                if v > threshold:
-                    return from_pos + i*(int(win_length*self._channel.get_framerate()))
+        to_pos = from_pos + delta*2
+
+        # Indexes of the windows starting in [from_pos, to_pos[
+        nbframes = int(win_length * framerate)
+        nbvols = self._channel.get_nframes() // nbframes + 1
+        first = -(-from_pos // nbframes)
+        last = min(nbvols, -(-to_pos // nbframes))
+
+        indexes = range(first, last)
         if direction == -1:
-            i = len(vol_stats)
-            for v in reversed(vol_stats):
-                if v > threshold:
-                    return from_pos + (i*(int(win_length*self._channel.get_framerate())))
-                i -= 1
+            indexes = reversed(indexes)
+        elif direction != 1:
+            return pos
+
+        for i in indexes:
+            volume = self._channel.extract_fragment(i*nbframes, (i+1)*nbframes).rms()
+            if volume == 0 and i == nbvols - 1:
+                # the last window is ignored if it is silent
+                continue
+            if volume > threshold:
+                if direction == 1:
+                    return i*nbframes
+                return (i+1)*nbframes
 
         return pos
 
@@ -182,9 +198,24 @@ class sppasChannelSilence(object):
         :returns: (int) volume value
 
         """
-        vmin = max(self._volume_stats.min(), 0)  # provide negative values
-        vmean = self._volume_stats.mean()
-        vcvar = 1.5 * self._volume_stats.coefvariation()
+        return sppasChannelSilence.threshold_vol(self._volume_stats.min(),
+                                                 self._volume_stats.mean(),
+                                                 self._volume_stats.coefvariation())
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def threshold_vol(vmin, vmean, coefvariation):
+        """ Return the threshold for speech/silence segmentation.
+
+        :param vmin: (int) Minimum of the rms values
+        :param vmean: (float) Mean of the rms values
+        :param coefvariation: (float) Coefficient of variation of the rms values
+        :returns: (int) volume value
+
+        """
+        vmin = max(vmin, 0)  # provide negative values
+        vcvar = 1.5 * coefvariation
 
         # alternative, in case the audio is not as good as expected!
         # (too low volume, or outliers which make the coeff variation very high)
@@ -214,7 +245,9 @@ class sppasChannelSilence(object):
         inside = False
         idxbegin = 0
         ignored = 0
-        delta = int(mintrackdur / self._volume_stats.get_winlen())
+        hop_len = self._volume_stats.get_hoplen()
+        framerate = self._channel.get_framerate()
+        delta = int(mintrackdur / hop_len)
 
         for i, v in enumerate(self._volume_stats):
             if v < threshold:
@@ -229,8 +262,8 @@ class sppasChannelSilence(object):
                     if (i-idxbegin) > delta:
                         inside = False
                         idxend = i - ignored  # we not use -1 because we want the end of the frame
-                        from_pos = int(idxbegin * self._volume_stats.get_winlen() * self._channel.get_framerate())
-                        to_pos = int(idxend * self._volume_stats.get_winlen() * self._channel.get_framerate())
+                        from_pos = int(idxbegin * hop_len * framerate)
+                        to_pos = int(idxend * hop_len * framerate)
 
                         # Find the boundaries with a better precision
                         w = self._volume_stats.get_winlen() / 4.
@@ -244,7 +277,7 @@ class sppasChannelSilence(object):
 
         # Last interval
         if inside is True:
-            start_pos = int(idxbegin * self._volume_stats.get_winlen() * self._channel.get_framerate())
+            start_pos = int(idxbegin * hop_len * framerate)
             end_pos = self._channel.get_nframes()
             self.__silences.append((start_pos, end_pos))
 
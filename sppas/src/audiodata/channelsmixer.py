@@ -32,7 +32,7 @@
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
-import struct
+import array
 
 from .channel import sppasChannel
 from .channelframes import sppasChannelFrames
@@ -41,6 +41,11 @@ from .audioconvert import sppasAudioConverter
 
 # ---------------------------------------------------------------------------
 
+# Number of samples mixed at a time
+BLOCK_SIZE = 65536
+
+# ---------------------------------------------------------------------------
+
 
 class sppasChannelMixer(object):
     """
@@ -107,39 +112,57 @@ class sppasChannelMixer(object):
     # -----------------------------------------------------------------------
 
     @staticmethod
-    def _sample_calculator(channels, pos, sampwidth, factors, attenuator):
-        """ Return the sample value, applying a factor and an attenuator.
+    def _block_calculator(blocks, factors, attenuator, minval, maxval):
+        """ Return the samples values of a block, applying factors and an attenuator.
 
-        :param channels: (Channel[]) the list of channels
-        :param pos: (int) the position of the sample to calculate
-        :param sampwidth: (int) the sample width
+        The result sample is the sum of each sample with the application of
+        the factors and the attenuator. It is truncated if there is clipping.
+
+        :param blocks: (array[]) the samples of the block, one array per channel
         :param factors: (float[]) the list of factors to apply to each sample of a channel (1 channel = 1 factor)
         :param attenuator: (float) a factor to apply to each sum of samples
+        :param minval: (float) minimum value of a sample
+        :param maxval: (float) maximum value of a sample
 
-        :returns: (float) the value of the sample calculated
+        :returns: (list of int) the values of the samples
 
         """
-        # variables to compare the value of the result sample to avoid clipping
-        minval = float(sppasChannelFrames().get_minval(sampwidth))
-        maxval = float(sppasChannelFrames().get_maxval(sampwidth))
-
-        # the result sample is the sum of each sample with the application of the factors
-        sampsum = 0
-        for factor, channel in zip(factors, channels):
-            data = channel.get_frames()[pos:pos+sampwidth]
-            data = sppasAudioConverter().unpack_data(data, sampwidth, 1)
-            data = data[0]
-            # without a cast, sum is a float!
-            sampsum += (data[0] * factor * attenuator)
+        sums = [0] * len(blocks[0])
+        for factor, block in zip(factors, blocks):
+            sums = [s + (d * factor * attenuator) for s, d in zip(sums, block)]
 
         # truncate the values if there is clipping
-        if sampsum < 0:
-            return max(sampsum, minval)
+        return [int(max(s, minval)) if s < 0 else int(min(s, maxval))
+                for s in sums]
+
+    # -----------------------------------------------------------------------
 
-        elif sampsum > 0:
-            return min(sampsum, maxval)
+    def mix_blocks(self, attenuator=1, block_size=BLOCK_SIZE):
+        """ Mix the channels of the list, one block of samples at a time.
 
-        return 0.
+        Only the current block of the result is in memory, so that the
+        mixed frames can be written progressively, with aio.save_blocks().
+
+        :param attenuator: (float) the factor to apply to each sample calculated
+        :param block_size: (int) the number of samples of each block
+        :returns: (generator) the mixed frames of each block
+
+        """
+        self.check_channels()
+
+        sampwidth = self._channels[0].get_sampwidth()
+        nframes = self._channels[0].get_nframes()
+        minval = float(sppasChannelFrames().get_minval(sampwidth))
+        maxval = float(sppasChannelFrames().get_maxval(sampwidth))
+        samples = [channel.get_samples() for channel in self._channels]
+        typecode = samples[0].typecode
+
+        for start in range(0, nframes, block_size):
+            end = min(start + block_size, nframes)
+            values = sppasChannelMixer._block_calculator(
+                [s[start:end] for s in samples],
+                self._factors, attenuator, minval, maxval)
+            yield sppasAudioConverter.array2frames(array.array(typecode, values))
 
     # -----------------------------------------------------------------------
 
@@ -154,22 +177,9 @@ class sppasChannelMixer(object):
 
         sampwidth = self._channels[0].get_sampwidth()
         framerate = self._channels[0].get_framerate()
+        frames = b"".join(self.mix_blocks(attenuator))
 
-        frames = ""
-        if sampwidth == 4:
-            for s in range(0, len(self._channels[0].get_frames()), sampwidth):
-                value = sppasChannelMixer._sample_calculator(self._channels, s, sampwidth, self._factors, attenuator)
-                frames += struct.pack("<l", long(value))
-        elif sampwidth == 2:
-            for s in range(0, len(self._channels[0].get_frames()), sampwidth):
-                value = sppasChannelMixer._sample_calculator(self._channels, s, sampwidth, self._factors, attenuator)
-                frames += struct.pack("<h", int(value))
-        else:
-            for s in range(0, len(self._channels[0].get_frames()), sampwidth):
-                value = sppasChannelMixer._sample_calculator(self._channels, s, sampwidth, self._factors, attenuator)
-                frames += struct.pack("<b", int(value))
-
-        return sppasChannel(framerate, sampwidth, str(frames))
+        return sppasChannel(framerate, sampwidth, frames)
 
     # -----------------------------------------------------------------------
 
@@ -183,16 +193,22 @@ class sppasChannelMixer(object):
         self.check_channels()
 
         sampwidth = self._channels[0].get_sampwidth()
-        minval = 0
-        maxval = 0
-        sampsum = 0
-        for s in range(0, len(self._channels[0].get_frames()), sampwidth):
-            value = sppasChannelMixer._sample_calculator(self._channels, s, sampwidth, self._factors, 1)
-            sampsum = long(value)
-            maxval = max(sampsum, maxval)
-            minval = min(sampsum, minval)
-
-        return minval, maxval
+        nframes = self._channels[0].get_nframes()
+        minval = float(sppasChannelFrames().get_minval(sampwidth))
+        maxval = float(sppasChannelFrames().get_maxval(sampwidth))
+        samples = [channel.get_samples() for channel in self._channels]
+
+        min_value = 0
+        max_value = 0
+        for start in range(0, nframes, BLOCK_SIZE):
+            end = min(start + BLOCK_SIZE, nframes)
+            values = sppasChannelMixer._block_calculator(
+                [s[start:end] for s in samples],
+                self._factors, 1, minval, maxval)
+            max_value = max(max(values), max_value)
+            min_value = min(min(values), min_value)
+
+        return min_value, max_value
 
     # -----------------------------------------------------------------------
 
@@ -33,7 +33,6 @@
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
-from .audioframes import sppasAudioFrames
 from .basevolume import sppasBaseVolume
 
 # ----------------------------------------------------------------------------
@@ -49,37 +48,33 @@ class sppasChannelVolume(sppasBaseVolume):
     :summary:      A class to estimates stats of the volume of an audio channel.
 
     The volume is the estimation of RMS values, sampled with a window of 10ms.
+    The RMS values are the ones cached by the channel: several instances
+    created with the same window share them.
 
     """
-    def __init__(self, channel, win_len=0.01):
+    def __init__(self, channel, win_len=0.01, hop_len=None):
         """ Constructor.
 
         :param channel: (sppasChannel) The channel to work on.
         :param win_len: (float) Window length to estimate the volume.
+        :param hop_len: (float) Time between the start of two successive
+        windows. Default is win_len.
 
         """
         sppasBaseVolume.__init__(self, win_len)
+        if hop_len is None:
+            hop_len = win_len
+        self._hoplen = float(hop_len)
 
-        # Remember current position
-        pos = channel.tell()
-
-        # Rewind to the beginning
-        channel.rewind()
-
-        # Constants
-        nbframes = int(win_len * channel.get_framerate())
-        nbvols = int(channel.get_duration()/win_len) + 1
-        self._volumes = [0]*nbvols
+        self._volumes = channel.get_volumes(win_len, hop_len)
+        self._rms = channel.rms()
 
-        for i in range(nbvols):
-            frames = channel.get_frames(nbframes)
-            a = sppasAudioFrames(frames, channel.get_sampwidth(), 1)
-            self._volumes[i] = a.rms()
+    # -----------------------------------------------------------------------
 
-        if self._volumes[-1] == 0:
-            self._volumes.pop()
+    def get_hoplen(self):
+        """ Return the time between the start of two successive windows.
 
-        # Returns to the position where we was before
-        channel.seek(pos)
+        :returns: (float) Duration in seconds.
 
-        self._rms = channel.rms()
+        """
+        return self._hoplen
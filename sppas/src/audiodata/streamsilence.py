@@ -0,0 +1,407 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.audiodata.streamsilence.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import audioop
+import math
+from collections import deque
+
+from .audiodataexc import AudioError, ChannelIndexError
+from .audioconvert import sppasAudioConverter
+from .channelsilence import sppasChannelSilence
+
+# ----------------------------------------------------------------------------
+
+BLOCK_NWIN = 1000
+
+# ----------------------------------------------------------------------------
+
+
+class sppasStreamSilence(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      This class implements the silence finding on an audio file.
+
+    Contrariwise to sppasChannelSilence, the channel is not loaded in memory.
+    The frames are read from the audio file by blocks and only a small buffer
+    of frames is kept around the current window, so that the memory does not
+    depend on the duration of the audio file. The silences and the tracks are
+    returned as soon as they are found, and they are the same as the ones of
+    sppasChannelSilence with the same parameters.
+
+    """
+    def __init__(self, audio, channel_idx=0, win_len=0.01, block_nwin=BLOCK_NWIN):
+        """ Create a sppasStreamSilence instance.
+
+        :param audio: (sppasAudioPCM) An opened audio file
+        :param channel_idx: (int) Index of the channel to work on
+        :param win_len: (float) duration of a window for the estimation of the volume
+        :param block_nwin: (int) Number of windows read at once in the audio file
+
+        """
+        if audio.get_audiofp() is None:
+            raise AudioError
+        if channel_idx < 0 or channel_idx >= audio.get_nchannels():
+            raise ChannelIndexError(channel_idx)
+
+        self._audio = audio
+        self._channel_idx = channel_idx
+        self._win_len = win_len
+        self._block_nwin = max(1, int(block_nwin))
+        self._threshold = 0
+
+        if self.get_win_nframes() <= 0:
+            raise ValueError("Invalid window length %f" % win_len)
+
+    # -----------------------------------------------------------------------
+    # Getters
+    # -----------------------------------------------------------------------
+
+    def get_framerate(self):
+        """ Return the frame rate of the audio file. """
+
+        return self._audio.get_framerate()
+
+    def get_sampwidth(self):
+        """ Return the sample width of the audio file. """
+
+        return self._audio.get_sampwidth()
+
+    def get_nframes(self):
+        """ Return the number of frames of a channel of the audio file. """
+
+        return self._audio.get_nframes()
+
+    def get_duration(self):
+        """ Return the duration of the audio file (in seconds). """
+
+        return self._audio.get_duration()
+
+    def get_winlen(self):
+        """ Return the windows length used to estimate the volume. """
+
+        return self._win_len
+
+    def get_win_nframes(self):
+        """ Return the number of frames of a window. """
+
+        return int(self._win_len * self._audio.get_framerate())
+
+    def get_threshold(self):
+        """ Return the last threshold used to search silences. """
+
+        return self._threshold
+
+    # -----------------------------------------------------------------------
+    # Read the audio file
+    # -----------------------------------------------------------------------
+
+    def read_blocks(self, from_pos=0, to_pos=None):
+        """ Read the frames of the channel, block by block.
+
+        :param from_pos: (int) Position of the first frame to read
+        :param to_pos: (int) Position after the last frame to read.
+        Default is the end of the audio file.
+        :returns: a generator of blocks of frames
+
+        """
+        nframes = self.get_nframes()
+        if to_pos is None or to_pos > nframes:
+            to_pos = nframes
+        nchannels = self._audio.get_nchannels()
+        sampwidth = self.get_sampwidth()
+        block_nframes = self._block_nwin * self.get_win_nframes()
+
+        pos = from_pos
+        while pos < to_pos:
+            # Several readers can be used at a time: go to the position
+            self._audio.seek(pos)
+            n = min(block_nframes, to_pos - pos)
+            frames = self._audio.read_frames(n)
+            if len(frames) == 0:
+                break
+            if nchannels > 1:
+                frames = sppasAudioConverter().deinterleave(frames,
+                                                            sampwidth,
+                                                            nchannels,
+                                                            [self._channel_idx])[0]
+            yield frames
+            pos += n
+
+    # -----------------------------------------------------------------------
+
+    def windows(self):
+        """ Read the windows of the channel and estimate their volume.
+
+        As for sppasChannel.get_volumes(), the last window is ignored if
+        it is not complete and if its rms value is 0.
+
+        :returns: a generator of tuples (rms value, frames of the window)
+
+        """
+        sampwidth = self.get_sampwidth()
+        win_size = self.get_win_nframes() * sampwidth
+        last = None
+        for block in self.read_blocks():
+            block = sppasAudioConverter.to_view(block)
+            for i in range(0, len(block), win_size):
+                if last is not None:
+                    yield last
+                frames = block[i:i+win_size]
+                last = (audioop.rms(frames, sampwidth), frames)
+
+        if last is not None:
+            if len(last[1]) == win_size or last[0] != 0:
+                yield last
+
+    # -----------------------------------------------------------------------
+    # Silence detection
+    # -----------------------------------------------------------------------
+
+    def search_threshold_vol(self):
+        """ Try to fix optimally the threshold for speech/silence segmentation.
+
+        The statistics of the rms values are estimated while reading the
+        audio file, without storing the rms values.
+
+        :returns: (int) volume value
+
+        """
+        n = 0
+        vmin = None
+        mean = 0.
+        m2 = 0.
+        for v, frames in self.windows():
+            n += 1
+            if vmin is None or v < vmin:
+                vmin = v
+            d = v - mean
+            mean += d / n
+            m2 += d * (v - mean)
+
+        if n == 0:
+            return 0
+
+        # Coefficient of variation of a population, given as a percentage
+        stdev = 0.
+        if n > 1:
+            stdev = math.sqrt(m2 / n)
+        if mean == 0.:
+            return 0
+        return sppasChannelSilence.threshold_vol(vmin, mean, stdev / mean * 100.)
+
+    # -----------------------------------------------------------------------
+
+    def search_silences(self, threshold=0, mintrackdur=0.08):
+        """ Search windows with a volume lesser than a given threshold.
+
+        The silences are found by the same algorithm than
+        sppasChannelSilence.search_silences(): only a small buffer of
+        frames is kept to refine the boundaries.
+
+        :param threshold: (int) Expected minimum volume (rms value)
+        If threshold is set to 0, search_threshold_vol() will assign a value.
+        :param mintrackdur: (float) The very very minimum duration for
+        a track (in seconds).
+        :returns: a generator of tuples (from_pos, to_pos)
+
+        """
+        if threshold == 0:
+            threshold = self.search_threshold_vol()
+        self._threshold = threshold
+
+        framerate = self.get_framerate()
+        sampwidth = self.get_sampwidth()
+        nframes = self.get_nframes()
+        win_len = self._win_len
+        win_nframes = self.get_win_nframes()
+        fine_nframes = int(win_len / 4. * framerate)
+        delta = int(mintrackdur / win_len)
+
+        # The buffer of frames starts at position buf_pos
+        buf = bytearray()
+        buf_pos = 0
+        # The volumes of the windows read but not already explored
+        pending = deque()
+
+        inside = False
+        idxbegin = 0
+        ignored = 0
+        from_pos = 0
+        i = 0
+        eof = False
+        reader = self.windows()
+
+        while True:
+            if len(pending) == 0 or \
+                    (eof is False and len(buf) // sampwidth + buf_pos <
+                     int((i + 1) * win_len * framerate) + win_nframes + fine_nframes):
+                # Read the next window before exploring the pending ones,
+                # so that the frames to refine the boundaries are available.
+                try:
+                    v, frames = next(reader)
+                    buf.extend(frames)
+                    pending.append(v)
+                    continue
+                except StopIteration:
+                    eof = True
+                    if len(pending) == 0:
+                        break
+
+            v = pending.popleft()
+            if v < threshold:
+                if inside is False:
+                    # It's the beginning of a block of zero volumes
+                    idxbegin = i
+                    inside = True
+                    pos = int(idxbegin * win_len * framerate)
+                    from_pos = self.__refine(buf, buf_pos, pos, threshold,
+                                             fine_nframes, -1)
+            else:
+                if inside is True:
+                    # It's the end of a block of non-zero volumes...
+                    # or not if the track is very short!
+                    if (i-idxbegin) > delta:
+                        inside = False
+                        idxend = i - ignored
+                        pos = int(idxend * win_len * framerate)
+                        to_pos = self.__refine(buf, buf_pos, pos, threshold,
+                                               fine_nframes, 1)
+                        yield from_pos, to_pos
+                        ignored = 0
+                    else:
+                        ignored += 1
+            i += 1
+
+            # Forget the frames we'll never explore again
+            keep_pos = max(0, int((i - delta - 3) * win_len * framerate) - win_nframes)
+            if inside is False:
+                keep_pos = max(0, int((i - 2) * win_len * framerate) - win_nframes)
+            if (keep_pos - buf_pos) * sampwidth > len(buf) // 2:
+                del buf[:(keep_pos - buf_pos) * sampwidth]
+                buf_pos = keep_pos
+
+        # Last interval
+        if inside is True:
+            yield int(idxbegin * win_len * framerate), nframes
+
+    # -----------------------------------------------------------------------
+
+    def search_tracks(self, threshold=0, minsildur=0.200, mintrackdur=0.300,
+                      shiftdurstart=0.010, shiftdurend=0.010, minblockdur=0.08):
+        """ Search the tracks, i.e. the intervals between silences.
+
+        Silences are searched, filtered and turned into tracks like with
+        search_silences(), filter_silences() and extract_tracks() of
+        sppasChannelSilence, but each track is returned as soon as the
+        silence following it is found.
+
+        :param threshold: (int) Expected minimum volume (rms value), 0=automatic
+        :param minsildur: (float) Minimum silence duration in seconds
+        :param mintrackdur: (float) The minimum duration for a track (in seconds)
+        :param shiftdurstart: (float) The time to remove to the start boundary (in seconds)
+        :param shiftdurend: (float) The time to add to the end boundary (in seconds)
+        :param minblockdur: (float) The very very minimum duration for a
+        track, used while searching silences (in seconds)
+        :returns: a generator of tuples (from_pos, to_pos)
+
+        """
+        framerate = self.get_framerate()
+        nframes = self.get_nframes()
+        delta = int(mintrackdur * framerate)
+        shiftstart = int(shiftdurstart * framerate)
+        shiftend = int(shiftdurend * framerate)
+        from_pos = 0
+        nsil = 0
+
+        for to_pos, next_from in self.search_silences(threshold, minblockdur):
+            sildur = float(next_from - to_pos) / float(framerate)
+            if sildur <= minsildur:
+                continue
+            nsil += 1
+
+            shift_from_pos = max(from_pos - shiftstart, 0)
+            shift_to_pos = min(to_pos + shiftend, nframes)
+            if (shift_to_pos - shift_from_pos) >= delta:
+                # Track is long enough to be considered a track.
+                yield int(shift_from_pos), int(shift_to_pos)
+
+            from_pos = next_from
+
+        # No silence: Only one track!
+        if nsil == 0:
+            yield 0, nframes
+
+        # Last track after the last silence
+        # (if the silence does not end at the end of the channel)
+        elif (nframes - from_pos) >= delta:
+            yield int(from_pos), int(nframes)
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __refine(self, buf, buf_pos, pos, threshold, nbframes, direction):
+        """ Refine the position of a silence around a given position.
+
+        Same as sppasChannelSilence.refine() but the rms values of the
+        windows are estimated from the frames of the buffer.
+
+        """
+        sampwidth = self.get_sampwidth()
+        delta = self.get_win_nframes()
+        from_pos = max(pos-delta, 0)
+        to_pos = from_pos + delta*2
+
+        # Indexes of the windows starting in [from_pos, to_pos[
+        first = -(-from_pos // nbframes)
+        last = min(self.get_nframes() // nbframes + 1, -(-to_pos // nbframes))
+        first = max(first, -(-buf_pos // nbframes))
+
+        indexes = range(first, last)
+        if direction == -1:
+            indexes = reversed(indexes)
+        for i in indexes:
+            start = (i*nbframes - buf_pos) * sampwidth
+            v = audioop.rms(bytes(buf[start:start + nbframes*sampwidth]), sampwidth)
+            if v > threshold:
+                if direction == 1:
+                    return i*nbframes
+                return (i+1)*nbframes
+
+        return pos
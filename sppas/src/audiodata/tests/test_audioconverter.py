@@ -110,6 +110,23 @@ class TestAudioUtils(unittest.TestCase):
         self.assertEqual(f2, f2c)
         self.assertEqual(f3, f3c)
 
+    def test_deinterleave(self):
+        f3 = self._sample_3.read_frames(10)
+        sw = self._sample_3.get_sampwidth()
+        left, right = sppasAudioConverter().deinterleave(f3, sw, 2)
+        self.assertEqual(len(left), 10*sw)
+        self.assertEqual(len(right), 10*sw)
+        self.assertEqual(sppasAudioConverter().unpack_data(left, sw, 1),
+                         [[0, 1, 1, 0, 1, -2, 2, -1, 1, -2]])
+        self.assertEqual(sppasAudioConverter().unpack_data(right, sw, 1),
+                         [[0, 1, -5, 5, -8, 14, -76, -169, -139, -149]])
+        self.assertEqual([right],
+                         sppasAudioConverter().deinterleave(f3, sw, 2, [1]))
+
+        # 1 byte samples
+        frames = sppasAudioConverter().deinterleave(b"abcdefg", 1, 3)
+        self.assertEqual(frames, [b"ad", b"be", b"cf"])
+
     def test_db(self):
         """ Test amp2db. """
         self.assertEqual(70, sppasAudioConverter().amp2db(3162))
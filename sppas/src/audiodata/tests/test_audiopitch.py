@@ -0,0 +1,95 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.audiodata.tests.test_audiopitch.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import unittest
+import math
+import struct
+
+from ..channel import sppasChannel
+from ..audiopitch import AudioPitch
+
+# ---------------------------------------------------------------------------
+
+
+def harmonics(f0, duration, framerate=16000):
+    """ Return the frames of a signal with 3 harmonics of f0. """
+
+    values = list()
+    for i in range(int(duration * framerate)):
+        t = float(i) / framerate
+        v = sum(math.sin(2. * math.pi * h * f0 * t) / h for h in (1, 2, 3))
+        values.append(int(8000 * v))
+    return b"".join([struct.pack("<h", v) for v in values])
+
+# ---------------------------------------------------------------------------
+
+
+class TestAudioPitch(unittest.TestCase):
+
+    def test_eval_pitch(self):
+        # 0.5 sec at 150Hz, 0.3 sec of silence, 0.5 sec at 220Hz
+        frames = harmonics(150, 0.5) + b"\x00\x00" * 4800 + harmonics(220, 0.5)
+        channel = sppasChannel(16000, 2, frames)
+
+        pitch = AudioPitch(delta=0.01, hzinf=60, hzsup=400)
+        values = pitch.eval_pitch(channel)
+        self.assertEqual(130, len(values))
+        self.assertEqual(130, len(pitch))
+        self.assertEqual(values, pitch.get_pitch_list())
+
+        for v in values[5:45]:
+            self.assertTrue(abs(v - 150.) < 1.5)
+        for v in values[55:75]:
+            self.assertEqual(0., v)
+        for v in values[85:125]:
+            self.assertTrue(abs(v - 220.) < 2.2)
+        self.assertEqual(values[20], pitch.get_pitch(0.205))
+        with self.assertRaises(ValueError):
+            pitch.get_pitch(2.)
+
+        # 150Hz is out of the range
+        pitch = AudioPitch(delta=0.01, hzinf=200, hzsup=400)
+        values = pitch.eval_pitch(channel)
+        for v in values[5:45]:
+            self.assertTrue(v == 0. or v >= 200.)
+
+        # down-sampled channel
+        channel = sppasChannel(44100, 2, harmonics(120, 0.5, 44100))
+        values = AudioPitch().eval_pitch(channel)
+        self.assertEqual(50, len(values))
+        for v in values[5:45]:
+            self.assertTrue(abs(v - 120.) < 1.2)
+
+        with self.assertRaises(ValueError):
+            AudioPitch(hzinf=300, hzsup=100).eval_pitch(channel)
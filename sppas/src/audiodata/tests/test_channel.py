@@ -126,3 +126,27 @@ class TestChannel(unittest.TestCase):
         channel = self._sample_1.get_channel(0)
         newchannel = channel.extract_fragment(1*channel.get_framerate(), 2*channel.get_framerate())
         self.assertEqual(newchannel.get_nframes()/newchannel.get_framerate(), 1)
+
+    def test_View(self):
+        cidx = self._sample_1.extract_channel(0)
+        channel = self._sample_1.get_channel(cidx)
+        sw = channel.get_sampwidth()
+
+        # a view is a window on the frames, from the current position
+        channel.seek(1000)
+        view = channel.get_view(500)
+        self.assertEqual(channel.tell(), 1500)
+        self.assertEqual(len(view), 500*sw)
+        self.assertEqual(bytes(view), channel.get_frames()[1000*sw:1500*sw])
+
+        # a fragment shares the frames of its channel
+        fragment = channel.extract_fragment(1000, 1500)
+        self.assertEqual(fragment.get_nframes(), 500)
+        self.assertEqual(fragment.get_frames(), bytes(view))
+        self.assertEqual(fragment.rms(), channel.extract_fragment(1000, 1500).rms())
+
+        # samples are stored in a typed array
+        samples = channel.get_samples()
+        self.assertEqual(len(samples), channel.get_nframes())
+        self.assertIs(samples, channel.get_samples())
+        self.assertEqual(list(fragment.get_samples()), list(samples[1000:1500]))
@@ -0,0 +1,161 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.audiodata.tests.test_channelmfcc.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import unittest
+import os
+import math
+import struct
+import shutil
+
+from sppas.src.utils.fileutils import sppasFileUtils
+
+from ..audiodataexc import ChannelError
+from ..channel import sppasChannel
+from ..channelmfcc import sppasChannelMFCC
+
+# ---------------------------------------------------------------------------
+
+TEMP = sppasFileUtils().set_random()
+
+# one second of a 440Hz sine at 16000Hz, 16 bits
+frames = b"".join([struct.pack("<h", int(10000*math.sin(2*math.pi*440*i/16000.)))
+                   for i in range(16000)])
+
+features = {"TARGETKIND": "MFCC_0_D_N_Z",
+            "TARGETRATE": "100000.0",
+            "WINDOWSIZE": "250000.0",
+            "NUMCHANS": "26",
+            "CEPLIFTER": "22",
+            "NUMCEPS": "12",
+            "ENORMALISE": "F"}
+
+# ---------------------------------------------------------------------------
+
+
+class TestChannelMFCC(unittest.TestCase):
+
+    def setUp(self):
+        self._channel = sppasChannel(16000, 2, frames)
+        if os.path.exists(TEMP) is False:
+            os.mkdir(TEMP)
+
+    def tearDown(self):
+        shutil.rmtree(TEMP)
+
+    def test_parm_kind(self):
+        self.assertEqual(("MFCC", ["0", "D", "N", "Z"]),
+                         sppasChannelMFCC.get_parm_kind("MFCC_0_D_N_Z"))
+        self.assertEqual(6, sppasChannelMFCC.get_parm_code("MFCC"))
+        self.assertEqual(6 + 0o20000 + 0o400,
+                         sppasChannelMFCC.get_parm_code("MFCC_0_D"))
+        with self.assertRaises(ValueError):
+            sppasChannelMFCC.get_parm_kind("MFCC_X")
+
+    def test_read_config(self):
+        filename = os.path.join(TEMP, "config")
+        with open(filename, "w") as fp:
+            fp.write("# comment\n")
+            fp.write("SOURCEFORMAT = WAV\n")
+            fp.write("HPARM: TARGETKIND = MFCC_0_D\n")
+            fp.write("NUMCHANS = 26\n")
+        config = sppasChannelMFCC.read_config(filename)
+        self.assertEqual(3, len(config))
+        self.assertEqual("MFCC_0_D", config["TARGETKIND"])
+        self.assertEqual("26", config["NUMCHANS"])
+
+    def test_evaluate(self):
+        with self.assertRaises(ChannelError):
+            sppasChannelMFCC().evaluate(features)
+
+        # PLP is rejected before anything is evaluated
+        with self.assertRaises(ValueError):
+            sppasChannelMFCC().evaluate({"TARGETKIND": "PLP_0"})
+        mfcc = sppasChannelMFCC(self._channel)
+        with self.assertRaises(ValueError):
+            mfcc.evaluate({"TARGETKIND": "PLP"})
+        with self.assertRaises(ValueError):
+            mfcc.write_mfc(os.path.join(TEMP, "plp.mfc"), {"TARGETKIND": "PLP"})
+
+        # 25ms window, 10ms shift: (16000-400)/160 + 1 frames
+        vectors = mfcc.evaluate(features)
+        self.assertEqual(98, len(vectors))
+        self.assertEqual(25, len(vectors[0]))
+
+        # cepstral mean was subtracted
+        for j in range(12):
+            self.assertAlmostEqual(0., sum(v[j] for v in vectors) / 98.)
+
+        d = dict(features)
+        d["TARGETKIND"] = "MFCC_0_D"
+        self.assertEqual(26, len(mfcc.evaluate(d)[0]))
+        d["TARGETKIND"] = "MFCC_E_D_A"
+        self.assertEqual(39, len(mfcc.evaluate(d)[0]))
+        d["TARGETKIND"] = "FBANK"
+        vectors = mfcc.evaluate(d)
+        self.assertEqual(26, len(vectors[0]))
+        # the sine is in the 5th channel of the filterbank
+        self.assertEqual(4, vectors[10].index(max(vectors[10])))
+
+        # not enough samples for a frame
+        mfcc = sppasChannelMFCC(sppasChannel(16000, 2, frames[:600]))
+        self.assertEqual([], mfcc.evaluate(features))
+
+    def test_write_read(self):
+        mfcc = sppasChannelMFCC(self._channel)
+        filename = os.path.join(TEMP, "sample.mfc")
+        d = dict(features)
+        d["TARGETKIND"] = "MFCC_0_D"
+        d["SAVECOMPRESSED"] = "F"
+        d["SAVEWITHCRC"] = "F"
+        self.assertEqual(98, mfcc.write_mfc(filename, d))
+        self.assertEqual(12 + 98*26*4, os.path.getsize(filename))
+        vectors, period, kind = sppasChannelMFCC.read_htk(filename)
+        self.assertEqual(100000, period)
+        self.assertEqual(sppasChannelMFCC.get_parm_code("MFCC_0_D"), kind)
+        expected = mfcc.evaluate(d)
+        for v, e in zip(vectors, expected):
+            for x, y in zip(v, e):
+                self.assertAlmostEqual(x, y, places=3)
+
+        # compressed, with a CRC
+        d["SAVECOMPRESSED"] = "T"
+        d["SAVEWITHCRC"] = "T"
+        self.assertEqual(98, mfcc.write_mfc(filename, d))
+        self.assertEqual(12 + (98+4)*26*2 + 2, os.path.getsize(filename))
+        vectors, period, kind = sppasChannelMFCC.read_htk(filename)
+        self.assertEqual(98, len(vectors))
+        self.assertEqual(sppasChannelMFCC.get_parm_code("MFCC_0_D_C_K"), kind)
+        for v, e in zip(vectors, expected):
+            for x, y in zip(v, e):
+                self.assertTrue(abs(x-y) < 0.01 * max(1., abs(y)))
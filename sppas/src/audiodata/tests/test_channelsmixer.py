@@ -83,3 +83,26 @@ class TestChannelsMixer(unittest.TestCase):
 
         self.assertEqual(newchannel.get_nframes(), mixer.get_channel(0).get_nframes())
         self.assertEqual(newchannel.get_nframes(), mixer.get_channel(1).get_nframes())
+
+    def test_MixBlocks(self):
+        self._sample_1.extract_channel(0)
+        channel = self._sample_1.get_channel(0)
+
+        mixer = sppasChannelMixer()
+        mixer.append_channel(channel, 0.5)
+        mixer.append_channel(channel, 0.5)
+
+        # mixing a channel with itself gives the same channel
+        newchannel = mixer.mix()
+        self.assertEqual(newchannel.get_frames(), channel.get_frames())
+        self.assertEqual(b"".join(mixer.mix_blocks(block_size=1000)),
+                         channel.get_frames())
+        samples = channel.get_samples()
+        self.assertEqual(mixer.get_minmax(), (min(samples), max(samples)))
+
+        # clipping
+        mixer = sppasChannelMixer()
+        mixer.append_channel(channel, 1000)
+        values = list(mixer.mix().get_samples())
+        self.assertEqual(max(values), 32767)
+        self.assertEqual(min(values), -32768)
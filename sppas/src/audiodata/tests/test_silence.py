@@ -0,0 +1,99 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+
+    src.audiodata.tests.test_silence.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import unittest
+import os.path
+
+from sppas import SAMPLES_PATH
+from ..aio import open as audio_open
+from ..channelsilence import sppasChannelSilence
+from ..streamsilence import sppasStreamSilence
+
+# ---------------------------------------------------------------------------
+
+sample_1 = os.path.join(SAMPLES_PATH, "samples-eng", "oriana1.wav")  # mono; 16000Hz; 16bits
+
+# ---------------------------------------------------------------------------
+
+
+class TestSilence(unittest.TestCase):
+
+    def test_refine(self):
+        audio = audio_open(sample_1)
+        channel = audio.get_channel(audio.extract_channel(0))
+        audio.close()
+        chansil = sppasChannelSilence(channel, 0.02)
+        threshold = chansil.search_silences(0, mintrackdur=0.08)
+
+        # the fine windows are not cached by the channel
+        self.assertEqual([(320, 320)], list(channel._volumes.keys()))
+
+        # refined positions are the ones of the windows of get_volumes()
+        volumes = channel.get_volumes(0.005)
+        for pos in range(0, channel.get_nframes(), 1234):
+            first = -(-max(pos-320, 0) // 80)
+            last = min(len(volumes), -(-(max(pos-320, 0)+640) // 80))
+            expected = [i*80 for i in range(first, last) if volumes[i] > threshold]
+            self.assertEqual(expected[0] if expected else pos,
+                             chansil.refine(pos, threshold, 0.005, direction=1))
+            expected = [(i+1)*80 for i in range(first, last) if volumes[i] > threshold]
+            self.assertEqual(expected[-1] if expected else pos,
+                             chansil.refine(pos, threshold, 0.005, direction=-1))
+
+    # -----------------------------------------------------------------------
+
+    def test_stream(self):
+        audio = audio_open(sample_1)
+        cidx = audio.extract_channel(0)
+        channel = audio.get_channel(cidx)
+        chansil = sppasChannelSilence(channel, 0.02)
+        threshold = chansil.search_silences(0, mintrackdur=0.08)
+        silences = list(chansil)
+        chansil.filter_silences(0.2)
+        tracks = chansil.extract_tracks(0.3, 0.01, 0.02)
+        audio.close()
+
+        # Same silences and tracks when the audio file is read block by block
+        audio = audio_open(sample_1)
+        streamsil = sppasStreamSilence(audio, 0, 0.02, block_nwin=10)
+        self.assertEqual(streamsil.search_threshold_vol(), threshold)
+        self.assertEqual(list(streamsil.search_silences(threshold, 0.08)), silences)
+        self.assertEqual(list(streamsil.search_tracks(threshold, 0.2, 0.3, 0.01, 0.02)), tracks)
+
+        # Blocks are the frames of the channel
+        frames = b"".join(streamsil.read_blocks(1000, 5000))
+        channel.seek(1000)
+        self.assertEqual(frames, channel.get_frames(4000))
+        audio.close()
@@ -65,3 +65,27 @@ class TestVolume(unittest.TestCase):
         self.assertEqual(int(chanvol.mean()), int(audiovol.mean()))
         self.assertEqual(int(chanvol.variance()), int(audiovol.variance()))
         self.assertEqual(int(chanvol.stdev()), int(audiovol.stdev()))
+
+    def test_cache_and_hop(self):
+        audio = audio_open(sample_1)
+        cidx = audio.extract_channel(0)
+        channel = audio.get_channel(cidx)
+
+        # volumes are estimated only once
+        chanvol1 = sppasChannelVolume(channel)
+        chanvol2 = sppasChannelVolume(channel, 0.01)
+        self.assertIs(chanvol1.volumes(), chanvol2.volumes())
+        self.assertIs(chanvol1.volumes(), channel.get_volumes(0.01))
+
+        # windows can overlap
+        chanvol = sppasChannelVolume(channel, 0.02, 0.01)
+        self.assertEqual(chanvol.get_winlen(), 0.02)
+        self.assertEqual(chanvol.get_hoplen(), 0.01)
+        self.assertEqual(chanvol.len(), chanvol1.len())
+        fragment = channel.extract_fragment(1600, 1920)
+        self.assertEqual(chanvol[10], fragment.rms())
+
+        # the cache is cleared when frames are changed
+        channel.set_frames(channel.get_frames())
+        self.assertIsNot(chanvol1.volumes(), channel.get_volumes(0.01))
+        self.assertEqual(chanvol1.volumes(), channel.get_volumes(0.01))
@@ -33,11 +33,13 @@
     
 """
 import os
+import re
 import collections
 import glob
 
 from sppas.src.dependencies.grako.parsing import graken, Parser
-from sppas.src.utils.makeunicode import basestring
+from sppas.src.utils.makeunicode import u, basestring
+from sppas.src.resources.dumpfile import sppasDumpFile
 
 from ..modelsexc import MioFolderError, MioFileError
 from .hmm import sppasHMM
@@ -87,16 +89,19 @@ class sppasHtkIO(sppasBaseIO):
 
     # -----------------------------------------------------------------
 
-    def __init__(self, name=None):
+    def __init__(self, name=None, nodump=True):
         """ Create a sppasHtkIO instances.
 
         :param name: (str) An identifier name for the Acoustic Model.
         By default, the name of the class is used.
+        :param nodump: (bool) Disable the use and the creation of a dump
+        file of the model.
 
         """
         if name is None:
             name = self.__class__.__name__
         sppasBaseIO.__init__(self, name)
+        self._nodump = nodump
 
     # -----------------------------------------------------------------------
 
@@ -258,41 +263,72 @@ class sppasHtkIO(sppasBaseIO):
     def read_macros_hmms(self, filenames):
         """ Load an HTK-ASCII model from one or more files.
 
+        The files are read by HtkModelReader, or by HtkModelParser if they
+        are using some HTK constructs that HtkModelReader does not support.
+        The dump file of the first file is used instead if it was created
+        from the same files, and if they were not modified since. It is
+        created otherwise, unless nodump is set.
+
         :param filenames: Name of the files of the model
         (e.g. macros and/or hmms files and/or hmmdefs)
 
         """
-        text = ''
+        dp = None
+        if self._nodump is False and len(filenames) > 0:
+            # the dump is keyed on the names and the dates of all the files
+            key = [(os.path.abspath(f), os.path.getmtime(f)) for f in filenames]
+            dp = sppasDumpFile(filenames[0])
+            data = dp.load_from_dump()
+            if isinstance(data, tuple) and len(data) == 3 and data[0] == key:
+                self.__set_macros_hmms(data[1], data[2])
+                return
+
+        lines = list()
         for fnm in filenames:
             with open(fnm, 'r') as fp:
-                for line in fp.readlines():
+                for line in fp:
                     line = line.strip()
                     if len(line) > 0:
-                        text += line + "\n"
+                        lines.append(line)
 
-        if len(text) == 0:
+        if len(lines) == 0:
             raise MioFileError(" ".join(filenames))
+        text = u("\n".join(lines) + "\n")
+
+        try:
+            macros, hmms = HtkModelReader(text).read()
+        except ValueError:
+            parser = HtkModelParser()
+            htk_model = HtkModelSemantics()  # OrderedDict()
+            model = parser.parse(text,
+                                 rule_name='model',
+                                 ignorecase=True,
+                                 semantics=htk_model,
+                                 comments_re="\(\*.*?\*\)",
+                                 trace=False)
+            macros = model['macros']
+            hmms = [(h['name'], h['definition']) for h in model['hmms']]
+
+        self.__set_macros_hmms(macros, hmms)
+        if dp is not None:
+            dp.save_as_dump((key, macros, hmms))
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
 
-        parser = HtkModelParser()
-        htk_model = HtkModelSemantics()  # OrderedDict()
-        model = parser.parse(text,
-                             rule_name='model',
-                             ignorecase=True,
-                             semantics=htk_model,
-                             comments_re="\(\*.*?\*\)",
-                             trace=False)
+    def __set_macros_hmms(self, macros, hmms):
+        """ Set the macros and the (name, definition) of the hmms. """
 
-        self._macros = model['macros']
+        self._macros = macros
         self._hmms = list()
-        for h in model['hmms']:
+        for name, definition in hmms:
             new_hmm = sppasHMM()
-            new_hmm.set_name(h['name'])
-            new_hmm.set_definition(h['definition'])
+            new_hmm.set_name(name)
+            new_hmm.set_definition(definition)
             self._hmms.append(new_hmm)
 
     # -----------------------------------------------------------------------
-    # Private
-    # -----------------------------------------------------------------------
 
     @staticmethod
     def _serialize_macros(macros, options=True, transition=True, variance=True, mean=True, state=True, duration=True):
@@ -592,6 +628,536 @@ class sppasHtkIO(sppasBaseIO):
             result = result + sppasHtkIO._array_to_htk(arr)
         return result
 
+# ---------------------------------------------------------------------------
+# Fast reader of an HTK acoustic model.
+# ---------------------------------------------------------------------------
+
+# Spaces and comments between tokens, as skipped by HtkModelParser
+_SPACES = re.compile(r'(?:\(\*.*?\*\)|\s+)*', re.UNICODE)
+
+# Patterns of the terminal rules of HtkModelParser
+_STRING = re.compile(r'.*', re.UNICODE)
+_VECTOR = re.compile(r'[\d.\-\+eE \n]+', re.UNICODE)
+_SHORT = re.compile(r'\d+', re.UNICODE)
+_FLOAT = re.compile(r'[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?', re.UNICODE)
+
+# Keywords of the options, in the order of the choices of HtkModelParser
+_COVKINDS = ('diagc', 'invdiagc', 'fullc', 'lltc', 'xformc')
+_DURKINDS = ('nulld', 'poissond', 'gammad', 'gen')
+_BASEKINDS = ('discrete', 'lpc', 'lpcepstra', 'mfcc', 'fbank', 'melspec',
+              'lprefc', 'lpdelcep', 'user')
+_QUALIFIERS = ('_D', '_A', '_T', '_E', '_N', '_Z', '_O', '_0', '_V', '_C', '_K')
+
+# ---------------------------------------------------------------------------
+
+
+class HtkModelReader(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Fast reader of HTK-ASCII acoustic models.
+
+    A hand-written recursive descent reader of the subset of HTK-ASCII
+    used by SPPAS: options, transition, state, variance, mean and duration
+    macros, then HMMs made of Gaussian mixtures. It follows the rules of
+    HtkModelParser and it returns the same macros and hmms, without
+    building the intermediate AST.
+
+    A ValueError is raised with the other constructs (InputXform, RegTree,
+    TMix, DProb, InvCovar, Xform, ...), or if the text does not end after
+    the HMMs: HtkModelParser has to be used instead.
+
+    >>> macros, hmms = HtkModelReader(text).read()
+
+    """
+    def __init__(self, text):
+        """ Create a HtkModelReader instance.
+
+        :param text: (str) Content of the HTK-ASCII files
+
+        """
+        self.__text = text
+        self.__pos = 0
+
+    # -----------------------------------------------------------------------
+
+    def read(self):
+        """ Read the macros and the hmms of the text.
+
+        :returns: list of macros and list of (name, definition) of the hmms
+        :raises: ValueError
+
+        """
+        self.__pos = 0
+        macros = list()
+        macro = self.__macrodef()
+        while macro is not None:
+            macros.append(macro)
+            macro = self.__macrodef()
+
+        hmms = list()
+        hmm = self.__hmmmacro()
+        while hmm is not None:
+            hmms.append(hmm)
+            hmm = self.__hmmmacro()
+
+        self.__skip()
+        if self.__pos < len(self.__text):
+            self.__error('<BeginHMM>')
+
+        return macros, hmms
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __macrodef(self):
+        """ Return the next macro or None. """
+
+        if self.__token('~o'):
+            options = self.__globalopts()
+            if options is None:
+                self.__error('option')
+            key = 'options'
+            macro = collections.OrderedDict()
+            macro['definition'] = options
+        else:
+            if self.__token('~t'):
+                key = 'transition'
+                name = self.__string()
+                self.__expect('<transp>')
+                definition = self.__transpdef()
+            elif self.__token('~s'):
+                key = 'state'
+                name = self.__string()
+                definition = self.__stateinfodef()
+            elif self.__token('~v'):
+                key = 'variance'
+                name = self.__string()
+                self.__expect('<variance>')
+                definition = self.__vectordef()
+            elif self.__token('~u'):
+                key = 'mean'
+                name = self.__string()
+                self.__expect('<mean>')
+                definition = self.__vectordef()
+            elif self.__token('~d'):
+                key = 'duration'
+                name = self.__string()
+                self.__expect('<duration>')
+                definition = self.__vectordef()
+            else:
+                return None
+            macro = collections.OrderedDict()
+            macro['name'] = name
+            macro['definition'] = definition
+
+        macrodef = collections.OrderedDict()
+        macrodef[key] = macro
+        return HtkModelReader.__define(
+            macrodef,
+            ('transition', 'state', 'options', 'variance', 'mean', 'duration'))
+
+    # -----------------------------------------------------------------------
+
+    def __hmmmacro(self):
+        """ Return the (name, definition) of the next hmm or None. """
+
+        name = None
+        if self.__token('~h'):
+            name = self.__string()
+            self.__expect('<beginhmm>')
+        elif self.__token('<beginhmm>') is False:
+            return None
+
+        definition = collections.OrderedDict()
+        options = self.__globalopts()
+        if options is not None:
+            definition['options'] = options
+        self.__expect('<numstates>')
+        definition['state_count'] = self.__short()
+
+        states = list()
+        while self.__token('<state>'):
+            state = collections.OrderedDict()
+            state['index'] = self.__short()
+            if self.__token('~s'):
+                state['state'] = self.__string()
+            else:
+                state['state'] = self.__stateinfodef()
+            states.append(state)
+        if len(states) == 0:
+            self.__error('<State>')
+        definition['states'] = states
+
+        if self.__token('~r'):
+            self.__error('<TransP>')
+        definition['transition'] = self.__transp()
+        duration = self.__duration()
+        if duration is not None:
+            definition['duration'] = duration
+        self.__expect('<endhmm>')
+
+        HtkModelReader.__define(
+            definition,
+            ('options', 'state_count', 'regression_tree', 'transition', 'duration'))
+
+        return name, definition
+
+    # -----------------------------------------------------------------------
+
+    def __globalopts(self):
+        """ Return the list of the next options or None. """
+
+        options = list()
+        option = self.__option()
+        while option is not None:
+            options.append(option)
+            option = self.__option()
+
+        if len(options) == 0:
+            return None
+        return options
+
+    # -----------------------------------------------------------------------
+
+    def __option(self):
+        """ Return the next option or None. """
+
+        option = collections.OrderedDict()
+        if self.__token('<hmmsetid>'):
+            option['hmm_set_id'] = self.__string()
+        elif self.__token('<streaminfo>'):
+            info = collections.OrderedDict()
+            info['count'] = self.__short()
+            info['sizes'] = self.__shorts()
+            option['stream_info'] = info
+        elif self.__token('<vecsize>'):
+            option['vector_size'] = self.__short()
+        elif self.__token('<inputxform>'):
+            self.__error('option')
+        else:
+            start = self.__pos
+            kind = self.__kind(_COVKINDS)
+            if kind is not None:
+                option['covariance_kind'] = kind
+            else:
+                self.__pos = start
+                kind = self.__kind(_DURKINDS)
+                if kind is not None:
+                    option['duration_kind'] = kind
+                else:
+                    self.__pos = start
+                    kind = self.__parmkind()
+                    if kind is None:
+                        self.__pos = start
+                        return None
+                    option['parameter_kind'] = kind
+
+        return HtkModelReader.__define(
+            option,
+            ('hmm_set_id', 'stream_info', 'vector_size', 'input_transform',
+             'covariance_kind', 'duration_kind', 'parameter_kind'))
+
+    # -----------------------------------------------------------------------
+
+    def __kind(self, keywords):
+        """ Return the keyword of a <keyword> option or None. """
+
+        if self.__token('<'):
+            for keyword in keywords:
+                if self.__token(keyword):
+                    if self.__token('>'):
+                        return keyword
+                    break
+
+        return None
+
+    # -----------------------------------------------------------------------
+
+    def __parmkind(self):
+        """ Return the base and the qualifiers of a <parmkind> option or None. """
+
+        if self.__token('<') is False:
+            return None
+
+        for base in _BASEKINDS:
+            if self.__token(base):
+                break
+        else:
+            return None
+
+        qualifiers = list()
+        found = True
+        while found is True:
+            found = False
+            for qualifier in _QUALIFIERS:
+                if self.__token(qualifier.lower()):
+                    qualifiers.append(qualifier)
+                    found = True
+                    break
+
+        if self.__token('>') is False:
+            return None
+
+        kind = collections.OrderedDict()
+        kind['base'] = base
+        kind['options'] = qualifiers
+        return kind
+
+    # -----------------------------------------------------------------------
+
+    def __stateinfodef(self):
+        """ Return the definition of a state. """
+
+        state = collections.OrderedDict()
+        if self.__token('<nummixes>'):
+            state['streams_mixcount'] = [self.__short()] + self.__shorts()
+        if self.__token('~w'):
+            state['weights'] = self.__string()
+        elif self.__token('<sweights>'):
+            state['weights'] = self.__vectordef()
+
+        streams = list()
+        stream = self.__stream()
+        while stream is not None:
+            streams.append(stream)
+            stream = self.__stream()
+        if len(streams) == 0:
+            self.__error('<Mean>')
+        state['streams'] = streams
+
+        duration = self.__duration()
+        if duration is not None:
+            state['duration'] = duration
+
+        return HtkModelReader.__define(
+            state,
+            ('streams_mixcount', 'weights', 'duration'))
+
+    # -----------------------------------------------------------------------
+
+    def __stream(self):
+        """ Return the next stream of a state or None. """
+
+        stream = collections.OrderedDict()
+        is_stream = self.__token('<stream>')
+        if is_stream is True:
+            stream['dim'] = self.__short()
+
+        mixtures = list()
+        mixture = self.__mixture()
+        while mixture is not None:
+            mixtures.append(mixture)
+            mixture = self.__mixture()
+
+        if len(mixtures) == 0:
+            if is_stream is True:
+                self.__error('<Mean>')
+            return None
+        stream['mixtures'] = mixtures
+
+        return HtkModelReader.__define(
+            stream,
+            ('dim', 'tmixpdf', 'discpdf'))
+
+    # -----------------------------------------------------------------------
+
+    def __mixture(self):
+        """ Return the next mixture of a stream or None. """
+
+        mixture = collections.OrderedDict()
+        is_mixture = self.__token('<mixture>')
+        if is_mixture is True:
+            mixture['index'] = self.__short()
+            mixture['weight'] = self.__float()
+
+        if self.__token('~m'):
+            mixture['pdf'] = self.__string()
+        else:
+            pdf = collections.OrderedDict()
+            is_rclass = self.__token('<rclass>')
+            if is_rclass is True:
+                pdf['regression_class'] = self.__short()
+            if self.__token('~u'):
+                pdf['mean'] = self.__string()
+            elif self.__token('<mean>'):
+                pdf['mean'] = self.__vectordef()
+            elif is_mixture is True or is_rclass is True:
+                self.__error('<Mean>')
+            else:
+                return None
+
+            covariance = collections.OrderedDict()
+            if self.__token('~v'):
+                covariance['variance'] = self.__string()
+            else:
+                self.__expect('<variance>')
+                covariance['variance'] = self.__vectordef()
+            pdf['covariance'] = covariance
+
+            if self.__token('<gconst>'):
+                pdf['gconst'] = self.__float()
+            mixture['pdf'] = HtkModelReader.__define(
+                pdf,
+                ('regression_class', 'mean', 'covariance', 'gconst'))
+
+        return HtkModelReader.__define(
+            mixture,
+            ('index', 'weight', 'pdf'))
+
+    # -----------------------------------------------------------------------
+
+    def __duration(self):
+        """ Return the next duration or None. """
+
+        if self.__token('~d'):
+            return self.__string()
+        if self.__token('<duration>'):
+            return self.__vectordef()
+        return None
+
+    # -----------------------------------------------------------------------
+
+    def __transp(self):
+        """ Return the transition matrix of an hmm. """
+
+        if self.__token('~t'):
+            return self.__string()
+        self.__expect('<transp>')
+        return self.__transpdef()
+
+    # -----------------------------------------------------------------------
+
+    def __transpdef(self):
+        """ Return the dim and the matrix of a <TransP>. """
+
+        transp = collections.OrderedDict()
+        transp['dim'] = self.__short()
+        array = [float(v) for v in self.__pattern(_VECTOR).split()]
+
+        # the same rows as HtkModelSemantics.transPdef()
+        transp['matrix'] = list()
+        row = list()
+        array.append(None)
+        for a in array:
+            if len(row) == transp['dim']:
+                transp['matrix'].append(row)
+                row = [a]
+            else:
+                row.append(a)
+
+        return transp
+
+    # -----------------------------------------------------------------------
+
+    def __vectordef(self):
+        """ Return the dim and the vector of a <Mean>, <Variance>, etc. """
+
+        vector = collections.OrderedDict()
+        vector['dim'] = self.__short()
+        vector['vector'] = [float(v) for v in self.__pattern(_VECTOR).split(' ')]
+        return vector
+
+    # -----------------------------------------------------------------------
+
+    def __string(self):
+        """ Return the end of the line, unquoted. """
+
+        txt = self.__pattern(_STRING)
+        if txt.startswith('"') and txt.endswith('"'):
+            return txt[1:-1]
+        return txt
+
+    # -----------------------------------------------------------------------
+
+    def __short(self):
+        return int(self.__pattern(_SHORT))
+
+    # -----------------------------------------------------------------------
+
+    def __shorts(self):
+        """ Return the list of the next short values. """
+
+        values = list()
+        self.__skip()
+        m = _SHORT.match(self.__text, self.__pos)
+        while m is not None:
+            values.append(int(m.group()))
+            self.__pos = m.end()
+            self.__skip()
+            m = _SHORT.match(self.__text, self.__pos)
+
+        return values
+
+    # -----------------------------------------------------------------------
+
+    def __float(self):
+        return float(self.__pattern(_FLOAT))
+
+    # -----------------------------------------------------------------------
+
+    def __pattern(self, pattern):
+        """ Return the text matching the pattern at the current position. """
+
+        self.__skip()
+        m = pattern.match(self.__text, self.__pos)
+        if m is None:
+            self.__error(pattern.pattern)
+        self.__pos = m.end()
+        return m.group()
+
+    # -----------------------------------------------------------------------
+
+    def __token(self, token):
+        """ Return True and move after the token if it is the next one.
+
+        :param token: (str) Lower-case token. Keywords can't be the
+        beginning of a longer name.
+
+        """
+        self.__skip()
+        end = self.__pos + len(token)
+        if self.__text[self.__pos:end].lower() != token:
+            return False
+        if token[0].isalpha() and token.isalnum() and end < len(self.__text):
+            if self.__text[end].isalnum():
+                return False
+
+        self.__pos = end
+        return True
+
+    # -----------------------------------------------------------------------
+
+    def __expect(self, token):
+        if self.__token(token) is False:
+            self.__error(token)
+
+    # -----------------------------------------------------------------------
+
+    def __skip(self):
+        self.__pos = _SPACES.match(self.__text, self.__pos).end()
+
+    # -----------------------------------------------------------------------
+
+    def __error(self, expected):
+        raise ValueError('Expected {:s} at position {:d} of the HTK-ASCII model.'
+                         ''.format(expected, self.__pos))
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __define(ast, keys):
+        """ Add the missing keys to an ast, like grako does. """
+
+        for key in keys:
+            if key not in ast:
+                ast[key] = None
+        return ast
+
 # ---------------------------------------------------------------------------
 # Semantic of an HTK acoustic model. Used to parse files.
 # ---------------------------------------------------------------------------
@@ -867,7 +867,7 @@ class sppasTrainingCorpus(object):
         audio_out.append_channel(formatter.get_channel())
         audiodataio.save(os.path.join(self.datatrainer.get_storewav(), outfile + ".wav"), audio_out)
 
-        # Generate MFCC
+        # Generate MFCC: with HCopy if it is installed, or in-process
         wav = os.path.join(self.datatrainer.get_storewav(), outfile + ".wav")
         mfc = os.path.join(self.datatrainer.get_storemfc(), outfile + ".mfc")
         sf = sppasFileUtils()
@@ -876,8 +876,14 @@ class sppasTrainingCorpus(object):
             fp.write('%s %s\n' % (wav, mfc))
 
         cmfc = sppasChannelMFCC(formatter.get_channel())
-        cmfc.hcopy(self.datatrainer.features.mfcconfigfile, tmpfile)
+        ret = cmfc.hcopy(self.datatrainer.features.mfcconfigfile, tmpfile)
         os.remove(tmpfile)
+        if ret is False:
+            try:
+                cmfc.write_mfc(mfc, self.datatrainer.features.mfcconfigfile)
+            except Exception:
+                self._pop_audio(outfile)
+                return False
 
         return True
 
@@ -886,7 +892,7 @@ class sppasTrainingCorpus(object):
     def _pop_audio(self, outfile):
         try:
             os.remove(os.path.join(self.datatrainer.get_storewav(), outfile + ".wav"))
-        except IOError:
+        except OSError:
             pass
 
     # -----------------------------------------------------------------------
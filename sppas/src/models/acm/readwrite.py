@@ -68,13 +68,16 @@ class sppasACMRW(object):
     
     # -----------------------------------------------------------------------
 
-    def __init__(self, folder):
+    def __init__(self, folder, nodump=True):
         """ Create an acoustic model reader-writer.
 
         :param folder: (str) Name of the folder with the acoustic model files
+        :param nodump: (bool) Disable the use and the creation of a dump
+        file of the model when it is read.
 
         """
         self.__folder = u(folder)
+        self.__nodump = nodump
 
     # -----------------------------------------------------------------------
     
@@ -130,7 +133,7 @@ class sppasACMRW(object):
         for file_reader in sppasACMRW.ACM_TYPES.values():
             try:
                 if file_reader.detect(self.__folder) is True:
-                    return file_reader()
+                    return file_reader(nodump=self.__nodump)
             except Exception:
                 continue
                 
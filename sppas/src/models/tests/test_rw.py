@@ -11,6 +11,7 @@ from sppas.src.utils.fileutils import sppasFileUtils
 from sppas.src.utils.compare import sppasCompare
 
 from ..acm.acmbaseio import sppasBaseIO
+from ..acm.acmodelhtkio import HtkModelReader
 from ..acm.readwrite import sppasACMRW
 from ..modelsexc import MioFolderError
 from ..modelsexc import MioFileFormatError
@@ -85,6 +86,99 @@ class TestMIO(unittest.TestCase):
         # model = rw.read()
         # self.assertEqual(len(model), 1368)   # monophones, biphones, triphones
 
+    def test_read_htk_reader(self):
+        text = '~o <StreamInfo> 1 2 <VecSize> 2 <nulld> <mfcc_0_D> <diagc>\n' \
+               '~v "varFloor1"\n<Variance> 2\n1.0 2.0\n' \
+               '~h "a"\n<BeginHMM>\n<NumStates> 3\n<State> 2\n<NumMixes> 1\n' \
+               '<Mixture> 1 1.0\n<Mean> 2\n0.5 -0.5\n~v "varFloor1"\n<GConst> 1.5\n' \
+               '<TransP> 3\n0.0 1.0 0.0\n0.0 0.6 0.4\n0.0 0.0 0.0\n<EndHMM>\n'
+        macros, hmms = HtkModelReader(text).read()
+
+        # Macros, with the keys of HtkModelParser in the same order
+        self.assertEqual(2, len(macros))
+        self.assertEqual(['options', 'transition', 'state', 'variance', 'mean', 'duration'],
+                         list(macros[0].keys()))
+        options = macros[0]['options']['definition']
+        self.assertEqual(5, len(options))
+        self.assertEqual(['stream_info', 'hmm_set_id', 'vector_size', 'input_transform',
+                          'covariance_kind', 'duration_kind', 'parameter_kind'],
+                         list(options[0].keys()))
+        self.assertEqual({'count': 1, 'sizes': [2]}, options[0]['stream_info'])
+        self.assertEqual(2, options[1]['vector_size'])
+        self.assertEqual('nulld', options[2]['duration_kind'])
+        self.assertEqual({'base': 'mfcc', 'options': ['_0', '_D']}, options[3]['parameter_kind'])
+        self.assertEqual('diagc', options[4]['covariance_kind'])
+        self.assertEqual({'name': 'varFloor1', 'definition': {'dim': 2, 'vector': [1., 2.]}},
+                         macros[1]['variance'])
+
+        # HMMs
+        self.assertEqual(1, len(hmms))
+        name, definition = hmms[0]
+        self.assertEqual("a", name)
+        self.assertEqual(['state_count', 'states', 'transition', 'options', 'regression_tree', 'duration'],
+                         list(definition.keys()))
+        self.assertEqual(3, definition['state_count'])
+        self.assertEqual({'dim': 3, 'matrix': [[0., 1., 0.], [0., 0.6, 0.4], [0., 0., 0.]]},
+                         definition['transition'])
+        self.assertEqual(1, len(definition['states']))
+        self.assertEqual(2, definition['states'][0]['index'])
+        state = definition['states'][0]['state']
+        self.assertEqual(['streams_mixcount', 'streams', 'weights', 'duration'], list(state.keys()))
+        self.assertEqual([1], state['streams_mixcount'])
+        self.assertEqual(['mixtures', 'dim', 'tmixpdf', 'discpdf'], list(state['streams'][0].keys()))
+        mixture = state['streams'][0]['mixtures'][0]
+        self.assertEqual([1, 1.], [mixture['index'], mixture['weight']])
+        self.assertEqual(['mean', 'covariance', 'gconst', 'regression_class'], list(mixture['pdf'].keys()))
+        self.assertEqual({'dim': 2, 'vector': [0.5, -0.5]}, mixture['pdf']['mean'])
+        self.assertEqual({'variance': 'varFloor1'}, mixture['pdf']['covariance'])
+        self.assertEqual(1.5, mixture['pdf']['gconst'])
+
+        # Constructs not supported by the reader
+        with self.assertRaises(ValueError):
+            HtkModelReader(text.replace("~v \"varFloor1\"\n<GConst>", "<InvCovar> 1 1.0\n<GConst>")).read()
+        with self.assertRaises(ValueError):
+            HtkModelReader(text + "~o <VecSize> 2\n").read()
+
+    def test_read_htk_dump(self):
+        folder = os.path.join(TEMP, "models-cat")
+        shutil.copytree(os.path.join(MODEL_PATH, "models-cat"), folder)
+        dump_filename = os.path.join(folder, "hmmdefs.dump")
+
+        model = sppasACMRW(folder).read()
+        self.assertFalse(os.path.exists(dump_filename))
+
+        model_dump = sppasACMRW(folder, nodump=False).read()
+        self.assertTrue(os.path.exists(dump_filename))
+        model_copy = sppasACMRW(folder, nodump=False).read()
+
+        for acmodel in (model_dump, model_copy):
+            self.assertEqual(model.get_macros(), acmodel.get_macros())
+            self.assertEqual([(h.get_name(), h.get_definition()) for h in model.get_hmms()],
+                             [(h.get_name(), h.get_definition()) for h in acmodel.get_hmms()])
+
+        # the dump is ignored if the model is more recent
+        filename = os.path.join(folder, "hmmdefs")
+        with open(filename, "a") as fp:
+            fp.write(self._read_text(os.path.join(TEMP, "protos", "proto.hmm")))
+        t = os.path.getmtime(dump_filename) + 1.
+        os.utime(filename, (t, t))
+        acmodel = sppasACMRW(folder, nodump=False).read()
+        self.assertEqual(len(model) + 1, len(acmodel))
+
+        # the dump of a model in several files is keyed on all the files
+        folder = os.path.join(TEMP, "protos")
+        dump_filename = os.path.join(folder, "macros.dump")
+        model = sppasACMRW(folder, nodump=False).read()
+        self.assertTrue(os.path.exists(dump_filename))
+        self.assertEqual(3, len(sppasACMRW(folder, nodump=False).read()))
+        os.remove(os.path.join(folder, "laugh.hmm"))
+        self.assertEqual(2, len(sppasACMRW(folder, nodump=False).read()))
+
+    @staticmethod
+    def _read_text(filename):
+        with open(filename, "r") as fp:
+            return fp.read()
+
     def test_load_save(self):
         self._test_load_save(os.path.join(MODEL_PATH, "models-jpn"))
         self._test_load_save(os.path.join(MODEL_PATH, "models-nan"))
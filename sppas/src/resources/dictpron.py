@@ -46,7 +46,8 @@ from sppas import PHONEMES_SEPARATOR
 from sppas import VARIANTS_SEPARATOR
 from sppas.src.utils.makeunicode import sppasUnicode
 
-from .dumpfile import sppasDumpFile
+from .mappedfile import sppasMappedFile, sppasMappedDict
+from .trie import sppasTrie
 from .resourcesexc import FileIOError, FileUnicodeError, FileFormatError
 
 # ---------------------------------------------------------------------------
@@ -98,9 +99,9 @@ class sppasDictPron(object):
         :param dict_filename: (str) Name of the file of the pronunciation dictionary
         :param nodump: (bool) Create or not a dump file.
 
-        A dump file is a binary version of the dictionary. Its size is greater
-        than the original ASCII dictionary but the time to load is divided
-        by two or three.
+        A dump file is a compiled version of the dictionary. It is not loaded
+        but memory-mapped: it opens in a few milliseconds and it is shared
+        by all the processes using the dictionary.
 
         """
         self._filename = ""
@@ -108,15 +109,19 @@ class sppasDictPron(object):
         # The pronunciation dictionary
         self._dict = dict()
 
+        # Tries of the entries, and the key to share them. Created when used.
+        self._tries = dict()
+        self._trie_key = None
+
         # Either read the dictionary from a dumped file or from the original
         # ASCII one.
         if dict_filename is not None:
 
             self._filename = dict_filename
-            dp = sppasDumpFile(dict_filename)
+            dp = sppasMappedFile(dict_filename)
             data = None
 
-            # Try first to get the dict from a dump file (at least 2 times faster)
+            # Try first to get the dict from a dump file (much faster)
             if nodump is False:
                 data = dp.load_from_dump()
 
@@ -129,6 +134,10 @@ class sppasDictPron(object):
             else:
                 self._dict = data
 
+            # The dictionaries of this file can share the same tries
+            self._trie_key = (os.path.abspath(dict_filename),
+                              os.path.getmtime(dict_filename))
+
     # -----------------------------------------------------------------------
     # Getters
     # -----------------------------------------------------------------------
@@ -146,6 +155,22 @@ class sppasDictPron(object):
 
     # -----------------------------------------------------------------------
 
+    def get_trie(self, reverse=False):
+        """ Return the trie of the entries.
+
+        The trie is shared by all the dictionaries loaded from the same
+        file, while they are not modified.
+
+        :param reverse: (bool) Return the trie to search suffixes.
+        :returns: (sppasTrie)
+
+        """
+        if reverse not in self._tries:
+            self._tries[reverse] = sppasTrie.shared(self._trie_key, lambda: list(self._dict), reverse)
+        return self._tries[reverse]
+
+    # -----------------------------------------------------------------------
+
     def get(self, entry, substitution=unk_stamp):
         """ Return the pronunciations of an entry in the dictionary.
 
@@ -241,8 +266,14 @@ class sppasDictPron(object):
         # Get the current pronunciation and append the new one
         new_pron = cur_pron + new_pron
 
+        # A compiled dictionary is read-only
+        if isinstance(self._dict, sppasMappedDict):
+            self._dict = self._dict.copy()
+
         # Add (or change) the entry in the dict
         self._dict[entry] = new_pron
+        self._tries = dict()
+        self._trie_key = None
 
     # -----------------------------------------------------------------------
 
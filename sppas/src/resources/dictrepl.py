@@ -39,7 +39,7 @@ import logging
 
 from sppas import encoding
 from sppas.src.utils.makeunicode import sppasUnicode, u
-from .dumpfile import sppasDumpFile
+from .mappedfile import sppasMappedFile, sppasMappedDict
 from .resourcesexc import FileUnicodeError
 
 # ----------------------------------------------------------------------------
@@ -76,21 +76,25 @@ class sppasDictRepl(object):
 
         :param dict_filename: (str) The dictionary file name (2 columns)
         :param nodump: (bool) Disable the creation of a dump file
-        A dump file is a binary version of the dictionary. Its size is greater
-        than the original ASCII dictionary but the time to load it is divided
-        by two or three.
+        A dump file is a compiled version of the dictionary. It is not loaded
+        but memory-mapped: it opens in a few milliseconds and it is shared
+        by all the processes using the dictionary.
 
         """
         self._dict = dict()
         self.__filename = ""
 
+        # The reversed dictionary: the list of keys of each value.
+        # It is created when it is used the first time.
+        self._reversed = None
+
         if dict_filename is not None:
 
             self.__filename = dict_filename
             data = None
-            dp = sppasDumpFile(dict_filename)
+            dp = sppasMappedFile(dict_filename)
 
-            # Try first to get the dict from a dump file (at least 2 times faster)
+            # Try first to get the dict from a dump file (much faster)
             if nodump is False:
                 data = dp.load_from_dump()
 
@@ -141,14 +145,7 @@ class sppasDictRepl(object):
 
         """
         s = sppasDictRepl.format_token(entry)
-
-        for v in self._dict.values():
-            values = v.split(sppasDictRepl.REPLACE_SEPARATOR)
-            for val in values:
-                if val == s:
-                    return True
-
-        return False
+        return s in self.__get_reversed()
 
     # -----------------------------------------------------------------------
 
@@ -216,15 +213,7 @@ class sppasDictRepl(object):
         """
         s = sppasDictRepl.format_token(value)
         # hum... of course, a value can have more than 1 key!
-        keys = []
-        for k, v in self._dict.items():
-            values = v.split(sppasDictRepl.REPLACE_SEPARATOR)
-            for val in values:
-                if val == s:
-                    keys.append(k)
-
-        if len(keys) == 0:
-            return ""
+        keys = self.__get_reversed().get(s, [])
 
         return sppasDictRepl.REPLACE_SEPARATOR.join(keys)
 
@@ -258,12 +247,23 @@ class sppasDictRepl(object):
         value = sppasDictRepl.format_token(repl)
 
         # Check key,value in the dict
+        new_value = value
         if key in self._dict:
             if self.is_value_of(key, value) is False:
                 value = "{0}|{1}".format(self._dict.get(key), value)
+            else:
+                # ... don't lose the other values of the key
+                value = self._dict[key]
+                new_value = None
+
+        # A compiled dictionary is read-only
+        if isinstance(self._dict, sppasMappedDict):
+            self._dict = self._dict.copy()
 
         # Append
         self._dict[key] = value
+        if new_value is not None and self._reversed is not None:
+            self.__add_reversed(key, new_value)
 
     # -----------------------------------------------------------------------
 
@@ -274,13 +274,20 @@ class sppasDictRepl(object):
 
         """
         s = sppasDictRepl.format_token(entry)
-        to_pop = list()
-        for k in self._dict.keys():
-            if k == s or self.is_value_of(k, entry):
-                to_pop.append(k)
+        to_pop = list(self.__get_reversed().get(s, []))
+        if s in self._dict and s not in to_pop:
+            to_pop.append(s)
 
+        if len(to_pop) > 0 and isinstance(self._dict, sppasMappedDict):
+            self._dict = self._dict.copy()
         for k in to_pop:
-            self._dict.pop(k)
+            value = self._dict.pop(k)
+            for v in value.split(sppasDictRepl.REPLACE_SEPARATOR):
+                keys = self._reversed.get(v, [])
+                if k in keys:
+                    keys.remove(k)
+                    if len(keys) == 0:
+                        self._reversed.pop(v)
 
     # -----------------------------------------------------------------------
     # File
@@ -336,6 +343,37 @@ class sppasDictRepl(object):
 
         return True
 
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __get_reversed(self):
+        """ Return the reversed dictionary, i.e. the keys of each value.
+
+        :returns: (dict) value: list of keys
+
+        """
+        if self._reversed is None:
+            self._reversed = dict()
+            for k, v in self._dict.items():
+                self.__add_reversed(k, v)
+
+        return self._reversed
+
+    # -----------------------------------------------------------------------
+
+    def __add_reversed(self, key, value):
+        """ Add a key to the reversed dictionary, for each of its values.
+
+        :param key: (str) A key of the dictionary
+        :param value: (str) One or several values separated by "|".
+
+        """
+        for v in value.split(sppasDictRepl.REPLACE_SEPARATOR):
+            keys = self._reversed.setdefault(v, [])
+            if key not in keys:
+                keys.append(key)
+
     # -----------------------------------------------------------------------
     # Overloads
     # -----------------------------------------------------------------------
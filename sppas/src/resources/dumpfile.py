@@ -40,8 +40,11 @@
 """
 import os
 import codecs
-import pickle
 import logging
+try:
+    import cPickle as pickle  # python 2
+except ImportError:
+    import pickle
 
 from .resourcesexc import DumpExtensionError
 
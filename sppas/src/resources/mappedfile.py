@@ -0,0 +1,396 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.resources.mappedfile.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Classes to manage compiled dump files.
+    A compiled dump file is a read-only binary version of a dictionary
+    which is memory-mapped instead of being loaded: it opens immediately,
+    an entry is found without deserializing anything, and its pages are
+    shared by all the processes using it.
+
+    The file is made of:
+
+        - a header with a magic string, the number of entries and the
+          size of the blobs of keys and of values;
+        - the table of the offsets of the keys into the keys blob;
+        - the table of the offsets of the values into the values blob;
+        - the keys blob: utf-8 keys, sorted;
+        - the values blob: utf-8 values, in the order of the keys.
+
+"""
+import os
+import mmap
+import struct
+import codecs
+import logging
+import tempfile
+
+from sppas.src.utils.makeunicode import u, text_type
+
+from .dumpfile import sppasDumpFile
+
+# ---------------------------------------------------------------------------
+
+
+class sppasMappedDict(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      A read-only dictionary of strings on a compiled file.
+
+    Entries are searched by dichotomy into the sorted table of keys of the
+    memory-mapped file.
+
+        >>> sppasMappedDict.compile({"a": "x", "b": "y"}, "file.cdump")
+        >>> d = sppasMappedDict("file.cdump")
+        >>> d.get("a")
+        >>> "x"
+
+    """
+    MAGIC = b"SPPASMD1"
+    HEADER = struct.Struct("<8sIII")
+    OFFSETS = struct.Struct("<II")
+
+    # -----------------------------------------------------------------------
+
+    def __init__(self, filename):
+        """ Create a sppasMappedDict instance.
+
+        :param filename: (str) Name of the compiled file.
+        :raises: IOError if the file is not a compiled file.
+
+        """
+        self._filename = filename
+        self._map = None
+        self._len = 0
+        self._keys_table = 0
+        self._values_table = 0
+        self._keys = 0
+        self._values = 0
+        self.__open()
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def compile(data, filename):
+        """ Write a dictionary of strings as a compiled file.
+
+        The file is first written with a unique temporary name in the same
+        directory, then renamed in place of the previous version: several
+        processes can compile the same file at the same time, and a process
+        mapping the previous version of the file is not disturbed.
+
+        :param data: (dict) Keys and values are strings. None values are
+        stored as empty strings.
+        :param filename: (str) Name of the compiled file.
+
+        """
+        entries = sorted((sppasMappedDict.encode(k), sppasMappedDict.encode(v))
+                         for k, v in data.items())
+
+        keys_offsets = [0]
+        values_offsets = [0]
+        for k, v in entries:
+            keys_offsets.append(keys_offsets[-1] + len(k))
+            values_offsets.append(values_offsets[-1] + len(v))
+
+        dirname, basename = os.path.split(os.path.abspath(filename))
+        fd, tmp_filename = tempfile.mkstemp(prefix=basename + ".", suffix=".tmp", dir=dirname)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(sppasMappedDict.HEADER.pack(
+                    sppasMappedDict.MAGIC, len(entries), keys_offsets[-1], values_offsets[-1]))
+                fp.write(struct.pack("<%dI" % len(keys_offsets), *keys_offsets))
+                fp.write(struct.pack("<%dI" % len(values_offsets), *values_offsets))
+                fp.write(b"".join(k for k, v in entries))
+                fp.write(b"".join(v for k, v in entries))
+            os.chmod(tmp_filename, 0o644)
+
+            # replace the file at once: it always exists for the readers
+            replace = getattr(os, "replace", os.rename)
+            replace(tmp_filename, filename)
+        except Exception:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def encode(entry):
+        """ Return an entry as utf-8 bytes (None is an empty string). """
+
+        if entry is None:
+            entry = ""
+        if isinstance(entry, text_type) is False:
+            entry = u(entry)
+        return entry.encode("utf-8")
+
+    # -----------------------------------------------------------------------
+
+    def get_filename(self):
+        """ Return the name of the compiled file. """
+
+        return self._filename
+
+    # -----------------------------------------------------------------------
+
+    def get(self, key, substitution=None):
+        """ Return the value of a key or substitution.
+
+        :param key: (str) Unicode string
+        :param substitution: Value to return if key is missing
+
+        """
+        i = self.__find(key)
+        if i == -1:
+            return substitution
+        return self.__value(i)
+
+    # -----------------------------------------------------------------------
+
+    def keys(self):
+        """ Return the list of keys, sorted. """
+
+        return [self.__key(i).decode("utf-8") for i in range(self._len)]
+
+    # -----------------------------------------------------------------------
+
+    def values(self):
+        """ Return the list of values, in the order of the keys. """
+
+        return [self.__value(i) for i in range(self._len)]
+
+    # -----------------------------------------------------------------------
+
+    def items(self):
+        """ Return the list of (key, value), sorted by keys. """
+
+        return [(self.__key(i).decode("utf-8"), self.__value(i))
+                for i in range(self._len)]
+
+    # -----------------------------------------------------------------------
+
+    def copy(self):
+        """ Return a dict with the entries, to be modified. """
+
+        return dict(self.items())
+
+    # -----------------------------------------------------------------------
+
+    def close(self):
+        """ Close the memory-mapped file. """
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __open(self):
+        """ Map the file into memory and read its header. """
+
+        with codecs.open(self._filename, 'rb') as fp:
+            self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, n, keys_size, values_size = \
+                sppasMappedDict.HEADER.unpack_from(self._map, 0)
+            if magic != sppasMappedDict.MAGIC:
+                raise IOError('{:s} is not a compiled file.'.format(self._filename))
+
+            self._len = n
+            self._keys_table = sppasMappedDict.HEADER.size
+            self._values_table = self._keys_table + 4*(n+1)
+            self._keys = self._values_table + 4*(n+1)
+            self._values = self._keys + keys_size
+            if self._values + values_size != len(self._map):
+                raise IOError('{:s} is truncated.'.format(self._filename))
+        except Exception:
+            self.close()
+            raise
+
+    # -----------------------------------------------------------------------
+
+    def __key(self, i):
+        """ Return the i-th key, as utf-8 bytes. """
+
+        start, end = sppasMappedDict.OFFSETS.unpack_from(self._map, self._keys_table + 4*i)
+        return self._map[self._keys+start:self._keys+end]
+
+    # -----------------------------------------------------------------------
+
+    def __value(self, i):
+        """ Return the i-th value, as a unicode string. """
+
+        start, end = sppasMappedDict.OFFSETS.unpack_from(self._map, self._values_table + 4*i)
+        return self._map[self._values+start:self._values+end].decode("utf-8")
+
+    # -----------------------------------------------------------------------
+
+    def __find(self, key):
+        """ Return the index of a key or -1. """
+
+        if self._map is None:
+            raise IOError('{:s} is closed.'.format(self._filename))
+
+        k = sppasMappedDict.encode(key)
+        unpack = sppasMappedDict.OFFSETS.unpack_from
+        data = self._map
+        table = self._keys_table
+        keys = self._keys
+
+        # Search the first key which is not lower than k
+        low = 0
+        high = self._len
+        while low < high:
+            mid = (low + high) // 2
+            start, end = unpack(data, table + 4*mid)
+            if data[keys+start:keys+end] < k:
+                low = mid + 1
+            else:
+                high = mid
+
+        if low < self._len:
+            start, end = unpack(data, table + 4*low)
+            if data[keys+start:keys+end] == k:
+                return low
+        return -1
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        return self._len
+
+    # -----------------------------------------------------------------------
+
+    def __contains__(self, item):
+        return self.__find(item) != -1
+
+    # -----------------------------------------------------------------------
+
+    def __getitem__(self, item):
+        i = self.__find(item)
+        if i == -1:
+            raise KeyError(item)
+        return self.__value(i)
+
+    # -----------------------------------------------------------------------
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield self.__key(i).decode("utf-8")
+
+    # -----------------------------------------------------------------------
+
+    def __getstate__(self):
+        # a memory map can't be pickled: the file is mapped again
+        return self._filename
+
+    # -----------------------------------------------------------------------
+
+    def __setstate__(self, filename):
+        self.__init__(filename)
+
+# ---------------------------------------------------------------------------
+
+
+class sppasMappedFile(sppasDumpFile):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      Manager for compiled dump files.
+
+    """
+    DUMP_FILENAME_EXT = ".cdump"
+
+    # -----------------------------------------------------------------------
+
+    def __init__(self, filename, dump_extension=DUMP_FILENAME_EXT):
+        """ Create a sppasMappedFile instance.
+
+        :param filename: (str) Name of the ASCII file.
+        :param dump_extension: (str) Extension of the compiled dump file.
+
+        """
+        sppasDumpFile.__init__(self, filename, dump_extension)
+
+    # -----------------------------------------------------------------------
+
+    def load_from_dump(self):
+        """ Map the compiled dump file.
+
+        :returns: (sppasMappedDict) or None
+
+        """
+        if self.has_dump() is False:
+            return None
+
+        dump_filename = self.get_dump_filename()
+
+        # An invalid file is not removed: another process may have replaced
+        # it already, and the next save_as_dump() replaces it at once.
+        try:
+            data = sppasMappedDict(dump_filename)
+        except Exception as e:
+            logging.info('Load a compiled data failed: {:s}'.format(str(e)))
+            return None
+
+        return data
+
+    # -----------------------------------------------------------------------
+
+    def save_as_dump(self, data):
+        """ Save a dictionary of strings as a compiled dump file.
+
+        :param data: (dict) The data to save
+        :returns: (bool)
+
+        """
+        try:
+            sppasMappedDict.compile(data, self.get_dump_filename())
+        except Exception as e:
+            logging.info('Save a compiled data failed: {:s}'.format(str(e)))
+            return False
+
+        return True
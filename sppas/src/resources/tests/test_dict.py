@@ -284,6 +284,31 @@ class TestDictRepl(unittest.TestCase):
         self.assertTrue(d.replace_reversed("v2"), "key1|key2")
         self.assertEqual(d.replace_reversed("v0"), "")
 
+    def test_reversed_add_remove(self):
+        d = sppasDictRepl()
+        d.add("key1", "v1")
+        self.assertEqual(d.replace_reversed("v1"), "key1")
+        d.add("key1", "v2")
+        d.add("key2", "v2|v3")
+        d.add("key2", "v3")
+        self.assertEqual(d.replace_reversed("v2"), "key1|key2")
+        self.assertEqual(d.replace_reversed("v3"), "key2")
+        self.assertTrue(d.is_value("v3"))
+        self.assertFalse(d.is_value("v2|v3"))
+
+        d.remove("v1")
+        self.assertFalse("key1" in d)
+        self.assertFalse(d.is_value("v1"))
+        self.assertEqual(d.replace_reversed("v2"), "key2")
+
+        d.remove("key2")
+        self.assertTrue(d.is_empty())
+        self.assertFalse(d.is_value("v2"))
+        self.assertEqual(d.replace_reversed("v3"), "")
+
+        d.add("key3", "v3")
+        self.assertEqual(d.replace_reversed("v3"), "key3")
+
 # ---------------------------------------------------------------------------
 
 
@@ -0,0 +1,175 @@
+# -*- coding: utf8 -*-
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.resources.tests.test_mappedfile.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import unittest
+import os.path
+import shutil
+import tempfile
+from multiprocessing import Pool
+
+from sppas.src.utils.makeunicode import u
+
+from ..mappedfile import sppasMappedDict, sppasMappedFile
+from ..dictpron import sppasDictPron
+
+# ---------------------------------------------------------------------------
+
+DICT_TEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "dict.txt")
+
+# ---------------------------------------------------------------------------
+
+
+def compile_and_map(args):
+    """ Compile a dictionary and map it: done by several processes. """
+
+    data, filename = args
+    for i in range(20):
+        sppasMappedDict.compile(data, filename)
+        d = sppasMappedDict(filename)
+        if d.copy() != data:
+            return False
+        d.close()
+    return True
+
+# ---------------------------------------------------------------------------
+
+
+class TestMappedDict(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "dict.cdump")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_compile(self):
+        data = {u("a"): u("x"), u("été"): u("e-t-e"), u("b"): None, u("ab"): u("x|y")}
+        sppasMappedDict.compile(data, self.filename)
+        d = sppasMappedDict(self.filename)
+        self.assertEqual(len(d), 4)
+        self.assertEqual(d.get("a"), u("x"))
+        self.assertEqual(d.get(u("été")), u("e-t-e"))
+        self.assertEqual(d.get("b"), u(""))
+        self.assertEqual(d["ab"], u("x|y"))
+        self.assertIsNone(d.get("c"))
+        self.assertEqual(d.get("c", "unk"), "unk")
+        self.assertTrue("a" in d)
+        self.assertFalse("A" in d)
+        self.assertFalse("" in d)
+        with self.assertRaises(KeyError):
+            d["c"]
+        self.assertEqual(list(d), sorted(data.keys()))
+        self.assertEqual(d.copy(), {u("a"): u("x"), u("été"): u("e-t-e"), u("b"): u(""), u("ab"): u("x|y")})
+        d.close()
+
+    def test_compile_concurrent(self):
+        # the file is replaced while it is mapped
+        data = dict((u("entry%d") % i, u("value%d") % i) for i in range(1000))
+        sppasMappedDict.compile({u("a"): u("x")}, self.filename)
+        d = sppasMappedDict(self.filename)
+        sppasMappedDict.compile(data, self.filename)
+        self.assertEqual(d.get("a"), u("x"))
+        d.close()
+
+        # several processes compile the same file and map it
+        pool = Pool(processes=4)
+        results = pool.map(compile_and_map, [(data, self.filename)] * 4)
+        pool.close()
+        pool.join()
+        self.assertEqual([True] * 4, results)
+        self.assertEqual(["dict.cdump"], os.listdir(self.tmpdir))
+
+    def test_empty(self):
+        sppasMappedDict.compile(dict(), self.filename)
+        d = sppasMappedDict(self.filename)
+        self.assertEqual(len(d), 0)
+        self.assertFalse("a" in d)
+        self.assertEqual(d.items(), [])
+
+    def test_bad_file(self):
+        with open(self.filename, "w") as fp:
+            fp.write("this is not a compiled file")
+        with self.assertRaises(IOError):
+            sppasMappedDict(self.filename)
+
+# ---------------------------------------------------------------------------
+
+
+class TestMappedFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "dict.txt")
+        shutil.copy(DICT_TEST, self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_dump(self):
+        dp = sppasMappedFile(self.filename)
+        self.assertEqual(dp.get_dump_filename(), os.path.join(self.tmpdir, "dict.cdump"))
+        self.assertFalse(dp.has_dump())
+        self.assertIsNone(dp.load_from_dump())
+        self.assertTrue(dp.save_as_dump({u("a"): u("x")}))
+        self.assertTrue(dp.has_dump())
+        self.assertEqual(dp.load_from_dump().items(), [(u("a"), u("x"))])
+
+        # an invalid dump is ignored, then replaced
+        with open(dp.get_dump_filename(), "w") as fp:
+            fp.write("this is not a compiled file")
+        self.assertIsNone(dp.load_from_dump())
+        os.remove(dp.get_dump_filename())
+        self.assertIsNone(dp.load_from_dump())
+        self.assertTrue(dp.save_as_dump({u("b"): u("y")}))
+        self.assertEqual(dp.load_from_dump().items(), [(u("b"), u("y"))])
+
+    def test_dictpron(self):
+        ascii_dict = sppasDictPron(self.filename, nodump=True)
+        sppasDictPron(self.filename)
+        mapped_dict = sppasDictPron(self.filename)
+        self.assertIsInstance(mapped_dict._dict, sppasMappedDict)
+        self.assertEqual(len(ascii_dict), len(mapped_dict))
+        for entry in ascii_dict:
+            self.assertEqual(ascii_dict.get_pron(entry), mapped_dict.get_pron(entry))
+            self.assertFalse(mapped_dict.is_unk(entry))
+            self.assertTrue(entry in mapped_dict)
+        self.assertTrue(mapped_dict.is_unk("azerty"))
+
+        # a compiled dict can still be modified
+        mapped_dict.add_pron("azerty", "a z")
+        self.assertEqual(mapped_dict.get_pron("azerty"), u("a-z"))
+        self.assertEqual(len(ascii_dict)+1, len(mapped_dict))
@@ -0,0 +1,90 @@
+# -*- coding: utf8 -*-
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.resources.tests.test_trie.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import unittest
+
+from sppas.src.utils.makeunicode import u
+
+from ..trie import sppasTrie
+
+# ---------------------------------------------------------------------------
+
+
+class TestTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = [u("a"), u("ab"), u("abcd"), u("b"), u("bc"), u("été"), u("")]
+
+    def test_prefixes(self):
+        t = sppasTrie(self.entries)
+        self.assertEqual(len(t), 6)
+        self.assertTrue(u("ab") in t)
+        self.assertFalse(u("abc") in t)
+        self.assertEqual(t.prefixes(u("abcde")), [1, 2, 4])
+        self.assertEqual(t.prefixes(u("abcde"), [2, 3, 5]), [2])
+        self.assertEqual(t.prefixes(u("ac")), [1])
+        self.assertEqual(t.prefixes(u("c")), [])
+        self.assertEqual(t.prefixes(u("")), [])
+        self.assertEqual(t.prefixes(u("étés")), [3])
+        self.assertEqual(t.longest(u("abc")), 2)
+        self.assertEqual(t.longest(u("xyz")), 0)
+
+    def test_suffixes(self):
+        t = sppasTrie(self.entries, reverse=True)
+        self.assertTrue(t.is_reversed())
+        self.assertTrue(u("bc") in t)
+        self.assertEqual(t.prefixes(u("xabc")), [2])
+        self.assertEqual(t.prefixes(u("cab")), [1, 2])
+        self.assertEqual(t.longest(u("xxbc")), 2)
+        self.assertEqual(t.longest(u("bcd")), 0)
+
+    def test_longest_sequence(self):
+        t = sppasTrie([u("parce_que"), u("parce"), u("au_fur_et_à_mesure"), u("au")])
+        self.assertEqual(t.longest_sequence([u("parce"), u("que"), u("je")], "_"), 2)
+        self.assertEqual(t.longest_sequence([u("parce"), u("qu")], "_"), 1)
+        self.assertEqual(t.longest_sequence([u("au"), u("fur"), u("et"), u("à"), u("mesure")], "_"), 5)
+        self.assertEqual(t.longest_sequence([u("au"), u("fur"), u("et")], "_"), 1)
+        self.assertEqual(t.longest_sequence([u("pa"), u("rce")], ""), 2)
+        self.assertEqual(t.longest_sequence([u("xx")], "_"), 0)
+
+    def test_shared(self):
+        key = ("lexicon", 0)
+        t = sppasTrie.shared(key, lambda: self.entries)
+        self.assertTrue(t is sppasTrie.shared(key, lambda: []))
+        self.assertFalse(t is sppasTrie.shared(key, lambda: self.entries, reverse=True))
+        self.assertTrue(sppasTrie.shared(key, lambda: [], reverse=True).is_reversed())
+        self.assertFalse(t is sppasTrie.shared(None, lambda: self.entries))
+        self.assertEqual(len(t), len(sppasTrie.shared(None, lambda: self.entries)))
@@ -86,3 +86,13 @@ class TestVocabulary(unittest.TestCase):
         l = sppasVocabulary(ITA, nodump=True)
         self.assertTrue(l.is_unk('toto'))
         self.assertFalse(l.is_unk(u('perché')))
+
+    def test_trie(self):
+        l = sppasVocabulary(VOCAB, nodump=True)
+        l2 = sppasVocabulary(VOCAB, nodump=True)
+        self.assertTrue(l.get_trie() is l2.get_trie())
+        self.assertTrue(u("normale") in l.get_trie())
+        l2.add(u("être"))
+        self.assertFalse(l.get_trie() is l2.get_trie())
+        self.assertTrue(u("être") in l2.get_trie())
+        self.assertFalse(u("être") in l.get_trie())
@@ -0,0 +1,235 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.resources.trie.py
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Class to find the entries of a lexicon which are prefixes of a string.
+
+"""
+import sys
+from bisect import bisect_left
+
+# ---------------------------------------------------------------------------
+
+if sys.version_info < (3,):
+    unichr_ = unichr
+else:
+    unichr_ = chr
+
+# ---------------------------------------------------------------------------
+
+
+class sppasTrie(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      A trie of the entries of a lexicon.
+
+    The trie is represented by the sorted list of the entries: the entries
+    below a node, i.e. starting with the same prefix, are a range of this
+    list. Walking down the trie is narrowing this range, character after
+    character, until it is empty. All the entries which are a prefix of a
+    string are then found in only one walk, without any other memory than
+    the list.
+
+    A reversed trie is made of the reversed entries: it finds the entries
+    which are a suffix of a string.
+
+        >>> t = sppasTrie(['a', 'ab', 'abcd', 'b'])
+        >>> t.prefixes('abcde')
+        >>> [1, 2, 4]
+        >>> t.longest('abc')
+        >>> 2
+        >>> sppasTrie(['a', 'ab', 'abcd', 'b'], reverse=True).longest('cab')
+        >>> 2
+
+    The tries of the lexicons loaded from a file are shared: a trie is
+    created only once for all the lexicons loaded from the same file.
+
+    """
+    # Key: the key of a lexicon and the direction, value: its trie
+    _shared = dict()
+
+    def __init__(self, entries=(), reverse=False):
+        """ Create a sppasTrie instance.
+
+        :param entries: (iterable) The entries of the lexicon (str)
+        :param reverse: (bool) Search suffixes instead of prefixes.
+
+        """
+        self._reverse = bool(reverse)
+        if self._reverse is True:
+            entries = [e[::-1] for e in entries]
+        self._entries = list()
+        for e in sorted(entries):
+            if len(e) > 0 and (len(self._entries) == 0 or e != self._entries[-1]):
+                self._entries.append(e)
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def shared(key, get_entries, reverse=False):
+        """ Return the trie of a lexicon, shared by the lexicons of the same key.
+
+        :param key: (tuple) Key of the lexicon, for example its file name
+        and modification time, or None if the trie can't be shared.
+        :param get_entries: (function) Return the entries of the lexicon.
+        It is called only if the trie is created.
+        :param reverse: (bool) Search suffixes instead of prefixes.
+        :returns: (sppasTrie)
+
+        """
+        if key is None:
+            return sppasTrie(get_entries(), reverse)
+
+        key = (key, bool(reverse))
+        if key not in sppasTrie._shared:
+            sppasTrie._shared[key] = sppasTrie(get_entries(), reverse)
+        return sppasTrie._shared[key]
+
+    # -----------------------------------------------------------------------
+
+    def is_reversed(self):
+        """ Return True if the trie searches suffixes. """
+
+        return self._reverse
+
+    # -----------------------------------------------------------------------
+
+    def prefixes(self, entry, ends=None):
+        """ Return the lengths of the prefixes of entry which are in the lexicon.
+
+        With a reversed trie, return the lengths of the suffixes of entry
+        which are in the lexicon.
+
+        :param entry: (str) The string to search in
+        :param ends: (list) The lengths to consider in ascending order,
+        for example the ends of the tokens of the string. All by default.
+        :returns: (list of int) Lengths in ascending order
+
+        """
+        if self._reverse is True:
+            entry = entry[::-1]
+
+        if ends is None:
+            ends = range(1, len(entry)+1)
+
+        lengths = list()
+        lo = 0
+        hi = len(self._entries)
+        for i in ends:
+            if i <= 0:
+                continue
+            # Narrow the range to the entries starting with entry[:i]
+            prefix = entry[:i]
+            lo = bisect_left(self._entries, prefix, lo, hi)
+            c = ord(prefix[-1])
+            if c < sys.maxunicode:
+                hi = bisect_left(self._entries, prefix[:-1] + unichr_(c+1), lo, hi)
+            if lo == hi:
+                break
+            if self._entries[lo] == prefix:
+                lengths.append(i)
+
+        return lengths
+
+    # -----------------------------------------------------------------------
+
+    def longest(self, entry, ends=None):
+        """ Return the length of the longest prefix of entry in the lexicon.
+
+        :param entry: (str) The string to search in
+        :param ends: (list) The lengths to consider in ascending order.
+        All by default.
+        :returns: (int) 0 if no prefix of entry is in the lexicon
+
+        """
+        lengths = self.prefixes(entry, ends)
+        if len(lengths) == 0:
+            return 0
+        return lengths[-1]
+
+    # -----------------------------------------------------------------------
+
+    def longest_sequence(self, tokens, separator=""):
+        """ Return the longest sequence of tokens which is in the lexicon.
+
+        The tokens are joined with the separator: the walk down the trie
+        stops at the first sequence which is not a prefix of an entry.
+
+        :param tokens: (list of str) The tokens to join
+        :param separator: (str) The separator of the tokens in the lexicon
+        :returns: (int) Number of tokens of the longest sequence, or 0
+
+        """
+        if self._reverse is True:
+            tokens = [t[::-1] for t in reversed(tokens)]
+
+        longest = 0
+        lo = 0
+        hi = len(self._entries)
+        prefix = ""
+        for n, token in enumerate(tokens, 1):
+            if n > 1:
+                prefix += separator
+            prefix += token
+            if len(prefix) == 0:
+                continue
+            # Narrow the range to the entries starting with prefix
+            lo = bisect_left(self._entries, prefix, lo, hi)
+            c = ord(prefix[-1])
+            if c < sys.maxunicode:
+                hi = bisect_left(self._entries, prefix[:-1] + unichr_(c+1), lo, hi)
+            if lo == hi:
+                break
+            if self._entries[lo] == prefix:
+                longest = n
+
+        return longest
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._entries)
+
+    # -----------------------------------------------------------------------
+
+    def __contains__(self, item):
+        if self._reverse is True:
+            item = item[::-1]
+        i = bisect_left(self._entries, item)
+        return i < len(self._entries) and self._entries[i] == item
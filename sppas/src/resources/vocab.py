@@ -32,6 +32,7 @@
     ~~~~~~~~~~~~~~~~~~~~~~~
 
 """
+import os
 import codecs
 import logging
 
@@ -39,7 +40,8 @@ from sppas import encoding
 from sppas.src.utils.makeunicode import sppasUnicode
 
 from .resourcesexc import FileIOError, FileUnicodeError, FileFormatError
-from .dumpfile import sppasDumpFile
+from .mappedfile import sppasMappedFile, sppasMappedDict
+from .trie import sppasTrie
 
 # ---------------------------------------------------------------------------
 
@@ -68,14 +70,18 @@ class sppasVocabulary(object):
         # Set the list of entries to be case-sensitive or not.
         self.__case_sensitive = case_sensitive
 
+        # Trie of the entries, and the key to share it. Created when used.
+        self.__trie = None
+        self.__trie_key = None
+
         self.__filename = ""
         if filename is not None:
 
             self.__filename = filename
-            dp = sppasDumpFile(filename)
+            dp = sppasMappedFile(filename)
 
             # Try first to get the dict from a dump file
-            # (at least 2 times faster than the ascii one)
+            # (much faster than the ascii one)
             data = dp.load_from_dump()
 
             # Load from ascii if: 1st load, or, dump load error, or dump older than ascii
@@ -86,6 +92,11 @@ class sppasVocabulary(object):
             else:
                 self.__entries = data
 
+            # The vocabularies of this file can share the same trie
+            self.__trie_key = (os.path.abspath(filename),
+                               os.path.getmtime(filename),
+                               case_sensitive)
+
     # -----------------------------------------------------------------------
 
     def get_filename(self):
@@ -110,7 +121,12 @@ class sppasVocabulary(object):
             entry = s.to_lower()
 
         if entry not in self.__entries:
+            # A compiled list of entries is read-only
+            if isinstance(self.__entries, sppasMappedDict):
+                self.__entries = self.__entries.copy()
             self.__entries[entry] = None
+            self.__trie = None
+            self.__trie_key = None
             return True
 
         return False
@@ -124,6 +140,21 @@ class sppasVocabulary(object):
 
     # -----------------------------------------------------------------------
 
+    def get_trie(self):
+        """ Return the trie of the entries.
+
+        The trie is shared by all the vocabularies loaded from the same
+        file, while they are not modified.
+
+        :returns: (sppasTrie)
+
+        """
+        if self.__trie is None:
+            self.__trie = sppasTrie.shared(self.__trie_key, self.get_list)
+        return self.__trie
+
+    # -----------------------------------------------------------------------
+
     def is_in(self, entry):
         """ Return True if entry is in the list.
 
@@ -48,6 +48,7 @@ t = translate("structs")
 from .baseoption import sppasBaseOption
 from .baseoption import sppasOption
 from .lang import sppasLangResource
+from .lrucache import sppasLRUCache
 from .metainfo import sppasMetaInfo
 from .tips import sppasTips
 
@@ -55,6 +56,7 @@ __all__ = [
     'sppasBaseOption',
     'sppasOption',
     'sppasLangResource',
+    'sppasLRUCache',
     'sppasMetaInfo',
     'sppasTips'
 ]
@@ -0,0 +1,150 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+
+    src.structs.lrucache.py
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import collections
+
+# ---------------------------------------------------------------------------
+
+
+class sppasLRUCache(object):
+    """
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      brigitte.bigi@gmail.com
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
+    :summary:      A bounded memo of the least recently used items.
+
+    When the cache is full, adding an item removes the least recently used
+    one. The number of hits and misses of get() are counted.
+
+    >>> memo = sppasLRUCache(maxsize=2)
+    >>> memo.add('a', 1)
+    >>> memo.get('a')
+    >>> 1
+    >>> memo.get('b', 0)
+    >>> 0
+    >>> memo.get_hits(), memo.get_misses()
+    >>> (1, 1)
+
+    """
+    def __init__(self, maxsize=10000):
+        """ Create a new sppasLRUCache instance.
+
+        :param maxsize: (int) Maximum number of items of the cache
+
+        """
+        maxsize = int(maxsize)
+        if maxsize < 1:
+            raise ValueError('Unexpected value for the size of the cache.')
+
+        self._maxsize = maxsize
+        self._items = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    # -----------------------------------------------------------------------
+
+    def get_maxsize(self):
+        """ Return the maximum number of items of the cache. """
+
+        return self._maxsize
+
+    # -----------------------------------------------------------------------
+
+    def get_hits(self):
+        """ Return the number of times get() found the key. """
+
+        return self._hits
+
+    # -----------------------------------------------------------------------
+
+    def get_misses(self):
+        """ Return the number of times get() did not find the key. """
+
+        return self._misses
+
+    # -----------------------------------------------------------------------
+
+    def get(self, key, default=None):
+        """ Return the value of a key, and mark it as the most recent one.
+
+        :param key: (hashable) The key
+        :param default: The value to return if the key is missing
+        :returns: value
+
+        """
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            self._misses += 1
+            return default
+
+        self._items[key] = value
+        self._hits += 1
+        return value
+
+    # -----------------------------------------------------------------------
+
+    def add(self, key, value):
+        """ Add or replace an item, and remove the oldest one if needed.
+
+        :param key: (hashable) The key
+        :param value: The value
+
+        """
+        if key in self._items:
+            del self._items[key]
+        elif len(self._items) >= self._maxsize:
+            self._items.popitem(last=False)
+        self._items[key] = value
+
+    # -----------------------------------------------------------------------
+
+    def clear(self):
+        """ Remove all items and reset the statistics. """
+
+        self._items.clear()
+        self._hits = 0
+        self._misses = 0
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
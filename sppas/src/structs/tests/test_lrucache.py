@@ -0,0 +1,79 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+
+    src.structs.tests.test_lrucache.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import unittest
+
+from ..lrucache import sppasLRUCache
+
+# ---------------------------------------------------------------------------
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_init(self):
+        memo = sppasLRUCache(maxsize=2)
+        self.assertEqual(len(memo), 0)
+        self.assertEqual(memo.get_maxsize(), 2)
+        with self.assertRaises(ValueError):
+            sppasLRUCache(maxsize=0)
+
+    def test_add_get(self):
+        memo = sppasLRUCache(maxsize=2)
+        memo.add('a', 1)
+        memo.add('b', 2)
+        self.assertEqual(memo.get('a'), 1)
+        self.assertIsNone(memo.get('c'))
+        self.assertEqual(memo.get('c', 0), 0)
+        self.assertEqual(memo.get_hits(), 1)
+        self.assertEqual(memo.get_misses(), 2)
+
+        # 'b' is the least recently used
+        memo.add('c', 3)
+        self.assertEqual(len(memo), 2)
+        self.assertTrue('a' in memo)
+        self.assertFalse('b' in memo)
+
+        # replace a value
+        memo.add('a', 4)
+        self.assertEqual(memo.get('a'), 4)
+        self.assertEqual(len(memo), 2)
+
+    def test_clear(self):
+        memo = sppasLRUCache()
+        memo.add('a', 1)
+        memo.get('a')
+        memo.clear()
+        self.assertEqual(len(memo), 0)
+        self.assertEqual(memo.get_hits(), 0)
+        self.assertEqual(memo.get_misses(), 0)
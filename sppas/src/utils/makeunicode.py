@@ -99,6 +99,10 @@ else:
 
 from .utilsexc import UtilsDataTypeError
 
+# Multiple whitespace, tab and CR/LF, compiled only once: to_strip() is
+# called on each token of each annotation.
+RE_WHITESPACE = re.compile("[\s]+")
+
 # ---------------------------------------------------------------------------
 
 
@@ -159,12 +163,11 @@ class sppasUnicode(object):
         """
         # Remove multiple whitespace
         e = self.unicode()
-        __str = re.sub("[\s]+", r" ", e)
+        __str = RE_WHITESPACE.sub(" ", e)
 
         # Remove whitespace at beginning and end
-        __str = re.sub("^[ ]+", r"", __str)
-        __str = re.sub("[ ]+$", r"", __str)
-        __str = re.sub("\ufeff", r"", __str)
+        __str = __str.strip(" ")
+        __str = __str.replace("\ufeff", "")
 
         self._entry = __str
 